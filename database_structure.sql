@@ -1,4 +1,5 @@
 CREATE EXTENSION IF NOT EXISTS "uuid-ossp";
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
 CREATE TABLE IF NOT EXISTS Roles(
   id SERIAL PRIMARY KEY NOT NULL,
   name TEXT NOT NULL,
@@ -20,6 +21,7 @@ CREATE TABLE IF NOT EXISTS Users(
   firstname TEXT NOT NULL,
   lastname TEXT NOT NULL,
   email TEXT CHECK(email LIKE '%@%.%'),
+  updated_on TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
   UNIQUE(username)
 );
 CREATE TABLE IF NOT EXISTS ProfileImages(
@@ -27,20 +29,39 @@ CREATE TABLE IF NOT EXISTS ProfileImages(
   user_id uuid REFERENCES Users ON DELETE CASCADE NOT NULL,
   image_type TEXT NOT NULL,
   image_data BYTEA NOT NULL,
+  image_version TEXT NOT NULL,
   UNIQUE(user_id)
 );
+CREATE TABLE IF NOT EXISTS ProfileImageVariants(
+  user_id uuid REFERENCES Users ON DELETE CASCADE NOT NULL,
+  size INTEGER NOT NULL,
+  image_type TEXT NOT NULL,
+  image_data BYTEA NOT NULL,
+  PRIMARY KEY(user_id, size)
+);
 CREATE TABLE IF NOT EXISTS Teams(
   id uuid PRIMARY KEY DEFAULT uuid_generate_v4 (),
   name TEXT NOT NULL,
   description TEXT,
-  team_leader uuid REFERENCES Users NOT NULL
+  team_leader uuid REFERENCES Users NOT NULL,
+  updated_on TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
+CREATE OR REPLACE FUNCTION split_flags(flags TEXT) RETURNS TEXT[] AS $$
+SELECT array_remove(string_to_array(btrim(regexp_replace(COALESCE(flags, ''), '\s*;\s*', ';', 'g')), ';'), '');
+$$ LANGUAGE sql IMMUTABLE;
+-- search vectors weight names over descriptions and comments, 'simple'
+-- configuration does not stem, so it works for Finnish and English alike
+CREATE OR REPLACE FUNCTION search_vector(name TEXT, description TEXT) RETURNS tsvector AS $$
+SELECT setweight(to_tsvector('simple', COALESCE(name, '')), 'A') || setweight(to_tsvector('simple', COALESCE(description, '')), 'B');
+$$ LANGUAGE sql IMMUTABLE;
 CREATE TABLE IF NOT EXISTS Projects(
   id uuid PRIMARY KEY DEFAULT uuid_generate_v4 (),
   project_owner uuid REFERENCES Users NOT NULL,
   name TEXT NOT NULL,
   description TEXT,
   flags TEXT,
+  flag_list TEXT[] GENERATED ALWAYS AS (split_flags(flags)) STORED,
+  search tsvector GENERATED ALWAYS AS (search_vector(name, description)) STORED,
   created TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
   updated_on TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
 );
@@ -51,6 +72,8 @@ CREATE TABLE IF NOT EXISTS Features(
   name TEXT NOT NULL,
   description TEXT,
   flags TEXT,
+  flag_list TEXT[] GENERATED ALWAYS AS (split_flags(flags)) STORED,
+  search tsvector GENERATED ALWAYS AS (search_vector(name, description)) STORED,
   status uuid REFERENCES Statuses,
   type uuid REFERENCES Types,
   priority INTEGER,
@@ -64,6 +87,8 @@ CREATE TABLE IF NOT EXISTS Tasks(
   name TEXT NOT NULL,
   description TEXT,
   flags TEXT,
+  flag_list TEXT[] GENERATED ALWAYS AS (split_flags(flags)) STORED,
+  search tsvector GENERATED ALWAYS AS (search_vector(name, description)) STORED,
   status uuid REFERENCES Statuses,
   type uuid REFERENCES Types,
   priority INTEGER,
@@ -75,6 +100,9 @@ CREATE TABLE IF NOT EXISTS Comments(
   feature_id uuid REFERENCES Features ON DELETE CASCADE,
   task_id uuid REFERENCES Tasks ON DELETE CASCADE,
   comment TEXT NOT NULL,
+  -- comment rendered from markdown, NULL until rendered by the app
+  comment_html TEXT,
+  search tsvector GENERATED ALWAYS AS (search_vector(NULL, comment)) STORED,
   time_spent NUMERIC NOT NULL,
   assignee uuid REFERENCES Users,
   created TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
@@ -98,6 +126,234 @@ CREATE TRIGGER updated_on BEFORE
 UPDATE ON Tasks FOR EACH ROW EXECUTE PROCEDURE updated_on();
 CREATE TRIGGER updated_on BEFORE
 UPDATE ON Comments FOR EACH ROW EXECUTE PROCEDURE updated_on();
+CREATE TRIGGER updated_on BEFORE
+UPDATE ON Users FOR EACH ROW EXECUTE PROCEDURE updated_on();
+CREATE TRIGGER updated_on BEFORE
+UPDATE ON Teams FOR EACH ROW EXECUTE PROCEDURE updated_on();
+-- team of the user is part of the user, so joining or leaving updates user
+CREATE OR REPLACE FUNCTION team_membership_updated_on() RETURNS trigger AS $$ BEGIN
+IF TG_OP IN ('UPDATE', 'DELETE') THEN
+UPDATE Users SET updated_on = now() WHERE id = OLD.user_id;
+END IF;
+IF TG_OP IN ('INSERT', 'UPDATE') THEN
+UPDATE Users SET updated_on = now() WHERE id = NEW.user_id;
+END IF;
+RETURN NULL;
+END;
+$$ language 'plpgsql';
+CREATE TRIGGER team_membership_updated_on AFTER
+INSERT OR UPDATE OR DELETE ON Teamsusers FOR EACH ROW EXECUTE PROCEDURE team_membership_updated_on();
+CREATE INDEX IF NOT EXISTS projects_project_owner_idx ON Projects (project_owner);
+CREATE INDEX IF NOT EXISTS projects_created_id_idx ON Projects (created, id);
+CREATE INDEX IF NOT EXISTS features_project_id_idx ON Features (project_id);
+CREATE INDEX IF NOT EXISTS features_feature_owner_idx ON Features (feature_owner);
+CREATE INDEX IF NOT EXISTS features_created_id_idx ON Features (created, id);
+CREATE INDEX IF NOT EXISTS tasks_feature_id_idx ON Tasks (feature_id);
+CREATE INDEX IF NOT EXISTS tasks_assignee_idx ON Tasks (assignee);
+CREATE INDEX IF NOT EXISTS tasks_created_id_idx ON Tasks (created, id);
+CREATE INDEX IF NOT EXISTS comments_feature_id_idx ON Comments (feature_id) INCLUDE (time_spent);
+CREATE INDEX IF NOT EXISTS comments_task_id_idx ON Comments (task_id) INCLUDE (time_spent);
+CREATE INDEX IF NOT EXISTS comments_assignee_created_id_time_spent_idx ON Comments (assignee, created, id) INCLUDE (time_spent);
+CREATE INDEX IF NOT EXISTS comments_created_id_idx ON Comments (created, id);
+CREATE INDEX IF NOT EXISTS teams_team_leader_idx ON Teams (team_leader);
+CREATE INDEX IF NOT EXISTS teamsusers_team_id_idx ON Teamsusers (team_id);
+CREATE INDEX IF NOT EXISTS teams_name_id_idx ON Teams (name, id);
+CREATE INDEX IF NOT EXISTS projects_flag_list_idx ON Projects USING GIN (flag_list);
+CREATE INDEX IF NOT EXISTS features_flag_list_idx ON Features USING GIN (flag_list);
+CREATE INDEX IF NOT EXISTS tasks_flag_list_idx ON Tasks USING GIN (flag_list);
+CREATE INDEX IF NOT EXISTS projects_search_idx ON Projects USING GIN (search);
+CREATE INDEX IF NOT EXISTS features_search_idx ON Features USING GIN (search);
+CREATE INDEX IF NOT EXISTS tasks_search_idx ON Tasks USING GIN (search);
+CREATE INDEX IF NOT EXISTS comments_search_idx ON Comments USING GIN (search);
+CREATE INDEX IF NOT EXISTS users_fullname_trgm_idx ON Users USING GIN ((firstname || ' ' || lastname) gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS projects_name_trgm_idx ON Projects USING GIN (name gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS features_name_trgm_idx ON Features USING GIN (name gin_trgm_ops);
+CREATE TABLE IF NOT EXISTS LookupVersions(
+  table_name TEXT PRIMARY KEY NOT NULL,
+  version BIGINT NOT NULL DEFAULT 0
+);
+CREATE OR REPLACE FUNCTION bump_lookup_version() RETURNS trigger AS $$ BEGIN
+INSERT INTO LookupVersions (table_name, version) VALUES (TG_TABLE_NAME, 1)
+ON CONFLICT (table_name) DO UPDATE SET version = LookupVersions.version + 1;
+RETURN NULL;
+END;
+$$ language 'plpgsql';
+CREATE TRIGGER bump_lookup_version AFTER
+INSERT OR UPDATE OR DELETE OR TRUNCATE ON Roles FOR EACH STATEMENT EXECUTE PROCEDURE bump_lookup_version();
+CREATE TRIGGER bump_lookup_version AFTER
+INSERT OR UPDATE OR DELETE OR TRUNCATE ON Statuses FOR EACH STATEMENT EXECUTE PROCEDURE bump_lookup_version();
+CREATE TRIGGER bump_lookup_version AFTER
+INSERT OR UPDATE OR DELETE OR TRUNCATE ON Types FOR EACH STATEMENT EXECUTE PROCEDURE bump_lookup_version();
+CREATE TABLE IF NOT EXISTS TimeSpentRollups(
+  scope TEXT NOT NULL CHECK(scope IN ('task', 'feature', 'project', 'user')),
+  id uuid NOT NULL,
+  comments BIGINT NOT NULL DEFAULT 0,
+  time_spent NUMERIC NOT NULL DEFAULT 0,
+  PRIMARY KEY(scope, id)
+);
+CREATE OR REPLACE FUNCTION add_time_spent(rollup_scope TEXT, rollup_id uuid, delta_comments BIGINT, delta_time NUMERIC) RETURNS void AS $$ BEGIN
+IF rollup_id IS NULL OR (delta_comments = 0 AND delta_time = 0) THEN
+RETURN;
+END IF;
+INSERT INTO TimeSpentRollups (scope, id, comments, time_spent) VALUES (rollup_scope, rollup_id, delta_comments, delta_time)
+ON CONFLICT (scope, id) DO UPDATE SET comments = TimeSpentRollups.comments + EXCLUDED.comments, time_spent = TimeSpentRollups.time_spent + EXCLUDED.time_spent;
+END;
+$$ language 'plpgsql';
+-- comments are given as arrays, so that rows changed by one statement,
+-- for example COPY, update each rollup only once. Comments of deleted
+-- features and tasks are skipped by the joins, their share of project's
+-- rollup is removed by delete triggers of the features and tasks.
+CREATE OR REPLACE FUNCTION add_comments_time_spent(feature_ids uuid[], task_ids uuid[], assignees uuid[], times NUMERIC[], sign INTEGER) RETURNS void AS $$
+WITH changes AS (
+SELECT * FROM unnest(feature_ids, task_ids, assignees, times) AS C(feature_id, task_id, assignee, time_spent)
+), deltas AS (
+SELECT 'user' AS scope, assignee AS id, COUNT(*) AS comments, SUM(time_spent) AS time_spent
+FROM changes WHERE assignee IS NOT NULL GROUP BY assignee
+UNION ALL
+SELECT 'feature', C.feature_id, COUNT(*), SUM(C.time_spent)
+FROM changes C JOIN Features F ON F.id = C.feature_id GROUP BY C.feature_id
+UNION ALL
+SELECT 'task', C.task_id, COUNT(*), SUM(C.time_spent)
+FROM changes C JOIN Tasks T ON T.id = C.task_id GROUP BY C.task_id
+UNION ALL
+SELECT 'project', project_id, COUNT(*), SUM(time_spent)
+FROM (
+SELECT F.project_id, C.time_spent FROM changes C JOIN Features F ON F.id = C.feature_id
+UNION ALL
+SELECT F.project_id, C.time_spent FROM changes C JOIN Tasks T ON T.id = C.task_id JOIN Features F ON F.id = T.feature_id
+) AS project_changes GROUP BY project_id
+)
+INSERT INTO TimeSpentRollups (scope, id, comments, time_spent)
+SELECT scope, id, sign * comments, sign * time_spent FROM deltas ORDER BY scope, id
+ON CONFLICT (scope, id) DO UPDATE SET comments = TimeSpentRollups.comments + EXCLUDED.comments, time_spent = TimeSpentRollups.time_spent + EXCLUDED.time_spent;
+$$ LANGUAGE sql;
+CREATE OR REPLACE FUNCTION comments_time_spent() RETURNS trigger AS $$ BEGIN
+IF TG_OP = 'INSERT' THEN
+PERFORM add_comments_time_spent(array_agg(feature_id), array_agg(task_id), array_agg(assignee), array_agg(time_spent), 1)
+FROM new_comments;
+ELSIF TG_OP = 'DELETE' THEN
+PERFORM add_comments_time_spent(array_agg(feature_id), array_agg(task_id), array_agg(assignee), array_agg(time_spent), -1)
+FROM old_comments;
+ELSE
+PERFORM add_comments_time_spent(array_agg(O.feature_id), array_agg(O.task_id), array_agg(O.assignee), array_agg(O.time_spent), -1)
+FROM old_comments O JOIN new_comments N ON N.id = O.id
+WHERE (O.feature_id, O.task_id, O.assignee, O.time_spent) IS DISTINCT FROM (N.feature_id, N.task_id, N.assignee, N.time_spent);
+PERFORM add_comments_time_spent(array_agg(N.feature_id), array_agg(N.task_id), array_agg(N.assignee), array_agg(N.time_spent), 1)
+FROM old_comments O JOIN new_comments N ON N.id = O.id
+WHERE (O.feature_id, O.task_id, O.assignee, O.time_spent) IS DISTINCT FROM (N.feature_id, N.task_id, N.assignee, N.time_spent);
+END IF;
+RETURN NULL;
+END;
+$$ language 'plpgsql';
+CREATE OR REPLACE FUNCTION task_time_spent() RETURNS trigger AS $$
+DECLARE
+task_comments BIGINT;
+task_time NUMERIC;
+old_project uuid;
+new_project uuid;
+BEGIN
+SELECT comments, time_spent INTO task_comments, task_time FROM TimeSpentRollups WHERE scope = 'task' AND id = OLD.id;
+IF FOUND THEN
+SELECT project_id INTO old_project FROM Features WHERE id = OLD.feature_id;
+IF TG_OP = 'UPDATE' THEN
+SELECT project_id INTO new_project FROM Features WHERE id = NEW.feature_id;
+END IF;
+IF old_project IS DISTINCT FROM new_project THEN
+PERFORM add_time_spent('project', old_project, -task_comments, -task_time);
+PERFORM add_time_spent('project', new_project, task_comments, task_time);
+END IF;
+END IF;
+IF TG_OP = 'DELETE' THEN
+DELETE FROM TimeSpentRollups WHERE scope = 'task' AND id = OLD.id;
+RETURN OLD;
+END IF;
+RETURN NEW;
+END;
+$$ language 'plpgsql';
+CREATE OR REPLACE FUNCTION feature_time_spent() RETURNS trigger AS $$
+DECLARE
+feature_comments BIGINT;
+feature_time NUMERIC;
+BEGIN
+SELECT COALESCE(SUM(R.comments), 0), COALESCE(SUM(R.time_spent), 0) INTO feature_comments, feature_time
+FROM (
+SELECT comments, time_spent FROM TimeSpentRollups WHERE scope = 'feature' AND id = OLD.id
+UNION ALL
+SELECT R.comments, R.time_spent FROM TimeSpentRollups R JOIN Tasks T ON R.scope = 'task' AND R.id = T.id WHERE T.feature_id = OLD.id
+) AS R;
+IF TG_OP = 'DELETE' THEN
+IF EXISTS (SELECT 1 FROM Projects WHERE id = OLD.project_id) THEN
+PERFORM add_time_spent('project', OLD.project_id, -feature_comments, -feature_time);
+END IF;
+DELETE FROM TimeSpentRollups WHERE scope = 'feature' AND id = OLD.id;
+RETURN OLD;
+END IF;
+IF OLD.project_id IS DISTINCT FROM NEW.project_id THEN
+PERFORM add_time_spent('project', OLD.project_id, -feature_comments, -feature_time);
+PERFORM add_time_spent('project', NEW.project_id, feature_comments, feature_time);
+END IF;
+RETURN NEW;
+END;
+$$ language 'plpgsql';
+CREATE OR REPLACE FUNCTION remove_time_spent_rollup() RETURNS trigger AS $$ BEGIN
+DELETE FROM TimeSpentRollups WHERE scope = TG_ARGV[0] AND id = OLD.id;
+RETURN OLD;
+END;
+$$ language 'plpgsql';
+-- rebuilds rollups from comments, returns amount of rollups which were wrong
+CREATE OR REPLACE FUNCTION rebuild_time_spent_rollups() RETURNS BIGINT AS $$
+DECLARE
+corrected BIGINT;
+BEGIN
+LOCK TABLE Comments, Tasks, Features IN SHARE MODE;
+WITH fresh AS (
+SELECT 'user' AS scope, assignee AS id, COUNT(*) AS comments, SUM(time_spent) AS time_spent
+FROM Comments WHERE assignee IS NOT NULL GROUP BY assignee
+UNION ALL
+SELECT 'feature', feature_id, COUNT(*), SUM(time_spent)
+FROM Comments WHERE feature_id IS NOT NULL GROUP BY feature_id
+UNION ALL
+SELECT 'task', task_id, COUNT(*), SUM(time_spent)
+FROM Comments WHERE task_id IS NOT NULL GROUP BY task_id
+UNION ALL
+SELECT 'project', project_id, COUNT(*), SUM(time_spent)
+FROM (
+SELECT F.project_id, C.time_spent FROM Comments C JOIN Features F ON F.id = C.feature_id
+UNION ALL
+SELECT F.project_id, C.time_spent FROM Comments C JOIN Tasks T ON T.id = C.task_id JOIN Features F ON F.id = T.feature_id
+) AS project_comments GROUP BY project_id
+), removed AS (
+DELETE FROM TimeSpentRollups R
+WHERE NOT EXISTS (SELECT 1 FROM fresh WHERE fresh.scope = R.scope AND fresh.id = R.id)
+RETURNING R.comments <> 0 OR R.time_spent <> 0 AS wrong
+), changed AS (
+INSERT INTO TimeSpentRollups (scope, id, comments, time_spent) SELECT scope, id, comments, time_spent FROM fresh
+ON CONFLICT (scope, id) DO UPDATE SET comments = EXCLUDED.comments, time_spent = EXCLUDED.time_spent
+WHERE (TimeSpentRollups.comments, TimeSpentRollups.time_spent) IS DISTINCT FROM (EXCLUDED.comments, EXCLUDED.time_spent)
+RETURNING 1
+)
+SELECT (SELECT COUNT(*) FROM removed WHERE wrong) + (SELECT COUNT(*) FROM changed) INTO corrected;
+RETURN corrected;
+END;
+$$ language 'plpgsql';
+CREATE TRIGGER time_spent_insert AFTER
+INSERT ON Comments REFERENCING NEW TABLE AS new_comments FOR EACH STATEMENT EXECUTE PROCEDURE comments_time_spent();
+CREATE TRIGGER time_spent_update AFTER
+UPDATE ON Comments REFERENCING OLD TABLE AS old_comments NEW TABLE AS new_comments FOR EACH STATEMENT EXECUTE PROCEDURE comments_time_spent();
+CREATE TRIGGER time_spent_delete AFTER
+DELETE ON Comments REFERENCING OLD TABLE AS old_comments FOR EACH STATEMENT EXECUTE PROCEDURE comments_time_spent();
+CREATE TRIGGER time_spent_delete BEFORE
+DELETE ON Tasks FOR EACH ROW EXECUTE PROCEDURE task_time_spent();
+CREATE TRIGGER time_spent_move AFTER
+UPDATE OF feature_id ON Tasks FOR EACH ROW EXECUTE PROCEDURE task_time_spent();
+CREATE TRIGGER time_spent_delete BEFORE
+DELETE ON Features FOR EACH ROW EXECUTE PROCEDURE feature_time_spent();
+CREATE TRIGGER time_spent_move AFTER
+UPDATE OF project_id ON Features FOR EACH ROW EXECUTE PROCEDURE feature_time_spent();
+CREATE TRIGGER time_spent_delete BEFORE
+DELETE ON Projects FOR EACH ROW EXECUTE PROCEDURE remove_time_spent_rollup('project');
+CREATE TRIGGER time_spent_delete BEFORE
+DELETE ON Users FOR EACH ROW EXECUTE PROCEDURE remove_time_spent_rollup('user');
 
 INSERT INTO Roles (name, description) VALUES ('user','default user role');
 INSERT INTO Roles (name, description) VALUES ('leader', 'default leader role');
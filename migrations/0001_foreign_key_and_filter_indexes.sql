@@ -0,0 +1,16 @@
+-- migrate:no-transaction
+-- Indexes for foreign keys and filters used by repositories, built
+-- without locking writes. Listings are ordered by (created, id).
+CREATE INDEX CONCURRENTLY IF NOT EXISTS projects_project_owner_idx ON Projects (project_owner);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS projects_created_id_idx ON Projects (created, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS features_project_id_idx ON Features (project_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS features_feature_owner_idx ON Features (feature_owner);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS features_created_id_idx ON Features (created, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS tasks_feature_id_idx ON Tasks (feature_id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS tasks_assignee_idx ON Tasks (assignee);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS tasks_created_id_idx ON Tasks (created, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS comments_feature_id_idx ON Comments (feature_id) INCLUDE (time_spent);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS comments_task_id_idx ON Comments (task_id) INCLUDE (time_spent);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS comments_assignee_created_id_idx ON Comments (assignee, created, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS teams_team_leader_idx ON Teams (team_leader);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS teamsusers_team_id_idx ON Teamsusers (team_id);
@@ -0,0 +1,27 @@
+-- Tables added to database_structure.sql after databases were created.
+CREATE TABLE IF NOT EXISTS ProfileImageVariants(
+  user_id uuid REFERENCES Users ON DELETE CASCADE NOT NULL,
+  size INTEGER NOT NULL,
+  image_type TEXT NOT NULL,
+  image_data BYTEA NOT NULL,
+  PRIMARY KEY(user_id, size)
+);
+CREATE TABLE IF NOT EXISTS LookupVersions(
+  table_name TEXT PRIMARY KEY NOT NULL,
+  version BIGINT NOT NULL DEFAULT 0
+);
+CREATE OR REPLACE FUNCTION bump_lookup_version() RETURNS trigger AS $$ BEGIN
+INSERT INTO LookupVersions (table_name, version) VALUES (TG_TABLE_NAME, 1)
+ON CONFLICT (table_name) DO UPDATE SET version = LookupVersions.version + 1;
+RETURN NULL;
+END;
+$$ language 'plpgsql';
+DROP TRIGGER IF EXISTS bump_lookup_version ON Roles;
+CREATE TRIGGER bump_lookup_version AFTER
+INSERT OR UPDATE OR DELETE OR TRUNCATE ON Roles FOR EACH STATEMENT EXECUTE PROCEDURE bump_lookup_version();
+DROP TRIGGER IF EXISTS bump_lookup_version ON Statuses;
+CREATE TRIGGER bump_lookup_version AFTER
+INSERT OR UPDATE OR DELETE OR TRUNCATE ON Statuses FOR EACH STATEMENT EXECUTE PROCEDURE bump_lookup_version();
+DROP TRIGGER IF EXISTS bump_lookup_version ON Types;
+CREATE TRIGGER bump_lookup_version AFTER
+INSERT OR UPDATE OR DELETE OR TRUNCATE ON Types FOR EACH STATEMENT EXECUTE PROCEDURE bump_lookup_version();
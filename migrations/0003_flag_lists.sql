@@ -0,0 +1,8 @@
+-- flags are stored as semicolon separated string, for example 'one;two;',
+-- flag_list keeps them as array so that listings can be filtered by flag
+CREATE OR REPLACE FUNCTION split_flags(flags TEXT) RETURNS TEXT[] AS $$
+SELECT array_remove(string_to_array(btrim(regexp_replace(COALESCE(flags, ''), '\s*;\s*', ';', 'g')), ';'), '');
+$$ LANGUAGE sql IMMUTABLE;
+ALTER TABLE Projects ADD COLUMN IF NOT EXISTS flag_list TEXT[] GENERATED ALWAYS AS (split_flags(flags)) STORED;
+ALTER TABLE Features ADD COLUMN IF NOT EXISTS flag_list TEXT[] GENERATED ALWAYS AS (split_flags(flags)) STORED;
+ALTER TABLE Tasks ADD COLUMN IF NOT EXISTS flag_list TEXT[] GENERATED ALWAYS AS (split_flags(flags)) STORED;
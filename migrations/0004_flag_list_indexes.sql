@@ -0,0 +1,4 @@
+-- migrate:no-transaction
+CREATE INDEX CONCURRENTLY IF NOT EXISTS projects_flag_list_idx ON Projects USING GIN (flag_list);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS features_flag_list_idx ON Features USING GIN (flag_list);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS tasks_flag_list_idx ON Tasks USING GIN (flag_list);
@@ -0,0 +1,163 @@
+-- Comments' time spent summed by task, feature, project and user,
+-- kept up to date by triggers and filled from existing comments.
+CREATE TABLE IF NOT EXISTS TimeSpentRollups(
+  scope TEXT NOT NULL CHECK(scope IN ('task', 'feature', 'project', 'user')),
+  id uuid NOT NULL,
+  comments BIGINT NOT NULL DEFAULT 0,
+  time_spent NUMERIC NOT NULL DEFAULT 0,
+  PRIMARY KEY(scope, id)
+);
+CREATE OR REPLACE FUNCTION add_time_spent(rollup_scope TEXT, rollup_id uuid, delta_comments BIGINT, delta_time NUMERIC) RETURNS void AS $$ BEGIN
+IF rollup_id IS NULL OR (delta_comments = 0 AND delta_time = 0) THEN
+RETURN;
+END IF;
+INSERT INTO TimeSpentRollups (scope, id, comments, time_spent) VALUES (rollup_scope, rollup_id, delta_comments, delta_time)
+ON CONFLICT (scope, id) DO UPDATE SET comments = TimeSpentRollups.comments + EXCLUDED.comments, time_spent = TimeSpentRollups.time_spent + EXCLUDED.time_spent;
+END;
+$$ language 'plpgsql';
+-- feature's and task's own rollups are skipped when they are being deleted,
+-- their share of project's rollup is removed by their delete triggers
+CREATE OR REPLACE FUNCTION add_comment_time_spent(comment_feature uuid, comment_task uuid, comment_assignee uuid, delta_comments BIGINT, delta_time NUMERIC) RETURNS void AS $$
+DECLARE
+parent_project uuid;
+BEGIN
+PERFORM add_time_spent('user', comment_assignee, delta_comments, delta_time);
+IF comment_feature IS NOT NULL THEN
+SELECT project_id INTO parent_project FROM Features WHERE id = comment_feature;
+IF FOUND THEN
+PERFORM add_time_spent('feature', comment_feature, delta_comments, delta_time);
+PERFORM add_time_spent('project', parent_project, delta_comments, delta_time);
+END IF;
+END IF;
+IF comment_task IS NOT NULL THEN
+SELECT F.project_id INTO parent_project FROM Tasks T JOIN Features F ON F.id = T.feature_id WHERE T.id = comment_task;
+IF FOUND THEN
+PERFORM add_time_spent('task', comment_task, delta_comments, delta_time);
+PERFORM add_time_spent('project', parent_project, delta_comments, delta_time);
+END IF;
+END IF;
+END;
+$$ language 'plpgsql';
+CREATE OR REPLACE FUNCTION comment_time_spent() RETURNS trigger AS $$ BEGIN
+IF TG_OP IN ('UPDATE', 'DELETE') THEN
+PERFORM add_comment_time_spent(OLD.feature_id, OLD.task_id, OLD.assignee, -1, -OLD.time_spent);
+END IF;
+IF TG_OP IN ('INSERT', 'UPDATE') THEN
+PERFORM add_comment_time_spent(NEW.feature_id, NEW.task_id, NEW.assignee, 1, NEW.time_spent);
+END IF;
+RETURN NULL;
+END;
+$$ language 'plpgsql';
+CREATE OR REPLACE FUNCTION task_time_spent() RETURNS trigger AS $$
+DECLARE
+task_comments BIGINT;
+task_time NUMERIC;
+old_project uuid;
+new_project uuid;
+BEGIN
+SELECT comments, time_spent INTO task_comments, task_time FROM TimeSpentRollups WHERE scope = 'task' AND id = OLD.id;
+IF FOUND THEN
+SELECT project_id INTO old_project FROM Features WHERE id = OLD.feature_id;
+IF TG_OP = 'UPDATE' THEN
+SELECT project_id INTO new_project FROM Features WHERE id = NEW.feature_id;
+END IF;
+IF old_project IS DISTINCT FROM new_project THEN
+PERFORM add_time_spent('project', old_project, -task_comments, -task_time);
+PERFORM add_time_spent('project', new_project, task_comments, task_time);
+END IF;
+END IF;
+IF TG_OP = 'DELETE' THEN
+DELETE FROM TimeSpentRollups WHERE scope = 'task' AND id = OLD.id;
+RETURN OLD;
+END IF;
+RETURN NEW;
+END;
+$$ language 'plpgsql';
+CREATE OR REPLACE FUNCTION feature_time_spent() RETURNS trigger AS $$
+DECLARE
+feature_comments BIGINT;
+feature_time NUMERIC;
+BEGIN
+SELECT COALESCE(SUM(R.comments), 0), COALESCE(SUM(R.time_spent), 0) INTO feature_comments, feature_time
+FROM (
+SELECT comments, time_spent FROM TimeSpentRollups WHERE scope = 'feature' AND id = OLD.id
+UNION ALL
+SELECT R.comments, R.time_spent FROM TimeSpentRollups R JOIN Tasks T ON R.scope = 'task' AND R.id = T.id WHERE T.feature_id = OLD.id
+) AS R;
+IF TG_OP = 'DELETE' THEN
+IF EXISTS (SELECT 1 FROM Projects WHERE id = OLD.project_id) THEN
+PERFORM add_time_spent('project', OLD.project_id, -feature_comments, -feature_time);
+END IF;
+DELETE FROM TimeSpentRollups WHERE scope = 'feature' AND id = OLD.id;
+RETURN OLD;
+END IF;
+IF OLD.project_id IS DISTINCT FROM NEW.project_id THEN
+PERFORM add_time_spent('project', OLD.project_id, -feature_comments, -feature_time);
+PERFORM add_time_spent('project', NEW.project_id, feature_comments, feature_time);
+END IF;
+RETURN NEW;
+END;
+$$ language 'plpgsql';
+CREATE OR REPLACE FUNCTION remove_time_spent_rollup() RETURNS trigger AS $$ BEGIN
+DELETE FROM TimeSpentRollups WHERE scope = TG_ARGV[0] AND id = OLD.id;
+RETURN OLD;
+END;
+$$ language 'plpgsql';
+-- rebuilds rollups from comments, returns amount of rollups which were wrong
+CREATE OR REPLACE FUNCTION rebuild_time_spent_rollups() RETURNS BIGINT AS $$
+DECLARE
+corrected BIGINT;
+BEGIN
+LOCK TABLE Comments, Tasks, Features IN SHARE MODE;
+WITH fresh AS (
+SELECT 'user' AS scope, assignee AS id, COUNT(*) AS comments, SUM(time_spent) AS time_spent
+FROM Comments WHERE assignee IS NOT NULL GROUP BY assignee
+UNION ALL
+SELECT 'feature', feature_id, COUNT(*), SUM(time_spent)
+FROM Comments WHERE feature_id IS NOT NULL GROUP BY feature_id
+UNION ALL
+SELECT 'task', task_id, COUNT(*), SUM(time_spent)
+FROM Comments WHERE task_id IS NOT NULL GROUP BY task_id
+UNION ALL
+SELECT 'project', project_id, COUNT(*), SUM(time_spent)
+FROM (
+SELECT F.project_id, C.time_spent FROM Comments C JOIN Features F ON F.id = C.feature_id
+UNION ALL
+SELECT F.project_id, C.time_spent FROM Comments C JOIN Tasks T ON T.id = C.task_id JOIN Features F ON F.id = T.feature_id
+) AS project_comments GROUP BY project_id
+), removed AS (
+DELETE FROM TimeSpentRollups R
+WHERE NOT EXISTS (SELECT 1 FROM fresh WHERE fresh.scope = R.scope AND fresh.id = R.id)
+RETURNING R.comments <> 0 OR R.time_spent <> 0 AS wrong
+), changed AS (
+INSERT INTO TimeSpentRollups (scope, id, comments, time_spent) SELECT scope, id, comments, time_spent FROM fresh
+ON CONFLICT (scope, id) DO UPDATE SET comments = EXCLUDED.comments, time_spent = EXCLUDED.time_spent
+WHERE (TimeSpentRollups.comments, TimeSpentRollups.time_spent) IS DISTINCT FROM (EXCLUDED.comments, EXCLUDED.time_spent)
+RETURNING 1
+)
+SELECT (SELECT COUNT(*) FROM removed WHERE wrong) + (SELECT COUNT(*) FROM changed) INTO corrected;
+RETURN corrected;
+END;
+$$ language 'plpgsql';
+DROP TRIGGER IF EXISTS time_spent ON Comments;
+CREATE TRIGGER time_spent AFTER
+INSERT OR DELETE OR UPDATE OF feature_id, task_id, assignee, time_spent ON Comments FOR EACH ROW EXECUTE PROCEDURE comment_time_spent();
+DROP TRIGGER IF EXISTS time_spent_delete ON Tasks;
+CREATE TRIGGER time_spent_delete BEFORE
+DELETE ON Tasks FOR EACH ROW EXECUTE PROCEDURE task_time_spent();
+DROP TRIGGER IF EXISTS time_spent_move ON Tasks;
+CREATE TRIGGER time_spent_move AFTER
+UPDATE OF feature_id ON Tasks FOR EACH ROW EXECUTE PROCEDURE task_time_spent();
+DROP TRIGGER IF EXISTS time_spent_delete ON Features;
+CREATE TRIGGER time_spent_delete BEFORE
+DELETE ON Features FOR EACH ROW EXECUTE PROCEDURE feature_time_spent();
+DROP TRIGGER IF EXISTS time_spent_move ON Features;
+CREATE TRIGGER time_spent_move AFTER
+UPDATE OF project_id ON Features FOR EACH ROW EXECUTE PROCEDURE feature_time_spent();
+DROP TRIGGER IF EXISTS time_spent_delete ON Projects;
+CREATE TRIGGER time_spent_delete BEFORE
+DELETE ON Projects FOR EACH ROW EXECUTE PROCEDURE remove_time_spent_rollup('project');
+DROP TRIGGER IF EXISTS time_spent_delete ON Users;
+CREATE TRIGGER time_spent_delete BEFORE
+DELETE ON Users FOR EACH ROW EXECUTE PROCEDURE remove_time_spent_rollup('user');
+SELECT rebuild_time_spent_rollups();
@@ -0,0 +1,6 @@
+-- migrate:no-transaction
+-- Index of assignee's comments by creation time covers time spent, so
+-- that timesheets are summed from the index only. It replaces the index
+-- without time spent, which still serves paging of assignee's comments.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS comments_assignee_created_id_time_spent_idx ON Comments (assignee, created, id) INCLUDE (time_spent);
+DROP INDEX CONCURRENTLY IF EXISTS comments_assignee_created_id_idx;
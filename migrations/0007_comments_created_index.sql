@@ -0,0 +1,3 @@
+-- migrate:no-transaction
+-- Exports list comments in order of creation and filter them by date.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS comments_created_id_idx ON Comments (created, id);
@@ -0,0 +1,61 @@
+-- Time spent rollups are updated once per statement instead of once per
+-- comment, so that bulk imports do not update same rollups row by row.
+-- comments are given as arrays, so that rows changed by one statement,
+-- for example COPY, update each rollup only once. Comments of deleted
+-- features and tasks are skipped by the joins, their share of project's
+-- rollup is removed by delete triggers of the features and tasks.
+CREATE OR REPLACE FUNCTION add_comments_time_spent(feature_ids uuid[], task_ids uuid[], assignees uuid[], times NUMERIC[], sign INTEGER) RETURNS void AS $$
+WITH changes AS (
+SELECT * FROM unnest(feature_ids, task_ids, assignees, times) AS C(feature_id, task_id, assignee, time_spent)
+), deltas AS (
+SELECT 'user' AS scope, assignee AS id, COUNT(*) AS comments, SUM(time_spent) AS time_spent
+FROM changes WHERE assignee IS NOT NULL GROUP BY assignee
+UNION ALL
+SELECT 'feature', C.feature_id, COUNT(*), SUM(C.time_spent)
+FROM changes C JOIN Features F ON F.id = C.feature_id GROUP BY C.feature_id
+UNION ALL
+SELECT 'task', C.task_id, COUNT(*), SUM(C.time_spent)
+FROM changes C JOIN Tasks T ON T.id = C.task_id GROUP BY C.task_id
+UNION ALL
+SELECT 'project', project_id, COUNT(*), SUM(time_spent)
+FROM (
+SELECT F.project_id, C.time_spent FROM changes C JOIN Features F ON F.id = C.feature_id
+UNION ALL
+SELECT F.project_id, C.time_spent FROM changes C JOIN Tasks T ON T.id = C.task_id JOIN Features F ON F.id = T.feature_id
+) AS project_changes GROUP BY project_id
+)
+INSERT INTO TimeSpentRollups (scope, id, comments, time_spent)
+SELECT scope, id, sign * comments, sign * time_spent FROM deltas ORDER BY scope, id
+ON CONFLICT (scope, id) DO UPDATE SET comments = TimeSpentRollups.comments + EXCLUDED.comments, time_spent = TimeSpentRollups.time_spent + EXCLUDED.time_spent;
+$$ LANGUAGE sql;
+CREATE OR REPLACE FUNCTION comments_time_spent() RETURNS trigger AS $$ BEGIN
+IF TG_OP = 'INSERT' THEN
+PERFORM add_comments_time_spent(array_agg(feature_id), array_agg(task_id), array_agg(assignee), array_agg(time_spent), 1)
+FROM new_comments;
+ELSIF TG_OP = 'DELETE' THEN
+PERFORM add_comments_time_spent(array_agg(feature_id), array_agg(task_id), array_agg(assignee), array_agg(time_spent), -1)
+FROM old_comments;
+ELSE
+PERFORM add_comments_time_spent(array_agg(O.feature_id), array_agg(O.task_id), array_agg(O.assignee), array_agg(O.time_spent), -1)
+FROM old_comments O JOIN new_comments N ON N.id = O.id
+WHERE (O.feature_id, O.task_id, O.assignee, O.time_spent) IS DISTINCT FROM (N.feature_id, N.task_id, N.assignee, N.time_spent);
+PERFORM add_comments_time_spent(array_agg(N.feature_id), array_agg(N.task_id), array_agg(N.assignee), array_agg(N.time_spent), 1)
+FROM old_comments O JOIN new_comments N ON N.id = O.id
+WHERE (O.feature_id, O.task_id, O.assignee, O.time_spent) IS DISTINCT FROM (N.feature_id, N.task_id, N.assignee, N.time_spent);
+END IF;
+RETURN NULL;
+END;
+$$ language 'plpgsql';
+DROP TRIGGER IF EXISTS time_spent ON Comments;
+DROP TRIGGER IF EXISTS time_spent_insert ON Comments;
+CREATE TRIGGER time_spent_insert AFTER
+INSERT ON Comments REFERENCING NEW TABLE AS new_comments FOR EACH STATEMENT EXECUTE PROCEDURE comments_time_spent();
+DROP TRIGGER IF EXISTS time_spent_update ON Comments;
+CREATE TRIGGER time_spent_update AFTER
+UPDATE ON Comments REFERENCING OLD TABLE AS old_comments NEW TABLE AS new_comments FOR EACH STATEMENT EXECUTE PROCEDURE comments_time_spent();
+DROP TRIGGER IF EXISTS time_spent_delete ON Comments;
+CREATE TRIGGER time_spent_delete AFTER
+DELETE ON Comments REFERENCING OLD TABLE AS old_comments FOR EACH STATEMENT EXECUTE PROCEDURE comments_time_spent();
+DROP FUNCTION IF EXISTS comment_time_spent();
+DROP FUNCTION IF EXISTS add_comment_time_spent(uuid, uuid, uuid, BIGINT, NUMERIC);
+SELECT rebuild_time_spent_rollups();
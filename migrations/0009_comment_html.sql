@@ -0,0 +1,4 @@
+-- Comments are rendered from markdown when they are written, instead of
+-- every time they are read. Existing comments stay NULL and are rendered
+-- by the app when shown.
+ALTER TABLE Comments ADD COLUMN IF NOT EXISTS comment_html TEXT;
@@ -0,0 +1,10 @@
+-- search vectors weight names over descriptions and comments, 'simple'
+-- configuration does not stem, so it works for Finnish and English alike.
+-- Generated columns keep the vectors up to date on every write.
+CREATE OR REPLACE FUNCTION search_vector(name TEXT, description TEXT) RETURNS tsvector AS $$
+SELECT setweight(to_tsvector('simple', COALESCE(name, '')), 'A') || setweight(to_tsvector('simple', COALESCE(description, '')), 'B');
+$$ LANGUAGE sql IMMUTABLE;
+ALTER TABLE Projects ADD COLUMN IF NOT EXISTS search tsvector GENERATED ALWAYS AS (search_vector(name, description)) STORED;
+ALTER TABLE Features ADD COLUMN IF NOT EXISTS search tsvector GENERATED ALWAYS AS (search_vector(name, description)) STORED;
+ALTER TABLE Tasks ADD COLUMN IF NOT EXISTS search tsvector GENERATED ALWAYS AS (search_vector(name, description)) STORED;
+ALTER TABLE Comments ADD COLUMN IF NOT EXISTS search tsvector GENERATED ALWAYS AS (search_vector(NULL, comment)) STORED;
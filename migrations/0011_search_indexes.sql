@@ -0,0 +1,5 @@
+-- migrate:no-transaction
+CREATE INDEX CONCURRENTLY IF NOT EXISTS projects_search_idx ON Projects USING GIN (search);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS features_search_idx ON Features USING GIN (search);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS tasks_search_idx ON Tasks USING GIN (search);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS comments_search_idx ON Comments USING GIN (search);
@@ -0,0 +1,2 @@
+-- trigram indexes let ILIKE lookups on any part of a name use an index
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
@@ -0,0 +1,4 @@
+-- migrate:no-transaction
+CREATE INDEX CONCURRENTLY IF NOT EXISTS users_fullname_trgm_idx ON Users USING GIN ((firstname || ' ' || lastname) gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS projects_name_trgm_idx ON Projects USING GIN (name gin_trgm_ops);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS features_name_trgm_idx ON Features USING GIN (name gin_trgm_ops);
@@ -0,0 +1,24 @@
+-- users and teams get updated_on like other tables, so that API responses
+-- about them can be validated with ETag and Last-Modified
+ALTER TABLE Users ADD COLUMN IF NOT EXISTS updated_on TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+ALTER TABLE Teams ADD COLUMN IF NOT EXISTS updated_on TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP;
+DROP TRIGGER IF EXISTS updated_on ON Users;
+CREATE TRIGGER updated_on BEFORE
+UPDATE ON Users FOR EACH ROW EXECUTE PROCEDURE updated_on();
+DROP TRIGGER IF EXISTS updated_on ON Teams;
+CREATE TRIGGER updated_on BEFORE
+UPDATE ON Teams FOR EACH ROW EXECUTE PROCEDURE updated_on();
+-- team of the user is part of the user, so joining or leaving updates user
+CREATE OR REPLACE FUNCTION team_membership_updated_on() RETURNS trigger AS $$ BEGIN
+IF TG_OP IN ('UPDATE', 'DELETE') THEN
+UPDATE Users SET updated_on = now() WHERE id = OLD.user_id;
+END IF;
+IF TG_OP IN ('INSERT', 'UPDATE') THEN
+UPDATE Users SET updated_on = now() WHERE id = NEW.user_id;
+END IF;
+RETURN NULL;
+END;
+$$ language 'plpgsql';
+DROP TRIGGER IF EXISTS team_membership_updated_on ON Teamsusers;
+CREATE TRIGGER team_membership_updated_on AFTER
+INSERT OR UPDATE OR DELETE ON Teamsusers FOR EACH ROW EXECUTE PROCEDURE team_membership_updated_on();
@@ -0,0 +1,3 @@
+-- migrate:no-transaction
+-- The API lists teams in order of name.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS teams_name_id_idx ON Teams (name, id);
@@ -0,0 +1,6 @@
+-- profile images get a version written together with the image, so that
+-- avatar addresses change with the image and can be cached for long, and
+-- conditional requests are answered without reading the image
+ALTER TABLE ProfileImages ADD COLUMN IF NOT EXISTS image_version TEXT;
+UPDATE ProfileImages SET image_version = md5(image_data) WHERE image_version IS NULL;
+ALTER TABLE ProfileImages ALTER COLUMN image_version SET NOT NULL;
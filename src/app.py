@@ -1,10 +1,12 @@
 from flask import Flask
 from flask_talisman import Talisman
 import utils.config as configs
+from utils.identity_map import add_stats_header
 
 app = Flask(__name__)
 Talisman(app, content_security_policy=configs.csp)
 app.secret_key = configs.secret
+app.after_request(add_stats_header)
 
 if configs.mode != 'TEST':
     import routes.base    # pylint: disable=unused-import
@@ -14,3 +16,9 @@ if configs.mode != 'TEST':
     import routes.projects    # pylint: disable=unused-import
     import routes.features    # pylint: disable=unused-import
     import routes.comments    # pylint: disable=unused-import
+    import routes.exports    # pylint: disable=unused-import
+    import routes.imports    # pylint: disable=unused-import
+    import routes.search    # pylint: disable=unused-import
+    import routes.autocomplete    # pylint: disable=unused-import
+    from routes.api import api
+    app.register_blueprint(api)
@@ -0,0 +1,187 @@
+'''Counts commits and WAL syncs of requests writing many rows
+
+Run with `invoke benchmark --name commits` against a scratch database
+on PostgreSQL 16 or newer. Rows added by the benchmark are removed at
+the end. Run it on an earlier revision too, to compare.
+'''
+import time
+
+from sqlalchemy import event, text
+
+from app import app
+from services.feature_service import feature_service
+from services.project_service import project_service
+from services.status_service import status_service
+from services.task_service import task_service
+from services.type_service import type_service
+from services.user_service import user_service
+from utils.database import db
+
+_BASE_URL = 'https://localhost'
+_ADMIN = 'bench_admin'
+_TEAMS = 20
+_COMMENTS = 50
+
+# PostgreSQL 18 moved syncs of WAL from pg_stat_wal to pg_stat_io
+_WAL_SYNCS = '''
+    SELECT CASE WHEN current_setting('server_version_num')::int >= 180000
+        THEN (SELECT sum(fsyncs) FROM pg_stat_io WHERE object = 'wal')
+        ELSE (SELECT (to_jsonb(W) ->> 'wal_sync')::bigint FROM pg_stat_wal W)
+    END
+'''
+
+# commits are counted in the app, because the server counts also
+# pings of the connection pool as transactions
+_commits = []
+
+
+def _wal_syncs() -> int:
+    '''_wal_syncs is used to get amount of WAL syncs, after statistics
+       of the connections of the app are flushed
+    '''
+    time.sleep(1.5)
+    with app.app_context():
+        db.session.execute(text('SELECT pg_stat_force_next_flush()'))
+        db.session.commit()
+        time.sleep(0.2)
+        syncs = db.session.execute(text(_WAL_SYNCS)).scalar()
+        db.session.remove()
+    return syncs
+
+
+def _setup() -> dict:
+    '''_setup is used to add users and a task to comment
+    '''
+    with app.app_context():
+        admin = user_service.new(_ADMIN, 3, _ADMIN, 'Bench', 'Admin',
+                                 'bench@admin.fi')
+        db.session.execute(
+            text('''INSERT INTO Users (username, user_role, password_hash,
+                        firstname, lastname)
+                    SELECT 'bench_user' || number, 1, 'hash', 'Bench',
+                        'User ' || number
+                    FROM generate_series(1, :users) number'''),
+            {'users': _TEAMS * 20})
+        users = [
+            str(row[0]) for row in db.session.execute(
+                text('''SELECT id FROM Users
+                        WHERE username LIKE 'bench_user%'
+                        ORDER BY username'''))
+        ]
+        status = status_service.get_all()[0][0]
+        ttype = type_service.get_all()[0][0]
+        project = project_service.new(str(admin.user_id), 'Bench project',
+                                      'Benchmark')
+        feature = feature_service.new(str(project.project_id),
+                                      str(admin.user_id), 'Bench feature',
+                                      'Benchmark', str(status), str(ttype),
+                                      1)
+        task = task_service.new(str(feature.feature_id), str(admin.user_id),
+                                'Bench task', 'Benchmark', str(status),
+                                str(ttype), 1)
+        db.session.commit()
+
+    return {
+        'admin': str(admin.user_id),
+        'users': users,
+        'task': str(task.task_id)
+    }
+
+
+def _cleanup():
+    with app.app_context():
+        db.session.execute(text("DELETE FROM Teams WHERE name LIKE 'Bench %'"))
+        db.session.execute(
+            text("DELETE FROM Projects WHERE name = 'Bench project'"))
+        db.session.execute(
+            text("DELETE FROM Users WHERE username LIKE 'bench\\_%'"))
+        db.session.commit()
+
+
+def _run(name: str, requests):
+    syncs = _wal_syncs()
+    _commits.clear()
+    start = time.perf_counter()
+    amount = requests()
+    elapsed = time.perf_counter() - start
+    commits = len(_commits)
+    syncs = _wal_syncs() - syncs
+
+    print(f'{name:32} requests {amount:3}  commits {commits:4}  '
+          f'WAL syncs {syncs:4}  {elapsed * 1000:6.0f} ms')
+
+
+def main():
+    app.config['TALISMAN_FORCE_HTTPS'] = False
+    data = _setup()
+    users = data['users']
+    with app.app_context():
+        event.listen(db.engine, 'commit', _commits.append)
+
+    client = app.test_client()
+    client.post('/users/login',
+                data={
+                    'username': _ADMIN,
+                    'password': _ADMIN
+                },
+                base_url=_BASE_URL)
+    with client.session_transaction() as session:
+        token = session['token']
+
+    def create_teams() -> int:
+        for team in range(_TEAMS):
+            members = users[team * 10:(team + 1) * 10]
+            client.post('/teams/add',
+                        data={
+                            'token': token,
+                            'name': f'Bench {team}',
+                            'description': 'Benchmark',
+                            'team_leader': members[0],
+                            'members': members
+                        },
+                        base_url=_BASE_URL)
+        return _TEAMS
+
+    def replace_members() -> int:
+        with app.app_context():
+            teams = [
+                str(row[0]) for row in db.session.execute(
+                    text("SELECT id FROM Teams WHERE name LIKE 'Bench %'"))
+            ]
+            db.session.remove()
+        for number, team in enumerate(teams):
+            start = (_TEAMS + number) * 10
+            client.post(f'/teams/edit/{team}/members',
+                        data={
+                            'token': token,
+                            'team_id': team,
+                            'members': users[start:start + 5]
+                        },
+                        base_url=_BASE_URL)
+        return len(teams)
+
+    def add_comments() -> int:
+        for number in range(_COMMENTS):
+            client.post('/comments/add',
+                        data={
+                            'token': token,
+                            'mode': 'tasks',
+                            'id': data['task'],
+                            'task_id': data['task'],
+                            'assignee': data['admin'],
+                            'comment': f'Comment {number}',
+                            'tspent': '1'
+                        },
+                        base_url=_BASE_URL)
+        return _COMMENTS
+
+    try:
+        _run('create team with 10 members', create_teams)
+        _run('replace 10 members with 5 new', replace_members)
+        _run('add comment', add_comments)
+    finally:
+        _cleanup()
+
+
+if __name__ == '__main__':
+    main()
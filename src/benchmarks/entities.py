@@ -0,0 +1,112 @@
+'''Measures memory and building time of Task entities of many rows
+
+Run with `invoke benchmark --name entities` against a scratch database.
+Tasks are added under a project of their own, 100 000 by default
+(--tasks), and removed at the end.
+'''
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+
+from sqlalchemy import text
+
+from app import app
+from repositories.task_repository import task_repository
+from utils.database import db
+from utils.row_mapper import to_task
+
+_SEED = (
+    '''INSERT INTO Users (username, user_role, password_hash, firstname,
+           lastname)
+       VALUES ('bench_entities', 1, 'hash', 'Bench', 'Entities')''',
+    '''INSERT INTO Projects (project_owner, name)
+       SELECT id, 'Bench entities' FROM Users
+       WHERE username = 'bench_entities' ''',
+    '''INSERT INTO Features (project_id, feature_owner, name)
+       SELECT P.id, P.project_owner, 'Bench feature' FROM Projects P
+       WHERE P.name = 'Bench entities' ''',
+    '''INSERT INTO Tasks (feature_id, assignee, name, description, status,
+           type, priority, flags)
+       SELECT F.id, F.feature_owner, 'Task ' || number, 'Description',
+           (SELECT id FROM Statuses LIMIT 1), (SELECT id FROM Types LIMIT 1),
+           1 + number % 3, 'bench;'
+       FROM Features F
+       CROSS JOIN generate_series(1, :tasks) number
+       WHERE F.name = 'Bench feature' ''',
+)
+
+_CLEANUP = (
+    "DELETE FROM Projects WHERE name = 'Bench entities'",
+    "DELETE FROM Users WHERE username = 'bench_entities'",
+)
+
+
+def _build(rows: list) -> list:
+    return [to_task(row) for row in rows]
+
+
+def _best(function, repeats: int) -> float:
+    '''_best is used to get the shortest time of running function,
+       with garbage collection disabled while it runs
+    '''
+    times = []
+    for _ in range(repeats):
+        gc.collect()
+        gc.disable()
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+        gc.enable()
+    return min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.split('\n', maxsplit=1)[0])
+    parser.add_argument('--tasks', type=int, default=100000)
+    args = parser.parse_args()
+
+    with app.app_context():
+        for sql in _SEED:
+            db.session.execute(text(sql), {'tasks': args.tasks})
+        db.session.commit()
+
+        try:
+            rows = task_repository.get_all()
+            task = to_task(rows[0])
+            size = sys.getsizeof(task)
+            if hasattr(task, '__dict__'):
+                size += sys.getsizeof(task.__dict__)
+            print(f'rows {len(rows)}, Task object with attributes {size} B')
+
+            from_rows = _best(lambda: _build(rows), 7)
+            tuples = [tuple(row) for row in rows]
+            from_tuples = _best(lambda: _build(tuples), 7)
+            del rows, tuples
+
+            fetched = _best(lambda: _build(task_repository.get_all()), 5)
+
+            gc.collect()
+            tracemalloc.start()
+            tasks = _build(task_repository.get_all())
+            gc.collect()
+            retained, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            del tasks
+
+            print(f'build from rows {from_rows * 1000:.0f} ms, '
+                  f'from tuples {from_tuples * 1000:.0f} ms, '
+                  f'fetch and build {fetched * 1000:.0f} ms')
+            print(f'retained Task list {retained / 2**20:.1f} MiB, '
+                  f'peak {peak / 2**20:.1f} MiB')
+        finally:
+            db.session.rollback()
+            for sql in _CLEANUP:
+                db.session.execute(text(sql))
+            db.session.commit()
+
+
+if __name__ == '__main__':
+    main()
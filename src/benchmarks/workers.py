@@ -0,0 +1,147 @@
+'''Measures throughput and latency of the dashboard with the worker
+classes of gunicorn_config.py
+
+Run with `invoke benchmark --name workers` against a database having
+the user given with --username and --password. Gunicorn is started in
+turn for every worker class given with --worker-classes, and clients
+load the dashboard over keep-alive connections. gevent has to be
+installed separately.
+'''
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.parse
+
+# the app redirects plain HTTP, requests come as if through a proxy
+_HEADERS = {'X-Forwarded-Proto': 'https'}
+_SRC_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _login(port: int, username: str, password: str) -> str:
+    '''_login is used to get session cookie of the user
+    '''
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+    body = urllib.parse.urlencode({
+        'username': username,
+        'password': password
+    })
+    connection.request(
+        'POST', '/users/login', body, {
+            **_HEADERS, 'Content-Type': 'application/x-www-form-urlencoded'
+        })
+    response = connection.getresponse()
+    response.read()
+    return response.getheader('Set-Cookie').split(';')[0]
+
+
+def _load(port: int, cookie: str, clients: int, duration: float) -> tuple:
+    '''_load is used to request the dashboard from many clients at once
+
+    Returns:
+        tuple: sorted latencies of the requests in seconds and amount
+            of responses which were not successful
+    '''
+    latencies = []
+    errors = []
+    lock = threading.Lock()
+    stop = time.monotonic() + duration
+
+    def client():
+        connection = http.client.HTTPConnection('127.0.0.1', port)
+        own_latencies = []
+        own_errors = 0
+        while time.monotonic() < stop:
+            start = time.perf_counter()
+            connection.request('GET',
+                               '/',
+                               headers={
+                                   **_HEADERS, 'Cookie': cookie
+                               })
+            response = connection.getresponse()
+            response.read()
+            own_latencies.append(time.perf_counter() - start)
+            own_errors += response.status != 200
+        with lock:
+            latencies.extend(own_latencies)
+            errors.append(own_errors)
+
+    threads = [threading.Thread(target=client) for _ in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    return sorted(latencies), sum(errors)
+
+
+def _serve(worker_class: str, workers: int, port: int) -> subprocess.Popen:
+    '''_serve is used to start Gunicorn and wait until it accepts
+       connections
+    '''
+    environment = dict(os.environ,
+                       GUNICORN_WORKER_CLASS=worker_class,
+                       PORT=str(port))
+    if workers:
+        environment['WEB_CONCURRENCY'] = str(workers)
+
+    server = subprocess.Popen(  # pylint: disable=consider-using-with
+        [
+            sys.executable, '-m', 'gunicorn', '-c', 'gunicorn_config.py',
+            'app:app'
+        ],
+        cwd=_SRC_DIRECTORY,
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f'Gunicorn with {worker_class} workers exited')
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+
+    server.terminate()
+    raise RuntimeError(f'Gunicorn with {worker_class} workers did not start')
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description=__doc__.split('\n', maxsplit=1)[0])
+    parser.add_argument('--worker-classes', default='sync,gthread,gevent')
+    parser.add_argument('--workers',
+                        type=int,
+                        help='defaults to WEB_CONCURRENCY of the config')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--port', type=int, default=8111)
+    parser.add_argument('--username', default='admin')
+    parser.add_argument('--password', default='admin')
+    args = parser.parse_args()
+
+    for worker_class in args.worker_classes.split(','):
+        server = _serve(worker_class, args.workers, args.port)
+        try:
+            cookie = _login(args.port, args.username, args.password)
+            latencies, errors = _load(args.port, cookie, args.clients,
+                                      args.duration)
+        finally:
+            server.terminate()
+            server.wait()
+
+        print(f'{worker_class:8} {len(latencies) / args.duration:7.1f} req/s  '
+              f'p50 {latencies[len(latencies) // 2] * 1000:6.1f} ms  '
+              f'p95 {latencies[int(len(latencies) * 0.95)] * 1000:6.1f} ms  '
+              f'errors {errors}')
+
+
+if __name__ == '__main__':
+    main()
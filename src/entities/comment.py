@@ -1,11 +1,15 @@
 from datetime import datetime
-from markdown2 import markdown
+from utils.markdown_cache import markdown_cache
 
 
 class Comment:
     '''Class Comment resembles comment and activity in features or in tasks.
     '''
 
+    __slots__ = ('comment_id', 'task_id', 'task_name', 'feature_id',
+                 'feature_name', 'assignee_id', 'assignee_name', 'time_spent',
+                 'comment', '_comment_html', 'created', 'updated_on', 'mode')
+
     def __init__(self,
                  cid: str,
                  aid: str,
@@ -18,7 +22,8 @@ class Comment:
                  tname: str = None,
                  fid: str = None,
                  fname: str = None,
-                 mode: str = None):
+                 mode: str = None,
+                 html: str = None):
         '''Initializes Comment with given values.
            Is optional to use with tasks or features.
 
@@ -38,6 +43,9 @@ class Comment:
                 references. Defaults to None.
             tname (str, optional): name of task into which
                 references. Defaults to None.
+            html (str, optional): comment rendered from markdown into
+                HTML, rendered on first use if not given.
+                Defaults to None.
         '''
         self.comment_id = cid
         self.task_id = tid
@@ -48,11 +56,22 @@ class Comment:
         self.assignee_name = aname
         self.time_spent = tspent
         self.comment = comment
-        self.comment_html = markdown(comment)
+        self._comment_html = html
         self.created = created
         self.updated_on = updated_on
         self.mode = mode
 
+    @property
+    def comment_html(self) -> str:
+        '''comment_html is comment rendered from markdown into HTML
+
+        Returns:
+            str: rendered comment
+        '''
+        if self._comment_html is None:
+            self._comment_html = markdown_cache.render(self.comment)
+        return self._comment_html
+
     def __str__(self) -> str:
         '''Method for generating formatted string from object
            to be mainly used in debugging matters.
@@ -7,6 +7,11 @@ class Feature:
     '''Class Feature resembles feature as a object from the database
     '''
 
+    __slots__ = ('feature_id', 'project_id', 'project_name', 'feature_owner',
+                 'feature_owner_name', 'name', 'description', 'status',
+                 'status_name', 'feature_type', 'feature_type_name', 'priority',
+                 'created', 'updated_on', 'flags', 'tasks', 'comments')
+
     def __init__(self,
                  fid: str,
                  pid: str,
@@ -98,3 +103,80 @@ class Feature:
                 f' - flags ”{self.flags}”\n'
                 f' - tasks:\n{tasks}'
                 f' - comments:\n{comments}')
+
+
+class FeatureSummary:
+    '''Class FeatureSummary resembles feature as a lightweight row
+       used in listings, without nested tasks and comments
+    '''
+
+    __slots__ = ('feature_id', 'project_id', 'project_name', 'feature_owner',
+                 'feature_owner_name', 'name', 'description', 'status',
+                 'status_name', 'feature_type', 'feature_type_name', 'priority',
+                 'created', 'updated_on', 'flags', 'task_count',
+                 'comment_count', 'time_spent')
+
+    def __init__(self,
+                 fid: str,
+                 pid: str,
+                 pname: str,
+                 foid: str,
+                 foname: str,
+                 name: str,
+                 description: str,
+                 status: str,
+                 sname: str,
+                 feature_type: str,
+                 ftname: str,
+                 priority: int,
+                 created: datetime,
+                 updated_on: datetime,
+                 flags: str = '',
+                 task_count: int = 0,
+                 comment_count: int = 0,
+                 time_spent: float = 0.0):
+        '''Initializes FeatureSummary object with given values
+
+        Args:
+            fid (str): id of feature
+            pid (str): id of project in which references
+            pname (str): name of project in which references
+            foid (str): id of the feature owner
+            foname (str):name of the feature owner
+            name (str): name of feature
+            description (str): description of feature
+            status (str): status of feature
+            sname (str): name of the status
+            feature_type (str): type of feature, like 'new feature' or 'bug fix'
+            ftname (str): name of the feature_type
+            priority (int): priority of feature, in three stages:
+                low, medium and high (1 = low, 3 = high)
+            created (datetime): creation time of feature
+            updated_on (datetime): latest time feature were updated on
+            flags (str, optional): flags are used to filter features.
+                Defaults to ''.
+            task_count (int, optional): amount of tasks in feature.
+                Defaults to 0.
+            comment_count (int, optional): amount of comments in feature
+                and its tasks. Defaults to 0.
+            time_spent (float, optional): total time spent in comments
+                of feature and its tasks. Defaults to 0.0.
+        '''
+        self.feature_id = fid
+        self.project_id = pid
+        self.project_name = pname
+        self.feature_owner = foid
+        self.feature_owner_name = foname
+        self.name = name
+        self.description = description
+        self.status = status
+        self.status_name = sname
+        self.feature_type = feature_type
+        self.feature_type_name = ftname
+        self.priority = priority
+        self.created = created
+        self.updated_on = updated_on
+        self.flags = flags
+        self.task_count = task_count
+        self.comment_count = comment_count
+        self.time_spent = time_spent
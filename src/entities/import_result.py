@@ -0,0 +1,41 @@
+class ImportResult:
+    '''Class ImportResult resembles outcome of one bulk import
+    '''
+
+    def __init__(self, target: str, imported: int, errors: [tuple]):
+        '''initializes ImportResult object
+
+        Args:
+            target (str): what was imported, tasks or comments
+            imported (int): amount of imported rows, 0 if there
+                were errors, because then nothing is imported
+            errors ([tuple]): line number and error message
+                of every unvalid row
+        '''
+        self.target = target
+        self.imported = imported
+        self.errors = errors
+
+    @property
+    def succeeded(self) -> bool:
+        '''succeeded tells if the rows were imported
+
+        Returns:
+            bool: True if there were no errors
+        '''
+        return not self.errors
+
+    def __str__(self) -> str:
+        '''Method for generating formatted string from object
+           to be mainly used in debugging matters.
+
+        Returns:
+            str: import result object in formatted string
+        '''
+
+        errors = ''
+        for line, message in self.errors:
+            errors += f'   › line {line}: {message}\n'
+
+        return (f'Imported {self.imported} {self.target}, '
+                f'{len(self.errors)} errors\n{errors}')
@@ -6,6 +6,9 @@ class Project:
     '''Class Project resembles project from the database as a object
     '''
 
+    __slots__ = ('project_id', 'project_owner_id', 'project_owner_name', 'name',
+                 'description', 'created', 'updated_on', 'flags', 'features')
+
     def __init__(self,
                  pid: str,
                  p_owner: str,
@@ -75,9 +78,61 @@ class Project:
         Returns:
             bool: result are the two objects the same
         '''
-        for field, value in self.__dict__.items():
-            if field not in o.__dict__.keys():
-                return False
-            if value != o.__dict__[field]:
-                return False
-        return True
+        if not isinstance(o, Project):
+            return False
+        return all(
+            getattr(self, field) == getattr(o, field)
+            for field in self.__slots__)
+
+
+class ProjectSummary:
+    '''Class ProjectSummary resembles project as a lightweight row
+       used in listings, without nested features
+    '''
+
+    __slots__ = ('project_id', 'project_owner_id', 'project_owner_name', 'name',
+                 'description', 'created', 'updated_on', 'flags',
+                 'feature_count', 'task_count', 'time_spent')
+
+    def __init__(self,
+                 pid: str,
+                 p_owner: str,
+                 p_owner_name: str,
+                 name: str,
+                 description: str,
+                 created: datetime,
+                 updated_on: datetime,
+                 flags: str = '',
+                 feature_count: int = 0,
+                 task_count: int = 0,
+                 time_spent: float = 0.0):
+        '''initializes ProjectSummary object
+
+        Args:
+            pid (str): id of project
+            p_owner (str): id of project owner
+            p_owner_name (str): name of project owner
+            name (str): name of project
+            description (str): description of project
+            created (datetime): creation time of project
+            updated_on (datetime): last time updated
+            flags (str, optional): flags are used to filter
+                projects. Defaults to ''.
+            feature_count (int, optional): amount of features
+                in project. Defaults to 0.
+            task_count (int, optional): amount of tasks in
+                project´s features. Defaults to 0.
+            time_spent (float, optional): total time spent in comments
+                of project´s features and tasks. Defaults to 0.0.
+        '''
+        self.project_id = pid
+        self.project_owner_id = p_owner
+        self.project_owner_name = p_owner_name
+        self.name = name
+        self.description = description
+        self.created = created
+        self.updated_on = updated_on
+        self.flags = flags
+        self.feature_count = feature_count
+        self.task_count = task_count
+        self.time_spent = time_spent
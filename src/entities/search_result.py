@@ -0,0 +1,59 @@
+from markupsafe import Markup
+
+
+class SearchResult:
+    '''Class SearchResult resembles one project, feature, task
+       or comment found with full-text search
+    '''
+
+    __slots__ = ('kind', 'result_id', 'name', 'snippet', 'target',
+                 'target_id', 'rank')
+
+    def __init__(self, kind: str, result_id: str, name: Markup,
+                 snippet: Markup, target: str, target_id: str, rank: float):
+        '''initializes SearchResult object
+
+        Args:
+            kind (str): what was found, projects, features,
+                tasks or comments
+            result_id (str): id of the found project, feature,
+                task or comment
+            name (Markup): name with matching words highlighted,
+                for comments name of the related feature or task
+            snippet (Markup): fragments of description or comment
+                with matching words highlighted
+            target (str): kind of the page showing the result,
+                projects, features or tasks
+            target_id (str): id of the page showing the result
+            rank (float): how well the result matches, bigger is better
+        '''
+        self.kind = kind
+        self.result_id = result_id
+        self.name = name
+        self.snippet = snippet
+        self.target = target
+        self.target_id = target_id
+        self.rank = rank
+
+    @property
+    def url(self) -> str:
+        '''url is address of the page showing the result
+
+        Returns:
+            str: path of the project, feature or task
+        '''
+        return f'/{self.target}/{self.target_id}'
+
+    def __str__(self) -> str:
+        '''Method for generating formatted string from object
+           to be mainly used in debugging matters.
+
+        Returns:
+            str: search result object in formatted string
+        '''
+
+        return (f'Search result ”{self.kind} ({self.result_id})”: \n'
+                f' - shown in ”{self.url}”\n'
+                f' - rank ”{self.rank}”\n'
+                f' - name ”{self.name}”\n'
+                f' - snippet ”{self.snippet}”')
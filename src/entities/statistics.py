@@ -0,0 +1,84 @@
+from datetime import date
+
+
+class TimeSpent:
+    '''Class TimeSpent resembles one row of time spent statistics,
+       for example time spent by one team member or in one project
+    '''
+
+    __slots__ = ('target_id', 'name', 'comments', 'time_spent')
+
+    def __init__(self, target_id: str, name: str, comments: int,
+                 time_spent: float):
+        '''initializes TimeSpent object
+
+        Args:
+            target_id (str): id of the member, project, feature or status
+            name (str): name of the member, project, feature or status
+            comments (int): amount of comments logging the time
+            time_spent (float): total time spent
+        '''
+        self.target_id = target_id
+        self.name = name
+        self.comments = comments
+        self.time_spent = time_spent
+
+    def __str__(self) -> str:
+        '''Method for generating formatted string from object
+           to be mainly used in debugging matters.
+
+        Returns:
+            str: time spent object in formatted string
+        '''
+
+        return (f'Time spent in ”{self.name}” ({self.target_id}): '
+                f'{self.time_spent} hours in {self.comments} comments')
+
+
+class Timesheet:
+    '''Class Timesheet resembles hours of team members
+       in each week between two dates
+    '''
+
+    def __init__(self, start: date, end: date, weeks: [date],
+                 members: [tuple]):
+        '''initializes Timesheet object
+
+        Args:
+            start (date): first day included
+            end (date): last day included
+            weeks ([date]): mondays of the weeks between start and end
+            members ([tuple]): user id, name, hours in each week
+                and total hours of every member
+        '''
+        self.start = start
+        self.end = end
+        self.weeks = weeks
+        self.members = members
+
+    @property
+    def totals(self) -> [float]:
+        '''totals is used to get hours of all members in each week
+
+        Returns:
+            [float]: hours in each week
+        '''
+        return [
+            sum(member[2][index] for member in self.members)
+            for index in range(len(self.weeks))
+        ]
+
+    def __str__(self) -> str:
+        '''Method for generating formatted string from object
+           to be mainly used in debugging matters.
+
+        Returns:
+            str: timesheet object in formatted string
+        '''
+
+        members = ''
+        for member in self.members:
+            members += f'   › {member[1]} ({member[0]}): {member[3]} hours\n'
+
+        return (f'Timesheet {self.start} - {self.end}, '
+                f'{len(self.weeks)} weeks\n{members}')
@@ -6,6 +6,11 @@ class Task:
     '''Class Task resembles tasks as a object from the database.
     '''
 
+    __slots__ = ('task_id', 'feature_id', 'feature_name', 'assignee_id',
+                 'assignee_name', 'name', 'description', 'status',
+                 'status_name', 'task_type', 'task_type_name', 'priority',
+                 'created', 'updated_on', 'flags', 'comments')
+
     def __init__(self,
                  tid: str,
                  fid: str,
@@ -91,3 +96,75 @@ class Task:
                 f' - updated on ”{self.updated_on}”\n'
                 f' - flags ”{self.flags}”\n'
                 f' - comments\n”{comments}”')
+
+
+class TaskSummary:
+    '''Class TaskSummary resembles task as a lightweight row
+       used in listings, without nested comments
+    '''
+
+    __slots__ = ('task_id', 'feature_id', 'feature_name', 'assignee_id',
+                 'assignee_name', 'name', 'description', 'status',
+                 'status_name', 'task_type', 'task_type_name', 'priority',
+                 'created', 'updated_on', 'flags', 'comment_count',
+                 'time_spent')
+
+    def __init__(self,
+                 tid: str,
+                 fid: str,
+                 fname: str,
+                 assignee: str,
+                 assignee_name: str,
+                 name: str,
+                 description: str,
+                 status: str,
+                 status_name: str,
+                 task_type: str,
+                 task_type_name: str,
+                 priority: int,
+                 created: datetime,
+                 updated_on: datetime,
+                 flags: str = '',
+                 comment_count: int = 0,
+                 time_spent: float = 0.0):
+        '''Initializes TaskSummary object with given values
+
+        Args:
+            tid (str): id of task
+            fid (str): id of feature in which references
+            fname (str): name of the feature
+            assignee (str): id of assignee
+            assignee_name (str): name of assignee
+            name (str): name of task
+            description (str): description of task
+            status (str): status of task
+            status_name (str): name of the status
+            task_type (str): type of task, like 'new feature' or 'bug fix'
+            task_type_name (str): name of the task type
+            priority (int): priority in three stages: low, severate and high
+            created (datetime): creation time of task
+            updated_on (datetime): latest time task is updated on
+            flags (str, optional): flags are used to filter tasks.
+                Defaults to ''.
+            comment_count (int, optional): amount of comments in task.
+                Defaults to 0.
+            time_spent (float, optional): total time spent in
+                task´s comments. Defaults to 0.0.
+        '''
+        self.task_id = tid
+        self.feature_id = fid
+        self.feature_name = fname
+        self.assignee_id = assignee
+        self.assignee_name = assignee_name
+        self.name = name
+        self.description = description
+        self.status = status
+        self.status_name = status_name
+        self.task_type = task_type
+        self.task_type_name = task_type_name
+        self.priority = priority
+        self.created = created
+        self.updated_on = updated_on
+        self.flags = flags
+        self.comment_count = comment_count
+        self.time_spent = time_spent
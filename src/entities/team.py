@@ -5,6 +5,9 @@ class Team:
     '''Class Team resembles user as a object from the database.
     '''
 
+    __slots__ = ('team_id', 'name', 'description', 'team_leader_id',
+                 'team_leader_name', 'members')
+
     def __init__(self,
                  teid: str,
                  name: str,
@@ -5,6 +5,10 @@ class User:
     '''Class User resembles user as a object from the database.
     '''
 
+    __slots__ = ('user_id', 'username', 'user_role', 'user_role_name',
+                 'password_hash', 'firstname', 'lastname', 'fullname', 'email',
+                 'profile_image', 'team_id', 'team_name')
+
     def __init__(self,
                  uid: str,
                  username: str,
@@ -29,8 +33,8 @@ class User:
             firstname (str): holds user´s firstname
             lastname (str): holds user´s lastname
             email (str): holds user´s email
-            profile_image (str, optional): holds user´s profile image as base64
-                encoded string or default value
+            profile_image (str, optional): holds address of user´s
+                profile image or default value
             teid (str, optional): id of the team if belongs to
             tename (str, optional): name of the team if belongs to
         '''
@@ -0,0 +1,83 @@
+import os
+from os import getenv
+
+# Gunicorn settings for production, used with `gunicorn -c gunicorn_config.py`
+
+WORKER_CLASSES = ('sync', 'gthread', 'gevent')
+
+worker_class = getenv('GUNICORN_WORKER_CLASS', 'gthread').lower()
+if worker_class not in WORKER_CLASSES:
+    raise ValueError(f'GUNICORN_WORKER_CLASS must be one of '
+                     f'{", ".join(WORKER_CLASSES)}, not {worker_class}')
+
+if worker_class == 'gevent':
+    # standard library has to be patched before the app is preloaded,
+    # otherwise locks and sockets created on import block the workers
+    from gevent import monkey
+    monkey.patch_all()
+
+bind = f'0.0.0.0:{getenv("PORT", "8000")}'
+# CPUs the process may run on, not all CPUs of the host. Quotas of
+# containers are not seen from here, so the default is capped to keep
+# connections of all workers below max_connections of the database, and
+# WEB_CONCURRENCY should be set where the CPU quota is known.
+MAX_DEFAULT_WORKERS = 9
+cpus = len(os.sched_getaffinity(0)) if hasattr(
+    os, 'sched_getaffinity') else os.cpu_count()
+workers = int(
+    getenv('WEB_CONCURRENCY', str(min(cpus * 2 + 1, MAX_DEFAULT_WORKERS))))
+# gthread: threads per worker, gevent: concurrent requests per worker.
+# Every worker has its own connection pool, DB_POOL_SIZE + DB_MAX_OVERFLOW
+# connections at most, so keep these below that. Sync workers handle one
+# request at a time, gunicorn would turn them into gthread with threads.
+threads = 1
+if worker_class == 'gthread':
+    threads = int(getenv('GUNICORN_THREADS', '4'))
+worker_connections = int(getenv('GUNICORN_WORKER_CONNECTIONS', '15'))
+timeout = int(getenv('GUNICORN_TIMEOUT', '30'))
+
+# workers are restarted after a while to release memory they have grown,
+# jitter keeps them from restarting all at the same time
+max_requests = int(getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = int(getenv('GUNICORN_MAX_REQUESTS_JITTER', '100'))
+
+# app is imported once in the master, workers share its memory copy-on-write
+preload_app = True
+
+accesslog = '-'
+
+
+def pre_fork(server, worker):  # pylint: disable=unused-argument
+    '''Closes database connections of the master before forking,
+       so that workers do not share sockets of the same connections
+    '''
+    from utils.database import db  # pylint: disable=import-outside-toplevel
+    db.engine.dispose()
+
+
+def post_fork(server, worker):  # pylint: disable=unused-argument
+    '''Makes psycopg2 yield to other greenlets while waiting for
+       the database, when gevent workers are used
+    '''
+    if worker_class == 'gevent':
+        from psycopg2 import extensions  # pylint: disable=import-outside-toplevel
+        extensions.set_wait_callback(_gevent_wait)
+
+
+def _gevent_wait(connection, wait_timeout=None):
+    '''Waits for psycopg2 connection without blocking other greenlets
+    '''
+    # pylint: disable=import-outside-toplevel
+    from gevent.socket import wait_read, wait_write
+    from psycopg2 import extensions, OperationalError
+
+    while True:
+        state = connection.poll()
+        if state == extensions.POLL_OK:
+            break
+        if state == extensions.POLL_READ:
+            wait_read(connection.fileno(), timeout=wait_timeout)
+        elif state == extensions.POLL_WRITE:
+            wait_write(connection.fileno(), timeout=wait_timeout)
+        else:
+            raise OperationalError(f'Bad result from poll: {state}')
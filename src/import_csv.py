@@ -0,0 +1,17 @@
+import sys
+from app import app
+from services.import_service import import_service
+
+if len(sys.argv) != 3 or sys.argv[1] not in ('tasks', 'comments'):
+    sys.exit('Usage: python3 src/import_csv.py tasks|comments FILE')
+
+with app.app_context(), open(sys.argv[2], encoding='utf-8-sig',
+                             newline='') as file:
+    if sys.argv[1] == 'tasks':
+        result = import_service.import_tasks(file)
+    else:
+        result = import_service.import_comments(file)
+
+print(result, end='')
+if not result.succeeded:
+    sys.exit(1)
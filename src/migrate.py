@@ -0,0 +1,10 @@
+from app import app
+from utils.migrations import migrate
+
+with app.app_context():
+    applied = migrate()
+
+for migration in applied:
+    print(f'Applied {migration.version}_{migration.name}')
+if not applied:
+    print('Database is up to date')
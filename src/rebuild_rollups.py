@@ -0,0 +1,7 @@
+from app import app
+from services.statistics_service import statistics_service
+
+with app.app_context():
+    corrected = statistics_service.rebuild_time_spent()
+
+print(f'Rebuilt rollups of time spent, {corrected} corrected')
@@ -0,0 +1,295 @@
+from sqlalchemy import Integer
+from utils.database import db, flag_condition, statement
+from utils.exceptions import DatabaseException
+from utils.pagination import Keyset, Page
+import utils.config as configs
+
+
+class _Resource:
+    '''Class describing how one resource of the API is read
+
+    Only columns listed in fields can be selected, so that names of
+    the fields asked by clients never end up in SQL as such.
+    '''
+
+    __slots__ = ('source', 'key', 'keyset', 'version', 'fields', 'filters')
+
+    def __init__(self, source: str, key: str, keyset: Keyset, version: str,
+                 fields: dict, filters: dict):
+        '''Initializes _Resource
+
+        Args:
+            source (str): tables of the resource with joins
+            key (str): column of the id of the resource
+            keyset (Keyset): ordering of listings
+            version (str): expression of the time the resource or
+                anything joined to it was last updated
+            fields (dict): column expressions by field names,
+                id of the resource first
+            filters (dict): conditions by names of filters, each with
+                parameter named after the filter
+        '''
+        self.source = source
+        self.key = key
+        self.keyset = keyset
+        self.version = version
+        self.fields = fields
+        self.filters = filters
+
+
+_OWNER = "U.firstname || ' ' || U.lastname"
+
+_RESOURCES = {
+    'projects': _Resource(
+        'Projects P JOIN Users U ON U.id = P.project_owner', 'P.id',
+        Keyset(('P.created', 'timestamp'), ('P.id', 'uuid')),
+        'GREATEST(P.updated_on, U.updated_on)', {
+            'project_id': 'P.id',
+            'project_owner_id': 'P.project_owner',
+            'project_owner_name': _OWNER,
+            'name': 'P.name',
+            'description': 'P.description',
+            'created': 'P.created',
+            'updated_on': 'P.updated_on',
+            'flags': 'P.flags',
+        }, {
+            'flag': flag_condition('P'),
+            'owner': 'P.project_owner = CAST(:owner AS uuid)',
+        }),
+    'features': _Resource(
+        '''Features F
+        JOIN Projects P ON P.id = F.project_id
+        JOIN Users U ON U.id = F.feature_owner
+        LEFT JOIN Statuses S ON S.id = F.status
+        LEFT JOIN Types T ON T.id = F.type''', 'F.id',
+        Keyset(('F.created', 'timestamp'), ('F.id', 'uuid')),
+        'GREATEST(F.updated_on, P.updated_on, U.updated_on)', {
+            'feature_id': 'F.id',
+            'project_id': 'F.project_id',
+            'project_name': 'P.name',
+            'feature_owner': 'F.feature_owner',
+            'feature_owner_name': _OWNER,
+            'name': 'F.name',
+            'description': 'F.description',
+            'status': 'F.status',
+            'status_name': 'S.name',
+            'feature_type': 'F.type',
+            'feature_type_name': 'T.name',
+            'priority': 'F.priority',
+            'created': 'F.created',
+            'updated_on': 'F.updated_on',
+            'flags': 'F.flags',
+        }, {
+            'flag': flag_condition('F'),
+            'project': 'F.project_id = CAST(:project AS uuid)',
+            'owner': 'F.feature_owner = CAST(:owner AS uuid)',
+        }),
+    'tasks': _Resource(
+        '''Tasks T
+        JOIN Features F ON F.id = T.feature_id
+        JOIN Users U ON U.id = T.assignee
+        LEFT JOIN Statuses S ON S.id = T.status
+        LEFT JOIN Types TY ON TY.id = T.type''', 'T.id',
+        Keyset(('T.created', 'timestamp'), ('T.id', 'uuid')),
+        'GREATEST(T.updated_on, F.updated_on, U.updated_on)', {
+            'task_id': 'T.id',
+            'feature_id': 'T.feature_id',
+            'feature_name': 'F.name',
+            'assignee_id': 'T.assignee',
+            'assignee_name': _OWNER,
+            'name': 'T.name',
+            'description': 'T.description',
+            'status': 'T.status',
+            'status_name': 'S.name',
+            'task_type': 'T.type',
+            'task_type_name': 'TY.name',
+            'priority': 'T.priority',
+            'created': 'T.created',
+            'updated_on': 'T.updated_on',
+            'flags': 'T.flags',
+        }, {
+            'flag': flag_condition('T'),
+            'feature': 'T.feature_id = CAST(:feature AS uuid)',
+            'assignee': 'T.assignee = CAST(:assignee AS uuid)',
+        }),
+    'comments': _Resource(
+        '''Comments C
+        LEFT JOIN Users U ON U.id = C.assignee
+        LEFT JOIN Features F ON F.id = C.feature_id
+        LEFT JOIN Tasks T ON T.id = C.task_id''', 'C.id',
+        Keyset(('C.created', 'timestamp'), ('C.id', 'uuid')),
+        'GREATEST(C.updated_on, U.updated_on, F.updated_on, T.updated_on)', {
+            'comment_id': 'C.id',
+            'feature_id': 'C.feature_id',
+            'feature_name': 'F.name',
+            'task_id': 'C.task_id',
+            'task_name': 'T.name',
+            'assignee_id': 'C.assignee',
+            'assignee_name': _OWNER,
+            'time_spent': 'C.time_spent',
+            'comment': 'C.comment',
+            'created': 'C.created',
+            'updated_on': 'C.updated_on',
+        }, {
+            'feature': 'C.feature_id = CAST(:feature AS uuid)',
+            'task': 'C.task_id = CAST(:task AS uuid)',
+            'assignee': 'C.assignee = CAST(:assignee AS uuid)',
+        }),
+    'teams': _Resource(
+        'Teams TE JOIN Users U ON U.id = TE.team_leader', 'TE.id',
+        Keyset(('TE.name', 'text'), ('TE.id', 'uuid'), descending=False),
+        'GREATEST(TE.updated_on, U.updated_on)', {
+            'team_id': 'TE.id',
+            'name': 'TE.name',
+            'description': 'TE.description',
+            'team_leader_id': 'TE.team_leader',
+            'team_leader_name': _OWNER,
+            'updated_on': 'TE.updated_on',
+        }, {
+            'leader': 'TE.team_leader = CAST(:leader AS uuid)',
+        }),
+    'users': _Resource(
+        '''Users U
+        JOIN Roles R ON R.id = U.user_role
+        LEFT JOIN Teamsusers TU ON TU.user_id = U.id
+        LEFT JOIN Teams TE ON TE.id = TU.team_id''', 'U.id',
+        Keyset(('U.username', 'text'), descending=False),
+        'GREATEST(U.updated_on, TE.updated_on)', {
+            'user_id': 'U.id',
+            'username': 'U.username',
+            'user_role': 'U.user_role',
+            'user_role_name': 'R.name',
+            'firstname': 'U.firstname',
+            'lastname': 'U.lastname',
+            'fullname': _OWNER,
+            'email': 'U.email',
+            'team_id': 'TU.team_id',
+            'team_name': 'TE.name',
+            'updated_on': 'U.updated_on',
+        }, {
+            'team': 'TU.team_id = CAST(:team AS uuid)',
+        }),
+}
+
+FIELDS = {name: tuple(resource.fields) for name, resource in _RESOURCES.items()}
+FILTERS = {
+    name: tuple(resource.filters) for name, resource in _RESOURCES.items()
+}
+
+# names of statuses, types and roles are cached lookups, renaming them
+# is noticed from their versions
+_LOOKUP_VERSION = '(SELECT COALESCE(SUM(version), 0) FROM LookupVersions)'
+
+
+class ApiRepository:
+    '''Class used for reading resources of the API from the database
+
+    Rows start with version columns, the time the row or anything joined
+    to it was last updated and version of lookup tables, followed by
+    key columns of the listing and asked fields.
+    '''
+
+    def get_page(self,
+                 name: str,
+                 fields: tuple = (),
+                 filters: dict = None,
+                 after: str = None,
+                 before: str = None,
+                 limit: int = None) -> Page:
+        '''get_page is used to get one page of resources with
+           only given fields selected
+
+        Args:
+            name (str): name of the resource, key of FIELDS
+            fields (tuple, optional): names of selected fields, without
+                fields only versions and keys are selected, which is
+                enough for checking if the page has changed.
+                Defaults to ().
+            filters (dict, optional): values by names of filters,
+                keys of FILTERS. Defaults to None.
+            after (str, optional): cursor of the row after which
+                the page starts. Defaults to None.
+            before (str, optional): cursor of the row before which
+                the page ends. Defaults to None.
+            limit (int, optional): size of the page.
+                Defaults to page_size of config.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid cursor is given
+
+        Returns:
+            Page: page of rows with versions, keys and fields
+        '''
+
+        resource = _RESOURCES[name]
+        filters = filters or {}
+        limit = limit or configs.page_size
+        condition, order, values = resource.keyset.clause(after, before)
+        conditions = [condition] + [
+            resource.filters[filter_name] for filter_name in sorted(filters)
+        ]
+        keys = [column for column, _ in resource.keyset.columns]
+
+        sql = f'''
+            SELECT {self._columns(resource, keys, fields)}
+            FROM {resource.source}
+            WHERE {' AND '.join(conditions)}
+            ORDER BY {order}
+            LIMIT :limit
+        '''
+
+        try:
+            rows = db.session.execute(statement(sql, limit=Integer), {
+                **values, **filters, 'limit': limit + 1
+            }).fetchall()
+        except Exception as error:
+            raise DatabaseException(f'While getting {name}') from error
+
+        return resource.keyset.page(
+            rows, limit, lambda row: row[2:2 + len(keys)], after, before)
+
+    def get_by_id(self, name: str, rid: str, fields: tuple = ()) -> tuple:
+        '''get_by_id is used to get one resource with only given
+           fields selected
+
+        Args:
+            name (str): name of the resource, key of FIELDS
+            rid (str): id of the resource
+            fields (tuple, optional): names of selected fields, without
+                fields only versions are selected. Defaults to ().
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            tuple: row with versions and fields, None if not found
+        '''
+
+        resource = _RESOURCES[name]
+
+        sql = f'''
+            SELECT {self._columns(resource, [], fields)}
+            FROM {resource.source}
+            WHERE {resource.key} = CAST(:id AS uuid)
+        '''
+
+        try:
+            row = db.session.execute(statement(sql), {'id': rid}).fetchone()
+        except Exception as error:
+            raise DatabaseException(f'While getting {name}') from error
+
+        return row
+
+    @staticmethod
+    def _columns(resource: _Resource, keys: list, fields: tuple) -> str:
+        # timestamps are stored in time zone of the database,
+        # HTTP dates need to know it
+        version = f"{resource.version} AT TIME ZONE current_setting('TimeZone')"
+        return ', '.join([version, _LOOKUP_VERSION, *keys] +
+                         [resource.fields[field] for field in fields])
+
+
+api_repository = ApiRepository()
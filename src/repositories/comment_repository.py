@@ -1,11 +1,137 @@
-from utils.database import db
+from sqlalchemy import Integer
+from utils.database import db, raise_for_foreign_key, statement
+from utils.identity_map import identity_mapped, invalidates_identity_map
 from utils.exceptions import DatabaseException, NotExistingException
+from utils.markdown_cache import markdown_cache
+from utils.pagination import Keyset, Page
+import utils.config as configs
+from utils import unit_of_work
+
+_REFERENCES = {
+    'comments_feature_id_fkey': 'comment´s related feature',
+    'comments_task_id_fkey': 'comment´s related task',
+    'comments_assignee_fkey': 'comment´s assignee',
+}
+
+_KEYSET = Keyset(('C.created', 'timestamp'), ('C.id', 'uuid'))
+
+_SELECT_WRITTEN = '''
+            SELECT C.id, C.assignee, U.firstname, U.lastname, C.time_spent, C.comment, C.created, C.updated_on, C.feature_id, F.name, C.task_id, T.name, C.comment_html
+            FROM Written C
+            JOIN Users U ON C.assignee = U.id
+            LEFT JOIN Features F ON C.feature_id = F.id
+            LEFT JOIN Tasks T ON C.task_id = T.id
+'''
+
+
+def _with_mode(comment: tuple) -> tuple:
+    '''_with_mode is used to convert comment row into tuple starting
+       with mode, either 'features' or 'tasks', followed by id and
+       name of the related feature or task
+
+    Args:
+        comment (tuple): comment row with both feature and task columns
+
+    Returns:
+        tuple: comment in same format as get_by_id returns
+    '''
+    if comment[8]:
+        return ('features', comment[0], comment[1], comment[2], comment[3],
+                comment[4], comment[5], comment[6], comment[7], comment[8],
+                comment[9], comment[12])
+    return ('tasks', comment[0], comment[1], comment[2], comment[3],
+            comment[4], comment[5], comment[6], comment[7], comment[10],
+            comment[11], comment[12])
+
+
+_NEW_FEATURE = statement('''
+    WITH Written AS (
+        INSERT INTO Comments
+        (feature_id, comment, comment_html, time_spent, assignee)
+        VALUES (:feature_id, :comment, :comment_html, :time_spent, :assignee)
+        RETURNING *
+    )
+''' + _SELECT_WRITTEN)
+
+_NEW_TASK = statement('''
+    WITH Written AS (
+        INSERT INTO Comments
+        (task_id, comment, comment_html, time_spent, assignee)
+        VALUES (:task_id, :comment, :comment_html, :time_spent, :assignee)
+        RETURNING *
+    )
+''' + _SELECT_WRITTEN)
+
+_GET_BY_ID = statement('''
+    SELECT C.id, C.assignee, U.firstname, U.lastname, C.time_spent, C.comment, C.created, C.updated_on, C.feature_id, F.name, C.task_id, T.name, C.comment_html  
+    FROM Comments C
+    LEFT JOIN Users U ON C.assignee = U.id
+    LEFT JOIN Features F ON C.feature_id = F.id
+    LEFT JOIN Tasks T ON C.task_id = T.id
+    WHERE C.id=:id
+''')
+
+_GET_ALL_BY_FEATURE_ID = statement('''
+    SELECT C.id, C.assignee, U.firstname, U.lastname, C.time_spent, C.comment, C.created, C.updated_on, C.feature_id, F.name, C.comment_html
+    FROM Comments C
+    JOIN Users U ON C.assignee = U.id
+    JOIN Features F ON C.feature_id = F.id
+    WHERE C.feature_id=:id
+''')
+
+_GET_ALL_BY_TASK_ID = statement('''
+    SELECT C.id, C.assignee, U.firstname, U.lastname, C.time_spent, C.comment, C.created, C.updated_on, C.task_id, T.name, C.comment_html
+    FROM Comments C
+    JOIN Users U ON C.assignee = U.id
+    JOIN Tasks T ON C.task_id = T.id
+    WHERE C.task_id=:id
+''')
+
+_GET_ALL_BY_FEATURE_IDS = statement('''
+    SELECT C.id, C.assignee, U.firstname, U.lastname, C.time_spent, C.comment, C.created, C.updated_on, C.feature_id, F.name, C.comment_html
+    FROM Comments C
+    JOIN Users U ON C.assignee = U.id
+    JOIN Features F ON C.feature_id = F.id
+    WHERE C.feature_id = ANY(CAST(:ids AS uuid[]))
+''')
+
+_GET_ALL_BY_TASK_IDS = statement('''
+    SELECT C.id, C.assignee, U.firstname, U.lastname, C.time_spent, C.comment, C.created, C.updated_on, C.task_id, T.name, C.comment_html
+    FROM Comments C
+    JOIN Users U ON C.assignee = U.id
+    JOIN Tasks T ON C.task_id = T.id
+    WHERE C.task_id = ANY(CAST(:ids AS uuid[]))
+''')
+
+_UPDATE_FEATURE = statement('''
+    WITH Written AS (
+        UPDATE Comments 
+        SET feature_id=:feature_id, comment=:comment, comment_html=:comment_html, time_spent=:time_spent, assignee=:assignee 
+        WHERE id=:id 
+        RETURNING *
+    )
+''' + _SELECT_WRITTEN)
+
+_UPDATE_TASK = statement('''
+    WITH Written AS (
+        UPDATE Comments 
+        SET task_id=:task_id, comment=:comment, comment_html=:comment_html, time_spent=:time_spent, assignee=:assignee 
+        WHERE id=:id 
+        RETURNING *
+    )
+''' + _SELECT_WRITTEN)
+
+_REMOVE = statement('''
+    DELETE FROM Comments 
+    WHERE id=:id
+''')
 
 
 class CommentRepository:
     '''Class used for handling comments in the database
     '''
 
+    @invalidates_identity_map
     def new(self,
             aid: str,
             comment: str,
@@ -24,47 +150,37 @@ class CommentRepository:
         Raises:
             DatabaseException: raised if problems occurs while
                 saving into the database
+            NotExistingException: raised if assignee, feature
+                or task is not found with given id
 
         Returns:
-            tuple: created comment´s id, creation and updated on time
+            tuple: created comment, in same format as get_by_id returns
         '''
 
         values = {
             'feature_id': fid,
             'task_id': tid,
             'comment': comment,
+            'comment_html': markdown_cache.render(comment),
             'time_spent': tspent,
             'assignee': aid,
         }
 
-        sql_feature = '''
-            INSERT INTO Comments
-            (feature_id, comment, time_spent, assignee)
-            VALUES (:feature_id, :comment, :time_spent, :assignee)
-            RETURNING id, created, updated_on
-        '''
-
-        sql_task = '''
-            INSERT INTO Comments
-            (task_id, comment, time_spent, assignee)
-            VALUES (:task_id, :comment, :time_spent, :assignee)
-            RETURNING id, created, updated_on
-        '''
-
-        sql = sql_feature if fid else sql_task
+        sql = _NEW_FEATURE if fid else _NEW_TASK
 
         try:
-            comment_id, created, updated_on = db.session.execute(
-                sql, values).fetchone()
-            db.session.commit()
+            comment = db.session.execute(sql, values).fetchone()
+            unit_of_work.commit()
         except Exception as error:
+            raise_for_foreign_key(error, _REFERENCES)
             raise DatabaseException('While saving new comment') from error
 
-        if not comment_id:
-            raise DatabaseException('While saving new comment') from error
+        if not comment:
+            raise DatabaseException('While saving new comment')
 
-        return (comment_id, created, updated_on)
+        return _with_mode(comment)
 
+    @identity_mapped
     def get_by_id(self, cid: str) -> tuple:
         '''get_by_id is used to find exact comment with
            given id from the database
@@ -81,33 +197,15 @@ class CommentRepository:
             tuple: comment with given id
         '''
 
-        sql = '''
-            SELECT C.id, C.assignee, U.firstname, U.lastname, C.time_spent, C.comment, C.created, C.updated_on, C.feature_id, F.name, C.task_id, T.name  
-            FROM Comments C
-            LEFT JOIN Users U ON C.assignee = U.id
-            LEFT JOIN Features F ON C.feature_id = F.id
-            LEFT JOIN Tasks T ON C.task_id = T.id
-            WHERE C.id=:id
-        '''
-
         try:
-            comment = db.session.execute(sql, {'id': cid}).fetchone()
+            comment = db.session.execute(_GET_BY_ID, {'id': cid}).fetchone()
         except Exception as error:
             raise DatabaseException('While getting the comment') from error
 
-        if not comment:
+        if not comment or not (comment[8] or comment[10]):
             raise NotExistingException('Comment')
 
-        if comment[8]:
-            return ('features', comment[0], comment[1], comment[2], comment[3],
-                    comment[4], comment[5], comment[6], comment[7], comment[8],
-                    comment[9])
-        elif comment[10]:
-            return ('tasks', comment[0], comment[1], comment[2], comment[3],
-                    comment[4], comment[5], comment[6], comment[7], comment[10],
-                    comment[11])
-        else:
-            raise NotExistingException('Comment')
+        return _with_mode(comment)
 
     def get_all_by_feature_id(self, fid: str) -> [tuple]:
         '''get_all_by_feature_id is used to get list of all comments
@@ -126,23 +224,17 @@ class CommentRepository:
             [tuple]: list of found comments
         '''
 
-        sql = '''
-            SELECT C.id, C.assignee, U.firstname, U.lastname, C.time_spent, C.comment, C.created, C.updated_on, C.feature_id, F.name
-            FROM Comments C
-            JOIN Users U ON C.assignee = U.id
-            JOIN Features F ON C.feature_id = F.id
-            WHERE C.feature_id=:id
-        '''
-
         try:
-            comments = db.session.execute(sql, {'id': fid}).fetchall()
+            comments = db.session.execute(_GET_ALL_BY_FEATURE_ID, {
+                'id': fid
+            }).fetchall()
         except Exception as error:
             raise DatabaseException(
                 'While getting all comments by feature id') from error
 
         return [('features', comment[0], comment[1], comment[2], comment[3],
                  comment[4], comment[5], comment[6], comment[7], comment[8],
-                 comment[9]) for comment in comments]
+                 comment[9], comment[10]) for comment in comments]
 
     def get_all_by_task_id(self, tid: str) -> [tuple]:
         '''get_all_by_task_id is used to get list of all comments
@@ -161,32 +253,26 @@ class CommentRepository:
             [tuple]: list of found comments
         '''
 
-        sql = '''
-            SELECT C.id, C.assignee, U.firstname, U.lastname, C.time_spent, C.comment, C.created, C.updated_on, C.task_id, T.name
-            FROM Comments C
-            JOIN Users U ON C.assignee = U.id
-            JOIN Tasks T ON C.task_id = T.id
-            WHERE C.task_id=:id
-        '''
-
         try:
-            comments = db.session.execute(sql, {'id': tid}).fetchall()
+            comments = db.session.execute(_GET_ALL_BY_TASK_ID, {
+                'id': tid
+            }).fetchall()
         except Exception as error:
             raise DatabaseException(
                 'While getting all comments by task id') from error
 
         return [('tasks', comment[0], comment[1], comment[2], comment[3],
                  comment[4], comment[5], comment[6], comment[7], comment[8],
-                 comment[9]) for comment in comments]
+                 comment[9], comment[10]) for comment in comments]
 
-    def get_all_by_assignee(self, aid: str) -> [tuple]:
-        '''get_all_by_assignee is used to get list of all comments
-           associated with given assignee´s id in the database.
+    def get_all_by_feature_ids(self, fids: [str]) -> [tuple]:
+        '''get_all_by_feature_ids is used to get list of all comments
+           associated with any of given feature ids in one query.
 
            If no comments found, returns empty list.
 
         Args:
-            aid (str): id of the related assignee
+            fids ([str]): ids of the related features
 
         Raises:
             DatabaseException: raised if problems occur
@@ -196,27 +282,109 @@ class CommentRepository:
             [tuple]: list of found comments
         '''
 
-        sql = '''
-            SELECT C.id, C.assignee, U.firstname, U.lastname, C.time_spent, C.comment, C.created, C.updated_on, C.feature_id, F.name, C.task_id, T.name
+        if not fids:
+            return []
+
+        try:
+            comments = db.session.execute(_GET_ALL_BY_FEATURE_IDS, {
+                'ids': [str(fid) for fid in fids]
+            }).fetchall()
+        except Exception as error:
+            raise DatabaseException(
+                'While getting all comments by feature ids') from error
+
+        return [('features', comment[0], comment[1], comment[2], comment[3],
+                 comment[4], comment[5], comment[6], comment[7], comment[8],
+                 comment[9], comment[10]) for comment in comments]
+
+    def get_all_by_task_ids(self, tids: [str]) -> [tuple]:
+        '''get_all_by_task_ids is used to get list of all comments
+           associated with any of given task ids in one query.
+
+           If no comments found, returns empty list.
+
+        Args:
+            tids ([str]): ids of the related tasks
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: list of found comments
+        '''
+
+        if not tids:
+            return []
+
+        try:
+            comments = db.session.execute(_GET_ALL_BY_TASK_IDS, {
+                'ids': [str(tid) for tid in tids]
+            }).fetchall()
+        except Exception as error:
+            raise DatabaseException(
+                'While getting all comments by task ids') from error
+
+        return [('tasks', comment[0], comment[1], comment[2], comment[3],
+                 comment[4], comment[5], comment[6], comment[7], comment[8],
+                 comment[9], comment[10]) for comment in comments]
+
+    def get_all_by_assignee(self,
+                            aid: str,
+                            after: str = None,
+                            before: str = None,
+                            limit: int = None) -> Page:
+        '''get_all_by_assignee is used to get one page of comments
+           associated with given assignee´s id in the database,
+           newest first
+
+           If no comments found, returns empty page.
+
+        Args:
+            aid (str): id of the related assignee
+            after (str, optional): cursor of the comment after which
+                the page starts. Defaults to None.
+            before (str, optional): cursor of the comment before which
+                the page ends. Defaults to None.
+            limit (int, optional): size of the page.
+                Defaults to page_size of config.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid cursor is given
+
+        Returns:
+            Page: page of found comments
+        '''
+
+        limit = limit or configs.page_size
+        condition, order, values = _KEYSET.clause(after, before)
+
+        sql = f'''
+            SELECT C.id, C.assignee, U.firstname, U.lastname, C.time_spent, C.comment, C.created, C.updated_on, C.feature_id, F.name, C.task_id, T.name, C.comment_html
             FROM Comments C
             JOIN Users U ON C.assignee = U.id
             LEFT JOIN Features F ON C.feature_id = F.id
             LEFT JOIN Tasks T ON C.task_id = T.id
-            WHERE C.assignee=:id
+            WHERE C.assignee=:id AND {condition}
+            ORDER BY {order}
+            LIMIT :limit
         '''
         try:
-            comments = db.session.execute(sql, {'id': aid}).fetchall()
+            comments = db.session.execute(statement(sql, limit=Integer), {
+                **values, 'id': aid,
+                'limit': limit + 1
+            }).fetchall()
         except Exception as error:
             raise DatabaseException(
                 'While getting all comments by assignee') from error
 
-        return [('features', comment[0], comment[1], comment[2], comment[3],
-                 comment[4], comment[5], comment[6], comment[7], comment[8],
-                 comment[9]) if comment[8] else
-                ('tasks', comment[0], comment[1], comment[2], comment[3],
-                 comment[4], comment[5], comment[6], comment[7], comment[10],
-                 comment[11]) for comment in comments]
+        return _KEYSET.page([_with_mode(comment) for comment in comments],
+                            limit, lambda comment: (comment[7], comment[1]),
+                            after, before)
 
+    @invalidates_identity_map
     def update(self,
                cid: str,
                aid: str,
@@ -242,9 +410,11 @@ class CommentRepository:
         Raises:
             DatabaseException: raised if problems occurs while
                 saving into the database
+            NotExistingException: raised if comment, assignee,
+                feature or task is not found with given id
 
         Returns:
-            tuple: updated comment´s id, creation and updated on time
+            tuple: updated comment, in same format as get_by_id returns
         '''
 
         values = {
@@ -252,38 +422,26 @@ class CommentRepository:
             'feature_id': fid,
             'task_id': tid,
             'comment': comment_text,
+            'comment_html': markdown_cache.render(comment_text),
             'time_spent': tspent,
             'assignee': aid,
         }
 
-        sql_feature = '''
-            UPDATE Comments 
-            SET feature_id=:feature_id, comment=:comment, time_spent=:time_spent, assignee=:assignee 
-            WHERE id=:id 
-            RETURNING id, created, updated_on
-        '''
-
-        sql_task = '''
-            UPDATE Comments 
-            SET task_id=:task_id, comment=:comment, time_spent=:time_spent, assignee=:assignee 
-            WHERE id=:id 
-            RETURNING id, created, updated_on
-        '''
-
-        sql = sql_feature if fid else sql_task
+        sql = _UPDATE_FEATURE if fid else _UPDATE_TASK
 
         try:
-            comment_id, created, updated_on = db.session.execute(
-                sql, values).fetchone()
-            db.session.commit()
+            comment = db.session.execute(sql, values).fetchone()
+            unit_of_work.commit()
         except Exception as error:
+            raise_for_foreign_key(error, _REFERENCES)
             raise DatabaseException('While saving updated comment') from error
 
-        if str(cid) != str(comment_id):
-            raise DatabaseException('While saving updated comment') from error
+        if not comment:
+            raise NotExistingException('Comment')
 
-        return (cid, created, updated_on)
+        return _with_mode(comment)
 
+    @invalidates_identity_map
     def remove(self, cid: str):
         '''remove is used to remove comment from the database
 
@@ -295,14 +453,9 @@ class CommentRepository:
                 while interacting with the database
         '''
 
-        sql = '''
-            DELETE FROM Comments 
-            WHERE id=:id
-        '''
-
         try:
-            db.session.execute(sql, {'id': cid})
-            db.session.commit()
+            db.session.execute(_REMOVE, {'id': cid})
+            unit_of_work.commit()
         except Exception as error:
             raise DatabaseException('While removing the comment') from error
 
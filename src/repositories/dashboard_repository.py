@@ -0,0 +1,128 @@
+from datetime import datetime
+
+from utils.database import db, statement
+from utils.exceptions import DatabaseException, NotExistingException
+
+
+def _timestamp(value: str) -> datetime:
+    '''_timestamp is used to convert timestamp given by json_agg
+       back into datetime
+
+    Args:
+        value (str): timestamp in ISO 8601 format
+
+    Returns:
+        datetime: converted timestamp
+    '''
+    if '.' in value:
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S.%f')
+    return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S')
+
+
+_GET_BY_USER = statement('''
+    WITH user_projects AS (
+        SELECT json_agg(json_build_array(P.id, P.project_owner, U.firstname, U.lastname, P.name, P.description, P.created, P.updated_on, P.flags)) AS items
+        FROM Projects P
+        JOIN Users U ON P.project_owner = U.id
+        WHERE P.project_owner=:id
+    ), user_features AS (
+        SELECT json_agg(json_build_array(F.id, F.project_id, P.name, F.feature_owner, U.firstname, U.lastname, F.name, F.description, F.status, S.name, F.type, T.name, F.priority, F.created, F.updated_on, F.flags)) AS items
+        FROM Features F
+        JOIN Projects P ON F.project_id = P.id
+        JOIN Users U ON F.feature_owner = U.id
+        JOIN Types T ON T.id = F.type
+        JOIN Statuses S ON S.id = F.status
+        WHERE F.feature_owner=:id
+    ), user_tasks AS (
+        SELECT json_agg(json_build_array(T.id, T.feature_id, F.name, T.assignee, U.firstname, U.lastname, T.name, T.description, T.status, S.name, T.type, Ty.name, T.priority, T.created, T.updated_on, T.flags)) AS items
+        FROM Tasks T
+        JOIN Features F ON F.id = T.feature_id
+        JOIN Users U ON U.id = T.assignee
+        JOIN Types Ty ON Ty.id = T.type
+        JOIN Statuses S ON S.id = T.status
+        WHERE T.assignee=:id
+    ), user_comments AS (
+        SELECT json_agg(json_build_array(CASE WHEN C.feature_id IS NOT NULL THEN 'features' ELSE 'tasks' END, C.id, C.assignee, U.firstname, U.lastname, C.time_spent, C.comment, C.created, C.updated_on, COALESCE(C.feature_id, C.task_id), COALESCE(F.name, T.name), C.comment_html)) AS items
+        FROM Comments C
+        JOIN Users U ON C.assignee = U.id
+        LEFT JOIN Features F ON C.feature_id = F.id
+        LEFT JOIN Tasks T ON C.task_id = T.id
+        WHERE C.assignee=:id
+    ), user_teams AS (
+        SELECT json_agg(json_build_array(T.id, T.name, T.description, T.team_leader, U.firstname, U.lastname)) AS items
+        FROM Teams T
+        JOIN Users U ON T.team_leader = U.id
+        WHERE T.team_leader=:id
+    )
+    SELECT UP.items, UF.items, UT.items, UC.items, UTe.items, COALESCE(R.time_spent, 0)
+    FROM Users U
+    CROSS JOIN user_projects UP
+    CROSS JOIN user_features UF
+    CROSS JOIN user_tasks UT
+    CROSS JOIN user_comments UC
+    CROSS JOIN user_teams UTe
+    LEFT JOIN TimeSpentRollups R ON R.scope = 'user' AND R.id = U.id
+    WHERE U.id=:id
+''')
+
+
+class DashboardRepository:
+    '''Class used for getting contents of user´s dashboard from the database
+    '''
+
+    def get_by_user(self, uid: str) -> tuple:
+        '''get_by_user is used to get user´s projects, features, tasks,
+           comments, led teams and total time spent with one query
+
+        Returned lists contain tuples in same format as
+        get_all_by_* methods of corresponding repositories.
+
+        Args:
+            uid (str): id of the user
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            NotExistingException: raised if user is not
+                found with given id
+
+        Returns:
+            tuple: lists of projects, features, tasks, comments
+                and teams, and total time spent
+        '''
+
+        try:
+            dashboard = db.session.execute(_GET_BY_USER, {'id': uid}).fetchone()
+        except Exception as error:
+            raise DatabaseException(
+                'While getting the dashboard of user') from error
+
+        if not dashboard:
+            raise NotExistingException('User')
+
+        projects = [(project[0], project[1], project[2], project[3],
+                     project[4], project[5], _timestamp(project[6]),
+                     _timestamp(project[7]), project[8])
+                    for project in dashboard[0] or []]
+        features = [(feature[0], feature[1], feature[2], feature[3],
+                     feature[4], feature[5], feature[6], feature[7],
+                     feature[8], feature[9], feature[10], feature[11],
+                     feature[12], _timestamp(feature[13]),
+                     _timestamp(feature[14]), feature[15])
+                    for feature in dashboard[1] or []]
+        tasks = [(task[0], task[1], task[2], task[3], task[4], task[5],
+                  task[6], task[7], task[8], task[9], task[10], task[11],
+                  task[12], _timestamp(task[13]), _timestamp(task[14]),
+                  task[15]) for task in dashboard[2] or []]
+        comments = [(comment[0], comment[1], comment[2], comment[3],
+                     comment[4], comment[5], comment[6],
+                     _timestamp(comment[7]), _timestamp(comment[8]),
+                     comment[9], comment[10], comment[11])
+                    for comment in dashboard[3] or []]
+        teams = [(team[0], team[1], team[2], team[3], team[4], team[5])
+                 for team in dashboard[4] or []]
+
+        return (projects, features, tasks, comments, teams, dashboard[5])
+
+
+dashboard_repository = DashboardRepository()
@@ -0,0 +1,216 @@
+from datetime import date, timedelta
+
+from utils.database import db, statement
+from utils.exceptions import DatabaseException
+import utils.config as configs
+
+
+def _filters(owner: str, project: str, created: str, pid: str, aid: str,
+             start: date, end: date) -> tuple:
+    '''_filters is used to build SQL condition and values
+       of optional export filters
+
+    Args:
+        owner (str): column of the assignee or owner
+        project (str): column of the project
+        created (str): column of the creation time
+        pid (str): id of the project, or None
+        aid (str): id of the assignee or owner, or None
+        start (date): first day included, or None
+        end (date): last day included, or None
+
+    Returns:
+        tuple: SQL condition and values for the condition
+    '''
+    conditions, values = [], {}
+
+    if pid:
+        conditions.append(f'{project} = :project')
+        values['project'] = pid
+    if aid:
+        conditions.append(f'{owner} = :assignee')
+        values['assignee'] = aid
+    if start:
+        conditions.append(f'{created} >= :start')
+        values['start'] = start
+    if end:
+        conditions.append(f'{created} < :end')
+        values['end'] = end + timedelta(days=1)
+
+    return (' AND '.join(conditions) or 'TRUE', values)
+
+
+def _stream(sql: str, values: dict, target: str):
+    '''_stream is used to iterate rows of query from server-side
+       cursor, fetching them in batches so that memory use stays
+       constant regardless of amount of rows
+
+    Args:
+        sql (str): query to be run
+        values (dict): values for the query
+        target (str): name of exported rows, used in error message
+
+    Raises:
+        DatabaseException: raised if problems occur
+            while interacting with the database
+
+    Yields:
+        tuple: rows of the query
+    '''
+    result = None
+    try:
+        result = db.session.execute(statement(sql),
+                                    values,
+                                    execution_options={
+                                        'stream_results': True
+                                    }).yield_per(configs.export_batch_size)
+        for row in result:
+            yield tuple(row)
+    except Exception as error:
+        raise DatabaseException(f'While exporting {target}') from error
+    finally:
+        if result is not None:
+            result.close()
+
+
+class ExportRepository:
+    '''Class used for reading exported rows from the database
+    '''
+
+    def stream_tasks(self,
+                     pid: str = None,
+                     aid: str = None,
+                     start: date = None,
+                     end: date = None):
+        '''stream_tasks is used to iterate tasks, oldest first,
+           with their comment count and time spent
+
+        Args:
+            pid (str, optional): only tasks of the project.
+                Defaults to None.
+            aid (str, optional): only tasks of the assignee.
+                Defaults to None.
+            start (date, optional): only tasks created on
+                or after the day. Defaults to None.
+            end (date, optional): only tasks created on
+                or before the day. Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Yields:
+            tuple: id, project id, project name, feature id, feature name,
+                name, description, status, type, priority, assignee´s
+                username, created, updated on, flags, amount of comments
+                and time spent of the task
+        '''
+
+        condition, values = _filters('T.assignee', 'F.project_id',
+                                     'T.created', pid, aid, start, end)
+
+        sql = f'''
+            SELECT T.id, F.project_id, P.name, T.feature_id, F.name, T.name, T.description, S.name, Ty.name, T.priority, U.username, T.created, T.updated_on, T.flags, COALESCE(R.comments, 0), COALESCE(R.time_spent, 0)
+            FROM Tasks T
+            JOIN Features F ON F.id = T.feature_id
+            JOIN Projects P ON P.id = F.project_id
+            JOIN Users U ON U.id = T.assignee
+            LEFT JOIN Statuses S ON S.id = T.status
+            LEFT JOIN Types Ty ON Ty.id = T.type
+            LEFT JOIN TimeSpentRollups R ON R.scope = 'task' AND R.id = T.id
+            WHERE {condition}
+            ORDER BY T.created, T.id
+        '''
+
+        return _stream(sql, values, 'tasks')
+
+    def stream_features(self,
+                        pid: str = None,
+                        aid: str = None,
+                        start: date = None,
+                        end: date = None):
+        '''stream_features is used to iterate features, oldest first,
+           with comment count and time spent of the feature´s comments
+
+        Args:
+            pid (str, optional): only features of the project.
+                Defaults to None.
+            aid (str, optional): only features of the owner.
+                Defaults to None.
+            start (date, optional): only features created on
+                or after the day. Defaults to None.
+            end (date, optional): only features created on
+                or before the day. Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Yields:
+            tuple: id, project id, project name, name, description,
+                status, type, priority, owner´s username, created,
+                updated on, flags, amount of comments and time spent
+                of the feature
+        '''
+
+        condition, values = _filters('F.feature_owner', 'F.project_id',
+                                     'F.created', pid, aid, start, end)
+
+        sql = f'''
+            SELECT F.id, F.project_id, P.name, F.name, F.description, S.name, Ty.name, F.priority, U.username, F.created, F.updated_on, F.flags, COALESCE(R.comments, 0), COALESCE(R.time_spent, 0)
+            FROM Features F
+            JOIN Projects P ON P.id = F.project_id
+            JOIN Users U ON U.id = F.feature_owner
+            LEFT JOIN Statuses S ON S.id = F.status
+            LEFT JOIN Types Ty ON Ty.id = F.type
+            LEFT JOIN TimeSpentRollups R ON R.scope = 'feature' AND R.id = F.id
+            WHERE {condition}
+            ORDER BY F.created, F.id
+        '''
+
+        return _stream(sql, values, 'features')
+
+    def stream_comments(self,
+                        pid: str = None,
+                        aid: str = None,
+                        start: date = None,
+                        end: date = None):
+        '''stream_comments is used to iterate comments, oldest first
+
+        Args:
+            pid (str, optional): only comments of features and tasks
+                of the project. Defaults to None.
+            aid (str, optional): only comments of the assignee.
+                Defaults to None.
+            start (date, optional): only comments created on
+                or after the day. Defaults to None.
+            end (date, optional): only comments created on
+                or before the day. Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Yields:
+            tuple: id, project id, feature id, task id, assignee´s
+                username, time spent, comment, created and updated on
+                of the comment
+        '''
+
+        condition, values = _filters('C.assignee', 'F.project_id',
+                                     'C.created', pid, aid, start, end)
+
+        sql = f'''
+            SELECT C.id, F.project_id, C.feature_id, C.task_id, U.username, C.time_spent, C.comment, C.created, C.updated_on
+            FROM Comments C
+            LEFT JOIN Tasks T ON T.id = C.task_id
+            JOIN Features F ON F.id = COALESCE(C.feature_id, T.feature_id)
+            LEFT JOIN Users U ON U.id = C.assignee
+            WHERE {condition}
+            ORDER BY C.created, C.id
+        '''
+
+        return _stream(sql, values, 'comments')
+
+
+export_repository = ExportRepository()
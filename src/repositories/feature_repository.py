@@ -1,11 +1,130 @@
-from utils.database import db
+from sqlalchemy import Integer
+from utils.database import db, flag_condition, like_patterns, raise_for_foreign_key, statement
+from utils.identity_map import identity_mapped, invalidates_identity_map
 from utils.exceptions import DatabaseException, NotExistingException
+from utils.pagination import Keyset, Page
+import utils.config as configs
+from utils import unit_of_work
+
+_REFERENCES = {
+    'features_project_id_fkey': 'Project',
+    'features_feature_owner_fkey': 'Feature Owner',
+    'features_status_fkey': 'Status',
+    'features_type_fkey': 'Feature Type',
+}
+
+_KEYSET = Keyset(('F.created', 'timestamp'), ('F.id', 'uuid'))
+
+
+_NEW = statement('''
+    WITH Inserted AS (
+        INSERT INTO Features
+        (project_id, feature_owner, name, description, flags, status, type, priority)
+        VALUES (:project_id, :feature_owner, :name, :description, :flags, :status, :type, :priority)
+        RETURNING *
+    )
+    SELECT F.id, F.project_id, P.name, F.feature_owner, U.firstname, U.lastname, F.name, F.description, F.status, S.name, F.type, T.name, F.priority, F.created, F.updated_on, F.flags
+    FROM Inserted F
+    JOIN Projects P ON F.project_id = P.id
+    JOIN Users U ON F.feature_owner = U.id
+    JOIN Types T ON T.id = F.type
+    JOIN Statuses S ON S.id = F.status
+''')
+
+_GET_ALL = statement('''
+    SELECT F.id, F.project_id, P.name, F.feature_owner, U.firstname, U.lastname, F.name, F.description, F.status, S.name, F.type, T.name, F.priority, F.created, F.updated_on, F.flags  
+    FROM Features F
+    JOIN Projects P ON F.project_id = P.id
+    JOIN Users U ON F.feature_owner = U.id
+    JOIN Types T ON T.id = F.type
+    JOIN Statuses S ON S.id = F.status
+''')
+
+_GET_FEATURES = statement('''
+    SELECT id, name
+    FROM Features
+''')
+
+_GET_FEATURES_BY_NAME = statement('''
+    SELECT id, name
+    FROM Features
+    WHERE name ILIKE :contains
+    ORDER BY name ILIKE :prefix DESC, name, id
+    LIMIT :limit
+''', limit=Integer)
+
+_GET_ALL_BY_PROJECT_ID = statement('''
+    SELECT F.id, F.project_id, P.name, F.feature_owner, U.firstname, U.lastname, F.name, F.description, F.status, S.name, F.type, T.name, F.priority, F.created, F.updated_on, F.flags  
+    FROM Features F
+    JOIN Projects P ON F.project_id = P.id
+    JOIN Users U ON F.feature_owner = U.id
+    JOIN Types T ON T.id = F.type
+    JOIN Statuses S ON S.id = F.status
+    WHERE P.id=:id
+''')
+
+_GET_ALL_BY_PROJECT_IDS = statement('''
+    SELECT F.id, F.project_id, P.name, F.feature_owner, U.firstname, U.lastname, F.name, F.description, F.status, S.name, F.type, T.name, F.priority, F.created, F.updated_on, F.flags
+    FROM Features F
+    JOIN Projects P ON F.project_id = P.id
+    JOIN Users U ON F.feature_owner = U.id
+    JOIN Types T ON T.id = F.type
+    JOIN Statuses S ON S.id = F.status
+    WHERE F.project_id = ANY(CAST(:ids AS uuid[]))
+''')
+
+_GET_ALL_BY_FEATURE_OWNER = statement('''
+    SELECT F.id, F.project_id, P.name, F.feature_owner, U.firstname, U.lastname, F.name, F.description, F.status, S.name, F.type, T.name, F.priority, F.created, F.updated_on, F.flags  
+    FROM Features F
+    JOIN Projects P ON F.project_id = P.id
+    JOIN Users U ON F.feature_owner = U.id
+    JOIN Types T ON T.id = F.type
+    JOIN Statuses S ON S.id = F.status
+    WHERE F.feature_owner=:id
+''')
+
+_GET_BY_ID = statement('''
+    SELECT F.id, F.project_id, P.name, F.feature_owner, U.firstname, U.lastname, F.name, F.description, F.status, S.name, F.type, T.name, F.priority, F.created, F.updated_on, F.flags  
+    FROM Features F
+    JOIN Projects P ON F.project_id = P.id
+    JOIN Users U ON F.feature_owner = U.id
+    JOIN Types T ON T.id = F.type
+    JOIN Statuses S ON S.id = F.status
+    WHERE F.id=:id
+''')
+
+_GET_NAME = statement('''
+    SELECT name
+    FROM Features
+    WHERE id=:id
+''')
+
+_UPDATE = statement('''
+    WITH Updated AS (
+        UPDATE Features
+        SET project_id=:project_id, feature_owner=:feature_owner, name=:name, description=:description, flags=:flags, status=:status, type=:type, priority=:priority
+        WHERE id=:id
+        RETURNING *
+    )
+    SELECT F.id, F.project_id, P.name, F.feature_owner, U.firstname, U.lastname, F.name, F.description, F.status, S.name, F.type, T.name, F.priority, F.created, F.updated_on, F.flags
+    FROM Updated F
+    JOIN Projects P ON F.project_id = P.id
+    JOIN Users U ON F.feature_owner = U.id
+    JOIN Types T ON T.id = F.type
+    JOIN Statuses S ON S.id = F.status
+''')
+
+_REMOVE = statement('''
+    DELETE FROM Features 
+    WHERE id=:id
+''')
 
 
 class FeatureRepository:
     '''Class for handling Features in the database
     '''
 
+    @invalidates_identity_map
     def new(self, pid: str, foid: str, name: str, description: str, flags: str,
             status: str, ftype: str, priority: int) -> tuple:
         '''new is used to create new features into the database
@@ -26,9 +145,11 @@ class FeatureRepository:
         Raises:
             DatabaseException: raised if problems occurs while
                 saving into the database
+            NotExistingException: raised if project, feature owner,
+                status or type is not found with given id
 
         Returns:
-            tuple: created feature´s id, creation and updated on time
+            tuple: created feature, in same format as get_by_id returns
         '''
 
         values = {
@@ -42,24 +163,17 @@ class FeatureRepository:
             'priority': priority
         }
 
-        sql = '''
-            INSERT INTO Features
-            (project_id, feature_owner, name, description, flags, status, type, priority)
-            VALUES (:project_id, :feature_owner, :name, :description, :flags, :status, :type, :priority)
-            RETURNING id, created, updated_on
-        '''
-
         try:
-            feature_id, created, updated_on = db.session.execute(
-                sql, values).fetchone()
-            db.session.commit()
+            feature = db.session.execute(_NEW, values).fetchone()
+            unit_of_work.commit()
         except Exception as error:
+            raise_for_foreign_key(error, _REFERENCES)
             raise DatabaseException('While saving new feature') from error
 
-        if not feature_id:
+        if not feature:
             raise DatabaseException('While saving new feature')
 
-        return (feature_id, created, updated_on)
+        return feature
 
     def get_all(self) -> [tuple]:
         '''get_all is used to list of all features in the database
@@ -74,24 +188,105 @@ class FeatureRepository:
             [tuple]: list of all features
         '''
 
-        sql = '''
-            SELECT F.id, F.project_id, P.name, F.feature_owner, U.firstname, U.lastname, F.name, F.description, F.status, S.name, F.type, T.name, F.priority, F.created, F.updated_on, F.flags  
-            FROM Features F
+        try:
+            features = db.session.execute(_GET_ALL).fetchall()
+        except Exception as error:
+            raise DatabaseException('While getting all features') from error
+
+        return features
+
+    def get_all_summaries(self,
+                          after: str = None,
+                          before: str = None,
+                          limit: int = None,
+                          flag: str = None) -> Page:
+        '''get_all_summaries is used to get one page of features, newest
+           first, with amount of tasks and comments and total time spent,
+           calculated in the database with one query
+
+        If no features found, returns empty page.
+
+        Args:
+            after (str, optional): cursor of the feature after which
+                the page starts. Defaults to None.
+            before (str, optional): cursor of the feature before which
+                the page ends. Defaults to None.
+            limit (int, optional): size of the page.
+                Defaults to page_size of config.
+            flag (str, optional): only features with given flag are listed.
+                Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid cursor is given
+
+        Returns:
+            Page: page of features with their totals
+        '''
+
+        limit = limit or configs.page_size
+        condition, order, values = _KEYSET.clause(after, before)
+
+        if flag:
+            condition = f'{condition} AND {flag_condition("F")}'
+            values['flag'] = flag
+
+        sql = f'''
+            WITH page AS (
+                SELECT *
+                FROM Features F
+                WHERE {condition}
+                ORDER BY {order}
+                LIMIT :limit
+            ), page_tasks AS (
+                SELECT id, feature_id
+                FROM Tasks
+                WHERE feature_id IN (SELECT id FROM page)
+            ), task_counts AS (
+                SELECT feature_id, COUNT(*) AS tasks
+                FROM page_tasks
+                GROUP BY feature_id
+            ), comment_totals AS (
+                SELECT feature_id, SUM(comments) AS comments, SUM(time_spent) AS time_spent
+                FROM (
+                    SELECT R.id AS feature_id, R.comments, R.time_spent
+                    FROM TimeSpentRollups R
+                    WHERE R.scope = 'feature' AND R.id IN (SELECT id FROM page)
+                    UNION ALL
+                    SELECT PT.feature_id, R.comments, R.time_spent
+                    FROM TimeSpentRollups R
+                    JOIN page_tasks PT ON R.scope = 'task' AND R.id = PT.id
+                ) AS page_rollups
+                GROUP BY feature_id
+            )
+            SELECT F.id, F.project_id, P.name, F.feature_owner, U.firstname, U.lastname, F.name, F.description, F.status, S.name, F.type, T.name, F.priority, F.created, F.updated_on, F.flags, COALESCE(TC.tasks, 0), COALESCE(CT.comments, 0), COALESCE(CT.time_spent, 0)
+            FROM page F
             JOIN Projects P ON F.project_id = P.id
             JOIN Users U ON F.feature_owner = U.id
             JOIN Types T ON T.id = F.type
             JOIN Statuses S ON S.id = F.status
+            LEFT JOIN task_counts TC ON TC.feature_id = F.id
+            LEFT JOIN comment_totals CT ON CT.feature_id = F.id
+            ORDER BY {order}
         '''
 
         try:
-            features = db.session.execute(sql).fetchall()
+            features = db.session.execute(statement(sql, limit=Integer), {
+                **values, 'limit': limit + 1
+            }).fetchall()
         except Exception as error:
-            raise DatabaseException('While getting all features') from error
+            raise DatabaseException(
+                'While getting summaries of all features') from error
 
-        return [(feature[0], feature[1], feature[2], feature[3], feature[4],
-                 feature[5], feature[6], feature[7], feature[8], feature[9],
-                 feature[10], feature[11], feature[12], feature[13],
-                 feature[14], feature[15]) for feature in features]
+        return _KEYSET.page([(feature[0], feature[1], feature[2], feature[3],
+                              feature[4], feature[5], feature[6], feature[7],
+                              feature[8], feature[9], feature[10], feature[11],
+                              feature[12], feature[13], feature[14],
+                              feature[15], feature[16], feature[17],
+                              feature[18]) for feature in features], limit,
+                            lambda feature: (feature[13], feature[0]), after,
+                            before)
 
     def get_features(self) -> [tuple]:
         '''get_features is used to get all features for
@@ -107,17 +302,42 @@ class FeatureRepository:
             [tuple]: list of feature id and name
         '''
 
-        sql = '''
-            SELECT id, name
-            FROM Features
+        try:
+            features = db.session.execute(_GET_FEATURES).fetchall()
+        except Exception as error:
+            raise DatabaseException('While getting all features') from error
+
+        return features
+
+    def get_features_by_name(self, name: str, limit: int = None) -> [tuple]:
+        '''get_features_by_name is used to get features containing
+           given text in their name for selecting features
+           in the frontend, names starting with it first
+
+        If no features found, returns empty list.
+
+        Args:
+            name (str): text to be found from the name
+            limit (int, optional): maximum amount of features.
+                Defaults to autocomplete_limit of config.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: list of feature id and name
         '''
 
+        values = {**like_patterns(name),
+                  'limit': limit or configs.autocomplete_limit}
         try:
-            features = db.session.execute(sql).fetchall()
+            features = db.session.execute(_GET_FEATURES_BY_NAME,
+                                          values).fetchall()
         except Exception as error:
-            raise DatabaseException('While getting all features') from error
+            raise DatabaseException('While getting features') from error
 
-        return [(feature[0], feature[1]) for feature in features]
+        return features
 
     def get_all_by_project_id(self, pid: str) -> [tuple]:
         '''get_all_by_project_id is used to get all features
@@ -136,26 +356,45 @@ class FeatureRepository:
             [tuple]: list of found features
         '''
 
-        sql = '''
-            SELECT F.id, F.project_id, P.name, F.feature_owner, U.firstname, U.lastname, F.name, F.description, F.status, S.name, F.type, T.name, F.priority, F.created, F.updated_on, F.flags  
-            FROM Features F
-            JOIN Projects P ON F.project_id = P.id
-            JOIN Users U ON F.feature_owner = U.id
-            JOIN Types T ON T.id = F.type
-            JOIN Statuses S ON S.id = F.status
-            WHERE P.id=:id
+        try:
+            features = db.session.execute(_GET_ALL_BY_PROJECT_ID, {
+                'id': pid
+            }).fetchall()
+        except Exception as error:
+            raise DatabaseException(
+                'While getting features by Project ID') from error
+
+        return features
+
+    def get_all_by_project_ids(self, pids: [str]) -> [tuple]:
+        '''get_all_by_project_ids is used to get all features
+           associated with any of given projects in one query
+
+        If no features found, returns empty list.
+
+        Args:
+            pids ([str]): ids of the projects in which features are associated
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: list of found features
         '''
 
+        if not pids:
+            return []
+
         try:
-            features = db.session.execute(sql, {'id': pid}).fetchall()
+            features = db.session.execute(_GET_ALL_BY_PROJECT_IDS, {
+                'ids': [str(pid) for pid in pids]
+            }).fetchall()
         except Exception as error:
             raise DatabaseException(
-                'While getting features by Project ID') from error
+                'While getting features by Project IDs') from error
 
-        return [(feature[0], feature[1], feature[2], feature[3], feature[4],
-                 feature[5], feature[6], feature[7], feature[8], feature[9],
-                 feature[10], feature[11], feature[12], feature[13],
-                 feature[14], feature[15]) for feature in features]
+        return features
 
     def get_all_by_feature_owner(self, foid: str) -> [tuple]:
         '''get_all_by_feature_owner is used get all features
@@ -174,27 +413,17 @@ class FeatureRepository:
             [tuple]: list of found features
         '''
 
-        sql = '''
-            SELECT F.id, F.project_id, P.name, F.feature_owner, U.firstname, U.lastname, F.name, F.description, F.status, S.name, F.type, T.name, F.priority, F.created, F.updated_on, F.flags  
-            FROM Features F
-            JOIN Projects P ON F.project_id = P.id
-            JOIN Users U ON F.feature_owner = U.id
-            JOIN Types T ON T.id = F.type
-            JOIN Statuses S ON S.id = F.status
-            WHERE F.feature_owner=:id
-        '''
-
         try:
-            features = db.session.execute(sql, {'id': foid}).fetchall()
+            features = db.session.execute(_GET_ALL_BY_FEATURE_OWNER, {
+                'id': foid
+            }).fetchall()
         except Exception as error:
             raise DatabaseException(
                 'While getting features by Feature Owner') from error
 
-        return [(feature[0], feature[1], feature[2], feature[3], feature[4],
-                 feature[5], feature[6], feature[7], feature[8], feature[9],
-                 feature[10], feature[11], feature[12], feature[13],
-                 feature[14], feature[15]) for feature in features]
+        return features
 
+    @identity_mapped
     def get_by_id(self, fid: str) -> tuple:
         '''get_by_id is used to found feature with given id
 
@@ -210,29 +439,17 @@ class FeatureRepository:
             tuple: found feature
         '''
 
-        sql = '''
-            SELECT F.id, F.project_id, P.name, F.feature_owner, U.firstname, U.lastname, F.name, F.description, F.status, S.name, F.type, T.name, F.priority, F.created, F.updated_on, F.flags  
-            FROM Features F
-            JOIN Projects P ON F.project_id = P.id
-            JOIN Users U ON F.feature_owner = U.id
-            JOIN Types T ON T.id = F.type
-            JOIN Statuses S ON S.id = F.status
-            WHERE F.id=:id
-        '''
-
         try:
-            feature = db.session.execute(sql, {'id': fid}).fetchone()
+            feature = db.session.execute(_GET_BY_ID, {'id': fid}).fetchone()
         except Exception as error:
             raise DatabaseException('While getting the feature') from error
 
         if not feature:
             raise NotExistingException('Feature')
 
-        return (feature[0], feature[1], feature[2], feature[3], feature[4],
-                feature[5], feature[6], feature[7], feature[8], feature[9],
-                feature[10], feature[11], feature[12], feature[13], feature[14],
-                feature[15])
+        return feature
 
+    @identity_mapped
     def get_name(self, fid: str) -> str:
         '''get_name is used to get name of feature with given id
 
@@ -249,14 +466,8 @@ class FeatureRepository:
             str: found name
         '''
 
-        sql = '''
-            SELECT name
-            FROM Features
-            WHERE id=:id
-        '''
-
         try:
-            name = db.session.execute(sql, {'id': fid}).fetchone()
+            name = db.session.execute(_GET_NAME, {'id': fid}).fetchone()
         except Exception as error:
             raise DatabaseException('While getting feature´s name') from error
 
@@ -265,6 +476,7 @@ class FeatureRepository:
 
         return name[0]
 
+    @invalidates_identity_map
     def update(self, fid: str, pid: str, foid: str, name: str, description: str,
                flags: str, status: str, ftype: str, priority: int) -> tuple:
         '''update is used to update feature with given values into the database
@@ -287,9 +499,11 @@ class FeatureRepository:
         Raises:
             DatabaseException: raised if problems occurs while
                 saving into the database
+            NotExistingException: raised if feature, project, feature
+                owner, status or type is not found with given id
 
         Returns:
-            tuple: updated feature´s id, creation and updated on time
+            tuple: updated feature, in same format as get_by_id returns
         '''
 
         values = {
@@ -304,25 +518,19 @@ class FeatureRepository:
             'priority': priority
         }
 
-        sql = '''
-            UPDATE Features
-            SET project_id=:project_id, feature_owner=:feature_owner, name=:name, description=:description, flags=:flags, status=:status, type=:type, priority=:priority
-            WHERE id=:id
-            RETURNING id, created, updated_on
-        '''
-
         try:
-            feature_id, created, updated_on = db.session.execute(
-                sql, values).fetchone()
-            db.session.commit()
+            feature = db.session.execute(_UPDATE, values).fetchone()
+            unit_of_work.commit()
         except Exception as error:
+            raise_for_foreign_key(error, _REFERENCES)
             raise DatabaseException('While saving updated feature') from error
 
-        if str(fid) != str(feature_id):
-            raise DatabaseException('While saving updated feature')
+        if not feature:
+            raise NotExistingException('Feature')
 
-        return (feature_id, created, updated_on)
+        return feature
 
+    @invalidates_identity_map
     def remove(self, fid: str) -> None:
         '''remove is used to remove feature from the database
 
@@ -334,14 +542,9 @@ class FeatureRepository:
                 while interacting with the database
         '''
 
-        sql = '''
-            DELETE FROM Features 
-            WHERE id=:id
-        '''
-
         try:
-            db.session.execute(sql, {'id': fid})
-            db.session.commit()
+            db.session.execute(_REMOVE, {'id': fid})
+            unit_of_work.commit()
         except Exception as error:
             raise DatabaseException('While removing the feature') from error
 
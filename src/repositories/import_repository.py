@@ -0,0 +1,209 @@
+from io import StringIO
+
+from utils.database import db, raise_for_foreign_key, statement
+from utils.exceptions import DatabaseException
+from utils import unit_of_work
+
+_REFERENCES = {
+    'tasks_feature_id_fkey': 'task´s feature',
+    'tasks_assignee_fkey': 'task´s assignee',
+    'comments_feature_id_fkey': 'comment´s related feature',
+    'comments_task_id_fkey': 'comment´s related task',
+    'comments_assignee_fkey': 'comment´s assignee',
+}
+
+
+def _ids_by_key(rows: list, key_length: int) -> dict:
+    '''_ids_by_key is used to group ids of found rows by their names
+
+    Args:
+        rows (list): rows with names first and id last
+        key_length (int): amount of names in a row
+
+    Returns:
+        dict: lists of ids keyed by names, a tuple of names
+            if there are many of them
+    '''
+    ids = {}
+    for row in rows:
+        key = row[0] if key_length == 1 else tuple(row[:key_length])
+        ids.setdefault(key, []).append(row[key_length])
+    return ids
+
+
+def _csv_value(value) -> str:
+    '''_csv_value is used to write value of a column for COPY
+
+    Values are always quoted and NULLs are left unquoted and empty,
+    which COPY keeps apart, so that no text is read as NULL.
+    '''
+    if value is None:
+        return ''
+    return '"' + str(value).replace('"', '""') + '"'
+
+
+_GET_USER_IDS = statement('''
+    SELECT username, id
+    FROM Users
+    WHERE username = ANY(:usernames)
+''')
+
+_GET_FEATURE_IDS = statement('''
+    SELECT P.name, F.name, F.id
+    FROM Features F
+    JOIN Projects P ON P.id = F.project_id
+    WHERE (P.name, F.name) IN (
+        SELECT * FROM unnest(CAST(:projects AS TEXT[]), CAST(:features AS TEXT[]))
+    )
+''')
+
+_GET_TASK_IDS = statement('''
+    SELECT P.name, F.name, T.name, T.id
+    FROM Tasks T
+    JOIN Features F ON F.id = T.feature_id
+    JOIN Projects P ON P.id = F.project_id
+    WHERE (P.name, F.name, T.name) IN (
+        SELECT * FROM unnest(CAST(:projects AS TEXT[]), CAST(:features AS TEXT[]), CAST(:tasks AS TEXT[]))
+    )
+''')
+
+
+class ImportRepository:
+    '''Class used for bulk imports into the database
+
+    Imported rows are written in one transaction, which is
+    committed or rolled back by calling commit or rollback.
+    '''
+
+    def get_user_ids(self, usernames: [str]) -> dict:
+        '''get_user_ids is used to find ids of users by usernames
+
+        Args:
+            usernames ([str]): usernames of the users
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            dict: lists of ids keyed by username
+        '''
+
+        try:
+            users = db.session.execute(_GET_USER_IDS, {
+                'usernames': list(usernames)
+            }).fetchall()
+        except Exception as error:
+            raise DatabaseException('While finding imported users') from error
+
+        return _ids_by_key(users, 1)
+
+    def get_feature_ids(self, names: [tuple]) -> dict:
+        '''get_feature_ids is used to find ids of features by
+           names of the features and their projects
+
+        Args:
+            names ([tuple]): project´s and feature´s names
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            dict: lists of ids keyed by tuple of project´s
+                and feature´s name
+        '''
+
+        try:
+            features = db.session.execute(
+                _GET_FEATURE_IDS, {
+                    'projects': [name[0] for name in names],
+                    'features': [name[1] for name in names]
+                }).fetchall()
+        except Exception as error:
+            raise DatabaseException(
+                'While finding imported features') from error
+
+        return _ids_by_key(features, 2)
+
+    def get_task_ids(self, names: [tuple]) -> dict:
+        '''get_task_ids is used to find ids of tasks by names
+           of the tasks and their features and projects
+
+        Args:
+            names ([tuple]): project´s, feature´s and task´s names
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            dict: lists of ids keyed by tuple of project´s,
+                feature´s and task´s name
+        '''
+
+        try:
+            tasks = db.session.execute(
+                _GET_TASK_IDS, {
+                    'projects': [name[0] for name in names],
+                    'features': [name[1] for name in names],
+                    'tasks': [name[2] for name in names]
+                }).fetchall()
+        except Exception as error:
+            raise DatabaseException('While finding imported tasks') from error
+
+        return _ids_by_key(tasks, 3)
+
+    def copy(self, table: str, columns: tuple, rows: [tuple]) -> None:
+        '''copy is used to load rows into table with COPY,
+           without committing the transaction
+
+        Args:
+            table (str): name of the table, Tasks or Comments
+            columns (tuple): names of the columns
+            rows ([tuple]): values of the rows, in order of the columns
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            NotExistingException: raised if referenced feature, task
+                or user has been removed during the import
+        '''
+
+        if not rows:
+            return
+
+        data = StringIO(''.join(
+            ','.join(_csv_value(value) for value in row) + '\n'
+            for row in rows))
+
+        sql = (f'COPY {table} ({", ".join(columns)}) '
+               'FROM STDIN WITH (FORMAT csv)')
+
+        try:
+            connection = db.session.connection().connection
+            with connection.cursor() as cursor:
+                cursor.copy_expert(sql, data)
+        except Exception as error:
+            raise_for_foreign_key(error, _REFERENCES)
+            raise DatabaseException(f'While importing {table}') from error
+
+    def commit(self) -> None:
+        '''commit is used to commit imported rows, at the end of
+           the request if importing within a request
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+        '''
+
+        unit_of_work.commit()
+
+    def rollback(self) -> None:
+        '''rollback is used to discard imported rows
+        '''
+
+        unit_of_work.rollback()
+
+
+import_repository = ImportRepository()
@@ -1,11 +1,90 @@
-from utils.database import db
+from sqlalchemy import Integer
+from utils.database import db, flag_condition, like_patterns, raise_for_foreign_key, statement
+from utils.identity_map import identity_mapped, invalidates_identity_map
 from utils.exceptions import DatabaseException, NotExistingException
+from utils.pagination import Keyset, Page
+import utils.config as configs
+from utils import unit_of_work
+
+_REFERENCES = {'projects_project_owner_fkey': 'Project Owner'}
+
+_KEYSET = Keyset(('P.created', 'timestamp'), ('P.id', 'uuid'))
+
+
+_NEW = statement('''
+    WITH Inserted AS (
+        INSERT INTO Projects
+        (project_owner, name, description, flags)
+        VALUES (:project_owner, :name, :description, :flags)
+        RETURNING *
+    )
+    SELECT P.id, P.project_owner, U.firstname, U.lastname, P.name, P.description, P.created, P.updated_on, P.flags
+    FROM Inserted P
+    JOIN Users U ON P.project_owner = U.id
+''')
+
+_GET_ALL = statement('''
+    SELECT P.id, P.project_owner, U.firstname, U.lastname, P.name, P.description, P.created, P.updated_on, P.flags 
+    FROM Projects P 
+    JOIN Users U ON P.project_owner = U.id
+''')
+
+_GET_PROJECTS = statement('''
+    SELECT id, name
+    FROM Projects
+''')
+
+_GET_PROJECTS_BY_NAME = statement('''
+    SELECT id, name
+    FROM Projects
+    WHERE name ILIKE :contains
+    ORDER BY name ILIKE :prefix DESC, name, id
+    LIMIT :limit
+''', limit=Integer)
+
+_GET_ALL_BY_PROJECT_OWNER = statement('''
+    SELECT P.id, P.project_owner, U.firstname, U.lastname, P.name, P.description, P.created, P.updated_on, P.flags 
+    FROM Projects P 
+    JOIN Users U ON P.project_owner = U.id
+    WHERE P.project_owner=:id
+''')
+
+_GET_BY_ID = statement('''
+    SELECT P.id, P.project_owner, U.firstname, U.lastname, P.name, P.description, P.created, P.updated_on, P.flags
+    FROM Projects P 
+    JOIN Users U ON P.project_owner = U.id 
+    WHERE P.id=:id
+''')
+
+_GET_NAME = statement('''
+    SELECT name 
+    FROM Projects 
+    WHERE id=:id
+''')
+
+_UPDATE = statement('''
+    WITH Updated AS (
+        UPDATE Projects 
+        SET project_owner=:project_owner, name=:name, description=:description, flags=:flags 
+        WHERE id=:id 
+        RETURNING *
+    )
+    SELECT P.id, P.project_owner, U.firstname, U.lastname, P.name, P.description, P.created, P.updated_on, P.flags
+    FROM Updated P
+    JOIN Users U ON P.project_owner = U.id
+''')
+
+_REMOVE = statement('''
+    DELETE FROM Projects 
+    WHERE id=:id
+''')
 
 
 class ProjectRepository:
     '''Class used for handling projects in the database
     '''
 
+    @invalidates_identity_map
     def new(self, poid: str, name: str, descrption: str, flags: str) -> tuple:
         '''new is used to create new projects into the database
 
@@ -19,9 +98,11 @@ class ProjectRepository:
         Raises:
             DatabaseException: raised if problems occurs while
                 saving into the database
+            NotExistingException: raised if project owner
+                is not found with given id
 
         Returns:
-            tuple: created project´s id, creation and updated_on time
+            tuple: created project, in same format as get_by_id returns
         '''
 
         values = {
@@ -31,25 +112,18 @@ class ProjectRepository:
             'flags': flags
         }
 
-        sql = '''
-            INSERT INTO Projects
-            (project_owner, name, description, flags)
-            VALUES (:project_owner, :name, :description, :flags)
-            RETURNING id, created, updated_on
-        '''
-
         try:
-            project_id, created, updated_on = db.session.execute(
-                sql, values).fetchone()
-            db.session.commit()
+            project = db.session.execute(_NEW, values).fetchone()
+            unit_of_work.commit()
         except Exception as error:
+            raise_for_foreign_key(error, _REFERENCES)
             raise DatabaseException(
                 'While saving new project into database') from error
 
-        if not project_id:
+        if not project:
             raise DatabaseException('While saving new project into database')
 
-        return (project_id, created, updated_on)
+        return project
 
     def get_all(self) -> [tuple]:
         '''get_all is used to get list of all projects in the database
@@ -64,20 +138,97 @@ class ProjectRepository:
             [tuple]: list of all projects
         '''
 
-        sql = '''
-            SELECT P.id, P.project_owner, U.firstname, U.lastname, P.name, P.description, P.created, P.updated_on, P.flags 
-            FROM Projects P 
+        try:
+            projects = db.session.execute(_GET_ALL).fetchall()
+        except Exception as error:
+            raise DatabaseException('While getting all projects') from error
+
+        return projects
+
+    def get_all_summaries(self,
+                          after: str = None,
+                          before: str = None,
+                          limit: int = None,
+                          flag: str = None) -> Page:
+        '''get_all_summaries is used to get one page of projects, newest
+           first, with amount of features and tasks and total time spent,
+           calculated in the database with one query
+
+        If no projects found, returns empty page.
+
+        Args:
+            after (str, optional): cursor of the project after which
+                the page starts. Defaults to None.
+            before (str, optional): cursor of the project before which
+                the page ends. Defaults to None.
+            limit (int, optional): size of the page.
+                Defaults to page_size of config.
+            flag (str, optional): only projects with given flag are listed.
+                Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid cursor is given
+
+        Returns:
+            Page: page of projects with their totals
+        '''
+
+        limit = limit or configs.page_size
+        condition, order, values = _KEYSET.clause(after, before)
+
+        if flag:
+            condition = f'{condition} AND {flag_condition("P")}'
+            values['flag'] = flag
+
+        sql = f'''
+            WITH page AS (
+                SELECT *
+                FROM Projects P
+                WHERE {condition}
+                ORDER BY {order}
+                LIMIT :limit
+            ), page_features AS (
+                SELECT id, project_id
+                FROM Features
+                WHERE project_id IN (SELECT id FROM page)
+            ), page_tasks AS (
+                SELECT T.id, PF.project_id
+                FROM Tasks T
+                JOIN page_features PF ON PF.id = T.feature_id
+            ), feature_counts AS (
+                SELECT project_id, COUNT(*) AS features
+                FROM page_features
+                GROUP BY project_id
+            ), task_counts AS (
+                SELECT project_id, COUNT(*) AS tasks
+                FROM page_tasks
+                GROUP BY project_id
+            )
+            SELECT P.id, P.project_owner, U.firstname, U.lastname, P.name, P.description, P.created, P.updated_on, P.flags, COALESCE(FC.features, 0), COALESCE(TC.tasks, 0), COALESCE(R.time_spent, 0)
+            FROM page P
             JOIN Users U ON P.project_owner = U.id
+            LEFT JOIN feature_counts FC ON FC.project_id = P.id
+            LEFT JOIN task_counts TC ON TC.project_id = P.id
+            LEFT JOIN TimeSpentRollups R ON R.scope = 'project' AND R.id = P.id
+            ORDER BY {order}
         '''
 
         try:
-            projects = db.session.execute(sql).fetchall()
+            projects = db.session.execute(statement(sql, limit=Integer), {
+                **values, 'limit': limit + 1
+            }).fetchall()
         except Exception as error:
-            raise DatabaseException('While getting all projects') from error
+            raise DatabaseException(
+                'While getting summaries of all projects') from error
 
-        return [(project[0], project[1], project[2], project[3], project[4],
-                 project[5], project[6], project[7], project[8])
-                for project in projects]
+        return _KEYSET.page([(project[0], project[1], project[2], project[3],
+                              project[4], project[5], project[6], project[7],
+                              project[8], project[9], project[10], project[11])
+                             for project in projects], limit,
+                            lambda project: (project[6], project[0]), after,
+                            before)
 
     def get_projects(self) -> [tuple]:
         '''get_projects is used to get all projects for
@@ -93,17 +244,42 @@ class ProjectRepository:
             [tuple]: list of project id and name
         '''
 
-        sql = '''
-            SELECT id, name
-            FROM Projects
+        try:
+            projects = db.session.execute(_GET_PROJECTS).fetchall()
+        except Exception as error:
+            raise DatabaseException('While getting all projects') from error
+
+        return projects
+
+    def get_projects_by_name(self, name: str, limit: int = None) -> [tuple]:
+        '''get_projects_by_name is used to get projects containing
+           given text in their name for selecting projects
+           in the frontend, names starting with it first
+
+        If no projects found, returns empty list.
+
+        Args:
+            name (str): text to be found from the name
+            limit (int, optional): maximum amount of projects.
+                Defaults to autocomplete_limit of config.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: list of project id and name
         '''
 
+        values = {**like_patterns(name),
+                  'limit': limit or configs.autocomplete_limit}
         try:
-            projects = db.session.execute(sql).fetchall()
+            projects = db.session.execute(_GET_PROJECTS_BY_NAME,
+                                          values).fetchall()
         except Exception as error:
-            raise DatabaseException('While getting all projects') from error
+            raise DatabaseException('While getting projects') from error
 
-        return [(project[0], project[1]) for project in projects]
+        return projects
 
     def get_all_by_project_owner(self, poid: str) -> [tuple]:
         '''get_all_by_project_owner is used get all projects
@@ -122,23 +298,17 @@ class ProjectRepository:
             [tuple]: list of found projects
         '''
 
-        sql = '''
-            SELECT P.id, P.project_owner, U.firstname, U.lastname, P.name, P.description, P.created, P.updated_on, P.flags 
-            FROM Projects P 
-            JOIN Users U ON P.project_owner = U.id
-            WHERE P.project_owner=:id
-        '''
-
         try:
-            projects = db.session.execute(sql, {'id': poid}).fetchall()
+            projects = db.session.execute(_GET_ALL_BY_PROJECT_OWNER, {
+                'id': poid
+            }).fetchall()
         except Exception as error:
             raise DatabaseException(
                 'While getting all projects by Project Owner') from error
 
-        return [(project[0], project[1], project[2], project[3], project[4],
-                 project[5], project[6], project[7], project[8])
-                for project in projects]
+        return projects
 
+    @identity_mapped
     def get_by_id(self, pid: str) -> tuple:
         '''get_by_id is used to find exact project with given id
 
@@ -154,24 +324,17 @@ class ProjectRepository:
             tuple: found project
         '''
 
-        sql = '''
-            SELECT P.id, P.project_owner, U.firstname, U.lastname, P.name, P.description, P.created, P.updated_on, P.flags
-            FROM Projects P 
-            JOIN Users U ON P.project_owner = U.id 
-            WHERE P.id=:id
-        '''
-
         try:
-            project = db.session.execute(sql, {'id': pid}).fetchone()
+            project = db.session.execute(_GET_BY_ID, {'id': pid}).fetchone()
         except Exception as error:
             raise DatabaseException('While getting the project') from error
 
         if not project:
             raise NotExistingException('Project')
 
-        return (project[0], project[1], project[2], project[3], project[4],
-                project[5], project[6], project[7], project[8])
+        return project
 
+    @identity_mapped
     def get_name(self, pid: str) -> str:
         '''get_name is used to get name of project with given id
 
@@ -188,14 +351,8 @@ class ProjectRepository:
             str: found name
         '''
 
-        sql = '''
-            SELECT name 
-            FROM Projects 
-            WHERE id=:id
-        '''
-
         try:
-            name = db.session.execute(sql, {'id': pid}).fetchone()
+            name = db.session.execute(_GET_NAME, {'id': pid}).fetchone()
         except Exception as error:
             raise DatabaseException('While getting feature´s name') from error
 
@@ -204,6 +361,7 @@ class ProjectRepository:
 
         return name[0]
 
+    @invalidates_identity_map
     def update(self, pid: str, poid: str, name: str, descrption: str,
                flags: str) -> tuple:
         '''update is used to update project with given values into the database
@@ -219,9 +377,11 @@ class ProjectRepository:
         Raises:
             DatabaseException: raised if problems occurs while
                 saving into the database
+            NotExistingException: raised if project or project
+                owner is not found with given id
 
         Returns:
-            tuple: updated project´s id, creation and updated on time
+            tuple: updated project, in same format as get_by_id returns
         '''
 
         values = {
@@ -232,25 +392,19 @@ class ProjectRepository:
             'flags': flags
         }
 
-        sql = '''
-            UPDATE Projects 
-            SET project_owner=:project_owner, name=:name, description=:description, flags=:flags 
-            WHERE id=:id 
-            RETURNING id, created, updated_on
-        '''
-
         try:
-            project_id, created, updated_on = db.session.execute(
-                sql, values).fetchone()
-            db.session.commit()
+            project = db.session.execute(_UPDATE, values).fetchone()
+            unit_of_work.commit()
         except Exception as error:
+            raise_for_foreign_key(error, _REFERENCES)
             raise DatabaseException('While saving updated project') from error
 
-        if str(pid) != str(project_id):
-            raise DatabaseException('While saving updated project')
+        if not project:
+            raise NotExistingException('Project')
 
-        return (project_id, created, updated_on)
+        return project
 
+    @invalidates_identity_map
     def remove(self, pid: str):
         '''remove is used to remove project from database
 
@@ -262,14 +416,9 @@ class ProjectRepository:
                 while interacting with the database
         '''
 
-        sql = '''
-            DELETE FROM Projects 
-            WHERE id=:id
-        '''
-
         try:
-            db.session.execute(sql, {'id': pid})
-            db.session.commit()
+            db.session.execute(_REMOVE, {'id': pid})
+            unit_of_work.commit()
         except Exception as error:
             raise DatabaseException('While removing the project') from error
 
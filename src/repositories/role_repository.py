@@ -1,15 +1,29 @@
-from utils.database import db
+from utils.database import db, statement
 from utils.exceptions import DatabaseException, NotExistingException
+from utils.lookup_cache import LookupCache
+
+
+_LOAD_ALL = statement('''
+    SELECT id, name, description
+    FROM Roles
+''')
 
 
 class RoleRepository:
     '''Class for handling Roles in the database
+
+    Roles are read through process-wide LookupCache, so the
+    table is queried only when it has been changed.
     '''
 
-    def get_all(self) -> [tuple]:
-        '''get_all is used to list of all roles
+    def __init__(self):
+        '''Initializes RoleRepository
+        '''
 
-        If no roles found, returns empty list.
+        self._cache = LookupCache('roles', self._load_all)
+
+    def _load_all(self) -> [tuple]:
+        '''_load_all is used to read all roles from the database
 
         Raises:
             DatabaseException: raised if problems occur
@@ -19,23 +33,33 @@ class RoleRepository:
             [tuple]: list of all roles
         '''
 
-        sql = '''
-            SELECT id, name, description 
-            FROM Roles
-        '''
-
         try:
-            roles = db.session.execute(sql).fetchall()
+            roles = db.session.execute(_LOAD_ALL).fetchall()
         except Exception as error:
             raise DatabaseException('While getting all roles') from error
 
-        return [(role[0], role[1], role[2]) for role in roles]
+        return roles
+
+    def get_all(self) -> [tuple]:
+        '''get_all is used to list of all roles
+
+        If no roles found, returns empty list.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: list of all roles
+        '''
+
+        return self._cache.get_all()
 
     def get_by_id(self, rid: int) -> tuple:
         '''get_by_id is used to found role with given id
 
         Args:
-            rid (str): id of the role to be found
+            rid (int): id of the role to be found
 
         Raises:
             DatabaseException: raised if problems while
@@ -47,20 +71,12 @@ class RoleRepository:
             tuple: role with given id
         '''
 
-        sql = '''
-            SELECT id, name, description 
-            FROM Roles
-        '''
-
-        try:
-            role = db.session.execute(sql, {'id': rid}).fetchone()
-        except Exception as error:
-            raise DatabaseException('While getting the role') from error
+        role = self._cache.get(rid)
 
         if not role:
             raise NotExistingException('Role')
 
-        return (role[0], role[1], role[2])
+        return role
 
     def get_name(self, rid: int) -> str:
         '''get_name is used to get name of role with given id
@@ -78,21 +94,14 @@ class RoleRepository:
             str: found name
         '''
 
-        sql = '''
-            SELECT name 
-            FROM Roles 
-            WHERE id=:id
-        '''
-
-        try:
-            name = db.session.execute(sql, {'id': rid}).fetchone()
-        except Exception as error:
-            raise DatabaseException('While getting role´s name') from error
+        return self.get_by_id(rid)[1]
 
-        if not name:
-            raise NotExistingException('Role')
+    def invalidate(self):
+        '''invalidate is used to drop cached roles, so that
+           they are read again from the database on next use
+        '''
 
-        return name[0]
+        self._cache.invalidate()
 
 
 role_repository = RoleRepository()
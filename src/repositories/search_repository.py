@@ -0,0 +1,139 @@
+from sqlalchemy import Integer
+from utils.database import db, statement
+from utils.exceptions import DatabaseException
+from utils.pagination import Keyset, Page
+import utils.config as configs
+
+_KEYSET = Keyset(('M.rank', 'real'), ('M.kind', 'text'), ('M.id', 'uuid'))
+
+# marks around matching words in snippets, escaped only after highlighting
+HIGHLIGHT_START = '\ue000'
+HIGHLIGHT_STOP = '\ue001'
+
+_NAME_OPTIONS = (f'HighlightAll=true, StartSel={HIGHLIGHT_START}, '
+                 f'StopSel={HIGHLIGHT_STOP}')
+_SNIPPET_OPTIONS = (f'MaxFragments=2, MaxWords=30, MinWords=10, '
+                    f'StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}')
+
+
+class SearchRepository:
+    '''Class used for full-text search of projects, features, tasks
+       and comments in the database
+    '''
+
+    def search(self,
+               query: str,
+               after: str = None,
+               before: str = None,
+               limit: int = None) -> Page:
+        '''search is used to get one page of projects, features, tasks
+           and comments matching given query, best matches first
+
+        Matches are found from search columns with GIN indexes and
+        ranked with ts_rank. Only the newest search_max_matches of
+        config matches per table are ranked, so that words found from
+        most of the rows do not rank the whole table. Only rows of the
+        page are joined to their names and highlighted with ts_headline.
+
+        Args:
+            query (str): words to search, in web search syntax,
+                for example: login "error message" -android
+            after (str, optional): cursor of the result after which
+                the page starts. Defaults to None.
+            before (str, optional): cursor of the result before which
+                the page ends. Defaults to None.
+            limit (int, optional): size of the page.
+                Defaults to page_size of config.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid cursor is given
+
+        Returns:
+            Page: page of tuples with kind, id, highlighted name,
+                highlighted snippet, kind and id of the page showing
+                the result, and rank
+        '''
+
+        limit = limit or configs.page_size
+        condition, order, values = _KEYSET.clause(after, before)
+
+        sql = f'''
+            WITH matches AS (
+                SELECT 'projects' AS kind, P.id, ts_rank(P.search,
+                    websearch_to_tsquery('simple', :query)) AS rank
+                FROM (
+                    SELECT id, search FROM Projects
+                    WHERE search @@ websearch_to_tsquery('simple', :query)
+                    ORDER BY created DESC, id DESC
+                    LIMIT :max_matches
+                ) P
+                UNION ALL
+                SELECT 'features' AS kind, F.id, ts_rank(F.search,
+                    websearch_to_tsquery('simple', :query)) AS rank
+                FROM (
+                    SELECT id, search FROM Features
+                    WHERE search @@ websearch_to_tsquery('simple', :query)
+                    ORDER BY created DESC, id DESC
+                    LIMIT :max_matches
+                ) F
+                UNION ALL
+                SELECT 'tasks' AS kind, T.id, ts_rank(T.search,
+                    websearch_to_tsquery('simple', :query)) AS rank
+                FROM (
+                    SELECT id, search FROM Tasks
+                    WHERE search @@ websearch_to_tsquery('simple', :query)
+                    ORDER BY created DESC, id DESC
+                    LIMIT :max_matches
+                ) T
+                UNION ALL
+                SELECT 'comments' AS kind, C.id, ts_rank(C.search,
+                    websearch_to_tsquery('simple', :query)) AS rank
+                FROM (
+                    SELECT id, search FROM Comments
+                    WHERE search @@ websearch_to_tsquery('simple', :query)
+                    ORDER BY created DESC, id DESC
+                    LIMIT :max_matches
+                ) C
+            ), page AS (
+                SELECT *
+                FROM matches M
+                WHERE {condition}
+                ORDER BY {order}
+                LIMIT :limit
+            )
+            SELECT M.kind, M.id,
+                ts_headline('simple', COALESCE(P.name, F.name, T.name, CF.name, CT.name), websearch_to_tsquery('simple', :query), :name_options),
+                ts_headline('simple', COALESCE(P.description, F.description, T.description, C.comment, ''), websearch_to_tsquery('simple', :query), :snippet_options),
+                CASE WHEN M.kind <> 'comments' THEN M.kind WHEN C.feature_id IS NOT NULL THEN 'features' ELSE 'tasks' END,
+                COALESCE(C.feature_id, C.task_id, M.id),
+                M.rank
+            FROM page M
+            LEFT JOIN Projects P ON M.kind = 'projects' AND P.id = M.id
+            LEFT JOIN Features F ON M.kind = 'features' AND F.id = M.id
+            LEFT JOIN Tasks T ON M.kind = 'tasks' AND T.id = M.id
+            LEFT JOIN Comments C ON M.kind = 'comments' AND C.id = M.id
+            LEFT JOIN Features CF ON CF.id = C.feature_id
+            LEFT JOIN Tasks CT ON CT.id = C.task_id
+            ORDER BY {order}
+        '''
+
+        try:
+            results = db.session.execute(statement(sql, limit=Integer,
+                                                   max_matches=Integer), {
+                **values, 'query': query,
+                'name_options': _NAME_OPTIONS,
+                'snippet_options': _SNIPPET_OPTIONS,
+                'max_matches': configs.search_max_matches,
+                'limit': limit + 1
+            }).fetchall()
+        except Exception as error:
+            raise DatabaseException('While searching') from error
+
+        return _KEYSET.page(results, limit,
+                            lambda result: (result[6], result[0], result[1]),
+                            after, before)
+
+
+search_repository = SearchRepository()
@@ -1,5 +1,135 @@
-from utils.database import db
-from utils.exceptions import DatabaseException, NotExistingException
+from datetime import date, timedelta
+
+from sqlalchemy import Date
+from utils.database import db, statement
+from utils.exceptions import DatabaseException
+from utils import unit_of_work
+
+# time spent of every comment with project, feature and status of the
+# commented feature or task, filtered further by the queries using it
+_WORK = '''
+    WITH work AS (
+        SELECT C.assignee, C.time_spent, F.project_id, F.id AS feature_id, F.status
+        FROM Comments C
+        JOIN Features F ON F.id = C.feature_id
+        UNION ALL
+        SELECT C.assignee, C.time_spent, F.project_id, F.id, T.status
+        FROM Comments C
+        JOIN Tasks T ON T.id = C.task_id
+        JOIN Features F ON F.id = T.feature_id
+    )
+'''
+
+
+_DB_HEALTH = statement('''
+    SELECT 1
+''')
+
+_GET_TIME_SPENT_BY_TASK = statement('''
+    SELECT time_spent
+    FROM TimeSpentRollups
+    WHERE scope='task' AND id=:id
+''')
+
+_GET_TIME_SPENT_BY_FEATURE = statement('''
+    SELECT time_spent
+    FROM TimeSpentRollups
+    WHERE scope='feature' AND id=:id
+''')
+
+_GET_TIME_SPENT_BY_USER = statement('''
+    SELECT time_spent
+    FROM TimeSpentRollups
+    WHERE scope='user' AND id=:id
+''')
+
+_GET_TIME_SPENT_BY_TEAM_MEMBERS = statement('''
+    SELECT U.id, U.firstname, U.lastname, COALESCE(R.comments, 0), COALESCE(R.time_spent, 0)
+    FROM Teamsusers TU
+    JOIN Users U ON U.id = TU.user_id
+    LEFT JOIN TimeSpentRollups R ON R.scope = 'user' AND R.id = U.id
+    WHERE TU.team_id=:id
+    ORDER BY 5 DESC, U.lastname, U.firstname
+''')
+
+_GET_TIME_SPENT_BY_TEAM_PROJECTS = statement(f'''
+    {_WORK}
+    SELECT P.id, P.name, COUNT(*), SUM(W.time_spent)
+    FROM work W
+    JOIN Teamsusers TU ON TU.user_id = W.assignee
+    JOIN Projects P ON P.id = W.project_id
+    WHERE TU.team_id=:id
+    GROUP BY P.id
+    ORDER BY 4 DESC, P.name
+''')
+
+_GET_TIME_SPENT_BY_TEAM_STATUSES = statement(f'''
+    {_WORK}
+    SELECT S.id, S.name, COUNT(*), SUM(W.time_spent)
+    FROM work W
+    JOIN Teamsusers TU ON TU.user_id = W.assignee
+    JOIN Statuses S ON S.id = W.status
+    WHERE TU.team_id=:id
+    GROUP BY S.id
+    ORDER BY 4 DESC, S.name
+''')
+
+_GET_TIME_SPENT_BY_PROJECT_MEMBERS = statement(f'''
+    {_WORK}
+    SELECT U.id, U.firstname, U.lastname, COUNT(*), SUM(W.time_spent)
+    FROM work W
+    JOIN Users U ON U.id = W.assignee
+    WHERE W.project_id=:id
+    GROUP BY U.id
+    ORDER BY 5 DESC, U.lastname, U.firstname
+''')
+
+_GET_TIME_SPENT_BY_PROJECT_FEATURES = statement('''
+    WITH project_features AS (
+        SELECT id, name
+        FROM Features
+        WHERE project_id=:id
+    ), rollups AS (
+        SELECT R.id AS feature_id, R.comments, R.time_spent
+        FROM TimeSpentRollups R
+        WHERE R.scope = 'feature' AND R.id IN (SELECT id FROM project_features)
+        UNION ALL
+        SELECT T.feature_id, R.comments, R.time_spent
+        FROM Tasks T
+        JOIN TimeSpentRollups R ON R.scope = 'task' AND R.id = T.id
+        WHERE T.feature_id IN (SELECT id FROM project_features)
+    )
+    SELECT PF.id, PF.name, COALESCE(SUM(R.comments), 0), COALESCE(SUM(R.time_spent), 0)
+    FROM project_features PF
+    LEFT JOIN rollups R ON R.feature_id = PF.id
+    GROUP BY PF.id, PF.name
+    ORDER BY 4 DESC, PF.name
+''')
+
+_GET_TIME_SPENT_BY_PROJECT_STATUSES = statement(f'''
+    {_WORK}
+    SELECT S.id, S.name, COUNT(*), SUM(W.time_spent)
+    FROM work W
+    JOIN Statuses S ON S.id = W.status
+    WHERE W.project_id=:id
+    GROUP BY S.id
+    ORDER BY 4 DESC, S.name
+''')
+
+_GET_TIMESHEET = statement('''
+    SELECT U.id, U.firstname, U.lastname, date_trunc('week', C.created) AS week, SUM(C.time_spent)
+    FROM Teamsusers TU
+    JOIN Users U ON U.id = TU.user_id
+    LEFT JOIN Comments C ON C.assignee = TU.user_id
+        AND C.created >= :start AND C.created < :end
+    WHERE TU.team_id=:id
+    GROUP BY U.id, week
+    ORDER BY U.lastname, U.firstname, U.id, week
+''', start=Date, end=Date)
+
+_REBUILD_TIME_SPENT = statement('''
+    SELECT rebuild_time_spent_rollups()
+''')
 
 
 class StatisticsRepository:
@@ -13,11 +143,7 @@ class StatisticsRepository:
             OperationalError: raised if database is not reachable
         '''
 
-        sql = '''
-            SELECT 1
-        '''
-
-        db.session.execute(sql)
+        db.session.execute(_DB_HEALTH)
 
     def get_time_spent_by_task(self, tid: str) -> float:
         '''get_time_spent_by_task is used to get time spent of task
@@ -28,26 +154,21 @@ class StatisticsRepository:
         Raises:
             DatabaseException: raised if problems occur
                 while interacting with the database
-            NotExistingException: raised if there is none time spent found
 
         Returns:
-            float: counted time spent
-        '''
-
-        sql = '''
-            SELECT SUM(time_spent)
-            FROM Comments
-            WHERE task_id=:id
+            float: counted time spent, 0 if none comments found
         '''
 
         try:
-            time_spent = db.session.execute(sql, {'id': tid}).fetchone()
+            time_spent = db.session.execute(_GET_TIME_SPENT_BY_TASK, {
+                'id': tid
+            }).fetchone()
         except Exception as error:
             raise DatabaseException(
                 'While getting the statistics for task') from error
 
         if not time_spent:
-            raise NotExistingException('Time spent for task')
+            return 0
 
         return time_spent[0]
 
@@ -60,26 +181,21 @@ class StatisticsRepository:
         Raises:
             DatabaseException: raised if problems occur
                 while interacting with the database
-            NotExistingException: raised if there is none time spent found
 
         Returns:
-            float: counted time spent
-        '''
-
-        sql = '''
-            SELECT SUM(time_spent)
-            FROM Comments
-            WHERE feature_id=:id
+            float: counted time spent, 0 if none comments found
         '''
 
         try:
-            time_spent = db.session.execute(sql, {'id': fid}).fetchone()
+            time_spent = db.session.execute(_GET_TIME_SPENT_BY_FEATURE, {
+                'id': fid
+            }).fetchone()
         except Exception as error:
             raise DatabaseException(
                 'While getting the statistics for task') from error
 
         if not time_spent:
-            raise NotExistingException('Time spent for task')
+            return 0
 
         return time_spent[0]
 
@@ -92,28 +208,238 @@ class StatisticsRepository:
         Raises:
             DatabaseException: raised if problems occur
                 while interacting with the database
-            NotExistingException: raised if there is none time spent found
 
         Returns:
-            float: counted time spent
-        '''
-
-        sql = '''
-            SELECT SUM(time_spent)
-            FROM Comments
-            WHERE assignee=:id
+            float: counted time spent, 0 if none comments found
         '''
 
         try:
-            time_spent = db.session.execute(sql, {'id': uid}).fetchone()
+            time_spent = db.session.execute(_GET_TIME_SPENT_BY_USER, {
+                'id': uid
+            }).fetchone()
         except Exception as error:
             raise DatabaseException(
                 'While getting the statistics for user') from error
 
         if not time_spent:
-            raise NotExistingException('Time spent for user')
+            return 0
 
         return time_spent[0]
 
+    def get_time_spent_by_team_members(self, teid: str) -> [tuple]:
+        '''get_time_spent_by_team_members is used to get time spent
+           by every member of team
+
+        Args:
+            teid (str): id of the team
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: user id, firstname, lastname, amount of comments
+                and time spent of every member, most time spent first
+        '''
+
+        try:
+            members = db.session.execute(_GET_TIME_SPENT_BY_TEAM_MEMBERS, {
+                'id': teid
+            }).fetchall()
+        except Exception as error:
+            raise DatabaseException(
+                'While getting the statistics for team members') from error
+
+        return members
+
+    def get_time_spent_by_team_projects(self, teid: str) -> [tuple]:
+        '''get_time_spent_by_team_projects is used to get time spent
+           by members of team in each project
+
+        Args:
+            teid (str): id of the team
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: project id, name, amount of comments and time spent
+                of every project, most time spent first
+        '''
+
+        try:
+            projects = db.session.execute(_GET_TIME_SPENT_BY_TEAM_PROJECTS, {
+                'id': teid
+            }).fetchall()
+        except Exception as error:
+            raise DatabaseException(
+                'While getting the statistics for team projects') from error
+
+        return projects
+
+    def get_time_spent_by_team_statuses(self, teid: str) -> [tuple]:
+        '''get_time_spent_by_team_statuses is used to get time spent
+           by members of team in features and tasks of each status
+
+        Args:
+            teid (str): id of the team
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: status id, name, amount of comments and time spent
+                of every status, most time spent first
+        '''
+
+        try:
+            statuses = db.session.execute(_GET_TIME_SPENT_BY_TEAM_STATUSES, {
+                'id': teid
+            }).fetchall()
+        except Exception as error:
+            raise DatabaseException(
+                'While getting the statistics for team statuses') from error
+
+        return statuses
+
+    def get_time_spent_by_project_members(self, pid: str) -> [tuple]:
+        '''get_time_spent_by_project_members is used to get time spent
+           in project by every user who has logged time into it
+
+        Args:
+            pid (str): id of the project
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: user id, firstname, lastname, amount of comments
+                and time spent of every user, most time spent first
+        '''
+
+        try:
+            members = db.session.execute(_GET_TIME_SPENT_BY_PROJECT_MEMBERS, {
+                'id': pid
+            }).fetchall()
+        except Exception as error:
+            raise DatabaseException(
+                'While getting the statistics for project members') from error
+
+        return members
+
+    def get_time_spent_by_project_features(self, pid: str) -> [tuple]:
+        '''get_time_spent_by_project_features is used to get time spent
+           in every feature of project, including time spent in tasks
+           of the feature
+
+        Args:
+            pid (str): id of the project
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: feature id, name, amount of comments and time spent
+                of every feature, most time spent first
+        '''
+
+        try:
+            features = db.session.execute(_GET_TIME_SPENT_BY_PROJECT_FEATURES, {
+                'id': pid
+            }).fetchall()
+        except Exception as error:
+            raise DatabaseException(
+                'While getting the statistics for project features') from error
+
+        return features
+
+    def get_time_spent_by_project_statuses(self, pid: str) -> [tuple]:
+        '''get_time_spent_by_project_statuses is used to get time spent
+           in features and tasks of project by their status
+
+        Args:
+            pid (str): id of the project
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: status id, name, amount of comments and time spent
+                of every status, most time spent first
+        '''
+
+        try:
+            statuses = db.session.execute(_GET_TIME_SPENT_BY_PROJECT_STATUSES, {
+                'id': pid
+            }).fetchall()
+        except Exception as error:
+            raise DatabaseException(
+                'While getting the statistics for project statuses') from error
+
+        return statuses
+
+    def get_timesheet(self, teid: str, start: date, end: date) -> [tuple]:
+        '''get_timesheet is used to get time spent by every member
+           of team in each week between given dates
+
+        Weeks start on monday. Members without time spent between
+        the dates have one row with None as week.
+
+        Args:
+            teid (str): id of the team
+            start (date): first day included
+            end (date): last day included
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: user id, firstname, lastname, first day of week
+                and time spent, ordered by member and week
+        '''
+
+        try:
+            timesheet = db.session.execute(_GET_TIMESHEET, {
+                'id': teid,
+                'start': start,
+                'end': end + timedelta(days=1)
+            }).fetchall()
+        except Exception as error:
+            raise DatabaseException(
+                'While getting the timesheet for team') from error
+
+        return [(row[0], row[1], row[2], row[3].date() if row[3] else None,
+                 row[4]) for row in timesheet]
+
+    def rebuild_time_spent(self) -> int:
+        '''rebuild_time_spent is used to rebuild rollups of time spent
+           from comments, correcting rollups which differ from comments
+
+        Rollups are kept up to date by triggers, so this is needed
+        only for reconciliation, for example after manual changes.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            int: amount of corrected rollups
+        '''
+
+        try:
+            corrected = db.session.execute(_REBUILD_TIME_SPENT).scalar()
+            unit_of_work.commit()
+        except Exception as error:
+            raise DatabaseException(
+                'While rebuilding rollups of time spent') from error
+
+        return corrected
+
 
 statistics_repository = StatisticsRepository()
@@ -1,15 +1,29 @@
-from utils.database import db
+from utils.database import db, statement
 from utils.exceptions import DatabaseException, NotExistingException
+from utils.lookup_cache import LookupCache
+
+
+_LOAD_ALL = statement('''
+    SELECT id, name
+    FROM Statuses
+''')
 
 
 class StatusRepository:
     '''Class for handling Statuses in the database
+
+    Statuses are read through process-wide LookupCache, so the
+    table is queried only when it has been changed.
     '''
 
-    def get_all(self) -> [tuple]:
-        '''get_all is used to list of all statuses
+    def __init__(self):
+        '''Initializes StatusRepository
+        '''
 
-        If no statuses found, returns empty list.
+        self._cache = LookupCache('statuses', self._load_all)
+
+    def _load_all(self) -> [tuple]:
+        '''_load_all is used to read all statuses from the database
 
         Raises:
             DatabaseException: raised if problems occur
@@ -19,23 +33,33 @@ class StatusRepository:
             [tuple]: list of all statuses
         '''
 
-        sql = '''
-            SELECT id, name 
-            FROM Statuses
-        '''
-
         try:
-            statuses = db.session.execute(sql).fetchall()
+            statuses = db.session.execute(_LOAD_ALL).fetchall()
         except Exception as error:
             raise DatabaseException('While getting all statuses') from error
 
-        return [(status[0], status[1]) for status in statuses]
+        return statuses
+
+    def get_all(self) -> [tuple]:
+        '''get_all is used to list of all statuses
+
+        If no statuses found, returns empty list.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: list of all statuses
+        '''
+
+        return self._cache.get_all()
 
     def get_by_id(self, sid: str) -> tuple:
         '''get_by_id is used to found status with given id
 
         Args:
-            rid (str): id of the status to be found
+            sid (str): id of the status to be found
 
         Raises:
             DatabaseException: raised if problems while
@@ -47,27 +71,18 @@ class StatusRepository:
             tuple: status with given id
         '''
 
-        sql = '''
-            SELECT id, name 
-            FROM Statuses 
-            WHERE id=:id
-        '''
-
-        try:
-            status = db.session.execute(sql, {'id': sid}).fetchone()
-        except Exception as error:
-            raise DatabaseException('While getting the status') from error
+        status = self._cache.get(sid)
 
         if not status:
             raise NotExistingException('Status')
 
-        return (status[0], status[1])
+        return status
 
     def get_name(self, sid: str) -> str:
         '''get_name is used to get name of status with given id
 
         Args:
-            rid (int): id of the status
+            sid (str): id of the status
 
         Raises:
             DatabaseException: raised if problems while
@@ -79,21 +94,14 @@ class StatusRepository:
             str: found name
         '''
 
-        sql = '''
-            SELECT name 
-            FROM Statuses 
-            WHERE id=:id
-        '''
-
-        try:
-            name = db.session.execute(sql, {'id': sid}).fetchone()
-        except Exception as error:
-            raise DatabaseException('While getting status´ name') from error
+        return self.get_by_id(sid)[1]
 
-        if not name:
-            raise NotExistingException('Status')
+    def invalidate(self):
+        '''invalidate is used to drop cached statuses, so that
+           they are read again from the database on next use
+        '''
 
-        return name[0]
+        self._cache.invalidate()
 
 
 status_repository = StatusRepository()
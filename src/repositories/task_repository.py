@@ -1,11 +1,133 @@
-from utils.database import db
+from sqlalchemy import Integer
+from utils.database import db, flag_condition, raise_for_foreign_key, statement
+from utils.identity_map import identity_mapped, invalidates_identity_map
 from utils.exceptions import DatabaseException, NotExistingException
+from utils.pagination import Keyset, Page
+import utils.config as configs
+from utils import unit_of_work
+
+_REFERENCES = {
+    'tasks_feature_id_fkey': 'Feature',
+    'tasks_assignee_fkey': 'Assignee',
+    'tasks_status_fkey': 'Status',
+    'tasks_type_fkey': 'Type',
+}
+
+_KEYSET = Keyset(('T.created', 'timestamp'), ('T.id', 'uuid'))
+
+
+_NEW = statement('''
+    WITH Inserted AS (
+        INSERT INTO Tasks
+        (feature_id, assignee, name, description, flags, status, type, priority) 
+        VALUES (:feature_id, :assignee, :name, :description, :flags, :status, :type, :priority) 
+        RETURNING *
+    )
+    SELECT T.id, T.feature_id, F.name, T.assignee, U.firstname, U.lastname, T.name, T.description, T.status, S.name, T.type, Ty.name, T.priority, T.created, T.updated_on, T.flags
+    FROM Inserted T
+    JOIN Features F ON F.id = T.feature_id
+    JOIN Users U ON U.id = T.assignee
+    JOIN Types Ty ON Ty.id = T.type
+    JOIN Statuses S ON S.id = T.status
+''')
+
+_GET_ALL = statement('''
+    SELECT T.id, T.feature_id, F.name, T.assignee, U.firstname, U.lastname, T.name, T.description, T.status, S.name, T.type, Ty.name, T.priority, T.created, T.updated_on, T.flags
+    FROM Tasks T
+    JOIN Features F ON F.id = T.feature_id
+    JOIN Users U ON U.id = T.assignee
+    JOIN Types Ty ON Ty.id = T.type
+    JOIN Statuses S ON S.id = T.status
+''')
+
+_GET_ALL_BY_FEATURE_ID = statement('''
+    SELECT T.id, T.feature_id, F.name, T.assignee, U.firstname, U.lastname, T.name, T.description, T.status, S.name, T.type, Ty.name, T.priority, T.created, T.updated_on, T.flags
+    FROM Tasks T
+    JOIN Features F ON F.id = T.feature_id
+    JOIN Users U ON U.id = T.assignee
+    JOIN Types Ty ON Ty.id = T.type
+    JOIN Statuses S ON S.id = T.status
+    WHERE T.feature_id=:id
+''')
+
+_GET_ALL_BY_FEATURE_IDS = statement('''
+    SELECT T.id, T.feature_id, F.name, T.assignee, U.firstname, U.lastname, T.name, T.description, T.status, S.name, T.type, Ty.name, T.priority, T.created, T.updated_on, T.flags
+    FROM Tasks T
+    JOIN Features F ON F.id = T.feature_id
+    JOIN Users U ON U.id = T.assignee
+    JOIN Types Ty ON Ty.id = T.type
+    JOIN Statuses S ON S.id = T.status
+    WHERE T.feature_id = ANY(CAST(:ids AS uuid[]))
+''')
+
+_GET_ALL_BY_ASSIGNEE = statement('''
+    SELECT T.id, T.feature_id, F.name, T.assignee, U.firstname, U.lastname, T.name, T.description, T.status, S.name, T.type, Ty.name, T.priority, T.created, T.updated_on, T.flags
+    FROM Tasks T
+    JOIN Features F ON F.id = T.feature_id
+    JOIN Users U ON U.id = T.assignee
+    JOIN Types Ty ON Ty.id = T.type
+    JOIN Statuses S ON S.id = T.status
+    WHERE T.assignee=:id
+''')
+
+_GET_BY_ID = statement('''
+    SELECT T.id, T.feature_id, F.name, T.assignee, U.firstname, U.lastname, T.name, T.description, T.status, S.name, T.type, Ty.name, T.priority, T.created, T.updated_on, T.flags
+    FROM Tasks T
+    JOIN Features F ON F.id = T.feature_id
+    JOIN Users U ON U.id = T.assignee
+    JOIN Types Ty ON Ty.id = T.type
+    JOIN Statuses S ON S.id = T.status
+    WHERE T.id=:id
+''')
+
+_GET_NAME = statement('''
+    SELECT name
+    FROM Tasks
+    WHERE id=:id
+''')
+
+_UPDATE = statement('''
+    WITH Updated AS (
+        UPDATE Tasks
+        SET feature_id=:feature_id, assignee=:assignee, name=:name, description=:description, flags=:flags, status=:status, type=:type, priority=:priority
+        WHERE id=:id
+        RETURNING *
+    )
+    SELECT T.id, T.feature_id, F.name, T.assignee, U.firstname, U.lastname, T.name, T.description, T.status, S.name, T.type, Ty.name, T.priority, T.created, T.updated_on, T.flags
+    FROM Updated T
+    JOIN Features F ON F.id = T.feature_id
+    JOIN Users U ON U.id = T.assignee
+    JOIN Types Ty ON Ty.id = T.type
+    JOIN Statuses S ON S.id = T.status
+''')
+
+_BULK_UPDATE = statement('''
+    WITH Updated AS (
+        UPDATE Tasks
+        SET status = COALESCE(CAST(:status AS uuid), status), assignee = COALESCE(CAST(:assignee AS uuid), assignee), priority = COALESCE(CAST(:priority AS INTEGER), priority)
+        WHERE id = ANY(CAST(:ids AS uuid[]))
+        RETURNING *
+    )
+    SELECT T.id, T.feature_id, F.name, T.assignee, U.firstname, U.lastname, T.name, T.description, T.status, S.name, T.type, Ty.name, T.priority, T.created, T.updated_on, T.flags
+    FROM Updated T
+    JOIN Features F ON F.id = T.feature_id
+    JOIN Users U ON U.id = T.assignee
+    JOIN Types Ty ON Ty.id = T.type
+    JOIN Statuses S ON S.id = T.status
+    ORDER BY T.created DESC, T.id DESC
+''')
+
+_REMOVE = statement('''
+    DELETE FROM Tasks 
+    WHERE id=:id
+''')
 
 
 class TaskRepository:
     '''Class used for handling tasks in the database
     '''
 
+    @invalidates_identity_map
     def new(self, fid: str, aid: str, name: str, description: str, status: str,
             ttype: str, priority: int, flags: str) -> tuple:
         '''new is used to create new tasks into the database
@@ -27,9 +149,11 @@ class TaskRepository:
         Raises:
             DatabaseException: raised if problems occurs while
                 saving into the database
+            NotExistingException: raised if feature, assignee,
+                status or type is not found with given id
 
         Returns:
-            tuple: created task´s id, creation and updated on time
+            tuple: created task, in same format as get_by_id returns
         '''
 
         values = {
@@ -43,25 +167,18 @@ class TaskRepository:
             'priority': priority
         }
 
-        sql = '''
-            INSERT INTO Tasks
-            (feature_id, assignee, name, description, flags, status, type, priority) 
-            VALUES (:feature_id, :assignee, :name, :description, :flags, :status, :type, :priority) 
-            RETURNING id, created, updated_on
-        '''
-
         try:
-            task_id, created, updated_on = db.session.execute(
-                sql, values).fetchone()
-            db.session.commit()
+            task = db.session.execute(_NEW, values).fetchone()
+            unit_of_work.commit()
         except Exception as error:
+            raise_for_foreign_key(error, _REFERENCES)
             raise DatabaseException(
-                'While ssaving new task into database') from error
+                'While saving new task into database') from error
 
-        if not task_id:
+        if not task:
             raise DatabaseException('While saving new task into database')
 
-        return (task_id, created, updated_on)
+        return task
 
     def get_all(self) -> [tuple]:
         '''get_all is used to get all tasks from the database
@@ -76,23 +193,82 @@ class TaskRepository:
             [tuple]: list of all tasks
         '''
 
-        sql = '''
-            SELECT T.id, T.feature_id, F.name, T.assignee, U.firstname, U.lastname, T.name, T.description, T.status, S.name, T.type, Ty.name, T.priority, T.created, T.updated_on, T.flags
-            FROM Tasks T
+        try:
+            tasks = db.session.execute(_GET_ALL).fetchall()
+        except Exception as error:
+            raise DatabaseException('While getting all tasks') from error
+
+        return tasks
+
+    def get_all_summaries(self,
+                          after: str = None,
+                          before: str = None,
+                          limit: int = None,
+                          flag: str = None) -> Page:
+        '''get_all_summaries is used to get one page of tasks, newest
+           first, with amount of comments and total time spent,
+           calculated in the database with one query
+
+        If no tasks found, returns empty page.
+
+        Args:
+            after (str, optional): cursor of the task after which
+                the page starts. Defaults to None.
+            before (str, optional): cursor of the task before which
+                the page ends. Defaults to None.
+            limit (int, optional): size of the page.
+                Defaults to page_size of config.
+            flag (str, optional): only tasks with given flag are listed.
+                Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid cursor is given
+
+        Returns:
+            Page: page of tasks with their totals
+        '''
+
+        limit = limit or configs.page_size
+        condition, order, values = _KEYSET.clause(after, before)
+
+        if flag:
+            condition = f'{condition} AND {flag_condition("T")}'
+            values['flag'] = flag
+
+        sql = f'''
+            WITH page AS (
+                SELECT *
+                FROM Tasks T
+                WHERE {condition}
+                ORDER BY {order}
+                LIMIT :limit
+            )
+            SELECT T.id, T.feature_id, F.name, T.assignee, U.firstname, U.lastname, T.name, T.description, T.status, S.name, T.type, Ty.name, T.priority, T.created, T.updated_on, T.flags, COALESCE(R.comments, 0), COALESCE(R.time_spent, 0)
+            FROM page T
             JOIN Features F ON F.id = T.feature_id
             JOIN Users U ON U.id = T.assignee
             JOIN Types Ty ON Ty.id = T.type
             JOIN Statuses S ON S.id = T.status
+            LEFT JOIN TimeSpentRollups R ON R.scope = 'task' AND R.id = T.id
+            ORDER BY {order}
         '''
 
         try:
-            tasks = db.session.execute(sql).fetchall()
+            tasks = db.session.execute(statement(sql, limit=Integer), {
+                **values, 'limit': limit + 1
+            }).fetchall()
         except Exception as error:
-            raise DatabaseException('While getting all tasks') from error
+            raise DatabaseException(
+                'While getting summaries of all tasks') from error
 
-        return [(task[0], task[1], task[2], task[3], task[4], task[5], task[6],
-                 task[7], task[8], task[9], task[10], task[11], task[12],
-                 task[13], task[14], task[15]) for task in tasks]
+        return _KEYSET.page([(task[0], task[1], task[2], task[3], task[4],
+                              task[5], task[6], task[7], task[8], task[9],
+                              task[10], task[11], task[12], task[13], task[14],
+                              task[15], task[16], task[17]) for task in tasks],
+                            limit, lambda task: (task[13], task[0]), after,
+                            before)
 
     def get_all_by_feature_id(self, fid: str) -> [tuple]:
         '''get_all_by_feature_id is used to get all tasks
@@ -111,25 +287,45 @@ class TaskRepository:
             [tuple]: list of found tasks
         '''
 
-        sql = '''
-            SELECT T.id, T.feature_id, F.name, T.assignee, U.firstname, U.lastname, T.name, T.description, T.status, S.name, T.type, Ty.name, T.priority, T.created, T.updated_on, T.flags
-            FROM Tasks T
-            JOIN Features F ON F.id = T.feature_id
-            JOIN Users U ON U.id = T.assignee
-            JOIN Types Ty ON Ty.id = T.type
-            JOIN Statuses S ON S.id = T.status
-            WHERE T.feature_id=:id
+        try:
+            tasks = db.session.execute(_GET_ALL_BY_FEATURE_ID, {
+                'id': fid
+            }).fetchall()
+        except Exception as error:
+            raise DatabaseException(
+                'While getting all tasks by Feature ID') from error
+
+        return tasks
+
+    def get_all_by_feature_ids(self, fids: [str]) -> [tuple]:
+        '''get_all_by_feature_ids is used to get all tasks
+           associated with any of given features in one query
+
+        If no tasks found, returns empty list.
+
+        Args:
+            fids ([str]): ids of the features in which tasks are associated
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: list of found tasks
         '''
 
+        if not fids:
+            return []
+
         try:
-            tasks = db.session.execute(sql, {'id': fid}).fetchall()
+            tasks = db.session.execute(_GET_ALL_BY_FEATURE_IDS, {
+                'ids': [str(fid) for fid in fids]
+            }).fetchall()
         except Exception as error:
             raise DatabaseException(
-                'While getting all tasks by Feature ID') from error
+                'While getting all tasks by Feature IDs') from error
 
-        return [(task[0], task[1], task[2], task[3], task[4], task[5], task[6],
-                 task[7], task[8], task[9], task[10], task[11], task[12],
-                 task[13], task[14], task[15]) for task in tasks]
+        return tasks
 
     def get_all_by_assignee(self, aid: str) -> [tuple]:
         '''get_all_by_feature_id is used to get all tasks
@@ -148,26 +344,17 @@ class TaskRepository:
             [tuple]: list of found tasks
         '''
 
-        sql = '''
-            SELECT T.id, T.feature_id, F.name, T.assignee, U.firstname, U.lastname, T.name, T.description, T.status, S.name, T.type, Ty.name, T.priority, T.created, T.updated_on, T.flags
-            FROM Tasks T
-            JOIN Features F ON F.id = T.feature_id
-            JOIN Users U ON U.id = T.assignee
-            JOIN Types Ty ON Ty.id = T.type
-            JOIN Statuses S ON S.id = T.status
-            WHERE T.assignee=:id
-        '''
-
         try:
-            tasks = db.session.execute(sql, {'id': aid}).fetchall()
+            tasks = db.session.execute(_GET_ALL_BY_ASSIGNEE, {
+                'id': aid
+            }).fetchall()
         except Exception as error:
             raise DatabaseException(
                 'While getting all tasks by assignee') from error
 
-        return [(task[0], task[1], task[2], task[3], task[4], task[5], task[6],
-                 task[7], task[8], task[9], task[10], task[11], task[12],
-                 task[13], task[14], task[15]) for task in tasks]
+        return tasks
 
+    @identity_mapped
     def get_by_id(self, tid: str) -> tuple:
         '''get_by_id is used to found task with given id
 
@@ -183,28 +370,17 @@ class TaskRepository:
             tuple: found task
         '''
 
-        sql = '''
-            SELECT T.id, T.feature_id, F.name, T.assignee, U.firstname, U.lastname, T.name, T.description, T.status, S.name, T.type, Ty.name, T.priority, T.created, T.updated_on, T.flags
-            FROM Tasks T
-            JOIN Features F ON F.id = T.feature_id
-            JOIN Users U ON U.id = T.assignee
-            JOIN Types Ty ON Ty.id = T.type
-            JOIN Statuses S ON S.id = T.status
-            WHERE T.id=:id
-        '''
-
         try:
-            task = db.session.execute(sql, {'id': tid}).fetchone()
+            task = db.session.execute(_GET_BY_ID, {'id': tid}).fetchone()
         except Exception as error:
             raise DatabaseException('While getting the task') from error
 
         if not task:
             raise NotExistingException('Task')
 
-        return (task[0], task[1], task[2], task[3], task[4], task[5], task[6],
-                task[7], task[8], task[9], task[10], task[11], task[12],
-                task[13], task[14], task[15])
+        return task
 
+    @identity_mapped
     def get_name(self, tid: str) -> str:
         '''get_name is used to get name of specific task
 
@@ -221,14 +397,8 @@ class TaskRepository:
             str: found name
         '''
 
-        sql = '''
-            SELECT name
-            FROM Tasks
-            WHERE id=:id
-        '''
-
         try:
-            name = db.session.execute(sql, {'id': tid}).fetchone()
+            name = db.session.execute(_GET_NAME, {'id': tid}).fetchone()
         except Exception as error:
             raise DatabaseException('While getting task´s name') from error
 
@@ -237,6 +407,7 @@ class TaskRepository:
 
         return name[0]
 
+    @invalidates_identity_map
     def update(self, tid: str, fid: str, aid: str, name: str, description: str,
                status: str, ttype: str, priority: int, flags: str) -> tuple:
         '''update is used to update task in the database
@@ -259,16 +430,11 @@ class TaskRepository:
         Raises:
             DatabaseException: raised if problems occurs while
                 saving into the database
+            NotExistingException: raised if task, feature, assignee,
+                status or type is not found with given id
 
         Returns:
-            tuple: updated task´s id, creation and updated on time
-        '''
-
-        sql = '''
-            UPDATE Tasks
-            SET feature_id=:feature_id, assignee=:assignee, name=:name, description=:description, flags=:flags, status=:status, type=:type, priority=:priority
-            WHERE id=:id
-            RETURNING id, created, updated_on
+            tuple: updated task, in same format as get_by_id returns
         '''
 
         values = {
@@ -284,17 +450,62 @@ class TaskRepository:
         }
 
         try:
-            task_id, created, updated_on = db.session.execute(
-                sql, values).fetchone()
-            db.session.commit()
+            task = db.session.execute(_UPDATE, values).fetchone()
+            unit_of_work.commit()
         except Exception as error:
+            raise_for_foreign_key(error, _REFERENCES)
             raise DatabaseException('While saving updated task') from error
 
-        if str(tid) != str(task_id):
-            raise DatabaseException('While saving updated task')
+        if not task:
+            raise NotExistingException('Task')
+
+        return task
+
+    @invalidates_identity_map
+    def bulk_update(self,
+                    tids: [str],
+                    status: str = None,
+                    aid: str = None,
+                    priority: int = None) -> [tuple]:
+        '''bulk_update is used to update status, assignee or priority
+           of many tasks with one statement
 
-        return (task_id, created, updated_on)
+        Values not given are left as they are. Tasks not found are
+        left out of the result.
 
+        Args:
+            tids ([str]): ids of the tasks
+            status (str, optional): id of new status. Defaults to None.
+            aid (str, optional): id of new assignee. Defaults to None.
+            priority (int, optional): new priority. Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occurs while
+                saving into the database
+            NotExistingException: raised if assignee or status
+                is not found with given id
+
+        Returns:
+            [tuple]: updated tasks, in same format as get_by_id returns
+        '''
+
+        values = {
+            'ids': list(tids),
+            'status': status,
+            'assignee': aid,
+            'priority': priority
+        }
+
+        try:
+            tasks = db.session.execute(_BULK_UPDATE, values).fetchall()
+            unit_of_work.commit()
+        except Exception as error:
+            raise_for_foreign_key(error, _REFERENCES)
+            raise DatabaseException('While saving updated tasks') from error
+
+        return tasks
+
+    @invalidates_identity_map
     def remove(self, tid: str) -> None:
         '''remove is used to remove task from the database
 
@@ -306,14 +517,9 @@ class TaskRepository:
                 while interacting with the database
         '''
 
-        sql = '''
-            DELETE FROM Tasks 
-            WHERE id=:id
-        '''
-
         try:
-            db.session.execute(sql, {'id': tid})
-            db.session.commit()
+            db.session.execute(_REMOVE, {'id': tid})
+            unit_of_work.commit()
         except Exception as error:
             raise DatabaseException('While removing the task') from error
 
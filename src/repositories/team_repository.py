@@ -1,12 +1,110 @@
 from sqlalchemy.exc import IntegrityError
-from utils.database import db
+from utils.database import db, statement
+from utils.identity_map import identity_mapped, invalidates_identity_map
 from utils.exceptions import DatabaseException, NotExistingException, UnvalidInputException
+from utils import unit_of_work
+
+
+_NEW_TEAMS = statement('''
+    INSERT INTO Teams
+    (name, description, team_leader)
+    VALUES (:name, :description, :team_leader)
+    RETURNING id
+''')
+
+_NEW_TEAMSUSERS = statement('''
+    INSERT INTO Teamsusers
+    (team_id, user_id)
+    VALUES (:team_id, :user_id)
+    RETURNING team_id, user_id
+''')
+
+_GET_ALL = statement('''
+    SELECT T.id, T.name, T.description, T.team_leader, U.firstname, U.lastname
+    FROM Teams T
+    JOIN Users U ON T.team_leader = U.id
+''')
+
+_GET_ALL_BY_TEAM_LEADER = statement('''
+    SELECT T.id, T.name, T.description, T.team_leader, U.firstname, U.lastname
+    FROM Teams T
+    JOIN Users U ON T.team_leader = U.id
+    WHERE T.team_leader=:id
+''')
+
+_GET_BY_ID = statement('''
+    SELECT T.id, T.name, T.description, T.team_leader, U.firstname, U.lastname
+    FROM Teams T
+    JOIN Users U ON T.team_leader = U.id
+    WHERE T.id=:id
+''')
+
+_GET_NAME = statement('''
+    SELECT name 
+    FROM Teams T 
+    WHERE id=:id
+''')
+
+# members and leaders of the teams the user leads or is member of
+_SHARES_TEAM = statement('''
+    WITH user_teams AS (
+        SELECT id, team_leader
+        FROM Teams
+        WHERE team_leader=:id
+        UNION
+        SELECT T.id, T.team_leader
+        FROM Teams T
+        JOIN Teamsusers TU ON TU.team_id = T.id
+        WHERE TU.user_id=:id
+    )
+    SELECT EXISTS (
+        SELECT 1
+        FROM user_teams T
+        WHERE T.team_leader=:member OR EXISTS (
+            SELECT 1
+            FROM Teamsusers
+            WHERE team_id = T.id AND user_id=:member
+        )
+    )
+''')
+
+_UPDATE = statement('''
+    UPDATE Teams 
+    SET name=:name, description=:description, team_leader=:team_leader
+    WHERE id=:id 
+    RETURNING id
+''')
+
+_UPDATE_TEAMSUSERS = statement('''
+    INSERT INTO Teamsusers
+    (team_id, user_id)
+    VALUES (:team_id, :user_id)
+    RETURNING team_id, user_id
+''')
+
+_ADD_MEMBER = statement('''
+    INSERT INTO Teamsusers
+    (team_id, user_id)
+    VALUES (:team_id, :user_id)
+    RETURNING team_id, user_id
+''')
+
+_REMOVE_MEMBER = statement('''
+    DELETE FROM Teamsusers
+    WHERE (team_id=:team_id and user_id=:user_id)
+''')
+
+_REMOVE = statement('''
+    DELETE FROM Teams
+    WHERE id=:id
+''')
 
 
 class TeamRepository:
     '''Class for handling Teams in the database
     '''
 
+    @invalidates_identity_map
     def new(self, name: str, description: str, tlid: str) -> str:
         '''new is used to create new teams into the database
 
@@ -25,29 +123,15 @@ class TeamRepository:
             str: created team´s id
         '''
 
-        sql_teams = '''
-            INSERT INTO Teams
-            (name, description, team_leader)
-            VALUES (:name, :description, :team_leader)
-            RETURNING id
-        '''
-
-        sql_teamsusers = '''
-            INSERT INTO Teamsusers
-            (team_id, user_id)
-            VALUES (:team_id, :user_id)
-            RETURNING team_id, user_id
-        '''
-
         values = {'name': name, 'description': description, 'team_leader': tlid}
 
         try:
-            team_id = db.session.execute(sql_teams, values).fetchone()[0]
-            teid, user_id = db.session.execute(sql_teamsusers, {
+            team_id = db.session.execute(_NEW_TEAMS, values).fetchone()[0]
+            teid, user_id = db.session.execute(_NEW_TEAMSUSERS, {
                 'team_id': str(team_id),
                 'user_id': tlid
             }).fetchone()
-            db.session.commit()
+            unit_of_work.commit()
         except IntegrityError as error:
 
             raise UnvalidInputException(
@@ -80,19 +164,12 @@ class TeamRepository:
             [tuple]: list of all teams
         '''
 
-        sql = '''
-            SELECT T.id, T.name, T.description, T.team_leader, U.firstname, U.lastname
-            FROM Teams T
-            JOIN Users U ON T.team_leader = U.id
-        '''
-
         try:
-            teams = db.session.execute(sql).fetchall()
+            teams = db.session.execute(_GET_ALL).fetchall()
         except Exception as error:
             raise DatabaseException('While getting all teams') from error
 
-        return [(team[0], team[1], team[2], team[3], team[4], team[5])
-                for team in teams]
+        return teams
 
     def get_all_by_team_leader(self, tlid: str) -> [tuple]:
         '''get_all_by_team_leader is used get all teams
@@ -111,22 +188,17 @@ class TeamRepository:
             [tuple]: list of found teams
         '''
 
-        sql = '''
-            SELECT T.id, T.name, T.description, T.team_leader, U.firstname, U.lastname
-            FROM Teams T
-            JOIN Users U ON T.team_leader = U.id
-            WHERE T.team_leader=:id
-        '''
-
         try:
-            teams = db.session.execute(sql, {'id': tlid}).fetchall()
+            teams = db.session.execute(_GET_ALL_BY_TEAM_LEADER, {
+                'id': tlid
+            }).fetchall()
         except Exception as error:
             raise DatabaseException(
                 'While getting all teams by team leader') from error
 
-        return [(team[0], team[1], team[2], team[3], team[4], team[5])
-                for team in teams]
+        return teams
 
+    @identity_mapped
     def get_by_id(self, teid: str) -> tuple:
         '''get_by_id is used to found team with given id
 
@@ -142,23 +214,17 @@ class TeamRepository:
             tuple: found team
         '''
 
-        sql = '''
-            SELECT T.id, T.name, T.description, T.team_leader, U.firstname, U.lastname
-            FROM Teams T
-            JOIN Users U ON T.team_leader = U.id
-            WHERE T.id=:id
-        '''
-
         try:
-            team = db.session.execute(sql, {'id': teid}).fetchone()
+            team = db.session.execute(_GET_BY_ID, {'id': teid}).fetchone()
         except Exception as error:
             raise DatabaseException('while getting team') from error
 
         if not team:
             raise NotExistingException('Team')
 
-        return (team[0], team[1], team[2], team[3], team[4], team[5])
+        return team
 
+    @identity_mapped
     def get_name(self, teid: str) -> str:
         '''get_name is used to get name of team with given id
 
@@ -175,19 +241,38 @@ class TeamRepository:
             str: found name
         '''
 
-        sql = '''
-            SELECT name 
-            FROM Teams T 
-            WHERE id=:id
-        '''
-
         try:
-            name = db.session.execute(sql, {'id': teid}).fetchone()
+            name = db.session.execute(_GET_NAME, {'id': teid}).fetchone()
         except Exception as error:
             raise DatabaseException('While getting team´s name') from error
 
         return name[0]
 
+    def shares_team(self, uid: str, member: str) -> bool:
+        '''shares_team is used to check if the user is in one of the
+           teams of another user, as a member or the team leader
+
+        Args:
+            uid (str): id of the user whose teams are checked
+            member (str): id of the user looked for in the teams
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            bool: True if member is in one of the teams of the user
+        '''
+
+        try:
+            return db.session.execute(_SHARES_TEAM, {
+                'id': uid,
+                'member': member
+            }).scalar()
+        except Exception as error:
+            raise DatabaseException('While checking teams') from error
+
+    @invalidates_identity_map
     def update(self, teid: str, name: str, description: str, tlid: str) -> str:
         '''update is used to update team with given values into the database
 
@@ -214,27 +299,13 @@ class TeamRepository:
             'team_leader': tlid
         }
 
-        sql = '''
-            UPDATE Teams 
-            SET name=:name, description=:description, team_leader=:team_leader
-            WHERE id=:id 
-            RETURNING id
-        '''
-
-        sql_teamsusers = '''
-            INSERT INTO Teamsusers
-            (team_id, user_id)
-            VALUES (:team_id, :user_id)
-            RETURNING team_id, user_id
-        '''
-
         try:
-            team_id = db.session.execute(sql, values).fetchone()[0]
-            teid_s, user_id = db.session.execute(sql_teamsusers, {
+            team_id = db.session.execute(_UPDATE, values).fetchone()[0]
+            teid_s, user_id = db.session.execute(_UPDATE_TEAMSUSERS, {
                 'team_id': str(team_id),
                 'user_id': tlid
             }).fetchone()
-            db.session.commit()
+            unit_of_work.commit()
         except IntegrityError as error:
             raise UnvalidInputException(
                 'Given team leader is already in some team',
@@ -253,6 +324,7 @@ class TeamRepository:
 
         return team_id
 
+    @invalidates_identity_map
     def add_member(self, teid: str, uid: str) -> tuple:
         '''add_member is used to add new members into team
 
@@ -270,18 +342,12 @@ class TeamRepository:
             tuple: user and team ids
         '''
 
-        sql = '''
-            INSERT INTO Teamsusers
-            (team_id, user_id)
-            VALUES (:team_id, :user_id)
-            RETURNING team_id, user_id
-        '''
-
         values = {'team_id': teid, 'user_id': uid}
 
         try:
-            team_id, user_id = db.session.execute(sql, values).fetchone()
-            db.session.commit()
+            team_id, user_id = db.session.execute(_ADD_MEMBER,
+                                                  values).fetchone()
+            unit_of_work.commit()
         except IntegrityError as error:
             raise UnvalidInputException('Given user is already in some team',
                                         source='adding user to team') from error
@@ -294,6 +360,7 @@ class TeamRepository:
 
         return (team_id, user_id)
 
+    @invalidates_identity_map
     def remove_member(self, teid: str, uid: str):
         '''remove_member is used to remove members from the team
 
@@ -306,18 +373,16 @@ class TeamRepository:
                 while interacting with the database
         '''
 
-        sql = '''
-            DELETE FROM Teamsusers
-            WHERE (team_id=:team_id and user_id=:user_id)
-        '''
-
         try:
-            db.session.execute(sql, {'team_id': teid, 'user_id': uid})
-            db.session.commit()
+            db.session.execute(_REMOVE_MEMBER, {
+                'team_id': teid, 'user_id': uid
+            })
+            unit_of_work.commit()
         except Exception as error:
             raise DatabaseException(
                 'While removing members from team') from error
 
+    @invalidates_identity_map
     def remove(self, teid: str):
         '''remove is used to remove feature from the database
 
@@ -329,14 +394,9 @@ class TeamRepository:
                 while interacting with the database
         '''
 
-        sql = '''
-            DELETE FROM Teams
-            WHERE id=:id
-        '''
-
         try:
-            db.session.execute(sql, {'id': teid})
-            db.session.commit()
+            db.session.execute(_REMOVE, {'id': teid})
+            unit_of_work.commit()
         except Exception as error:
             raise DatabaseException('team remove') from error
 
@@ -1,15 +1,29 @@
-from utils.database import db
+from utils.database import db, statement
 from utils.exceptions import DatabaseException, NotExistingException
+from utils.lookup_cache import LookupCache
+
+
+_LOAD_ALL = statement('''
+    SELECT id, name
+    FROM Types
+''')
 
 
 class TypeRepository:
     '''Class for handling Types in the database
+
+    Types are read through process-wide LookupCache, so the
+    table is queried only when it has been changed.
     '''
 
-    def get_all(self) -> [tuple]:
-        '''get_all is used to list of all types
+    def __init__(self):
+        '''Initializes TypeRepository
+        '''
 
-        If no types found, returns empty list.
+        self._cache = LookupCache('types', self._load_all)
+
+    def _load_all(self) -> [tuple]:
+        '''_load_all is used to read all types from the database
 
         Raises:
             DatabaseException: raised if problems occur
@@ -19,23 +33,33 @@ class TypeRepository:
             [tuple]: list of all types
         '''
 
-        sql = '''
-            SELECT id, name 
-            FROM Types
-        '''
-
         try:
-            types = db.session.execute(sql).fetchall()
+            types = db.session.execute(_LOAD_ALL).fetchall()
         except Exception as error:
             raise DatabaseException('While getting all types') from error
 
-        return [(type[0], type[1]) for type in types]
+        return types
+
+    def get_all(self) -> [tuple]:
+        '''get_all is used to list of all types
+
+        If no types found, returns empty list.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: list of all types
+        '''
+
+        return self._cache.get_all()
 
     def get_by_id(self, tyid: str) -> tuple:
         '''get_by_id is used to found type with given id
 
         Args:
-            rid (str): id of the type to be found
+            tyid (str): id of the type to be found
 
         Raises:
             DatabaseException: raised if problems while
@@ -47,27 +71,18 @@ class TypeRepository:
             tuple: type with given id
         '''
 
-        sql = '''
-            SELECT id, name 
-            FROM Types 
-            WHERE id=:id
-        '''
-
-        try:
-            found_type = db.session.execute(sql, {'id': tyid}).fetchone()
-        except Exception as error:
-            raise DatabaseException('While getting the type') from error
+        found_type = self._cache.get(tyid)
 
         if not found_type:
             raise NotExistingException('Type')
 
-        return (found_type[0], found_type[1])
+        return found_type
 
     def get_name(self, tyid: str) -> str:
         '''get_name is used to get name of type with given id
 
         Args:
-            rid (int): id of the type
+            tyid (str): id of the type
 
         Raises:
             DatabaseException: raised if problems while
@@ -79,21 +94,14 @@ class TypeRepository:
             str: found name
         '''
 
-        sql = '''
-            SELECT name 
-            FROM Types 
-            WHERE id=:id
-        '''
-
-        try:
-            name = db.session.execute(sql, {'id': tyid}).fetchone()
-        except Exception as error:
-            raise DatabaseException('While getting type´s name') from error
+        return self.get_by_id(tyid)[1]
 
-        if not name:
-            raise NotExistingException('Type')
+    def invalidate(self):
+        '''invalidate is used to drop cached types, so that
+           they are read again from the database on next use
+        '''
 
-        return name[0]
+        self._cache.invalidate()
 
 
 type_repository = TypeRepository()
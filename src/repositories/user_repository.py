@@ -1,13 +1,159 @@
 import re
+from hashlib import md5
+from sqlalchemy import Integer
 from sqlalchemy.exc import IntegrityError
 from utils.exceptions import DatabaseException, UnvalidInputException, NotExistingException, UsernameDuplicateException
-from utils.database import db
+from utils.database import db, like_patterns, statement
+from utils.identity_map import identity_mapped, invalidates_identity_map
+from utils.pagination import Keyset, Page
+import utils.config as configs
+from utils import unit_of_work
+
+_KEYSET = Keyset(('U.username', 'text'), descending=False)
+
+
+_NEW = statement('''
+    INSERT INTO Users
+    (username, user_role, password_hash, 
+    firstname, lastname, email) 
+    VALUES (:username, :user_role, :password_hash, 
+    :firstname, :lastname, :email) 
+    RETURNING id
+''')
+
+_GET_BY_ID = statement('''
+    SELECT U.id, U.username, U.user_role, R.name, U.password_hash, U.firstname, U.lastname, U.email, PI.image_version, T.id, T.name 
+    FROM Users U
+    LEFT JOIN Teamsusers TU ON U.id = TU.user_id
+    LEFT JOIN Teams T ON TU.team_id = T.id
+    LEFT JOIN ProfileImages PI ON PI.user_id = U.id
+    LEFT JOIN Roles R ON R.id = U.user_role
+    WHERE U.id=:id
+''')
+
+_GET_BY_USERNAME = statement('''
+    SELECT U.id, U.username, U.user_role, R.name, U.password_hash, U.firstname, U.lastname, U.email, PI.image_version, T.id, T.name 
+    FROM Users U
+    LEFT JOIN Teamsusers TU ON U.id = TU.user_id
+    LEFT JOIN Teams T ON TU.team_id = T.id
+    LEFT JOIN ProfileImages PI ON PI.user_id = U.id
+    LEFT JOIN Roles R ON R.id = U.user_role
+    WHERE U.username=:username
+''')
+
+_GET_FULLNAME = statement('''
+    SELECT firstname, lastname 
+    FROM Users 
+    WHERE id=:id
+''')
+
+_GET_PROFILE_IMAGE_VERSION = statement('''
+    SELECT U.id, PI.image_version
+    FROM Users U
+    LEFT JOIN ProfileImages PI ON PI.user_id = U.id
+    WHERE U.id=:id
+''')
+
+_GET_PROFILE_IMAGE = statement('''
+    SELECT I.image_type, V.image_version, I.image_data
+    FROM (
+        SELECT image_type, image_data, size
+        FROM ProfileImageVariants
+        WHERE user_id=:id AND size >= :size
+        UNION ALL
+        SELECT image_type, image_data, NULL
+        FROM ProfileImages
+        WHERE user_id=:id
+    ) I, ProfileImages V
+    WHERE V.user_id=:id
+    ORDER BY I.size NULLS LAST
+    LIMIT 1
+''')
+
+_GET_ALL_BY_TEAM = statement('''
+    SELECT U.id, U.username, U.user_role, R.name, U.password_hash, U.firstname, U.lastname, U.email, PI.image_version, T.id, T.name 
+    FROM Users U
+    LEFT JOIN Teamsusers TU ON U.id = TU.user_id
+    LEFT JOIN Teams T ON TU.team_id = T.id
+    LEFT JOIN ProfileImages PI ON PI.user_id = U.id
+    LEFT JOIN Roles R ON R.id = U.user_role
+    WHERE TU.team_id=:id
+''')
+
+_GET_USERS = statement('''
+    SELECT U.id, U.firstname, U.lastname, PI.image_version
+    FROM Users U
+    LEFT JOIN ProfileImages PI ON PI.user_id = U.id
+''')
+
+_GET_TEAM_USERS = statement('''
+    SELECT U.id, U.firstname, U.lastname, PI.image_version
+    FROM Users U
+    LEFT JOIN Teamsusers TU ON TU.user_id = U.id
+    LEFT JOIN ProfileImages PI ON PI.user_id = U.id
+    WHERE TU.team_id=:id
+''')
+
+_GET_USERS_BY_NAME = statement('''
+    SELECT U.id, U.firstname, U.lastname, PI.image_version
+    FROM Users U
+    LEFT JOIN ProfileImages PI ON PI.user_id = U.id
+    WHERE U.firstname || ' ' || U.lastname ILIKE :contains
+    ORDER BY U.firstname || ' ' || U.lastname ILIKE :prefix DESC, U.firstname, U.lastname, U.id
+    LIMIT :limit
+''', limit=Integer)
+
+_GET_TEAM_USERS_BY_NAME = statement('''
+    SELECT U.id, U.firstname, U.lastname, PI.image_version
+    FROM Users U
+    JOIN Teamsusers TU ON TU.user_id = U.id
+    LEFT JOIN ProfileImages PI ON PI.user_id = U.id
+    WHERE TU.team_id=:id AND U.firstname || ' ' || U.lastname ILIKE :contains
+    ORDER BY U.firstname || ' ' || U.lastname ILIKE :prefix DESC, U.firstname, U.lastname, U.id
+    LIMIT :limit
+''', limit=Integer)
+
+_UPDATE_PROFILE_IMAGE = statement('''
+    INSERT INTO ProfileImages
+    (user_id, image_type, image_data, image_version)
+    VALUES (:user_id, :image_type, :image_data, :image_version)
+    ON CONFLICT (user_id) DO UPDATE
+        SET image_type = excluded.image_type,
+            image_data = excluded.image_data,
+            image_version = excluded.image_version
+    RETURNING user_id
+''')
+
+_UPDATE_PROFILE_IMAGE_REMOVE_THUMBNAILS = statement('''
+    DELETE FROM ProfileImageVariants
+    WHERE user_id=:user_id
+''')
+
+_UPDATE_PROFILE_IMAGE_THUMBNAIL = statement('''
+    INSERT INTO ProfileImageVariants
+    (user_id, size, image_type, image_data)
+    VALUES (:user_id, :size, :image_type, :image_data)
+''')
+
+_UPDATE = statement('''
+    UPDATE Users 
+    SET username=:username, user_role=:user_role, password_hash=:password_hash, 
+    firstname=:firstname, lastname=:lastname, email=:email
+    WHERE id=:id
+    RETURNING id
+''')
+
+_REMOVE = statement('''
+    DELETE FROM Users 
+    WHERE id=:id
+''')
 
 
 class UserRepository:
     '''Class used for handling users in the database
     '''
 
+    @invalidates_identity_map
     def new(self, username: str, user_role: int, password_hash: str,
             firstname: str, lastname: str, email: str) -> str:
         '''new is used to create new users into the database.
@@ -41,18 +187,9 @@ class UserRepository:
             'email': email,
         }
 
-        sql = '''
-            INSERT INTO Users
-            (username, user_role, password_hash, 
-            firstname, lastname, email) 
-            VALUES (:username, :user_role, :password_hash, 
-            :firstname, :lastname, :email) 
-            RETURNING id
-        '''
-
         try:
-            user_id = db.session.execute(sql, values).fetchone()[0]
-            db.session.commit()
+            user_id = db.session.execute(_NEW, values).fetchone()[0]
+            unit_of_work.commit()
         except IntegrityError as error:
             unvalid_email = re.compile(r'.*"users_email_check".*')
             duplicate_username = re.compile(
@@ -76,6 +213,7 @@ class UserRepository:
 
         return user_id
 
+    @identity_mapped
     def get_by_id(self, uid: str) -> tuple:
         '''get_by_id is used to found user with given id
 
@@ -91,26 +229,15 @@ class UserRepository:
             tuple: found user
         '''
 
-        sql = '''
-            SELECT U.id, U.username, U.user_role, R.name, U.password_hash, U.firstname, U.lastname, U.email, PI.image_type, encode(PI.image_data, 'base64'), T.id, T.name 
-            FROM Users U
-            LEFT JOIN Teamsusers TU ON U.id = TU.user_id
-            LEFT JOIN Teams T ON TU.team_id = T.id
-            LEFT JOIN ProfileImages PI ON PI.user_id = U.id
-            LEFT JOIN Roles R ON R.id = U.user_role
-            WHERE U.id=:id
-        '''
-
         try:
-            user = db.session.execute(sql, {'id': uid}).fetchone()
+            user = db.session.execute(_GET_BY_ID, {'id': uid}).fetchone()
         except Exception as error:
             raise DatabaseException('While getting user by id') from error
 
         if not user:
             raise NotExistingException('User')
 
-        return (user[0], user[1], user[2], user[3], user[4], user[5], user[6],
-                user[7], user[8], user[9], user[10], user[11])
+        return user
 
     def get_by_username(self, username: str) -> tuple:
         '''get_by_id is used to found user with given username
@@ -127,29 +254,19 @@ class UserRepository:
             tuple: found user
         '''
 
-        sql = '''
-            SELECT U.id, U.username, U.user_role, R.name, U.password_hash, U.firstname, U.lastname, U.email, PI.image_type, encode(PI.image_data, 'base64'), T.id, T.name 
-            FROM Users U
-            LEFT JOIN Teamsusers TU ON U.id = TU.user_id
-            LEFT JOIN Teams T ON TU.team_id = T.id
-            LEFT JOIN ProfileImages PI ON PI.user_id = U.id
-            LEFT JOIN Roles R ON R.id = U.user_role
-            WHERE U.username=:username
-        '''
-
         values = {'username': username.lower()}
 
         try:
-            user = db.session.execute(sql, values).fetchone()
+            user = db.session.execute(_GET_BY_USERNAME, values).fetchone()
         except Exception as error:
             raise DatabaseException('While getting user by username') from error
 
         if not user:
             raise NotExistingException('User')
 
-        return (user[0], user[1], user[2], user[3], user[4], user[5], user[6],
-                user[7], user[8], user[9], user[10], user[11])
+        return user
 
+    @identity_mapped
     def get_fullname(self, uid: str) -> tuple:
         '''get_fullname is used to get name of user with given id
 
@@ -166,14 +283,8 @@ class UserRepository:
             tuple: found name
         '''
 
-        sql = '''
-            SELECT firstname, lastname 
-            FROM Users 
-            WHERE id=:id
-        '''
-
         try:
-            firstname, lastname = db.session.execute(sql, {
+            firstname, lastname = db.session.execute(_GET_FULLNAME, {
                 'id': uid
             }).fetchone()
         except Exception as error:
@@ -184,9 +295,10 @@ class UserRepository:
 
         return (firstname, lastname)
 
-    def get_profile_image(self, uid: str) -> tuple:
-        '''get_profile_image is used to get profile image
-           of user with given id
+    @identity_mapped
+    def get_profile_image_version(self, uid: str) -> str:
+        '''get_profile_image_version is used to get version of profile
+           image of user with given id, without the image itself
 
         Args:
             uid (str): id of the user
@@ -194,63 +306,119 @@ class UserRepository:
         Raises:
             DatabaseException: raised if problems occur
                 while interacting with the database
+            NotExistingException: raised if user is not
+                found with given id
 
         Returns:
-            tuple: found profile image
+            str: version of the profile image, None if user has none
         '''
 
-        sql = '''
-            SELECT U.id, PI.image_type, encode(PI.image_data, 'base64') 
-            FROM Users U
-            LEFT JOIN ProfileImages PI ON PI.user_id = U.id
-            WHERE U.id=:id
+        try:
+            image = db.session.execute(_GET_PROFILE_IMAGE_VERSION, {
+                'id': uid
+            }).fetchone()
+        except Exception as error:
+            raise DatabaseException(
+                'While getting user´s profile image') from error
+
+        if not image:
+            raise NotExistingException('User')
+
+        return image[1]
+
+    def get_profile_image(self, uid: str, size: int = None) -> tuple:
+        '''get_profile_image is used to get profile image
+           of user with given id
+
+        If size is given, smallest thumbnail at least that size is
+        returned. If there is none, original image is returned.
+
+        Args:
+            uid (str): id of the user
+            size (int, optional): wanted width of the image in pixels.
+                Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            NotExistingException: raised if user has no profile image
+
+        Returns:
+            tuple: type, version and raw bytes of the profile image
         '''
 
         try:
-            user_id, image_type, image_data = db.session.execute(
-                sql, {
-                    'id': uid
-                }).fetchone()
+            image = db.session.execute(_GET_PROFILE_IMAGE, {
+                'id': uid,
+                'size': size
+            }).fetchone()
         except Exception as error:
             raise DatabaseException(
                 'While getting user´s profile image') from error
 
-        if str(user_id) != str(uid):
-            raise DatabaseException('')
+        if not image:
+            raise NotExistingException('Profile image')
 
-        return (image_type, image_data)
+        return (image[0], image[1], bytes(image[2]))
 
-    def get_all(self) -> [tuple]:
-        '''get_all is used to list of all users in the database
+    def get_all(self,
+                after: str = None,
+                before: str = None,
+                limit: int = None) -> Page:
+        '''get_all is used to get one page of users in the database,
+           ordered by username
 
-        If no users found, returns empty list.
+        If no users found, returns empty page.
+
+        Args:
+            after (str, optional): cursor of the user after which
+                the page starts. Defaults to None.
+            before (str, optional): cursor of the user before which
+                the page ends. Defaults to None.
+            limit (int, optional): size of the page.
+                Defaults to page_size of config.
 
         Raises:
             DatabaseException: raised if problems occur
                 while interacting with the database
+            UnvalidInputException: raised if unvalid cursor is given
 
         Returns:
-            [tuple]: list of all users
+            Page: page of users
         '''
 
-        sql = '''
-            SELECT U.id, U.username, U.user_role, R.name, U.password_hash, U.firstname, U.lastname, U.email, PI.image_type, encode(PI.image_data, 'base64'), T.id, T.name 
-            FROM Users U
+        limit = limit or configs.page_size
+        condition, order, values = _KEYSET.clause(after, before)
+
+        sql = f'''
+            WITH page AS (
+                SELECT *
+                FROM Users U
+                WHERE {condition}
+                ORDER BY {order}
+                LIMIT :limit
+            )
+            SELECT U.id, U.username, U.user_role, R.name, U.password_hash, U.firstname, U.lastname, U.email, PI.image_version, T.id, T.name 
+            FROM page U
             LEFT JOIN Teamsusers TU ON U.id = TU.user_id
             LEFT JOIN Teams T ON TU.team_id = T.id
             LEFT JOIN ProfileImages PI ON PI.user_id = U.id
             LEFT JOIN Roles R ON R.id = U.user_role
+            ORDER BY {order}
         '''
 
         try:
-            result = db.session.execute(sql)
+            result = db.session.execute(statement(sql, limit=Integer), {
+                **values, 'limit': limit + 1
+            })
             users = result.fetchall()
         except Exception as error:
             raise DatabaseException('While getting all users') from error
 
-        return [(user[0], user[1], user[2], user[3], user[4], user[5], user[6],
-                 user[7], user[8], user[9], user[10], user[11])
-                for user in users]
+        return _KEYSET.page([(user[0], user[1], user[2], user[3], user[4],
+                              user[5], user[6], user[7], user[8], user[9],
+                              user[10]) for user in users], limit,
+                            lambda user: (user[1],), after, before)
 
     def get_all_by_team(self, teid: str) -> [tuple]:
         '''get_all_by_team is used to list of all users in the database
@@ -269,25 +437,15 @@ class UserRepository:
             [tuple]: list of all users
         '''
 
-        sql = '''
-            SELECT U.id, U.username, U.user_role, R.name, U.password_hash, U.firstname, U.lastname, U.email, PI.image_type, encode(PI.image_data, 'base64'), T.id, T.name 
-            FROM Users U
-            LEFT JOIN Teamsusers TU ON U.id = TU.user_id
-            LEFT JOIN Teams T ON TU.team_id = T.id
-            LEFT JOIN ProfileImages PI ON PI.user_id = U.id
-            LEFT JOIN Roles R ON R.id = U.user_role
-            WHERE TU.team_id=:id
-        '''
-
         try:
-            users = db.session.execute(sql, {'id': teid}).fetchall()
+            users = db.session.execute(_GET_ALL_BY_TEAM, {
+                'id': teid
+            }).fetchall()
         except Exception as error:
             raise DatabaseException(
                 'While getting all users by team') from error
 
-        return [(user[0], user[1], user[2], user[3], user[4], user[5], user[6],
-                 user[7], user[8], user[9], user[10], user[11])
-                for user in users]
+        return users
 
     def get_users(self) -> [tuple]:
         '''get_users is used to get all users for
@@ -300,21 +458,15 @@ class UserRepository:
                 while interacting with the database
 
         Returns:
-            [tuple]: list of user id, name and profile images
-        '''
-
-        sql = '''
-            SELECT U.id, U.firstname, U.lastname, PI.image_type, encode(PI.image_data, 'base64')
-            FROM Users U
-            LEFT JOIN ProfileImages PI ON PI.user_id = U.id
+            [tuple]: list of user id, name and profile image type
         '''
 
         try:
-            users = db.session.execute(sql).fetchall()
+            users = db.session.execute(_GET_USERS).fetchall()
         except Exception as error:
             raise DatabaseException('While getting all users') from error
 
-        return [(user[0], user[1], user[2], user[3], user[4]) for user in users]
+        return users
 
     def get_team_users(self, teid: str) -> [tuple]:
         '''get_team_users is used to get all team´s users for
@@ -330,61 +482,106 @@ class UserRepository:
                 while interacting with the database
 
         Returns:
-            [tuple]: list of user id, name and profile images
+            [tuple]: list of user id, name and profile image type
         '''
 
-        sql = '''
-            SELECT U.id, U.firstname, U.lastname, PI.image_type, encode(PI.image_data, 'base64')
-            FROM Users U
-            LEFT JOIN Teamsusers TU ON TU.user_id = U.id
-            LEFT JOIN ProfileImages PI ON PI.user_id = U.id
-            WHERE TU.team_id=:id
+        try:
+            users = db.session.execute(_GET_TEAM_USERS, {'id': teid}).fetchall()
+        except Exception as error:
+            raise DatabaseException('While getting all users') from error
+
+        return users
+
+    def get_users_by_name(self,
+                          name: str,
+                          teid: str = None,
+                          limit: int = None) -> [tuple]:
+        '''get_users_by_name is used to get users containing given
+           text in their full name for selecting users in the frontend,
+           names starting with it first
+
+        If no users found, returns empty list.
+
+        Args:
+            name (str): text to be found from the full name
+            teid (str, optional): id of the team, if only members
+                of the team are wanted. Defaults to None.
+            limit (int, optional): maximum amount of users.
+                Defaults to autocomplete_limit of config.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: list of user id, name and profile image type
         '''
 
+        values = {**like_patterns(name),
+                  'limit': limit or configs.autocomplete_limit}
         try:
-            users = db.session.execute(sql, {'id': teid}).fetchall()
+            if teid:
+                users = db.session.execute(_GET_TEAM_USERS_BY_NAME, {
+                    **values, 'id': teid
+                }).fetchall()
+            else:
+                users = db.session.execute(_GET_USERS_BY_NAME,
+                                           values).fetchall()
         except Exception as error:
-            raise DatabaseException('While getting all users') from error
+            raise DatabaseException('While getting users') from error
 
-        return [(user[0], user[1], user[2], user[3], user[4]) for user in users]
+        return users
 
-    def update_profile_image(self, uid: str, img_type: str,
-                             img_data: str) -> str:
+    @invalidates_identity_map
+    def update_profile_image(self,
+                             uid: str,
+                             img_type: str,
+                             img_data: bytes,
+                             thumbnails: dict = None) -> str:
         '''update_profile_image is used to update user´s
            profile images into the database
 
+        Previous thumbnails of the user are replaced
+        with given ones in the same transaction. Version of
+        the images is md5 hash of the image.
+
         Args:
             uid (str): uid (str): id of user
-            img_type (str): type of the image.
-            img_data (str): byte data of the image
+            img_type (str): type of the image and its thumbnails
+            img_data (bytes): byte data of the image
+            thumbnails (dict, optional): byte data of thumbnails
+                keyed by their size. Defaults to None.
 
         Raises:
             DatabaseException: raised if problems occurs while
                 saving into the database
         '''
 
-        sql = '''
-            INSERT INTO ProfileImages
-            (user_id, image_type, image_data)
-            VALUES (:user_id, :image_type, :image_data)
-            ON CONFLICT (user_id) DO UPDATE
-                SET image_type = excluded.image_type,
-                    image_data = excluded.image_data
-            RETURNING user_id
-        '''
-
         values = {
             'user_id': uid,
             'image_type': img_type,
-            'image_data': img_data
+            'image_data': img_data,
+            'image_version': md5(img_data).hexdigest()
         }
 
         try:
-            db.session.execute(sql, values)
-            db.session.commit()
+            db.session.execute(_UPDATE_PROFILE_IMAGE, values)
+            db.session.execute(_UPDATE_PROFILE_IMAGE_REMOVE_THUMBNAILS, {
+                'user_id': uid
+            })
+            for size, thumbnail in (thumbnails or {}).items():
+                db.session.execute(
+                    _UPDATE_PROFILE_IMAGE_THUMBNAIL, {
+                        'user_id': uid,
+                        'size': size,
+                        'image_type': img_type,
+                        'image_data': thumbnail
+                    })
+            unit_of_work.commit()
         except Exception as error:
             raise DatabaseException('While updating profile image') from error
 
+    @invalidates_identity_map
     def update(self, uid: str, username: str, user_role: int,
                password_hash: str, firstname: str, lastname: str,
                email: str) -> str:
@@ -419,17 +616,9 @@ class UserRepository:
             'id': uid
         }
 
-        sql = '''
-            UPDATE Users 
-            SET username=:username, user_role=:user_role, password_hash=:password_hash, 
-            firstname=:firstname, lastname=:lastname, email=:email
-            WHERE id=:id
-            RETURNING id
-        '''
-
         try:
-            user_id = db.session.execute(sql, values).fetchone()
-            db.session.commit()
+            user_id = db.session.execute(_UPDATE, values).fetchone()
+            unit_of_work.commit()
         except IntegrityError as error:
             raise UsernameDuplicateException() from error
         except Exception as error:
@@ -437,6 +626,7 @@ class UserRepository:
 
         return user_id[0]
 
+    @invalidates_identity_map
     def remove(self, uid: str):
         '''remove is used to remove feature from the database
 
@@ -448,14 +638,9 @@ class UserRepository:
                 while interacting with the database
         '''
 
-        sql = '''
-            DELETE FROM Users 
-            WHERE id=:id
-        '''
-
         try:
-            db.session.execute(sql, {'id': uid})
-            db.session.commit()
+            db.session.execute(_REMOVE, {'id': uid})
+            unit_of_work.commit()
         except Exception as error:
             raise DatabaseException('While removing the user') from error
 
@@ -0,0 +1,124 @@
+from flask import Blueprint, jsonify, make_response, request, session
+from werkzeug.http import is_resource_modified
+from services.api_service import api_service, RESOURCES
+from utils.exceptions import DatabaseException, NotExistingException, UnvalidInputException
+
+api = Blueprint('api_v1', __name__, url_prefix='/api/v1')
+
+# listing of these resources is shown only for leaders and admins
+_LEADER_LISTINGS = ('teams', 'users')
+_PAGING_ARGS = ('fields', 'after', 'before')
+
+
+def _error(status: int, message: str):
+    return make_response(jsonify({'error': message}), status)
+
+
+def _check_access(resource: str, listing: bool = False):
+    '''_check_access is used to get error response if the resource
+       can not be read by the logged in user, None otherwise
+    '''
+    if 'user' not in session:
+        return _error(401, 'Login required.')
+    if resource not in RESOURCES:
+        return _error(404, f'Error: Resource {resource} not found.')
+    if listing and resource in _LEADER_LISTINGS and session['user_role'] < 2:
+        return _error(403, 'Not enough permissions.')
+    return None
+
+
+def _conditional(get_version, *args):
+    '''_conditional is used to answer 304 Not Modified when client
+       already has the current version, checked without fetching fields
+
+    Args:
+        get_version (function): service method giving ETag and
+            Last-Modified, which is None for pages, so that they are
+            answered 304 only on matching ETag
+        args: arguments for get_version
+
+    Returns:
+        response with status 304 or None if full response is needed
+    '''
+    if not request.if_none_match and not request.if_modified_since:
+        return None
+
+    etag, last_modified = get_version(*args)
+    if is_resource_modified(request.environ, etag,
+                            last_modified=last_modified):
+        return None
+
+    response = make_response('', 304)
+    _set_version(response, etag, last_modified)
+    return response
+
+
+def _set_version(response, etag: str, last_modified):
+    response.set_etag(etag)
+    # werkzeug would date None to the current time
+    if last_modified:
+        response.last_modified = last_modified
+
+
+def _respond(body: dict, etag: str, last_modified):
+    response = jsonify(body)
+    _set_version(response, etag, last_modified)
+    return response
+
+
+def _filters() -> dict:
+    return {
+        name: value
+        for name, value in request.args.items()
+        if name not in _PAGING_ARGS
+    }
+
+
+@api.route('/<resource>', methods=['GET'])
+def get_resources(resource: str):
+    error = _check_access(resource, listing=True)
+    if error:
+        return error
+
+    args = (resource, request.args.get('fields'), _filters(),
+            request.args.get('after'), request.args.get('before'))
+
+    try:
+        not_modified = _conditional(api_service.get_page_version, *args)
+        if not_modified:
+            return not_modified
+        page, etag, last_modified = api_service.get_page(*args)
+    except UnvalidInputException as error:
+        return _error(400, str(error))
+    except DatabaseException as error:
+        return _error(503, str(error))
+
+    return _respond(
+        {
+            'items': page.items,
+            'next_cursor': page.next_cursor,
+            'prev_cursor': page.prev_cursor
+        }, etag, last_modified)
+
+
+@api.route('/<resource>/<uuid:rid>', methods=['GET'])
+def get_resource(resource: str, rid):
+    error = _check_access(resource)
+    if error:
+        return error
+
+    args = (resource, str(rid), request.args.get('fields'))
+
+    try:
+        not_modified = _conditional(api_service.get_version, *args)
+        if not_modified:
+            return not_modified
+        item, etag, last_modified = api_service.get_by_id(*args)
+    except UnvalidInputException as error:
+        return _error(400, str(error))
+    except NotExistingException as error:
+        return _error(404, str(error))
+    except DatabaseException as error:
+        return _error(503, str(error))
+
+    return _respond(item, etag, last_modified)
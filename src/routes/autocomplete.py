@@ -0,0 +1,70 @@
+from flask import jsonify, request, session, abort
+from app import app
+from services.feature_service import feature_service
+from services.project_service import project_service
+from services.user_service import user_service
+from utils.exceptions import DatabaseException, NotExistingException, UnvalidInputException
+
+base_url = '/autocomplete'
+
+
+def _users(name: str) -> [tuple]:
+    '''_users is used to get users with given text in their name,
+       that the logged in user can select, members of own team for
+       basic users
+    '''
+    if session['user_role'] > 1:
+        return user_service.get_users_by_name(name)
+    if session.get('team_id'):
+        return user_service.get_users_by_name(name, session['team_id'])
+    if name.strip() and name.strip().lower() in session['username'].lower():
+        return [(session['user'], session['username'],
+                 user_service.get_profile_image(session['user']))]
+    return []
+
+
+@app.route(f'{base_url}/users', methods=['GET'])
+def autocomplete_users():
+    if 'user' not in session:
+        abort(403)
+
+    try:
+        users = _users(request.args.get('q', ''))
+    except (NotExistingException, UnvalidInputException):
+        abort(400)
+    except DatabaseException:
+        abort(503)
+
+    return jsonify([{
+        'id': str(uid),
+        'name': name,
+        'image': image
+    } for uid, name, image in users])
+
+
+@app.route(f'{base_url}/features', methods=['GET'])
+def autocomplete_features():
+    if 'user' not in session:
+        abort(403)
+
+    try:
+        features = feature_service.get_features_by_name(
+            request.args.get('q', ''))
+    except DatabaseException:
+        abort(503)
+
+    return jsonify([{'id': str(fid), 'name': name} for fid, name in features])
+
+
+@app.route(f'{base_url}/projects', methods=['GET'])
+def autocomplete_projects():
+    if 'user' not in session:
+        abort(403)
+
+    try:
+        projects = project_service.get_projects_by_name(
+            request.args.get('q', ''))
+    except DatabaseException:
+        abort(503)
+
+    return jsonify([{'id': str(pid), 'name': name} for pid, name in projects])
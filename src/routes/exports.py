@@ -0,0 +1,30 @@
+from flask import Response, redirect, request, session, flash, stream_with_context
+from app import app
+from services.export_service import export_service, MIMETYPES
+from utils.exceptions import UnvalidInputException
+
+base_url = '/exports'
+
+
+@app.route(f'{base_url}/<target>.<file_format>', methods=['GET'])
+def export(target, file_format):
+    if 'user' not in session or session['user_role'] < 2:
+        flash('Not enough permissions.', 'is-danger')
+        return redirect('/')
+
+    try:
+        chunks = export_service.export(target, file_format,
+                                       request.args.get('project'),
+                                       request.args.get('assignee'),
+                                       request.args.get('start'),
+                                       request.args.get('end'))
+    except UnvalidInputException as error:
+        flash(str(error), 'is-danger')
+        return redirect('/')
+
+    return Response(stream_with_context(chunks),
+                    mimetype=MIMETYPES[file_format],
+                    headers={
+                        'Content-Disposition':
+                            f'attachment; filename={target}.{file_format}'
+                    })
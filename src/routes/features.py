@@ -1,7 +1,6 @@
 from flask import redirect, render_template, request, session, abort, flash
 from app import app
 from services.feature_service import feature_service
-from services.project_service import project_service
 from services.status_service import status_service
 from services.type_service import type_service
 from services.user_service import user_service
@@ -14,12 +13,18 @@ base_url = '/features'
 @app.route(f'{base_url}', methods=['GET'])
 def features():
     try:
-        all_features = feature_service.get_all()
+        page = feature_service.get_all_summaries(request.args.get('after'),
+                                                 request.args.get('before'),
+                                                 request.args.get('flag'))
+    except UnvalidInputException as error:
+        flash(str(error), 'is-danger')
+        return redirect(base_url)
     except DatabaseException as error:
         flash(str(error), 'is-danger')
         return redirect('/')
 
-    return render_template('features/features.html', features=all_features)
+    return render_template('features/features.html', features=page.items,
+                           page=page)
 
 
 @app.route(f'{base_url}/<uuid:feature_id>', methods=['GET'])
@@ -53,22 +58,11 @@ def edit_feature(feature_id):
 
         # GET shows feature
         if request.method == 'GET':
-            if session['user_role'] == 1:
-                try:
-                    users = user_service.get_team_users(session['team_id'])
-                except (UnvalidInputException, NotExistingException):
-                    users = [(session['user'], session['username'],
-                              user_service.get_profile_image(session['user']))]
-            else:
-                users = user_service.get_users()
-            projects = project_service.get_projects()
             statuses = status_service.get_all()
             types = type_service.get_all()
 
             return render_template('features/features_edit.html',
                                    feature=feature,
-                                   users=users,
-                                   projects=projects,
                                    statuses=statuses,
                                    types=types)
 
@@ -98,21 +92,10 @@ def create_feature():
     # GET shows creation page
     try:
         if request.method == 'GET':
-            if session['user_role'] == 1:
-                try:
-                    users = user_service.get_team_users(session['team_id'])
-                except (UnvalidInputException, NotExistingException):
-                    users = [(session['user'], session['username'],
-                              user_service.get_profile_image(session['user']))]
-            else:
-                users = user_service.get_users()
-            projects = project_service.get_projects()
             statuses = status_service.get_all()
             types = type_service.get_all()
 
             return render_template('features/features_add.html',
-                                   users=users,
-                                   projects=projects,
                                    statuses=statuses,
                                    types=types)
 
@@ -0,0 +1,50 @@
+from io import TextIOWrapper
+from flask import redirect, render_template, request, session, abort, flash
+from app import app
+from services.import_service import import_service
+from utils.exceptions import DatabaseException, UnvalidInputException
+from utils import unit_of_work
+
+base_url = '/imports'
+
+
+@app.route(f'{base_url}', methods=['GET', 'POST'])
+def imports():
+    if 'user' not in session or session['user_role'] < 3:
+        flash('Not enough permissions.', 'is-danger')
+        return redirect('/')
+
+    # GET shows import form
+    if request.method == 'GET':
+        return render_template('imports/imports.html')
+
+    # POST imports uploaded file
+    if session['token'] != request.form['token']:
+        abort(403)
+
+    target = request.form.get('target')
+    upload = request.files.get('file')
+    if target not in ('tasks', 'comments') or not upload:
+        flash('Choose what to import and the CSV file.', 'is-danger')
+        return redirect(base_url)
+
+    file = TextIOWrapper(upload.stream, encoding='utf-8-sig', newline='')
+    try:
+        # import is committed as soon as all rows are loaded
+        with unit_of_work.immediate():
+            if target == 'tasks':
+                result = import_service.import_tasks(file)
+            else:
+                result = import_service.import_comments(file)
+    except (UnvalidInputException, DatabaseException) as error:
+        flash(str(error), 'is-danger')
+        return redirect(base_url)
+
+    if result.succeeded:
+        flash(f'Imported {result.imported} {result.target} successfully',
+              'is-success')
+    else:
+        flash(f'Nothing imported, {len(result.errors)} unvalid rows',
+              'is-danger')
+
+    return render_template('imports/imports.html', result=result)
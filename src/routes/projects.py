@@ -2,6 +2,7 @@ from flask import redirect, render_template, request, session, abort, flash
 from app import app
 from services.project_service import project_service
 from services.user_service import user_service
+from services.statistics_service import statistics_service
 from utils.exceptions import UnvalidInputException, NotExistingException, EmptyValueException, DatabaseException
 
 base_url = '/projects'
@@ -10,12 +11,18 @@ base_url = '/projects'
 @app.route(f'{base_url}', methods=['GET'])
 def projects():
     try:
-        all_projects = project_service.get_all()
+        page = project_service.get_all_summaries(request.args.get('after'),
+                                                 request.args.get('before'),
+                                                 request.args.get('flag'))
+    except UnvalidInputException as error:
+        flash(str(error), 'is-danger')
+        return redirect(base_url)
     except DatabaseException as error:
         flash(str(error), 'is-danger')
         return redirect(base_url)
 
-    return render_template('projects/projects.html', projects=all_projects)
+    return render_template('projects/projects.html', projects=page.items,
+                           page=page)
 
 
 @app.route(f'{base_url}/<uuid:project_id>', methods=['GET'])
@@ -24,6 +31,12 @@ def view_project(project_id):
         project = project_service.get_by_id(project_id)
         project_owner_profile_image = user_service.get_profile_image(
             project.project_owner_id)
+        by_feature = statistics_service.get_time_spent_by_project_features(
+            project_id)
+        by_member = statistics_service.get_time_spent_by_project_members(
+            project_id)
+        by_status = statistics_service.get_time_spent_by_project_statuses(
+            project_id)
     except (NotExistingException, UnvalidInputException,
             DatabaseException) as error:
         flash(str(error), 'is-danger')
@@ -32,7 +45,10 @@ def view_project(project_id):
     return render_template(
         'projects/projects_view.html',
         project=project,
-        project_owner_profile_image=project_owner_profile_image)
+        project_owner_profile_image=project_owner_profile_image,
+        by_feature=by_feature,
+        by_member=by_member,
+        by_status=by_status)
 
 
 @app.route(f'{base_url}/edit/<uuid:project_id>', methods=['GET', 'POST'])
@@ -47,18 +63,8 @@ def edit_project(project_id):
 
         # GET shows edit page
         if request.method == 'GET':
-            if session['user_role'] == 1:
-                try:
-                    users = user_service.get_team_users(session['team_id'])
-                except (UnvalidInputException, NotExistingException):
-                    users = [(session['user'], session['username'],
-                              user_service.get_profile_image(session['user']))]
-            else:
-                users = user_service.get_users()
-
             return render_template('projects/projects_edit.html',
-                                   project=project,
-                                   users=users)
+                                   project=project)
         # POST updates project
         if request.method == 'POST':
             if session['token'] != request.form['token']:
@@ -84,17 +90,7 @@ def create_project():
     try:
         # GET shows creation page
         if request.method == 'GET':
-
-            if session['user_role'] == 1:
-                try:
-                    users = user_service.get_team_users(session['team_id'])
-                except (UnvalidInputException, NotExistingException):
-                    users = [(session['user'], session['username'],
-                              user_service.get_profile_image(session['user']))]
-            else:
-                users = user_service.get_users()
-
-            return render_template('projects/projects_add.html', users=users)
+            return render_template('projects/projects_add.html')
 
         # POST creates new project
         if request.method == 'POST':
@@ -0,0 +1,27 @@
+from flask import redirect, render_template, request, session, flash
+from app import app
+from services.search_service import search_service
+from utils.exceptions import UnvalidInputException, EmptyValueException, DatabaseException
+
+base_url = '/search'
+
+
+@app.route(f'{base_url}', methods=['GET'])
+def search():
+    if 'user' not in session:
+        flash('Not enough permissions.', 'is-danger')
+        return redirect('/')
+
+    try:
+        page = search_service.search(request.args.get('q'),
+                                     request.args.get('after'),
+                                     request.args.get('before'))
+    except (EmptyValueException, UnvalidInputException) as error:
+        flash(str(error), 'is-danger')
+        return redirect('/')
+    except DatabaseException as error:
+        flash(str(error), 'is-danger')
+        return redirect('/')
+
+    return render_template('search/search.html', results=page.items,
+                           page=page)
@@ -1,6 +1,5 @@
 from flask import redirect, render_template, request, session, abort, flash
 from app import app
-from services.feature_service import feature_service
 from services.user_service import user_service
 from services.task_service import task_service
 from services.type_service import type_service
@@ -14,11 +13,16 @@ base_url = '/tasks'
 @app.route(f'{base_url}', methods=['GET'])
 def tasks():
     try:
-        all_tasks = task_service.get_all()
+        page = task_service.get_all_summaries(request.args.get('after'),
+                                              request.args.get('before'),
+                                              request.args.get('flag'))
+    except UnvalidInputException as error:
+        flash(str(error), 'is-danger')
+        return redirect(base_url)
     except DatabaseException as error:
         flash(str(error), 'is-danger')
         return redirect('/')
-    return render_template('tasks/tasks.html', tasks=all_tasks)
+    return render_template('tasks/tasks.html', tasks=page.items, page=page)
 
 
 @app.route(f'{base_url}/<uuid:task_id>', methods=['GET', 'POST'])
@@ -51,22 +55,11 @@ def edit_task(task_id):
 
         # GET shows task
         if request.method == 'GET':
-            if session['user_role'] == 1:
-                try:
-                    users = user_service.get_team_users(session['team_id'])
-                except (UnvalidInputException, NotExistingException):
-                    users = [(session['user'], session['username'],
-                              user_service.get_profile_image(session['user']))]
-            else:
-                users = user_service.get_users()
-            features = feature_service.get_features()
             statuses = status_service.get_all()
             types = type_service.get_all()
 
             return render_template('tasks/tasks_edit.html',
                                    task=task,
-                                   users=users,
-                                   features=features,
                                    statuses=statuses,
                                    types=types)
 
@@ -92,26 +85,59 @@ def edit_task(task_id):
         return redirect(base_url)
 
 
+@app.route(f'{base_url}/bulk-edit', methods=['GET', 'POST'])
+def bulk_edit_tasks():
+    if 'user' not in session or session['user_role'] < 2:
+        abort(403)
+
+    try:
+        # GET shows values to set for selected tasks
+        if request.method == 'GET':
+            task_ids = request.args.getlist('task_id')
+            if not task_ids:
+                flash('Select tasks to edit.', 'is-danger')
+                return redirect(base_url)
+
+            return render_template('tasks/tasks_bulk_edit.html',
+                                   task_ids=task_ids,
+                                   statuses=status_service.get_all())
+
+        # POST updates selected tasks
+        if request.method == 'POST':
+            if session['token'] != request.form['token']:
+                abort(403)
+
+            task_ids = request.form.getlist('task_id')
+            updated_tasks = task_service.bulk_update(
+                task_ids, session['user'], session['user_role'] > 2,
+                request.form.get('status'), request.form.get('assignee_id'),
+                request.form.get('priority'))
+
+            skipped = len(set(task_ids)) - len(updated_tasks)
+            if skipped:
+                flash(
+                    f'Saved {len(updated_tasks)} tasks, {skipped} tasks '
+                    'not found', 'is-danger')
+            else:
+                flash(f'Saved {len(updated_tasks)} tasks successfully',
+                      'is-success')
+            return redirect(base_url)
+
+    except (NotExistingException, EmptyValueException, UnvalidInputException,
+            DatabaseException) as error:
+        flash(str(error), 'is-danger')
+        return redirect(base_url)
+
+
 @app.route(f'{base_url}/add', methods=['GET', 'POST'])
 def create_task():
     try:
         # GET shows creation page
         if request.method == 'GET':
-            if session['user_role'] == 1:
-                try:
-                    users = user_service.get_team_users(session['team_id'])
-                except (UnvalidInputException, NotExistingException):
-                    users = [(session['user'], session['username'],
-                              user_service.get_profile_image(session['user']))]
-            else:
-                users = user_service.get_users()
-            features = feature_service.get_features()
             statuses = status_service.get_all()
             types = type_service.get_all()
 
             return render_template('tasks/tasks_add.html',
-                                   users=users,
-                                   features=features,
                                    statuses=statuses,
                                    types=types)
 
@@ -2,6 +2,7 @@ from flask import redirect, render_template, request, session, abort, flash
 from app import app
 from services.user_service import user_service
 from services.team_service import team_service
+from services.statistics_service import statistics_service
 from utils.exceptions import NotExistingException, EmptyValueException, DatabaseException, UnvalidInputException
 
 base_url = '/teams'
@@ -27,6 +28,12 @@ def view_team(team_id):
         team = team_service.get_by_id(team_id)
         team_leader_profile_image = user_service.get_profile_image(
             team.team_leader_id)
+        by_member = statistics_service.get_time_spent_by_team_members(
+            team_id)
+        by_project = statistics_service.get_time_spent_by_team_projects(
+            team_id)
+        by_status = statistics_service.get_time_spent_by_team_statuses(
+            team_id)
     except (NotExistingException, UnvalidInputException,
             DatabaseException) as error:
         flash(str(error), 'is-danger')
@@ -34,7 +41,34 @@ def view_team(team_id):
 
     return render_template('teams/teams_view.html',
                            team=team,
-                           team_leader_profile_image=team_leader_profile_image)
+                           team_leader_profile_image=team_leader_profile_image,
+                           by_member=by_member,
+                           by_project=by_project,
+                           by_status=by_status)
+
+
+@app.route(f'{base_url}/<uuid:team_id>/timesheet', methods=['GET'])
+def team_timesheet(team_id):
+    try:
+        team = team_service.get_by_id(team_id)
+
+        if team.team_leader_id != session['user'] and session['user_role'] < 2:
+            flash('Not enough permissions.', 'is-danger')
+            return redirect('/')
+
+        timesheet = statistics_service.get_timesheet(team_id,
+                                                     request.args.get('start'),
+                                                     request.args.get('end'))
+    except UnvalidInputException as error:
+        flash(str(error), 'is-danger')
+        return redirect(f'{base_url}/{team_id}/timesheet')
+    except (NotExistingException, DatabaseException) as error:
+        flash(str(error), 'is-danger')
+        return redirect(base_url)
+
+    return render_template('teams/teams_timesheet.html',
+                           team=team,
+                           timesheet=timesheet)
 
 
 @app.route(f'{base_url}/edit/<uuid:team_id>', methods=['GET', 'POST'])
@@ -1,6 +1,8 @@
 import os
-from flask import redirect, render_template, request, session, abort, flash
+from flask import redirect, render_template, request, session, abort, flash, make_response
+from werkzeug.http import is_resource_modified
 from app import app
+import utils.config as configs
 from services.user_service import user_service
 from services.role_service import role_service
 from utils.exceptions import NotExistingException, UnvalidInputException, LoginException, UsernameDuplicateException, ValueShorterThanException, EmptyValueException, DatabaseException
@@ -41,11 +43,15 @@ def users():
         return redirect('/')
 
     try:
-        all_users = user_service.get_all()
+        page = user_service.get_all(request.args.get('after'),
+                                    request.args.get('before'))
+    except UnvalidInputException as error:
+        flash(str(error), 'is-danger')
+        return redirect(base_url)
     except DatabaseException as error:
         flash(str(error), 'is-danger')
         return redirect(base_url)
-    return render_template('users/users.html', users=all_users)
+    return render_template('users/users.html', users=page.items, page=page)
 
 
 @app.route(f'{base_url}/<uuid:user_id>', methods=['GET', 'POST'])
@@ -60,6 +66,39 @@ def view_user(user_id):
     return render_template('users/users_view.html', user=user)
 
 
+def _avatar_headers(response, img_version: str):
+    # versioned addresses change with the image, so they are not revalidated
+    if request.args.get('v') == img_version:
+        max_age = f'{configs.avatar_versioned_max_age}, immutable'
+    else:
+        max_age = configs.avatar_max_age
+    response.headers['Cache-Control'] = f'private, max-age={max_age}'
+    response.set_etag(img_version)
+    return response
+
+
+@app.route(f'{base_url}/<uuid:user_id>/avatar', methods=['GET'])
+def user_avatar(user_id):
+    if 'user' not in session:
+        abort(403)
+
+    try:
+        if request.if_none_match:
+            img_version = user_service.get_avatar_version(user_id)
+            if not is_resource_modified(request.environ, img_version):
+                return _avatar_headers(make_response('', 304), img_version)
+        img_type, img_version, img_data = user_service.get_avatar(
+            user_id, request.args.get('size', type=int))
+    except (NotExistingException, UnvalidInputException):
+        abort(404)
+    except DatabaseException:
+        abort(503)
+
+    response = make_response(img_data)
+    response.headers['Content-Type'] = img_type
+    return _avatar_headers(response, img_version)
+
+
 @app.route(f'{base_url}/edit/<uuid:user_id>', methods=['GET', 'POST'])
 def edit_user(user_id):
     try:
@@ -0,0 +1,261 @@
+from datetime import datetime
+from decimal import Decimal
+from hashlib import sha256
+from html import unescape
+from uuid import UUID
+
+from repositories.api_repository import api_repository, ApiRepository, FIELDS, FILTERS
+
+from utils.exceptions import NotExistingException, UnvalidInputException
+from utils.pagination import Page
+from utils.validators import validate_flag, validate_uuid4
+
+RESOURCES = tuple(FIELDS)
+
+
+def _json_value(value):
+    '''_json_value is used to convert column value into value
+       that can be written as JSON
+
+    Args:
+        value: value of a column
+
+    Returns:
+        value as str, int, float, bool or None
+    '''
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    return value
+
+
+def _version(parts: list, rows: list, width: int) -> tuple:
+    '''_version is used to get ETag and Last-Modified of rows
+
+    ETag is calculated from version columns and keys of rows, which
+    are the same whether fields are selected or not, so it can be
+    checked without fetching fields.
+
+    Args:
+        parts (list): values identifying the response, like resource
+            name, fields and cursors
+        rows (list): rows with versions, keys and fields
+        width (int): amount of field columns in rows
+
+    Returns:
+        tuple: ETag as str and Last-Modified as datetime,
+            None if there are no rows
+    '''
+    digest = sha256(repr(parts).encode())
+    for row in rows:
+        digest.update(repr(tuple(row[:len(row) - width])).encode())
+
+    last_modified = max((row[0] for row in rows), default=None)
+    return digest.hexdigest()[:32], last_modified
+
+
+def _page_etag(parts: list, page: Page, width: int) -> str:
+    '''_page_etag is used to get ETag of a page, which covers also
+       its cursors, so that rows added before or after the page change
+       it
+
+    Pages have no Last-Modified, because rows deleted from the page or
+    leaving its filters do not change the times of the rows left.
+    '''
+    etag, _ = _version([*parts, page.next_cursor, page.prev_cursor],
+                       page.items, width)
+    return etag
+
+
+class ApiService:
+    '''Class used for reading projects, features, tasks, comments,
+       teams and users for the JSON API
+    '''
+
+    def __init__(self,
+                 default_api_repository: ApiRepository = api_repository):
+        '''Initializes ApiService
+
+        Args:
+            default_api_repository (ApiRepository, optional):
+                interaction module with database for the API.
+                Defaults to api_repository.
+        '''
+        self._api_repository = default_api_repository
+
+    def get_page(self,
+                 name: str,
+                 fields: str = None,
+                 filters: dict = None,
+                 after: str = None,
+                 before: str = None) -> tuple:
+        '''get_page is used to get one page of resources as dictionaries
+
+        Args:
+            name (str): name of the resource, one of RESOURCES
+            fields (str, optional): comma separated names of fields
+                to include. Defaults to None, which includes all.
+            filters (dict, optional): values by names of filters.
+                Defaults to None.
+            after (str, optional): cursor of the resource after which
+                the page starts. Defaults to None.
+            before (str, optional): cursor of the resource before which
+                the page ends. Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            NotExistingException: raised if resource is not found
+            UnvalidInputException: raised if unvalid fields, filters
+                or cursor are given
+
+        Returns:
+            tuple: Page of dictionaries, ETag and Last-Modified,
+                which is always None for pages
+        '''
+
+        fields = self._fields(name, fields)
+        filters = self._filters(name, filters)
+        page = self._api_repository.get_page(name, fields, filters, after,
+                                             before)
+        etag = _page_etag(
+            [name, fields, sorted(filters.items()), after, before], page,
+            len(fields))
+
+        return (page.map(lambda row: self._to_dict(name, fields, row)), etag,
+                None)
+
+    def get_page_version(self,
+                         name: str,
+                         fields: str = None,
+                         filters: dict = None,
+                         after: str = None,
+                         before: str = None) -> tuple:
+        '''get_page_version is used to get ETag and Last-Modified of
+           a page without fetching its fields
+
+        Args:
+            same as in get_page
+
+        Raises:
+            same as in get_page
+
+        Returns:
+            tuple: ETag and Last-Modified, same as given by get_page
+        '''
+
+        fields = self._fields(name, fields)
+        filters = self._filters(name, filters)
+        page = self._api_repository.get_page(name, (), filters, after, before)
+
+        return _page_etag(
+            [name, fields, sorted(filters.items()), after, before], page,
+            0), None
+
+    def get_by_id(self, name: str, rid: str, fields: str = None) -> tuple:
+        '''get_by_id is used to get one resource as dictionary
+
+        Args:
+            name (str): name of the resource, one of RESOURCES
+            rid (str): id of the resource
+            fields (str, optional): comma separated names of fields
+                to include. Defaults to None, which includes all.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            NotExistingException: raised if resource is not found
+            UnvalidInputException: raised if unvalid fields are given
+
+        Returns:
+            tuple: dictionary, ETag and Last-Modified
+        '''
+
+        fields = self._fields(name, fields)
+        row = self._get_row(name, rid, fields)
+        etag, last_modified = _version([name, fields, str(rid)], [row],
+                                       len(fields))
+
+        return self._to_dict(name, fields, row), etag, last_modified
+
+    def get_version(self, name: str, rid: str, fields: str = None) -> tuple:
+        '''get_version is used to get ETag and Last-Modified of
+           one resource without fetching its fields
+
+        Args:
+            same as in get_by_id
+
+        Raises:
+            same as in get_by_id
+
+        Returns:
+            tuple: ETag and Last-Modified, same as given by get_by_id
+        '''
+
+        fields = self._fields(name, fields)
+        row = self._get_row(name, rid, ())
+
+        return _version([name, fields, str(rid)], [row], 0)
+
+    def _get_row(self, name: str, rid: str, fields: tuple) -> tuple:
+        if not validate_uuid4(rid):
+            raise UnvalidInputException(reason='unvalid formatting',
+                                        source='id')
+
+        row = self._api_repository.get_by_id(name, str(rid), fields)
+        if not row:
+            raise NotExistingException(name[:-1].capitalize())
+        return row
+
+    @staticmethod
+    def _fields(name: str, fields: str = None) -> tuple:
+        '''_fields is used to validate asked fields, id of the
+           resource is always included first
+        '''
+        if name not in FIELDS:
+            raise NotExistingException('Resource')
+
+        if not fields:
+            return FIELDS[name]
+
+        asked = [field.strip() for field in fields.split(',') if field.strip()]
+        for field in asked:
+            if field not in FIELDS[name]:
+                raise UnvalidInputException(reason=f'unknown field {field}',
+                                            source='fields')
+
+        return tuple(dict.fromkeys([FIELDS[name][0], *asked]))
+
+    @staticmethod
+    def _filters(name: str, filters: dict = None) -> dict:
+        '''_filters is used to validate names and values of filters
+        '''
+        filters = filters or {}
+        for filter_name, value in filters.items():
+            if filter_name not in FILTERS[name]:
+                raise UnvalidInputException(
+                    reason=f'unknown filter {filter_name}', source='filters')
+            if filter_name == 'flag':
+                if not validate_flag(value):
+                    raise UnvalidInputException(reason='unvalid flag',
+                                                source='flag')
+            elif not validate_uuid4(value):
+                raise UnvalidInputException(reason='unvalid formatting',
+                                            source=filter_name)
+
+        return dict(filters)
+
+    @staticmethod
+    def _to_dict(name: str, fields: tuple, row: tuple) -> dict:
+        values = dict(
+            zip(fields, map(_json_value, row[len(row) - len(fields):])))
+        # comments are stored escaped for the templates
+        if name == 'comments' and values.get('comment'):
+            values['comment'] = unescape(values['comment'])
+        return values
+
+
+api_service = ApiService()
@@ -1,11 +1,9 @@
 from entities.comment import Comment
 from repositories.comment_repository import comment_repository, CommentRepository
-from repositories.feature_repository import feature_repository, FeatureRepository
-from repositories.user_repository import user_repository, UserRepository
-from repositories.task_repository import task_repository, TaskRepository
 from utils.exceptions import EmptyValueException, UnvalidInputException, NotExistingException
 from utils.validators import validate_uuid4
-from utils.helpers import fullname
+from utils.pagination import Page
+from utils.row_mapper import to_comment
 
 
 class CommentService:
@@ -15,9 +13,6 @@ class CommentService:
     def __init__(
         self,
         default_comment_repository: CommentRepository = comment_repository,
-        default_feature_repository: FeatureRepository = feature_repository,
-        default_task_repository: TaskRepository = task_repository,
-        default_user_repository: UserRepository = user_repository,
     ):
         '''Initializes CommentService
 
@@ -25,21 +20,9 @@ class CommentService:
             default_comment_repository (CommentRepository, optional):
                 interaction module with database for comments.
                 Defaults to comment_repository.
-            default_feature_repository (FeatureRepository, optional):
-                interaction module with database for features.
-                Defaults to feature_repository.
-            default_task_repository (TaskRepository, optional):
-                interaction module with database for tasks.
-                Defaults to task_repository.
-            default_user_repository (UserRepository, optional):
-                interaction module with database for users.
-                Defaults to user_repository.
         '''
 
         self._comment_repository = default_comment_repository
-        self._feature_repository = default_feature_repository
-        self._task_repository = default_task_repository
-        self._user_repository = default_user_repository
 
     def new(self,
             aid: str,
@@ -79,10 +62,6 @@ class CommentService:
         if not validate_uuid4(aid):
             raise UnvalidInputException('comment´s assignee id')
 
-        aname = self._user_repository.get_fullname(aid)
-        if not aname:
-            raise NotExistingException('comment´s assignee')
-
         try:
             tspent = float(tspent)
         except ValueError as error:
@@ -96,54 +75,23 @@ class CommentService:
             if not validate_uuid4(fid):
                 raise UnvalidInputException('comment´s feature id')
 
-            fname = self._feature_repository.get_name(fid)
-
-            if not fname:
-                raise NotExistingException('comment´s related feature')
-
-            comment_id, created, updated_on = self._comment_repository.new(
-                aid,
-                comment,
-                tspent,
-                fid=fid,
-            )
-            created_comment = Comment(comment_id,
-                                      aid,
-                                      aname,
-                                      tspent,
-                                      comment,
-                                      created,
-                                      updated_on,
-                                      fid=fid,
-                                      fname=fname)
+            created_comment = self._comment_repository.new(aid,
+                                                           comment,
+                                                           tspent,
+                                                           fid=fid)
         elif tid:
             if not validate_uuid4(tid):
                 raise UnvalidInputException('comment´s task id')
 
-            tname = self._task_repository.get_name(tid)
-
-            if not tname:
-                raise NotExistingException('comment´s related task')
-
-            comment_id, created, updated_on = self._comment_repository.new(
-                aid,
-                comment,
-                tspent,
-                tid=tid,
-            )
-            created_comment = Comment(comment_id,
-                                      aid,
-                                      aname,
-                                      tspent,
-                                      comment,
-                                      created,
-                                      updated_on,
-                                      tid=tid,
-                                      tname=tname)
+            created_comment = self._comment_repository.new(aid,
+                                                           comment,
+                                                           tspent,
+                                                           tid=tid)
         else:
             raise EmptyValueException(
                 'Adding comment', 'either feature or task id needs to be given')
-        return created_comment
+
+        return to_comment(created_comment)
 
     def get_all_by_feature_id(self, fid: str) -> [Comment]:
         '''get_all_by_feature_id is used to get list of all comments
@@ -167,16 +115,7 @@ class CommentService:
             raise UnvalidInputException('comment´s feature id')
 
         comments = [
-            Comment(comment[1],
-                    comment[2],
-                    fullname(comment[3], comment[4]),
-                    comment[5],
-                    comment[6],
-                    comment[7],
-                    comment[8],
-                    fid=comment[9],
-                    fname=comment[10],
-                    mode=comment[0])
+            to_comment(comment)
             for comment in self._comment_repository.get_all_by_feature_id(fid)
         ]
 
@@ -204,28 +143,19 @@ class CommentService:
             raise UnvalidInputException('comment´s task id')
 
         comments = comments = [
-            Comment(comment[1],
-                    comment[2],
-                    fullname(comment[3], comment[4]),
-                    comment[5],
-                    comment[6],
-                    comment[7],
-                    comment[8],
-                    tid=comment[9],
-                    tname=comment[10],
-                    mode=comment[0])
+            to_comment(comment)
             for comment in self._comment_repository.get_all_by_task_id(tid)
         ]
         return comments
 
-    def get_all_by_assignee(self, aid: str) -> [Comment]:
-        '''get_all_by_assignee is used to get list of all comments
-           associated with given assignee´s id in the database.
+    def get_all_by_feature_ids(self, fids: [str]) -> dict:
+        '''get_all_by_feature_ids is used to get comments of several
+           features with one query, grouped by feature id.
 
-           If no comments found, returns empty list.
+           Features without comments are not included in returned dict.
 
         Args:
-            aid (str): id of the related assignee
+            fids ([str]): ids of the related features
 
         Raises:
             DatabaseException: raised if problems occur
@@ -234,38 +164,75 @@ class CommentService:
                 id is given
 
         Returns:
-            [Comment]: list of found comments
+            dict: lists of found comments keyed by feature id
         '''
-        if not validate_uuid4(aid):
-            raise UnvalidInputException('comment´s assignee id')
+        if not all(validate_uuid4(fid) for fid in fids):
+            raise UnvalidInputException('comment´s feature id')
 
-        comments = self._comment_repository.get_all_by_assignee(aid)
-        comments = [
-            Comment(comment[1],
-                    comment[2],
-                    fullname(comment[3], comment[4]),
-                    comment[5],
-                    comment[6],
-                    comment[7],
-                    comment[8],
-                    fid=comment[9],
-                    fname=comment[10],
-                    mode=comment[0]) if comment[0] == 'features' else Comment(
-                        comment[1],
-                        comment[2],
-                        fullname(comment[3], comment[4]),
-                        comment[5],
-                        comment[6],
-                        comment[7],
-                        comment[8],
-                        tid=comment[9],
-                        tname=comment[10],
-                        mode=comment[0])
-            for comment in self._comment_repository.get_all_by_assignee(aid)
-        ]
+        comments = {}
+        for comment in self._comment_repository.get_all_by_feature_ids(fids):
+            comments.setdefault(comment[9], []).append(to_comment(comment))
+
+        return comments
+
+    def get_all_by_task_ids(self, tids: [str]) -> dict:
+        '''get_all_by_task_ids is used to get comments of several
+           tasks with one query, grouped by task id.
+
+           Tasks without comments are not included in returned dict.
+
+        Args:
+            tids ([str]): ids of the related tasks
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid
+                id is given
+
+        Returns:
+            dict: lists of found comments keyed by task id
+        '''
+        if not all(validate_uuid4(tid) for tid in tids):
+            raise UnvalidInputException('comment´s task id')
+
+        comments = {}
+        for comment in self._comment_repository.get_all_by_task_ids(tids):
+            comments.setdefault(comment[9], []).append(to_comment(comment))
 
         return comments
 
+    def get_all_by_assignee(self,
+                            aid: str,
+                            after: str = None,
+                            before: str = None) -> Page:
+        '''get_all_by_assignee is used to get one page of comments
+           associated with given assignee´s id, newest first
+
+           If no comments found, returns empty page.
+
+        Args:
+            aid (str): id of the related assignee
+            after (str, optional): cursor of the comment after which
+                the page starts. Defaults to None.
+            before (str, optional): cursor of the comment before which
+                the page ends. Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid
+                id or cursor is given
+
+        Returns:
+            Page: page of found comments as Comment objects
+        '''
+        if not validate_uuid4(aid):
+            raise UnvalidInputException('comment´s assignee id')
+
+        return self._comment_repository.get_all_by_assignee(
+            aid, after, before).map(to_comment)
+
     def get_by_id(self, cid: str) -> Comment:
         '''get_by_id is used to find exact comment with
            given id from the database
@@ -292,26 +259,7 @@ class CommentService:
         if not comment:
             raise NotExistingException('Comment')
 
-        if comment[0] == 'features':
-            return Comment(comment[1],
-                           comment[2],
-                           fullname(comment[3], comment[4]),
-                           comment[5],
-                           comment[6],
-                           comment[7],
-                           comment[8],
-                           fid=comment[9],
-                           fname=comment[10])
-        else:
-            return Comment(comment[1],
-                           comment[2],
-                           fullname(comment[3], comment[4]),
-                           comment[5],
-                           comment[6],
-                           comment[7],
-                           comment[8],
-                           tid=comment[9],
-                           tname=comment[10])
+        return to_comment(comment)
 
     def update(self,
                cid: str,
@@ -356,12 +304,6 @@ class CommentService:
         if not validate_uuid4(aid):
             raise UnvalidInputException('comment´s assignee id')
 
-        comment = self.get_by_id(cid)
-        aname = self._user_repository.get_fullname(aid)
-
-        if not aname:
-            raise NotExistingException('comment´s assignee')
-
         try:
             tspent = float(tspent)
         except ValueError as error:
@@ -375,47 +317,26 @@ class CommentService:
             if not validate_uuid4(fid):
                 raise UnvalidInputException('comment´s feature id')
 
-            fname = self._feature_repository.get_name(fid)
-
-            if not fname:
-                raise NotExistingException('comment´s related feature')
-
-            comment_id, created, updated_on = self._comment_repository.update(
-                comment.comment_id, aid, comment_text, fid=fid)
-            updated_comment = Comment(comment_id,
-                                      aid,
-                                      aname,
-                                      tspent,
-                                      comment,
-                                      created,
-                                      updated_on,
-                                      fid=fid,
-                                      fname=fname)
+            comment = self._comment_repository.update(cid,
+                                                      aid,
+                                                      comment_text,
+                                                      tspent,
+                                                      fid=fid)
         elif tid:
             if not validate_uuid4(tid):
                 raise UnvalidInputException('comment´s task id')
-            tname = self._task_repository.get_name(tid)
-
-            if not tname:
-                raise NotExistingException('comment´s related task')
-
-            comment_id, created, updated_on = self._comment_repository.update(
-                comment.comment_id, aid, comment_text, tspent, tid=tid)
-            updated_comment = Comment(comment_id,
-                                      aid,
-                                      aname,
-                                      tspent,
-                                      comment,
-                                      created,
-                                      updated_on,
-                                      tid=tid,
-                                      tname=tname)
+
+            comment = self._comment_repository.update(cid,
+                                                      aid,
+                                                      comment_text,
+                                                      tspent,
+                                                      tid=tid)
         else:
             raise EmptyValueException(
                 'Updating comment',
                 'either feature or task id needs to be given')
 
-        return updated_comment
+        return to_comment(comment)
 
     def remove(self, cid: str):
         '''remove is used to remove comment from the database
@@ -439,5 +360,4 @@ class CommentService:
         self._comment_repository.get_by_id(cid)
         self._comment_repository.remove(cid)
 
-
 comment_service = CommentService()
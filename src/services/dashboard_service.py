@@ -0,0 +1,64 @@
+from repositories.dashboard_repository import dashboard_repository, DashboardRepository
+
+from utils.exceptions import UnvalidInputException
+from utils.validators import validate_uuid4
+from utils.row_mapper import to_comment, to_feature, to_project, to_task, to_team
+
+
+class DashboardService:
+    '''Class used for handling user´s dashboard in the application
+    '''
+
+    def __init__(self,
+                 default_dashboard_repository:
+                 DashboardRepository = dashboard_repository):
+        '''Initializes DashboardService
+
+        Args:
+            default_dashboard_repository (DashboardRepository, optional):
+                interaction module with database for dashboard.
+                Defaults to dashboard_repository.
+        '''
+
+        self._dashboard_repository = default_dashboard_repository
+
+    def get_by_user(self, uid: str) -> tuple:
+        '''get_by_user is used to get everything shown in user´s
+           dashboard with one round trip into the database
+
+        Projects, features and tasks are returned without
+        their nested children and teams without members.
+
+        Args:
+            uid (str): id of the user
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            NotExistingException: raised if user is not
+                found with given id
+            UnvalidInputException: raised if unvalid
+                id is given
+
+        Returns:
+            tuple: lists of user´s projects, features, tasks,
+                comments and teams, and total time spent
+        '''
+
+        if not validate_uuid4(uid):
+            raise UnvalidInputException(reason='unvalid formatting of uuid4',
+                                        source='User ID')
+
+        (projects, features, tasks, comments, teams,
+         time_spent) = self._dashboard_repository.get_by_user(uid)
+
+        projects = [to_project(project) for project in projects]
+        features = [to_feature(feature) for feature in features]
+        tasks = [to_task(task) for task in tasks]
+        comments = [to_comment(comment) for comment in comments]
+        teams = [to_team(team) for team in teams]
+
+        return (projects, features, tasks, comments, teams, time_spent)
+
+
+dashboard_service = DashboardService()
@@ -0,0 +1,163 @@
+import csv
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from repositories.export_repository import export_repository, ExportRepository
+
+from utils.exceptions import UnvalidInputException
+from utils.validators import validate_uuid4
+import utils.config as configs
+
+_HEADERS = {
+    'tasks': ('id', 'project_id', 'project', 'feature_id', 'feature', 'name',
+              'description', 'status', 'type', 'priority', 'assignee',
+              'created', 'updated_on', 'flags', 'comments', 'time_spent'),
+    'features': ('id', 'project_id', 'project', 'name', 'description',
+                 'status', 'type', 'priority', 'owner', 'created',
+                 'updated_on', 'flags', 'comments', 'time_spent'),
+    'comments': ('id', 'project_id', 'feature_id', 'task_id', 'assignee',
+                 'time_spent', 'comment', 'created', 'updated_on'),
+}
+
+MIMETYPES = {
+    'csv': 'text/csv',
+    'jsonl': 'application/x-ndjson',
+}
+
+
+class _Echo:
+    '''File-like object for csv.writer, returning written line
+       instead of storing it
+    '''
+
+    def write(self, line: str) -> str:
+        return line
+
+
+def _json_value(value):
+    '''_json_value is used to convert values not supported by json,
+       like timestamps and decimal numbers
+
+    Args:
+        value: value of a column
+
+    Returns:
+        value in format supported by json
+    '''
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+class ExportService:
+    '''Class used for exporting tasks, features and comments
+    '''
+
+    def __init__(
+            self,
+            default_export_repository: ExportRepository = export_repository):
+        '''Initializes ExportService
+
+        Args:
+            default_export_repository (ExportRepository, optional):
+                interaction module with database for exports.
+                Defaults to export_repository.
+        '''
+        self._export_repository = default_export_repository
+
+    def export(self,
+               target: str,
+               file_format: str,
+               pid: str = None,
+               aid: str = None,
+               start: str = None,
+               end: str = None):
+        '''export is used to get exported rows as chunks of text,
+           read from the database lazily while iterating
+
+        Given values are validated before anything is read, so that
+        problems can be reported before the response starts.
+
+        Args:
+            target (str): what to export, tasks, features or comments
+            file_format (str): format of the export, csv or jsonl
+            pid (str, optional): only rows of the project.
+                Defaults to None.
+            aid (str, optional): only rows of the assignee or owner.
+                Defaults to None.
+            start (str, optional): only rows created on or after
+                the day, in format YYYY-MM-DD. Defaults to None.
+            end (str, optional): only rows created on or before
+                the day, in format YYYY-MM-DD. Defaults to None.
+
+        Raises:
+            UnvalidInputException: raised if unvalid
+                values are given
+            DatabaseException: raised while iterating if problems
+                occur while interacting with the database
+
+        Returns:
+            generator: chunks of the exported file
+        '''
+
+        if target not in _HEADERS:
+            raise UnvalidInputException('Unvalid export',
+                                        'not being tasks, features or comments',
+                                        'export target')
+
+        if file_format not in MIMETYPES:
+            raise UnvalidInputException('Unvalid export',
+                                        'not being csv or jsonl',
+                                        'export format')
+
+        if pid and not validate_uuid4(pid):
+            raise UnvalidInputException(reason='unvalid formatting of uuid4',
+                                        source='Project ID')
+
+        if aid and not validate_uuid4(aid):
+            raise UnvalidInputException(reason='unvalid formatting of uuid4',
+                                        source='Assignee ID')
+
+        try:
+            start = date.fromisoformat(start) if start else None
+            end = date.fromisoformat(end) if end else None
+        except ValueError as error:
+            raise UnvalidInputException('Unvalid formatting',
+                                        'not being in YYYY-MM-DD format',
+                                        'export dates') from error
+
+        stream = getattr(self._export_repository, f'stream_{target}')
+        rows = stream(pid or None, aid or None, start, end)
+
+        if file_format == 'csv':
+            return self._csv(_HEADERS[target], rows)
+        return self._json_lines(_HEADERS[target], rows)
+
+    @staticmethod
+    def _csv(header: tuple, rows):
+        writer = csv.writer(_Echo())
+        chunk = [writer.writerow(header)]
+        for row in rows:
+            chunk.append(writer.writerow(row))
+            if len(chunk) >= configs.export_batch_size:
+                yield ''.join(chunk)
+                chunk = []
+        yield ''.join(chunk)
+
+    @staticmethod
+    def _json_lines(header: tuple, rows):
+        chunk = []
+        for row in rows:
+            chunk.append(
+                json.dumps(dict(zip(header, row)), default=_json_value) +
+                '\n')
+            if len(chunk) >= configs.export_batch_size:
+                yield ''.join(chunk)
+                chunk = []
+        yield ''.join(chunk)
+
+
+export_service = ExportService()
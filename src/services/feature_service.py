@@ -2,16 +2,15 @@ from entities.feature import Feature
 
 from repositories.project_repository import project_repository, ProjectRepository
 from repositories.feature_repository import feature_repository, FeatureRepository
-from repositories.type_repository import type_repository, TypeRepository
-from repositories.status_repository import status_repository, StatusRepository
 from repositories.user_repository import user_repository, UserRepository
 
 from services.task_service import task_service, TaskService
 from services.comment_service import comment_service, CommentService
 
 from utils.exceptions import EmptyValueException, UnvalidInputException, NotExistingException
-from utils.validators import validate_flags, validate_uuid4
-from utils.helpers import fullname
+from utils.validators import validate_flag, validate_flags, validate_uuid4
+from utils.pagination import Page
+from utils.row_mapper import to_feature, to_feature_summary
 
 
 class FeatureService:
@@ -21,8 +20,6 @@ class FeatureService:
             self,
             default_project_repository: ProjectRepository = project_repository,
             default_feature_repository: FeatureRepository = feature_repository,
-            default_type_repository: TypeRepository = type_repository,
-            default_status_repository: StatusRepository = status_repository,
             default_user_repository: UserRepository = user_repository,
             default_task_service: TaskService = task_service,
             default_comment_service: CommentService = comment_service):
@@ -35,12 +32,6 @@ class FeatureService:
             default_feature_repository (FeatureRepository, optional):
                 interaction module with database for features.
                 Defaults to feature_repository.
-            default_type_repository (TypeRepository, optional):
-                interaction module with database for types.
-                Defaults to feature_repository.
-            default_status_repository (StatusRepository, optional):
-                interaction module with database for statuses.
-                Defaults to status_repository.
             default_user_repository (UserRepository, optional):
                 interaction module with database for users.
                 Defaults to user_repository.
@@ -54,8 +45,6 @@ class FeatureService:
 
         self._project_repository = default_project_repository
         self._feature_repository = default_feature_repository
-        self._type_repository = default_type_repository
-        self._status_repository = default_status_repository
         self._user_repository = default_user_repository
         self._task_service = default_task_service
         self._comment_service = default_comment_service
@@ -93,8 +82,8 @@ class FeatureService:
             EmptyValueException: raised if any given values is empty
             UnvalidInputException: raised if formatting of given
                 input value is incorrect
-            NotExistingException: raised if feature owner or project
-                with given id is not found
+            NotExistingException: raised if project, feature owner,
+                status or type with given id is not found
 
         Returns:
             Feature: created feature
@@ -137,27 +126,10 @@ class FeatureService:
             raise UnvalidInputException(reason='priority is not in scale 1-3',
                                         source='priority')
 
-        pname = self._project_repository.get_name(pid)
-        foname = self._user_repository.get_fullname(foid)
-        sname = self._status_repository.get_name(status)
-        ftname = self._type_repository.get_name(ftype)
-
-        if not pname:
-            raise NotExistingException('Project')
-        if not foname:
-            raise NotExistingException('Feature Owner')
-        if not sname:
-            raise NotExistingException('Status')
-        if not ftname:
-            raise NotExistingException('Feature Type')
+        feature = self._feature_repository.new(pid, foid, name, description,
+                                               flags, status, ftype, priority)
 
-        feature_id, created, updated_on = self._feature_repository.new(
-            pid, foid, name, description, flags, status, ftype, priority)
-
-        created_feature = Feature(feature_id, pid, pname, foid, foname, name,
-                                  description, status, sname, ftype, ftname,
-                                  priority, created, updated_on)
-        return created_feature
+        return to_feature(feature)
 
     def get_all(self) -> [Feature]:
         '''get_all is used to list of all features in the database
@@ -172,17 +144,45 @@ class FeatureService:
             [Feature]: list of all features
         '''
 
-        features = [
-            Feature(feature[0], feature[1], feature[2], feature[3],
-                    fullname(feature[4], feature[5]), feature[6], feature[7],
-                    feature[8], feature[9], feature[10], feature[11],
-                    feature[12], feature[13], feature[14], feature[15],
-                    self._task_service.get_all_by_feature_id(feature[0]),
-                    self._comment_service.get_all_by_feature_id(feature[0]))
-            for feature in self._feature_repository.get_all()
-        ]
+        return self._to_features(self._feature_repository.get_all())
 
-        return features
+    def get_all_summaries(self,
+                          after: str = None,
+                          before: str = None,
+                          flag: str = None) -> Page:
+        '''get_all_summaries is used to get one page of features
+           as lightweight summaries for listings, newest first
+
+        Amounts of tasks and comments and total time spent are
+        calculated in the database, tasks and comments are not loaded.
+        If no features found, returns empty page.
+
+        Args:
+            after (str, optional): cursor of the feature after which
+                the page starts. Defaults to None.
+            before (str, optional): cursor of the feature before which
+                the page ends. Defaults to None.
+            flag (str, optional): if given, only features having
+                the flag are listed. Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid cursor or flag
+                is given
+
+        Returns:
+            Page: page of features as FeatureSummary objects
+        '''
+
+        if flag:
+            if not validate_flag(flag):
+                raise UnvalidInputException('Unvalid formatting',
+                                            'not being single flag', 'flag')
+            flag = flag.strip()
+
+        return self._feature_repository.get_all_summaries(
+            after, before, flag=flag).map(to_feature_summary)
 
     def get_features(self) -> [tuple]:
         '''get_features is used to get all features for
@@ -201,6 +201,28 @@ class FeatureService:
         features = self._feature_repository.get_features()
         return features
 
+    def get_features_by_name(self, name: str) -> [tuple]:
+        '''get_features_by_name is used to get features containing given
+           text in their name for selecting features in the frontend
+
+        If no text is given or no features found, returns empty list.
+
+        Args:
+            name (str): text to be found from the name
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: list of feature id and name
+        '''
+        name = (name or '').strip()
+        if not name:
+            return []
+
+        return self._feature_repository.get_features_by_name(name)
+
     def get_all_by_project_id(self, pid: str) -> [Feature]:
         '''get_all_by_project_id is used to get all features
            associated with given project
@@ -229,15 +251,39 @@ class FeatureService:
         if not self._project_repository.get_by_id(pid):
             raise NotExistingException('Project')
 
-        features = [
-            Feature(feature[0], feature[1], feature[2], feature[3],
-                    fullname(feature[4], feature[5]), feature[6], feature[7],
-                    feature[8], feature[9], feature[10], feature[11],
-                    feature[12], feature[13], feature[14], feature[15],
-                    self._task_service.get_all_by_feature_id(feature[0]),
-                    self._comment_service.get_all_by_feature_id(feature[0]))
-            for feature in self._feature_repository.get_all_by_project_id(pid)
-        ]
+        return self._to_features(
+            self._feature_repository.get_all_by_project_id(pid))
+
+    def get_all_by_project_ids(self, pids: [str]) -> dict:
+        '''get_all_by_project_ids is used to get features of several
+           projects, grouped by project id.
+
+        Features, their tasks and comments are loaded with constant
+        amount of queries regardless of the amount of projects.
+        Projects without features are not included in returned dict.
+
+        Args:
+            pids ([str]): ids of the projects in which features are associated
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid
+                id is given
+
+        Returns:
+            dict: lists of found features keyed by project id
+        '''
+
+        if not all(validate_uuid4(pid) for pid in pids):
+            raise UnvalidInputException(reason='unvalid formatting of uuid4',
+                                        source='project id')
+
+        features = {}
+        for feature in self._to_features(
+                self._feature_repository.get_all_by_project_ids(pids)):
+            features.setdefault(feature.project_id, []).append(feature)
+
         return features
 
     def get_all_by_feature_owner(self, foid: str) -> [Feature]:
@@ -268,16 +314,8 @@ class FeatureService:
         if not self._user_repository.get_by_id(foid):
             raise NotExistingException('Feature owner')
 
-        features = [
-            Feature(feature[0], feature[1], feature[2], feature[3],
-                    fullname(feature[4], feature[5]), feature[6], feature[7],
-                    feature[8], feature[9], feature[10], feature[11],
-                    feature[12], feature[13], feature[14], feature[15],
-                    self._task_service.get_all_by_feature_id(feature[0]),
-                    self._comment_service.get_all_by_feature_id(feature[0])) for
-            feature in self._feature_repository.get_all_by_feature_owner(foid)
-        ]
-        return features
+        return self._to_features(
+            self._feature_repository.get_all_by_feature_owner(foid))
 
     def get_by_id(self, fid: str) -> Feature:
         '''get_by_id is used to found feature with given id
@@ -300,14 +338,7 @@ class FeatureService:
         if not validate_uuid4(fid):
             raise UnvalidInputException('feature´s id')
 
-        feature = self._feature_repository.get_by_id(fid)
-
-        return Feature(feature[0], feature[1], feature[2], feature[3],
-                       fullname(feature[4], feature[5]), feature[6], feature[7],
-                       feature[8], feature[9], feature[10], feature[11],
-                       feature[12], feature[13], feature[14], feature[15],
-                       self._task_service.get_all_by_feature_id(feature[0]),
-                       self._comment_service.get_all_by_feature_id(feature[0]))
+        return self._to_features([self._feature_repository.get_by_id(fid)])[0]
 
     def get_name(self, fid: str) -> str:
         '''get_name is used to get name of feature with given id
@@ -369,8 +400,8 @@ class FeatureService:
             EmptyValueException: raised if any given values is empty
             UnvalidInputException: raised if formatting of given
                 input value is incorrect
-            NotExistingException: raised if feature, feature owner or project
-                with given id is not found
+            NotExistingException: raised if feature, project, feature
+                owner, status or type with given id is not found
 
 
         Returns:
@@ -389,10 +420,6 @@ class FeatureService:
             raise UnvalidInputException(reason='unvalid formatting of uuid4',
                                         source='feature id')
 
-        feature = self._feature_repository.get_by_id(fid)
-        if not feature:
-            raise NotExistingException('Feature')
-
         if not validate_uuid4(pid):
             raise UnvalidInputException(reason='unvalid formatting of uuid4',
                                         source='project id')
@@ -422,25 +449,11 @@ class FeatureService:
             raise UnvalidInputException(reason='priority is not in scale 1-3',
                                         source='priority')
 
-        pname = self._project_repository.get_name(pid)
-        foname = self._user_repository.get_fullname(foid)
-        sname = self._status_repository.get_name(status)
-        ftname = self._type_repository.get_name(ftype)
+        feature = self._feature_repository.update(fid, pid, foid, name,
+                                                  description, flags, status,
+                                                  ftype, priority)
 
-        if not pname:
-            raise NotExistingException('Project')
-        if not foname:
-            raise NotExistingException('Feature owner')
-        if not sname:
-            raise NotExistingException('Status')
-        if not ftname:
-            raise NotExistingException('Feature Type')
-
-        feature_id, created, updated_on = self._feature_repository.update(
-            fid, pid, foid, name, description, flags, status, ftype, priority)
-        return Feature(feature_id, pid, pname, foid, foname, name, description,
-                       status, sname, ftype, ftname, priority, created,
-                       updated_on)
+        return to_feature(feature)
 
     def remove(self, fid: str):
         '''remove is used to remove feature
@@ -463,5 +476,25 @@ class FeatureService:
         self._feature_repository.get_by_id(fid)
         self._feature_repository.remove(fid)
 
+    def _to_features(self, features: [tuple]) -> [Feature]:
+        '''_to_features is used to build Feature objects from repository
+           rows, loading tasks and comments of all given features at once
+
+        Args:
+            features ([tuple]): features as returned by feature repository
+
+        Returns:
+            [Feature]: list of features with their tasks and comments
+        '''
+
+        fids = [feature[0] for feature in features]
+        tasks = self._task_service.get_all_by_feature_ids(fids)
+        comments = self._comment_service.get_all_by_feature_ids(fids)
+
+        return [
+            to_feature(feature, tasks.get(feature[0], []),
+                       comments.get(feature[0], [])) for feature in features
+        ]
+
 
 feature_service = FeatureService()
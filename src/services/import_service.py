@@ -0,0 +1,388 @@
+import csv
+from datetime import datetime
+from itertools import islice
+from math import isfinite
+
+from markupsafe import escape
+
+from entities.import_result import ImportResult
+
+from repositories.import_repository import import_repository, ImportRepository
+from repositories.status_repository import status_repository, StatusRepository
+from repositories.type_repository import type_repository, TypeRepository
+
+from utils.exceptions import DatabaseException, NotExistingException, UnvalidInputException
+from utils.validators import validate_flags
+import utils.config as configs
+
+_TASK_COLUMNS = ('project', 'feature', 'name', 'description', 'assignee',
+                 'status', 'type', 'priority')
+_COMMENT_COLUMNS = ('project', 'feature', 'assignee', 'time_spent', 'comment')
+
+# importing stops being validated after this many errors
+_MAX_ERRORS = 100
+
+
+class _RowError(Exception):
+    '''Exception for one unvalid row of an import, reported with
+       line number instead of stopping the import
+    '''
+
+
+def _required(row: dict, column: str, max_length: int = 100) -> str:
+    '''_required is used to get stripped value of a required column
+
+    Args:
+        row (dict): row of the CSV file
+        column (str): name of the column
+        max_length (int, optional): maximum length of the value.
+            Defaults to 100.
+
+    Raises:
+        _RowError: raised if value is empty or too long
+
+    Returns:
+        str: value of the column
+    '''
+    value = (row.get(column) or '').strip()
+    if not value:
+        raise _RowError(f'{column} is empty')
+    if len(value) > max_length:
+        raise _RowError(f'{column} is longer than {max_length} characters')
+    return value
+
+
+def _created(row: dict):
+    '''_created is used to parse optional creation time of a row
+
+    Args:
+        row (dict): row of the CSV file
+
+    Raises:
+        _RowError: raised if creation time is not in ISO format
+
+    Returns:
+        datetime: creation time, None if not given
+    '''
+    value = (row.get('created') or '').strip()
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError as error:
+        raise _RowError(
+            'created is not in YYYY-MM-DD[ HH:MM[:SS]] format') from error
+
+
+def _resolve(ids: dict, key, label: str) -> str:
+    '''_resolve is used to get the only id found with given names
+
+    Args:
+        ids (dict): lists of ids keyed by names
+        key: names of the object
+        label (str): name of the object in error messages
+
+    Raises:
+        _RowError: raised if none or many ids are found
+
+    Returns:
+        str: id of the object
+    '''
+    found = ids.get(key, [])
+    names = ' / '.join(key) if isinstance(key, tuple) else key
+    if not found:
+        raise _RowError(f'{label} "{names}" not found')
+    if len(found) > 1:
+        raise _RowError(f'{label} "{names}" is ambiguous')
+    return str(found[0])
+
+
+class ImportService:
+    '''Class used for bulk importing tasks and comments from CSV files
+    '''
+
+    def __init__(
+            self,
+            default_import_repository: ImportRepository = import_repository,
+            default_status_repository: StatusRepository = status_repository,
+            default_type_repository: TypeRepository = type_repository):
+        '''Initializes ImportService
+
+        Args:
+            default_import_repository (ImportRepository, optional):
+                interaction module with database for imports.
+                Defaults to import_repository.
+            default_status_repository (StatusRepository, optional):
+                interaction module with database for statuses.
+                Defaults to status_repository.
+            default_type_repository (TypeRepository, optional):
+                interaction module with database for types.
+                Defaults to type_repository.
+        '''
+        self._import_repository = default_import_repository
+        self._status_repository = default_status_repository
+        self._type_repository = default_type_repository
+
+    def import_tasks(self, file) -> ImportResult:
+        '''import_tasks is used to import tasks from CSV file
+
+        File has a header row with columns project, feature, name,
+        description, assignee, status, type and priority, and optional
+        columns flags and created. Features are found by names of the
+        project and feature, assignee by username and status and type
+        by their names. Rows are validated and loaded in batches, all
+        in one transaction, so either all rows are imported or none.
+
+        Args:
+            file: text file object of the CSV file
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if required columns
+                are missing from the header
+
+        Returns:
+            ImportResult: amount of imported tasks or errors of rows
+        '''
+
+        statuses = self._names_to_ids(self._status_repository.get_all())
+        types = self._names_to_ids(self._type_repository.get_all())
+
+        def parse(row: dict) -> dict:
+            task = {
+                'project': _required(row, 'project'),
+                'feature': _required(row, 'feature'),
+                'name': _required(row, 'name'),
+                'description': _required(row, 'description', 1000),
+                'assignee': _required(row, 'assignee'),
+                'flags': (row.get('flags') or '').strip(),
+                'created': _created(row),
+            }
+
+            if len(task['flags']) > 1000:
+                raise _RowError('flags is longer than 1000 characters')
+            if not validate_flags(task['flags']):
+                raise _RowError('flags is not in "one;two;flags;" format')
+
+            status = _required(row, 'status').lower()
+            if status not in statuses:
+                raise _RowError(f'status "{status}" not found')
+            task['status'] = statuses[status]
+
+            ttype = _required(row, 'type').lower()
+            if ttype not in types:
+                raise _RowError(f'type "{ttype}" not found')
+            task['type'] = types[ttype]
+
+            try:
+                task['priority'] = int(_required(row, 'priority'))
+            except ValueError as error:
+                raise _RowError('priority is not an integer') from error
+            if not 1 <= task['priority'] <= 3:
+                raise _RowError('priority is not in scale 1-3')
+
+            return task
+
+        def load(tasks: [dict]):
+            features = self._import_repository.get_feature_ids(
+                list({(task['project'], task['feature']) for task in tasks}))
+            users = self._import_repository.get_user_ids(
+                {task['assignee'] for task in tasks})
+
+            def to_row(task: dict) -> tuple:
+                return (_resolve(features, (task['project'], task['feature']),
+                                 'feature'),
+                        _resolve(users, task['assignee'], 'assignee'),
+                        task['name'], task['description'], task['flags'],
+                        task['status'], task['type'], task['priority'])
+
+            return to_row
+
+        return self._import('tasks', 'Tasks', file, _TASK_COLUMNS, parse,
+                            load,
+                            ('feature_id', 'assignee', 'name', 'description',
+                             'flags', 'status', 'type', 'priority'))
+
+    def import_comments(self, file) -> ImportResult:
+        '''import_comments is used to import comments from CSV file
+
+        File has a header row with columns project, feature, assignee,
+        time_spent and comment, and optional columns task and created.
+        Comment is related to the task if task is given, otherwise to
+        the feature. Rows are validated and loaded in batches, all in
+        one transaction, so either all rows are imported or none.
+
+        Args:
+            file: text file object of the CSV file
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if required columns
+                are missing from the header
+
+        Returns:
+            ImportResult: amount of imported comments or errors of rows
+        '''
+
+        def parse(row: dict) -> dict:
+            comment = {
+                'project': _required(row, 'project'),
+                'feature': _required(row, 'feature'),
+                'task': (row.get('task') or '').strip(),
+                'assignee': _required(row, 'assignee'),
+                'comment': str(escape(_required(row, 'comment', 1000))),
+                'created': _created(row),
+            }
+
+            try:
+                time_spent = float(_required(row, 'time_spent'))
+            except ValueError as error:
+                raise _RowError('time_spent is not a number') from error
+            # NaN and infinity would make every sum of time spent the same
+            if not isfinite(time_spent) or time_spent < 0:
+                raise _RowError('time_spent is not a finite number of '
+                                'at least 0')
+            comment['time_spent'] = time_spent
+
+            return comment
+
+        def load(comments: [dict]):
+            features = self._import_repository.get_feature_ids(
+                list({(comment['project'], comment['feature'])
+                      for comment in comments
+                      if not comment['task']}))
+            tasks = self._import_repository.get_task_ids(
+                list({(comment['project'], comment['feature'], comment['task'])
+                      for comment in comments
+                      if comment['task']}))
+            users = self._import_repository.get_user_ids(
+                {comment['assignee'] for comment in comments})
+
+            def to_row(comment: dict) -> tuple:
+                if comment['task']:
+                    target = (None,
+                              _resolve(tasks,
+                                       (comment['project'], comment['feature'],
+                                        comment['task']), 'task'))
+                else:
+                    target = (_resolve(features,
+                                       (comment['project'], comment['feature']),
+                                       'feature'), None)
+                return target + (_resolve(users, comment['assignee'],
+                                          'assignee'), comment['comment'],
+                                 comment['time_spent'])
+
+            return to_row
+
+        return self._import('comments', 'Comments', file, _COMMENT_COLUMNS,
+                            parse, load, ('feature_id', 'task_id', 'assignee',
+                                          'comment', 'time_spent'))
+
+    def _import(self, target: str, table: str, file, required: tuple, parse,
+                load, columns: tuple) -> ImportResult:
+        '''_import is used to read, validate and load rows of CSV file
+           in batches of configured size
+
+        Every batch is parsed row by row, names of the batch are resolved
+        to ids with one query per referenced table and valid rows are
+        loaded with COPY. After first error nothing is loaded anymore,
+        but rows are still validated so that all errors are reported.
+
+        Args:
+            target (str): what is imported, tasks or comments
+            table (str): table rows are loaded into
+            file: text file object of the CSV file
+            required (tuple): columns required in the header
+            parse (function): function parsing one row into dict,
+                raising _RowError if row is unvalid
+            load (function): function resolving names of parsed batch,
+                returning function which turns parsed row into values
+                of the columns
+            columns (tuple): columns of the table rows are loaded into
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if required columns
+                are missing from the header
+
+        Returns:
+            ImportResult: amount of imported rows or errors of rows
+        '''
+
+        reader = csv.DictReader(file)
+        imported = 0
+        errors = []
+
+        try:
+            missing = [
+                column for column in required
+                if column not in (reader.fieldnames or [])
+            ]
+            if missing:
+                raise UnvalidInputException('Unvalid import',
+                                            f'missing {", ".join(missing)}',
+                                            'CSV header')
+
+            numbered = ((reader.line_num, row) for row in reader)
+            while len(errors) < _MAX_ERRORS:
+                chunk = list(islice(numbered, configs.import_batch_size))
+                if not chunk:
+                    break
+
+                batch = []
+                for line, row in chunk:
+                    try:
+                        if None in row:
+                            raise _RowError('too many values')
+                        batch.append((line, parse(row)))
+                    except _RowError as error:
+                        errors.append((line, str(error)))
+
+                if not batch:
+                    continue
+
+                to_row = load([row for _, row in batch])
+                rows = []
+                for line, row in batch:
+                    try:
+                        rows.append((to_row(row), row['created']))
+                    except _RowError as error:
+                        errors.append((line, str(error)))
+
+                if not errors:
+                    self._copy(table, columns, rows)
+                    imported += len(rows)
+        except NotExistingException as error:
+            errors.append((reader.line_num, str(error)))
+        except (csv.Error, UnicodeDecodeError) as error:
+            errors.append((reader.line_num, f'unreadable CSV: {error}'))
+        except (DatabaseException, UnvalidInputException):
+            self._import_repository.rollback()
+            raise
+
+        if errors:
+            self._import_repository.rollback()
+            return ImportResult(target, 0, sorted(errors)[:_MAX_ERRORS])
+
+        self._import_repository.commit()
+        return ImportResult(target, imported, [])
+
+    def _copy(self, table: str, columns: tuple, rows: [tuple]) -> None:
+        '''_copy is used to load rows, setting creation time of rows
+           having it and leaving default of the database to others
+        '''
+        self._import_repository.copy(
+            table, columns, [row for row, created in rows if not created])
+        self._import_repository.copy(
+            table, columns + ('created', 'updated_on'),
+            [row + (created, created) for row, created in rows if created])
+
+    @staticmethod
+    def _names_to_ids(rows: [tuple]) -> dict:
+        return {name.lower(): str(sid) for sid, name in rows}
+
+
+import_service = ImportService()
@@ -6,8 +6,9 @@ from repositories.project_repository import project_repository, ProjectRepositor
 from services.feature_service import feature_service, FeatureService
 
 from utils.exceptions import EmptyValueException, UnvalidInputException, NotExistingException
-from utils.validators import validate_flags, validate_uuid4
-from utils.helpers import fullname
+from utils.validators import validate_flag, validate_flags, validate_uuid4
+from utils.pagination import Page
+from utils.row_mapper import to_project, to_project_summary
 
 
 class ProjectService:
@@ -72,23 +73,14 @@ class ProjectService:
                                         'not being in correct format of uuid4',
                                         'project owner id')
 
-        poname = self._user_repository.get_fullname(poid)
-
-        if not poname:
-            raise NotExistingException('Project Owner')
-
         if not validate_flags(flags):
             raise UnvalidInputException(
                 'Unvalid formatting',
                 'not being in "one;two;three;flags;" format', 'flags')
 
-        project_id, created, updated_on = self._project_repository.new(
-            poid, name, description, flags)
-
-        created_project = Project(project_id, poid, poname, name, description,
-                                  created, updated_on)
+        project = self._project_repository.new(poid, name, description, flags)
 
-        return created_project
+        return to_project(project)
 
     def update(self, pid: str, poid: str, name: str, description: str,
                flags: str) -> Project:
@@ -123,10 +115,6 @@ class ProjectService:
                                         'not being in correct format of uuid4',
                                         'project id')
 
-        project = self._project_repository.get_by_id(pid)
-        if not project:
-            raise NotExistingException('Project')
-
         if not poid or not name or not description or not flags:
             raise EmptyValueException(
                 'One of given values is empty, all values need to have value')
@@ -136,23 +124,15 @@ class ProjectService:
                                         'not being in correct format of uuid4',
                                         'project owner id')
 
-        poname = self._user_repository.get_fullname(poid)
-
-        if not poname:
-            raise NotExistingException('Project Owner')
-
         if not validate_flags(flags):
             raise UnvalidInputException(
                 'Unvalid formatting',
                 'not being in "one;two;three;flags;" format', 'flags')
 
-        project_id, created, updated_on = self._project_repository.update(
-            pid, poid, name, description, flags)
-
-        updated_project = Project(project_id, poid, poname, name, description,
-                                  created, updated_on)
+        project = self._project_repository.update(pid, poid, name,
+                                                  description, flags)
 
-        return updated_project
+        return to_project(project)
 
     def get_all(self) -> [Project]:
         '''get_all is used to get list of all projects in the database
@@ -167,14 +147,45 @@ class ProjectService:
             [Project]: list of all projects
         '''
 
-        projects = [
-            Project(project[0], project[1], fullname(project[2], project[3]),
-                    project[4], project[5], project[6], project[7], project[8],
-                    self._feature_service.get_all_by_project_id(project[0]))
-            for project in self._project_repository.get_all()
-        ]
+        return self._to_projects(self._project_repository.get_all())
 
-        return projects
+    def get_all_summaries(self,
+                          after: str = None,
+                          before: str = None,
+                          flag: str = None) -> Page:
+        '''get_all_summaries is used to get one page of projects
+           as lightweight summaries for listings, newest first
+
+        Amounts of features and tasks and total time spent are
+        calculated in the database, features are not loaded.
+        If no projects found, returns empty page.
+
+        Args:
+            after (str, optional): cursor of the project after which
+                the page starts. Defaults to None.
+            before (str, optional): cursor of the project before which
+                the page ends. Defaults to None.
+            flag (str, optional): if given, only projects having
+                the flag are listed. Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid cursor or flag
+                is given
+
+        Returns:
+            Page: page of projects as ProjectSummary objects
+        '''
+
+        if flag:
+            if not validate_flag(flag):
+                raise UnvalidInputException('Unvalid formatting',
+                                            'not being single flag', 'flag')
+            flag = flag.strip()
+
+        return self._project_repository.get_all_summaries(
+            after, before, flag=flag).map(to_project_summary)
 
     def get_projects(self) -> [tuple]:
         '''get_projects is used to get all projects for
@@ -192,6 +203,28 @@ class ProjectService:
         projects = self._project_repository.get_projects()
         return projects
 
+    def get_projects_by_name(self, name: str) -> [tuple]:
+        '''get_projects_by_name is used to get projects containing given
+           text in their name for selecting projects in the frontend
+
+        If no text is given or no projects found, returns empty list.
+
+        Args:
+            name (str): text to be found from the name
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: list of project id and name
+        '''
+        name = (name or '').strip()
+        if not name:
+            return []
+
+        return self._project_repository.get_projects_by_name(name)
+
     def get_all_by_project_owner(self, poid: str) -> [Project]:
         '''get_all_by_project_owner is used get all projects
            associated with given project owner
@@ -219,14 +252,8 @@ class ProjectService:
         if not self._user_repository.get_by_id(poid):
             raise NotExistingException('Project Owner')
 
-        projects = [
-            Project(project[0], project[1], fullname(project[2], project[3]),
-                    project[4], project[5], project[6], project[7], project[8],
-                    self._feature_service.get_all_by_project_id(project[0])) for
-            project in self._project_repository.get_all_by_project_owner(poid)
-        ]
-
-        return projects
+        return self._to_projects(
+            self._project_repository.get_all_by_project_owner(poid))
 
     def get_by_id(self, pid: str) -> Project:
         '''get_by_id is used to find exact project with given id
@@ -250,12 +277,7 @@ class ProjectService:
             raise UnvalidInputException(reason='unvalid formatting of uuid4',
                                         source='Project ID')
 
-        project = self._project_repository.get_by_id(pid)
-
-        return Project(project[0], project[1], fullname(project[2],
-                                                        project[3]), project[4],
-                       project[5], project[6], project[7], project[8],
-                       self._feature_service.get_all_by_project_id(project[0]))
+        return self._to_projects([self._project_repository.get_by_id(pid)])[0]
 
     def get_name(self, pid: str) -> str:
         '''get_name is used to get name of project with given id
@@ -304,5 +326,25 @@ class ProjectService:
         self._project_repository.get_by_id(pid)
         self._project_repository.remove(pid)
 
+    def _to_projects(self, projects: [tuple]) -> [Project]:
+        '''_to_projects is used to build Project objects from repository
+           rows, loading whole feature, task and comment tree of given
+           projects with constant amount of queries
+
+        Args:
+            projects ([tuple]): projects as returned by project repository
+
+        Returns:
+            [Project]: list of projects with their features
+        '''
+
+        features = self._feature_service.get_all_by_project_ids(
+            [project[0] for project in projects])
+
+        return [
+            to_project(project, features.get(project[0], []))
+            for project in projects
+        ]
+
 
 project_service = ProjectService()
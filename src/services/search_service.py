@@ -0,0 +1,101 @@
+from html import unescape
+
+from markupsafe import Markup, escape
+
+from entities.search_result import SearchResult
+
+from repositories.search_repository import search_repository, SearchRepository, HIGHLIGHT_START, HIGHLIGHT_STOP
+
+from utils.exceptions import EmptyValueException, UnvalidInputException
+from utils.pagination import Page
+
+_MAX_QUERY_LENGTH = 200
+
+
+def _highlight(text: str) -> Markup:
+    '''_highlight is used to escape text highlighted by the database
+       and to turn its highlight marks into HTML
+
+    Args:
+        text (str): text with matching words between highlight marks
+
+    Returns:
+        Markup: escaped text with matching words inside mark elements
+    '''
+    return Markup(
+        str(escape(text or '')).replace(HIGHLIGHT_START, '<mark>').replace(
+            HIGHLIGHT_STOP, '</mark>'))
+
+
+def _to_result(row) -> SearchResult:
+    '''_to_result is used to build SearchResult from search row
+
+    Args:
+        row: search result as returned by SearchRepository
+
+    Returns:
+        SearchResult: result with highlighted name and snippet
+    '''
+    # comments are stored escaped, so they are unescaped before
+    # escaping again with the highlights
+    snippet = unescape(row[3]) if row[0] == 'comments' else row[3]
+    return SearchResult(row[0], row[1], _highlight(row[2]),
+                        _highlight(snippet), row[4], row[5], row[6])
+
+
+class SearchService:
+    '''Class used for searching projects, features, tasks and comments
+    '''
+
+    def __init__(
+            self,
+            default_search_repository: SearchRepository = search_repository):
+        '''Initializes SearchService
+
+        Args:
+            default_search_repository (SearchRepository, optional):
+                interaction module with database for searching.
+                Defaults to search_repository.
+        '''
+        self._search_repository = default_search_repository
+
+    def search(self,
+               query: str,
+               after: str = None,
+               before: str = None) -> Page:
+        '''search is used to get one page of projects, features, tasks
+           and comments matching given words, best matches first
+
+        Args:
+            query (str): words to search. Phrases can be quoted,
+                words excluded with minus and alternatives
+                separated with or.
+            after (str, optional): cursor of the result after which
+                the page starts. Defaults to None.
+            before (str, optional): cursor of the result before which
+                the page ends. Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            EmptyValueException: raised if no words are given
+            UnvalidInputException: raised if query is too long
+                or unvalid cursor is given
+
+        Returns:
+            Page: page of found SearchResult objects
+        '''
+
+        query = (query or '').strip()
+        if not query:
+            raise EmptyValueException('search words')
+        if len(query) > _MAX_QUERY_LENGTH:
+            raise UnvalidInputException(
+                'Unvalid input',
+                f'longer than {_MAX_QUERY_LENGTH} characters', 'search words')
+
+        return self._search_repository.search(query, after,
+                                              before).map(_to_result)
+
+
+search_service = SearchService()
@@ -1,10 +1,14 @@
+from datetime import date, timedelta
+
 from repositories.statistics_repository import statistics_repository, StatisticsRepository
 from repositories.feature_repository import feature_repository, FeatureRepository
 from repositories.task_repository import task_repository, TaskRepository
 from repositories.user_repository import user_repository, UserRepository
 
+from entities.statistics import TimeSpent, Timesheet
 from utils.exceptions import UnvalidInputException
 from utils.validators import validate_uuid4
+from utils.helpers import fullname
 
 
 class StatisticsService:
@@ -123,5 +127,248 @@ class StatisticsService:
 
         return time_spent
 
+    def get_time_spent_by_team_members(self, teid: str) -> [TimeSpent]:
+        '''get_time_spent_by_team_members is used to get time spent
+           by each member of team
+
+        If nothing found, returns empty list.
+
+        Args:
+            teid (str): id of the team
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid
+                id is given
+
+        Returns:
+            [TimeSpent]: time spent, most time spent first
+        '''
+
+        if not validate_uuid4(teid):
+            raise UnvalidInputException('team´s id')
+
+        rows = self._statistics_repository.get_time_spent_by_team_members(teid)
+        return [
+            TimeSpent(row[0], fullname(row[1], row[2]), row[3],
+                      float(row[4])) for row in rows
+        ]
+
+    def get_time_spent_by_team_projects(self, teid: str) -> [TimeSpent]:
+        '''get_time_spent_by_team_projects is used to get time spent
+           by members of team in each project
+
+        If nothing found, returns empty list.
+
+        Args:
+            teid (str): id of the team
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid
+                id is given
+
+        Returns:
+            [TimeSpent]: time spent, most time spent first
+        '''
+
+        if not validate_uuid4(teid):
+            raise UnvalidInputException('team´s id')
+
+        rows = self._statistics_repository.get_time_spent_by_team_projects(teid)
+        return [
+            TimeSpent(row[0], row[1], row[2], float(row[3])) for row in rows
+        ]
+
+    def get_time_spent_by_team_statuses(self, teid: str) -> [TimeSpent]:
+        '''get_time_spent_by_team_statuses is used to get time spent
+           by members of team in features
+           and tasks of each status
+
+        If nothing found, returns empty list.
+
+        Args:
+            teid (str): id of the team
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid
+                id is given
+
+        Returns:
+            [TimeSpent]: time spent, most time spent first
+        '''
+
+        if not validate_uuid4(teid):
+            raise UnvalidInputException('team´s id')
+
+        rows = self._statistics_repository.get_time_spent_by_team_statuses(teid)
+        return [
+            TimeSpent(row[0], row[1], row[2], float(row[3])) for row in rows
+        ]
+
+    def get_time_spent_by_project_members(self, pid: str) -> [TimeSpent]:
+        '''get_time_spent_by_project_members is used to get time spent
+           in project by each user
+
+        If nothing found, returns empty list.
+
+        Args:
+            pid (str): id of the project
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid
+                id is given
+
+        Returns:
+            [TimeSpent]: time spent, most time spent first
+        '''
+
+        if not validate_uuid4(pid):
+            raise UnvalidInputException('project´s id')
+
+        rows = self._statistics_repository.get_time_spent_by_project_members(
+            pid)
+        return [
+            TimeSpent(row[0], fullname(row[1], row[2]), row[3],
+                      float(row[4])) for row in rows
+        ]
+
+    def get_time_spent_by_project_features(self, pid: str) -> [TimeSpent]:
+        '''get_time_spent_by_project_features is used to get time spent
+           in each feature of project, including
+           its tasks
+
+        If nothing found, returns empty list.
+
+        Args:
+            pid (str): id of the project
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid
+                id is given
+
+        Returns:
+            [TimeSpent]: time spent, most time spent first
+        '''
+
+        if not validate_uuid4(pid):
+            raise UnvalidInputException('project´s id')
+
+        rows = self._statistics_repository.get_time_spent_by_project_features(
+            pid)
+        return [
+            TimeSpent(row[0], row[1], row[2], float(row[3])) for row in rows
+        ]
+
+    def get_time_spent_by_project_statuses(self, pid: str) -> [TimeSpent]:
+        '''get_time_spent_by_project_statuses is used to get time spent
+           in features and tasks of project
+           by their status
+
+        If nothing found, returns empty list.
+
+        Args:
+            pid (str): id of the project
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid
+                id is given
+
+        Returns:
+            [TimeSpent]: time spent, most time spent first
+        '''
+
+        if not validate_uuid4(pid):
+            raise UnvalidInputException('project´s id')
+
+        rows = self._statistics_repository.get_time_spent_by_project_statuses(
+            pid)
+        return [
+            TimeSpent(row[0], row[1], row[2], float(row[3])) for row in rows
+        ]
+
+    def get_timesheet(self,
+                      teid: str,
+                      start: str = None,
+                      end: str = None) -> Timesheet:
+        '''get_timesheet is used to get hours of every member of team
+           in each week between given dates
+
+        Args:
+            teid (str): id of the team
+            start (str, optional): first day included, in format
+                YYYY-MM-DD. Defaults to monday seven weeks before end.
+            end (str, optional): last day included, in format
+                YYYY-MM-DD. Defaults to today.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid id
+                or dates are given
+
+        Returns:
+            Timesheet: hours of team members in each week
+        '''
+
+        if not validate_uuid4(teid):
+            raise UnvalidInputException('team´s id')
+
+        try:
+            end = date.fromisoformat(end) if end else date.today()
+            start = date.fromisoformat(start) if start else end - timedelta(
+                days=end.weekday() + 7 * 7)
+        except ValueError as error:
+            raise UnvalidInputException('Unvalid formatting',
+                                        'not being in YYYY-MM-DD format',
+                                        'timesheet dates') from error
+
+        if start > end:
+            raise UnvalidInputException('Unvalid dates',
+                                        'start being after end', 'timesheet')
+
+        first_week = start - timedelta(days=start.weekday())
+        weeks = [
+            first_week + timedelta(weeks=index)
+            for index in range((end - first_week).days // 7 + 1)
+        ]
+
+        members = {}
+        for row in self._statistics_repository.get_timesheet(teid, start, end):
+            if row[0] not in members:
+                members[row[0]] = (row[0], fullname(row[1], row[2]),
+                                   [0.0] * len(weeks))
+            if row[3]:
+                members[row[0]][2][(row[3] - first_week).days // 7] = float(
+                    row[4])
+
+        return Timesheet(start, end, weeks,
+                         [(uid, name, hours, sum(hours))
+                          for uid, name, hours in members.values()])
+
+    def rebuild_time_spent(self) -> int:
+        '''rebuild_time_spent is used to rebuild rollups of time spent
+           of tasks, features, projects and users from comments
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            int: amount of corrected rollups
+        '''
+
+        return self._statistics_repository.rebuild_time_spent()
+
 
 statistics_service = StatisticsService()
@@ -2,15 +2,16 @@ from entities.task import Task
 
 from repositories.task_repository import task_repository, TaskRepository
 from repositories.feature_repository import feature_repository, FeatureRepository
+from repositories.team_repository import team_repository, TeamRepository
 from repositories.user_repository import user_repository, UserRepository
 
-from services.type_service import type_service, TypeService
-from services.status_service import status_service, StatusService
 from services.comment_service import comment_service, CommentService
 
 from utils.exceptions import EmptyValueException, NotExistingException, UnvalidInputException
-from utils.validators import validate_flags, validate_uuid4
-from utils.helpers import fullname
+from utils.validators import validate_flag, validate_flags, validate_uuid4
+from utils.pagination import Page
+from utils.row_mapper import to_task, to_task_summary
+import utils.config as configs
 
 
 class TaskService:
@@ -22,8 +23,7 @@ class TaskService:
         default_task_repository: TaskRepository = task_repository,
         default_feature_repository: FeatureRepository = feature_repository,
         default_user_repository: UserRepository = user_repository,
-        default_status_service: StatusService = status_service,
-        default_type_service: TypeService = type_service,
+        default_team_repository: TeamRepository = team_repository,
         default_comment_service: CommentService = comment_service,
     ):
         '''Initializes FeatureService
@@ -38,12 +38,9 @@ class TaskService:
             default_user_repository (UserRepository, optional):
                 interaction module with database for users.
                 Defaults to user_repostory.
-            default_status_service (StatusService, optional):
-                interaction module with statuses.
-                Defaults to status_service.
-            default_type_service (TypeService, optional):
-                interaction module with types.
-                Defaults to type_service.
+            default_team_repository (TeamRepository, optional):
+                interaction module with database for teams.
+                Defaults to team_repository.
             default_comment_service (CommentService, optional):
                 interaction module with comments.
                 Defaults to comment_service.
@@ -52,8 +49,7 @@ class TaskService:
         self._task_repository = default_task_repository
         self._feature_repository = default_feature_repository
         self._user_repository = default_user_repository
-        self._status_service = default_status_service
-        self._type_service = default_type_service
+        self._team_repository = default_team_repository
         self._comment_service = default_comment_service
 
     def new(self,
@@ -87,8 +83,8 @@ class TaskService:
             EmptyValueException: raised if any given values is empty
             UnvalidInputException: raised if formatting of given
                 input value is incorrect
-            NotExistingException: raised if feature owner or project
-                with given id is not found
+            NotExistingException: raised if feature, assignee, status
+                or type with given id is not found
 
         Returns:
             Task: created task
@@ -131,27 +127,10 @@ class TaskService:
             raise UnvalidInputException(reson='priority is not in scale 1-3',
                                         source='priority')
 
-        fname = self._feature_repository.get_name(fid)
-        aname = self._user_repository.get_fullname(aid)
-        sname = self._status_service.get_name(status)
-        ttname = self._type_service.get_name(ttype)
-
-        if not fname:
-            raise NotExistingException('Feature')
-        if not aname:
-            raise NotExistingException('Assignee')
-        if not sname:
-            raise NotExistingException('Status')
-        if not ttname:
-            raise NotExistingException('Type')
-
-        task_id, created, updated_on = self._task_repository.new(
-            fid, aid, name, description, status, ttype, priority, flags)
+        task = self._task_repository.new(fid, aid, name, description, status,
+                                         ttype, priority, flags)
 
-        created_task = Task(task_id, fid, fname, aid, aname, name, description,
-                            status, sname, ttype, ttname, priority, created,
-                            updated_on, flags)
-        return created_task
+        return to_task(task)
 
     def get_all(self) -> [Task]:
         '''get_all is used to get all tasks from the database
@@ -166,15 +145,45 @@ class TaskService:
             [Task]: list of all found tasks
         '''
 
-        tasks = [
-            Task(task[0], task[1], task[2], task[3], fullname(task[4], task[5]),
-                 task[6], task[7], task[8], task[9], task[10], task[11],
-                 task[12], task[13], task[14], task[15],
-                 self._comment_service.get_all_by_task_id(task[0]))
-            for task in self._task_repository.get_all()
-        ]
+        return self._to_tasks(self._task_repository.get_all())
 
-        return tasks
+    def get_all_summaries(self,
+                          after: str = None,
+                          before: str = None,
+                          flag: str = None) -> Page:
+        '''get_all_summaries is used to get one page of tasks as
+           lightweight summaries for listings, newest first
+
+        Amount of comments and total time spent are calculated
+        in the database, comments are not loaded.
+        If no tasks found, returns empty page.
+
+        Args:
+            after (str, optional): cursor of the task after which
+                the page starts. Defaults to None.
+            before (str, optional): cursor of the task before which
+                the page ends. Defaults to None.
+            flag (str, optional): if given, only tasks having
+                the flag are listed. Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid cursor or flag
+                is given
+
+        Returns:
+            Page: page of found tasks as TaskSummary objects
+        '''
+
+        if flag:
+            if not validate_flag(flag):
+                raise UnvalidInputException('Unvalid formatting',
+                                            'not being single flag', 'flag')
+            flag = flag.strip()
+
+        return self._task_repository.get_all_summaries(
+            after, before, flag=flag).map(to_task_summary)
 
     def get_all_by_feature_id(self, fid: str) -> [Task]:
         '''get_all_by_feature_id is used to get all tasks
@@ -204,13 +213,37 @@ class TaskService:
         if not self._feature_repository.get_by_id(fid):
             raise NotExistingException('Feature')
 
-        tasks = [
-            Task(task[0], task[1], task[2], task[3], fullname(task[4], task[5]),
-                 task[6], task[7], task[8], task[9], task[10], task[11],
-                 task[12], task[13], task[14], task[15],
-                 self._comment_service.get_all_by_task_id(task[0]))
-            for task in self._task_repository.get_all_by_feature_id(fid)
-        ]
+        return self._to_tasks(self._task_repository.get_all_by_feature_id(fid))
+
+    def get_all_by_feature_ids(self, fids: [str]) -> dict:
+        '''get_all_by_feature_ids is used to get tasks of several
+           features, grouped by feature id.
+
+        Tasks and their comments are loaded with one query each,
+        regardless of the amount of features. Features without
+        tasks are not included in returned dict.
+
+        Args:
+            fids ([str]): ids of the features in which tasks are associated
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid
+                id is given
+
+        Returns:
+            dict: lists of found tasks keyed by feature id
+        '''
+
+        if not all(validate_uuid4(fid) for fid in fids):
+            raise UnvalidInputException(reason='unvalid formatting of uuid4',
+                                        source='Feature ID')
+
+        tasks = {}
+        for task in self._to_tasks(
+                self._task_repository.get_all_by_feature_ids(fids)):
+            tasks.setdefault(task.feature_id, []).append(task)
 
         return tasks
 
@@ -242,15 +275,7 @@ class TaskService:
         if not self._user_repository.get_by_id(aid):
             raise NotExistingException('Assignee')
 
-        tasks = [
-            Task(task[0], task[1], task[2], task[3], fullname(task[4], task[5]),
-                 task[6], task[7], task[8], task[9], task[10], task[11],
-                 task[12], task[13], task[14], task[15],
-                 self._comment_service.get_all_by_task_id(task[0]))
-            for task in self._task_repository.get_all_by_assignee(aid)
-        ]
-
-        return tasks
+        return self._to_tasks(self._task_repository.get_all_by_assignee(aid))
 
     def get_by_id(self, tid: str) -> Task:
         '''get_by_id is used to found task with given id
@@ -274,11 +299,7 @@ class TaskService:
 
         task = self._task_repository.get_by_id(tid)
 
-        return Task(task[0], task[1], task[2], task[3],
-                    fullname(task[4],
-                             task[5]), task[6], task[7], task[8], task[9],
-                    task[10], task[11], task[12], task[13], task[14], task[15],
-                    self._comment_service.get_all_by_task_id(task[0]))
+        return to_task(task, self._comment_service.get_all_by_task_id(task[0]))
 
     def get_name(self, tid: str) -> str:
         '''get_name is used to get name of specific task
@@ -330,8 +351,8 @@ class TaskService:
             EmptyValueException: raised if any given values is empty
             UnvalidInputException: raised if formatting of given
                 input value is incorrect
-            NotExistingException: raised if feature, feature owner or project
-                with given id is not found
+            NotExistingException: raised if task, feature, assignee,
+                status or type with given id is not found
 
         Returns:
             Task: updated task
@@ -349,8 +370,6 @@ class TaskService:
             raise UnvalidInputException(reason='unvalid formatting of uuid4',
                                         source='task id')
 
-        self._task_repository.get_by_id(tid)
-
         if not validate_uuid4(fid):
             raise UnvalidInputException(reason='unvalid formatting of uuid4',
                                         source='feature id')
@@ -380,27 +399,95 @@ class TaskService:
             raise UnvalidInputException(reson='priority is not in scale 1-3',
                                         source='priority')
 
-        fname = self._feature_repository.get_name(fid)
-        aname = self._user_repository.get_fullname(aid)
-        sname = self._status_service.get_name(status)
-        ttname = self._type_service.get_name(ttype)
+        task = self._task_repository.update(tid, fid, aid, name, description,
+                                            status, ttype, priority, flags)
 
-        if not fname:
-            raise NotExistingException('Feature')
-        if not aname:
-            raise NotExistingException('Assignee')
-        if not sname:
-            raise NotExistingException('Status')
-        if not ttname:
-            raise NotExistingException('Type')
+        return to_task(task)
+
+    def bulk_update(self,
+                    tids: [str],
+                    uid: str,
+                    privileged: bool,
+                    status: str = None,
+                    aid: str = None,
+                    priority: int = None) -> [Task]:
+        '''bulk_update is used to update status, assignee or priority
+           of many tasks in one transaction
+
+        Values not given are left as they are. New assignee has to be
+        in one of the teams of the user, unless the user is privileged.
+        Tasks not found are left out of the returned tasks.
+
+        Args:
+            tids ([str]): ids of the tasks
+            uid (str): id of the user updating the tasks
+            privileged (bool): True if user can assign tasks to anyone,
+                for example admins
+            status (str, optional): id of new status. Defaults to None.
+            aid (str, optional): id of new assignee. Defaults to None.
+            priority (int, optional): new priority, in three stages:
+                low, medium and high (1 = low, 3 = high). Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occurs while
+                saving into the database
+            EmptyValueException: raised if no tasks or no new
+                values are given
+            UnvalidInputException: raised if formatting of given
+                input value is incorrect or assignee is not in
+                the teams of the user
+            NotExistingException: raised if assignee or status
+                with given id is not found
+
+        Returns:
+            [Task]: updated tasks without comments
+        '''
+
+        if not tids or not (status or aid or priority):
+            raise EmptyValueException('tasks or new values')
+
+        if len(tids) > configs.bulk_edit_max_tasks:
+            raise UnvalidInputException(
+                'Too many tasks',
+                f'more than {configs.bulk_edit_max_tasks} tasks', 'task ids')
+
+        for tid in tids:
+            if not validate_uuid4(tid):
+                raise UnvalidInputException(
+                    reason='unvalid formatting of uuid4', source='task id')
+
+        if not validate_uuid4(uid):
+            raise UnvalidInputException(reason='unvalid formatting of uuid4',
+                                        source='user id')
+        if aid and not validate_uuid4(aid):
+            raise UnvalidInputException(reason='unvalid formatting of uuid4',
+                                        source='assignee')
+        if status and not validate_uuid4(status):
+            raise UnvalidInputException(reason='unvalid formatting of uuid4',
+                                        source='status id')
+
+        if priority:
+            try:
+                priority = int(priority)
+            except Exception as error:
+                raise UnvalidInputException(
+                    reason='can not be converted into integer',
+                    source='priority') from error
+
+            if not 1 <= priority <= 3:
+                raise UnvalidInputException(
+                    reason='priority is not in scale 1-3', source='priority')
 
-        task_id, created, updated_on = self._task_repository.update(
-            tid, fid, aid, name, description, status, ttype, priority, flags)
+        if aid and not privileged and not self._team_repository.shares_team(
+                uid, aid):
+            raise UnvalidInputException('Unvalid assignee',
+                                        'assignee not being in your teams',
+                                        'bulk edit')
 
-        updated_task = Task(task_id, fid, fname, aid, aname, name, description,
-                            status, sname, ttype, ttname, priority, created,
-                            updated_on, flags)
-        return updated_task
+        tasks = self._task_repository.bulk_update(set(tids), status or None,
+                                                  aid or None, priority or None)
+
+        return [to_task(task) for task in tasks]
 
     def remove(self, tid: str) -> None:
         '''remove is used to remove task from the database
@@ -423,5 +510,21 @@ class TaskService:
         self._task_repository.get_by_id(tid)
         self._task_repository.remove(tid)
 
+    def _to_tasks(self, tasks: [tuple]) -> [Task]:
+        '''_to_tasks is used to build Task objects from repository rows,
+           loading comments of all given tasks with one query
+
+        Args:
+            tasks ([tuple]): tasks as returned by task repository
+
+        Returns:
+            [Task]: list of tasks with their comments
+        '''
+
+        comments = self._comment_service.get_all_by_task_ids(
+            [task[0] for task in tasks])
+
+        return [to_task(task, comments.get(task[0], [])) for task in tasks]
+
 
 task_service = TaskService()
@@ -4,7 +4,7 @@ from repositories.team_repository import team_repository, TeamRepository
 from services.user_service import user_service, UserService
 
 from utils.exceptions import NotExistingException, EmptyValueException, UnvalidInputException
-from utils.helpers import fullname
+from utils.row_mapper import to_team
 from utils.validators import validate_uuid4
 
 
@@ -84,8 +84,7 @@ class TeamService:
         '''
 
         teams = [
-            Team(team[0], team[1], team[2], team[3], fullname(team[4], team[5]),
-                 self._user_service.get_all_by_team(team[0]))
+            to_team(team, self._user_service.get_all_by_team(team[0]))
             for team in self._team_repository.get_all()
         ]
         return teams
@@ -119,8 +118,7 @@ class TeamService:
             raise NotExistingException('Team Leader')
 
         teams = teams = [
-            Team(team[0], team[1], team[2], team[3], fullname(team[4], team[5]),
-                 self._user_service.get_all_by_team(team[0]))
+            to_team(team, self._user_service.get_all_by_team(team[0]))
             for team in self._team_repository.get_all_by_team_leader(tlid)
         ]
         return teams
@@ -147,9 +145,7 @@ class TeamService:
             raise UnvalidInputException('team´s id')
 
         team = self._team_repository.get_by_id(teid)
-        return Team(team[0], team[1], team[2], team[3],
-                    fullname(team[4], team[5]),
-                    self._user_service.get_all_by_team(team[0]))
+        return to_team(team, self._user_service.get_all_by_team(team[0]))
 
     def get_name(self, teid: str) -> str:
         '''get_name is used to get name of team with given id
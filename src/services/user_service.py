@@ -7,7 +7,10 @@ from repositories.team_repository import team_repository, TeamRepository
 
 from services.role_service import role_service, RoleService
 
-from utils.helpers import image_string, fullname
+from utils.helpers import avatar_url, fullname
+from utils.images import process_profile_image
+from utils.pagination import Page
+from utils.row_mapper import to_user
 from utils.validators import validate_uuid4
 from utils.exceptions import ValueShorterThanException, EmptyValueException, LoginException, NotExistingException, UnvalidInputException
 
@@ -122,9 +125,7 @@ class UserService:
             raise UnvalidInputException('User´s id')
 
         user = self._user_repository.get_by_id(uid)
-        return User(user[0], user[1], user[2], user[3],
-                    user[4], user[5], user[6], user[7],
-                    image_string(user[8], user[9]), user[10], user[11])
+        return to_user(user)
 
     def get_by_username(self, username: str) -> User:
         '''get_by_username is used to find users from database by username
@@ -142,29 +143,29 @@ class UserService:
         '''
 
         user = self._user_repository.get_by_username(username)
-        return User(user[0], user[1], user[2], user[3],
-                    user[4], user[5], user[6], user[7],
-                    image_string(user[8], user[9]), user[10], user[11])
+        return to_user(user)
 
-    def get_all(self) -> [User]:
-        '''get_all is used to list of all users in the database
+    def get_all(self, after: str = None, before: str = None) -> Page:
+        '''get_all is used to get one page of users, ordered by username
 
-        If no users found, returns empty list.
+        If no users found, returns empty page.
+
+        Args:
+            after (str, optional): cursor of the user after which
+                the page starts. Defaults to None.
+            before (str, optional): cursor of the user before which
+                the page ends. Defaults to None.
 
         Raises:
             DatabaseException: raised if problems occur
                 while interacting with the database
+            UnvalidInputException: raised if unvalid cursor is given
 
         Returns:
-            [User]: list of all users
+            Page: page of users as User objects
         '''
 
-        users = [
-            User(user[0], user[1], user[2], user[3], user[4], user[5], user[6],
-                 user[7], image_string(user[8], user[9]), user[10], user[11])
-            for user in self._user_repository.get_all()
-        ]
-        return users
+        return self._user_repository.get_all(after, before).map(to_user)
 
     def get_all_by_team(self, teid: str) -> [User]:
         '''get_all is used to list of all features in the database
@@ -194,8 +195,7 @@ class UserService:
             raise NotExistingException('Team')
 
         users = [
-            User(user[0], user[1], user[2], user[3], user[4], user[5], user[6],
-                 user[7], image_string(user[8], user[9]), user[10], user[11])
+            to_user(user)
             for user in self._user_repository.get_all_by_team(teid)
         ]
         return users
@@ -215,7 +215,7 @@ class UserService:
         '''
 
         users = [(user[0], fullname(user[1],
-                                    user[2]), image_string(user[3], user[4]))
+                                    user[2]), avatar_url(user[0], user[3]))
                  for user in self._user_repository.get_users()]
         return users
 
@@ -247,10 +247,44 @@ class UserService:
             raise NotExistingException('Team')
 
         users = [(user[0], fullname(user[1],
-                                    user[2]), image_string(user[3], user[4]))
+                                    user[2]), avatar_url(user[0], user[3]))
                  for user in self._user_repository.get_team_users(teid)]
         return users
 
+    def get_users_by_name(self, name: str, teid: str = None) -> [tuple]:
+        '''get_users_by_name is used to get users containing given text
+           in their full name for selecting users in the frontend
+
+        If no text is given or no users found, returns empty list.
+
+        Args:
+            name (str): text to be found from the full name
+            teid (str, optional): id of the team, if only members
+                of the team are wanted. Defaults to None.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            UnvalidInputException: raised if unvalid
+                id is given
+
+        Returns:
+            [tuple]: list of users id, name and profile image
+        '''
+        if teid is not None and not validate_uuid4(teid):
+            raise UnvalidInputException(reason='unvalid formatting of uuid4',
+                                        source='Team ID')
+
+        name = (name or '').strip()
+        if not name:
+            return []
+
+        users = [(user[0], fullname(user[1],
+                                    user[2]), avatar_url(user[0], user[3]))
+                 for user in self._user_repository.get_users_by_name(
+                     name, teid)]
+        return users
+
     def get_fullname(self, uid: str) -> str:
         '''get_fullname is used to get name of user with given id
 
@@ -295,26 +329,81 @@ class UserService:
                 id is given
 
         Returns:
-            str: found profile image
+            str: address of found profile image,
+                None if user has no profile image
         '''
         if not validate_uuid4(uid):
             raise UnvalidInputException(reason='unvalid formatting of uuid4',
                                         source='User ID')
 
-        if not self._user_repository.get_by_id(uid):
-            raise NotExistingException('User')
+        image_version = self._user_repository.get_profile_image_version(uid)
+        return avatar_url(uid, image_version)
 
-        image = self._user_repository.get_profile_image(uid)
-        return image_string(image[0], image[1])
+    def get_avatar_version(self, uid: str) -> str:
+        '''get_avatar_version is used to get version of profile
+           image of user with given id, without the image itself
 
-    def update_profile_image(self, uid: str, img_type: str, img_data: str):
+        Args:
+            uid (str): id of the user
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            NotExistingException: raised if user is not found
+                with given id or has no profile image
+            UnvalidInputException: raised if unvalid
+                id is given
+
+        Returns:
+            str: version of the image, used as its ETag
+        '''
+        if not validate_uuid4(uid):
+            raise UnvalidInputException(reason='unvalid formatting of uuid4',
+                                        source='User ID')
+
+        image_version = self._user_repository.get_profile_image_version(uid)
+        if not image_version:
+            raise NotExistingException('Profile image')
+        return image_version
+
+    def get_avatar(self, uid: str, size: int = None) -> tuple:
+        '''get_avatar is used to get profile image of
+           user with given id as raw bytes
+
+        Args:
+            uid (str): id of the user
+            size (int, optional): wanted width of the image, smallest
+                thumbnail fitting it is returned. Defaults to None,
+                which returns the whole image.
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+            NotExistingException: raised if user has
+                no profile image
+            UnvalidInputException: raised if unvalid
+                id is given
+
+        Returns:
+            tuple: type, version and bytes of the image
+        '''
+        if not validate_uuid4(uid):
+            raise UnvalidInputException(reason='unvalid formatting of uuid4',
+                                        source='User ID')
+
+        return self._user_repository.get_profile_image(uid, size)
+
+    def update_profile_image(self, uid: str, img_type: str, img_data: bytes):
         '''update_profile_image is used to update user´s
            profile images into the database
 
+        Image is downscaled and thumbnails are created from it
+        before saving. Stored type is detected from the image itself.
+
         Args:
             uid (str): uid (str): id of user
-            img_type (str): type of the image.
-            img_data (str): byte data of the image
+            img_type (str): type of the image given by uploader
+            img_data (bytes): byte data of the image
 
         Raises:
             DatabaseException: raised if problems occurs while
@@ -335,12 +424,14 @@ class UserService:
             raise UnvalidInputException('''Profile image type not supported,
                 supported types are "image/jpeg", "image/png", "image/gif"''')
 
-        if len(img_data) > 1000 * 1024:
+        if len(img_data) > 10 * 1024 * 1024:
             raise UnvalidInputException(
-                'Profile image size too big, supports only < 1MB')
+                'Profile image size too big, supports only < 10MB')
+
+        img_type, img_data, thumbnails = process_profile_image(img_data)
 
         return self._user_repository.update_profile_image(
-            uid, img_type, img_data)
+            uid, img_type, img_data, thumbnails)
 
     def update(self, uid: str, username: str, user_role: str, password: str,
                firstname: str, lastname: str, email: str) -> User:
@@ -0,0 +1,167 @@
+from datetime import datetime
+
+import pytest
+
+import routes.api
+from app import app
+from services.api_service import ApiService
+from utils.pagination import Page
+
+_BASE_URL = 'https://localhost'
+_FIRST = '0f3b9d2e-6c1a-4e8b-9a57-3d2c1b0a9e81'
+_SECOND = '5a6b7c8d-9e0f-4a1b-8c2d-3e4f5a6b7c82'
+
+
+class _ApiRepository:
+    '''API repository with teams kept in a list, recording which
+       fields were selected
+    '''
+
+    def __init__(self):
+        self.teams = [{
+            'team_id': team_id,
+            'name': name,
+            'description': 'Team',
+            'team_leader_id': _FIRST,
+            'team_leader_name': 'Leader',
+            'updated_on': datetime(2022, 5, day),
+        } for team_id, name, day in ((_FIRST, 'First', 1),
+                                     (_SECOND, 'Second', 2))]
+        self.next_cursor = None
+        self.selected = []
+
+    def get_page(self, name, fields=(), filters=None, after=None,
+                 before=None) -> Page:
+        # pylint: disable=unused-argument
+        self.selected.append(fields)
+        return Page([(team['updated_on'], 0, team['name'], team['team_id'],
+                      *(team[field] for field in fields))
+                     for team in self.teams], self.next_cursor)
+
+    def get_by_id(self, name, rid, fields=()) -> tuple:
+        # pylint: disable=unused-argument
+        self.selected.append(fields)
+        for team in self.teams:
+            if team['team_id'] == rid:
+                return (team['updated_on'], 0,
+                        *(team[field] for field in fields))
+        return None
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    fake = _ApiRepository()
+    monkeypatch.setattr(routes.api, 'api_service',
+                        ApiService(default_api_repository=fake))
+    return fake
+
+
+@pytest.fixture
+def client():
+    test_client = app.test_client()
+    with test_client.session_transaction() as session:
+        session['user'] = _FIRST
+        session['user_role'] = 3
+    return test_client
+
+
+def _get(client, path: str, **headers):
+    # pylint: disable=redefined-outer-name
+    return client.get(f'/api/v1{path}', headers=headers, base_url=_BASE_URL)
+
+
+def test_listing_is_not_modified_with_matching_etag(repository, client):
+    # pylint: disable=redefined-outer-name
+    etag = _get(client, '/teams').get_etag()[0]
+    repository.selected.clear()
+
+    response = _get(client, '/teams', If_None_Match=f'"{etag}"')
+
+    assert response.status_code == 304
+    assert response.get_etag()[0] == etag
+    assert repository.selected == [()]
+
+
+def test_listing_has_no_last_modified(repository, client):
+    # pylint: disable=redefined-outer-name,unused-argument
+    response = _get(client, '/teams')
+
+    assert response.status_code == 200
+    assert response.last_modified is None
+
+
+def test_listing_ignores_if_modified_since(repository, client):
+    # pylint: disable=redefined-outer-name
+    repository.teams.pop()
+
+    response = _get(client,
+                    '/teams',
+                    If_Modified_Since='Fri, 01 Jan 2100 00:00:00 GMT')
+
+    assert response.status_code == 200
+    assert len(response.get_json()['items']) == 1
+
+
+def test_listing_etag_changes_when_row_is_deleted(repository, client):
+    # pylint: disable=redefined-outer-name
+    etag = _get(client, '/teams').get_etag()[0]
+    repository.teams.pop()
+
+    response = _get(client, '/teams', If_None_Match=f'"{etag}"')
+
+    assert response.status_code == 200
+    assert response.get_etag()[0] != etag
+
+
+def test_listing_etag_changes_with_cursors(repository, client):
+    # pylint: disable=redefined-outer-name
+    etag = _get(client, '/teams').get_etag()[0]
+    repository.next_cursor = 'cursor'
+
+    response = _get(client, '/teams', If_None_Match=f'"{etag}"')
+
+    assert response.status_code == 200
+    assert response.get_json()['next_cursor'] == 'cursor'
+
+
+def test_resource_is_not_modified_since_last_modified(repository, client):
+    # pylint: disable=redefined-outer-name
+    response = _get(client, f'/teams/{_SECOND}')
+    assert response.last_modified == datetime(2022, 5, 2).astimezone()
+    repository.selected.clear()
+
+    response = _get(client,
+                    f'/teams/{_SECOND}',
+                    If_Modified_Since='Mon, 02 May 2022 00:00:00 GMT')
+
+    assert response.status_code == 304
+    assert repository.selected == [()]
+
+
+def test_only_asked_fields_are_selected(repository, client):
+    # pylint: disable=redefined-outer-name
+    response = _get(client, '/teams?fields=name')
+
+    assert response.get_json()['items'] == [{
+        'team_id': _FIRST,
+        'name': 'First'
+    }, {
+        'team_id': _SECOND,
+        'name': 'Second'
+    }]
+    assert repository.selected == [('team_id', 'name')]
+
+
+def test_etag_depends_on_asked_fields(repository, client):
+    # pylint: disable=redefined-outer-name,unused-argument
+    etag = _get(client, '/teams?fields=name').get_etag()[0]
+
+    assert _get(client, '/teams').get_etag()[0] != etag
+
+
+def test_unknown_field_is_rejected(repository, client):
+    # pylint: disable=redefined-outer-name
+    response = _get(client, '/teams?fields=password_hash')
+
+    assert response.status_code == 400
+    assert not repository.selected
@@ -0,0 +1,120 @@
+from hashlib import md5
+
+import pytest
+from sqlalchemy import text
+
+import routes.users
+from app import app
+from repositories.user_repository import user_repository
+from services.user_service import UserService
+from utils.helpers import avatar_url
+
+_BASE_URL = 'https://localhost'
+_USER = '0f3b9d2e-6c1a-4e8b-9a57-3d2c1b0a9e81'
+_IMAGE = b'image'
+_VERSION = md5(_IMAGE).hexdigest()
+
+
+class _UserRepository:
+    '''User repository with one profile image, recording whether
+       the image itself was read
+    '''
+
+    def __init__(self):
+        self.images_read = 0
+
+    def get_profile_image_version(self, uid: str) -> str:
+        # pylint: disable=unused-argument
+        return _VERSION
+
+    def get_profile_image(self, uid: str, size: int = None) -> tuple:
+        # pylint: disable=unused-argument
+        self.images_read += 1
+        return ('image/png', _VERSION, _IMAGE)
+
+
+@pytest.fixture
+def repository(monkeypatch):
+    fake = _UserRepository()
+    monkeypatch.setattr(routes.users, 'user_service',
+                        UserService(default_user_repository=fake))
+    return fake
+
+
+@pytest.fixture
+def client():
+    test_client = app.test_client()
+    with test_client.session_transaction() as session:
+        session['user'] = _USER
+    return test_client
+
+
+def _get(client, path: str, **headers):
+    # pylint: disable=redefined-outer-name
+    return client.get(path, headers=headers, base_url=_BASE_URL)
+
+
+def test_address_has_version_of_the_image():
+    assert avatar_url(_USER, _VERSION) == \
+        f'/users/{_USER}/avatar?size=48&v={_VERSION}'
+    assert avatar_url(_USER, None) is None
+
+
+def test_image_is_not_read_when_not_modified(repository, client):
+    # pylint: disable=redefined-outer-name
+    response = _get(client,
+                    avatar_url(_USER, _VERSION),
+                    **{'If-None-Match': f'"{_VERSION}"'})
+
+    assert response.status_code == 304
+    assert response.headers['ETag'] == f'"{_VERSION}"'
+    assert repository.images_read == 0
+
+
+def test_image_is_read_when_modified(repository, client):
+    # pylint: disable=redefined-outer-name
+    response = _get(client,
+                    avatar_url(_USER, _VERSION),
+                    **{'If-None-Match': '"previous"'})
+
+    assert response.status_code == 200
+    assert response.data == _IMAGE
+    assert response.headers['ETag'] == f'"{_VERSION}"'
+    assert repository.images_read == 1
+
+
+def test_versioned_address_is_cached_long(repository, client):
+    # pylint: disable=redefined-outer-name,unused-argument
+    response = _get(client, avatar_url(_USER, _VERSION))
+
+    assert response.cache_control.max_age == \
+        routes.users.configs.avatar_versioned_max_age
+    assert response.cache_control.immutable
+
+
+def test_outdated_address_is_revalidated(repository, client):
+    # pylint: disable=redefined-outer-name,unused-argument
+    response = _get(client, avatar_url(_USER, 'previous'))
+
+    assert response.cache_control.max_age == \
+        routes.users.configs.avatar_max_age
+    assert not response.cache_control.immutable
+
+
+def test_version_is_written_with_the_image(database, queries):
+    uid = str(
+        database.execute(
+            text('''INSERT INTO Users (username, user_role, password_hash,
+                       firstname, lastname, email)
+                    VALUES ('avatar_user', 1, 'hash', 'Avatar', 'User',
+                       'avatar@example.com')
+                    RETURNING id''')).scalar())
+    user_repository.update_profile_image(uid, 'image/png', _IMAGE,
+                                         {48: b'thumbnail'})
+    queries.clear()
+
+    assert user_repository.get_profile_image_version(uid) == _VERSION
+    assert all('image_data' not in statement for statement in queries)
+    assert user_repository.get_profile_image(uid, 48) == ('image/png',
+                                                          _VERSION,
+                                                          b'thumbnail')
@@ -0,0 +1,77 @@
+import os
+import sys
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.exc import OperationalError
+
+# tests import modules the same way as the application, which is run
+# from src directory
+SRC_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, SRC_DIRECTORY)
+
+# modules using the database read its address when imported, tests that
+# do not connect to it can be run without one
+os.environ.setdefault('DATABASE_URL',
+                      'postgresql://localhost/projektinator-test')
+# sessions of test clients are signed with the secret
+os.environ.setdefault('SECRET', 'test')
+
+# application is imported before the modules under test, like when it
+# is run, because importing it imports the routes and their services
+from app import app    # pylint: disable=wrong-import-position
+from utils.database import db    # pylint: disable=wrong-import-position
+
+
+def _require_database():
+    try:
+        db.session.execute(text('SELECT 1'))
+    except OperationalError:
+        pytest.skip('test database is not available')
+
+
+@pytest.fixture
+def database():
+    '''database gives session of the test database inside a request
+       context, and discards everything written by the test
+
+    Tests using it are skipped if the database can not be reached.
+    '''
+    with app.test_request_context():
+        _require_database()
+        try:
+            yield db.session
+        finally:
+            db.session.rollback()
+
+
+@pytest.fixture
+def engine():
+    '''engine gives engine of the test database for tests that manage
+       their own connections and transactions, and have to clean up
+       after themselves
+
+    Tests using it are skipped if the database can not be reached.
+    '''
+    with app.app_context():
+        _require_database()
+        db.session.rollback()
+        yield db.engine
+
+
+@pytest.fixture
+def queries(database):    # pylint: disable=redefined-outer-name,unused-argument
+    '''queries gives list of statements sent to the database
+       during the test
+    '''
+    statements = []
+
+    def _record(*args):
+        # arguments are connection, cursor, statement and its parameters
+        statements.append(args[2])
+
+    event.listen(db.engine, 'before_cursor_execute', _record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', _record)
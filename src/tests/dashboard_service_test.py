@@ -0,0 +1,60 @@
+import pytest
+from sqlalchemy import text
+
+from services.dashboard_service import dashboard_service
+
+_ADD_USER = text('''
+    INSERT INTO Users (username, user_role, password_hash, firstname,
+        lastname, email)
+    VALUES ('dashboard', 1, 'hash', 'Dash', 'Board', 'dash@board.fi')
+    RETURNING id
+''')
+
+_ADD_TREE = text('''
+    WITH project AS (
+        INSERT INTO Projects (project_owner, name, description)
+        VALUES (:uid, 'Project', 'description')
+        RETURNING id
+    ), feature AS (
+        INSERT INTO Features (project_id, feature_owner, name, status, type,
+            priority)
+        SELECT id, :uid, 'Feature', (SELECT id FROM Statuses LIMIT 1),
+            (SELECT id FROM Types LIMIT 1), 1
+        FROM project
+        RETURNING id
+    ), tasks AS (
+        INSERT INTO Tasks (feature_id, assignee, name, status, type, priority)
+        SELECT feature.id, :uid, 'Task ' || number,
+            (SELECT id FROM Statuses LIMIT 1), (SELECT id FROM Types LIMIT 1), 1
+        FROM feature, generate_series(1, :tasks) number
+        RETURNING id
+    )
+    INSERT INTO Comments (task_id, comment, time_spent, assignee)
+    SELECT id, 'comment', 1, :uid FROM tasks
+''')
+
+
+def _dashboard_user(session, tasks: int) -> str:
+    uid = session.execute(_ADD_USER).scalar()
+    session.execute(_ADD_TREE, {'uid': uid, 'tasks': tasks})
+    session.execute(
+        text('''INSERT INTO Teams (name, team_leader)
+                VALUES ('Team', :uid)'''), {'uid': uid})
+    return str(uid)
+
+
+@pytest.mark.parametrize('tasks', [1, 1000])
+def test_dashboard_is_loaded_with_one_query(database, queries, tasks):
+    uid = _dashboard_user(database, tasks)
+    queries.clear()
+
+    (projects, features, user_tasks, comments, teams,
+     time_spent) = dashboard_service.get_by_user(uid)
+
+    assert len(queries) == 1
+    assert len(projects) == 1
+    assert len(features) == 1
+    assert len(user_tasks) == tasks
+    assert len(comments) == tasks
+    assert len(teams) == 1
+    assert time_spent == tasks
@@ -0,0 +1,35 @@
+from sqlalchemy import text
+
+from utils.database import like_patterns
+
+
+def test_plain_term_is_wrapped_in_wildcards():
+    assert like_patterns('word') == {'contains': '%word%', 'prefix': 'word%'}
+
+
+def test_percent_sign_is_escaped():
+    assert like_patterns('100%') == {
+        'contains': '%100\\%%',
+        'prefix': '100\\%%'
+    }
+
+
+def test_underscore_is_escaped():
+    assert like_patterns('a_b') == {'contains': '%a\\_b%', 'prefix': 'a\\_b%'}
+
+
+def test_backslash_is_escaped():
+    assert like_patterns('a\\b') == {
+        'contains': '%a\\\\b%',
+        'prefix': 'a\\\\b%'
+    }
+
+
+def test_escaped_wildcards_match_only_themselves(database):
+    patterns = like_patterns('%_\\')
+    matches = database.execute(
+        text('''SELECT name FROM (VALUES ('a%_\\b'), ('ab'), ('a%xb'))
+                    AS Names (name)
+                WHERE name ILIKE :contains'''), patterns).scalars().all()
+
+    assert matches == ['a%_\\b']
@@ -0,0 +1,77 @@
+from io import BytesIO
+
+import pytest
+from PIL import Image
+
+from utils.exceptions import UnvalidInputException
+from utils.images import ORIGINAL_MAX_SIZE, THUMBNAIL_SIZES, process_profile_image
+
+
+def _image(img_format: str, size: tuple, mode: str = 'RGB', **options) -> bytes:
+    buffer = BytesIO()
+    Image.new(mode, size).save(buffer, img_format, **options)
+    return buffer.getvalue()
+
+
+def _open(data: bytes) -> Image.Image:
+    return Image.open(BytesIO(data))
+
+
+def test_large_jpeg_is_downscaled_keeping_aspect_ratio():
+    img_type, original, _ = process_profile_image(_image('JPEG', (2048, 1024)))
+
+    assert img_type == 'image/jpeg'
+    assert _open(original).format == 'JPEG'
+    assert _open(original).size == (ORIGINAL_MAX_SIZE, ORIGINAL_MAX_SIZE // 2)
+
+
+def test_small_image_is_not_upscaled():
+    _, original, _ = process_profile_image(_image('PNG', (20, 10)))
+
+    assert _open(original).size == (20, 10)
+
+
+def test_thumbnails_are_square_in_every_size():
+    _, _, thumbnails = process_profile_image(_image('JPEG', (300, 100)))
+
+    assert sorted(thumbnails) == sorted(THUMBNAIL_SIZES)
+    for size, data in thumbnails.items():
+        assert _open(data).size == (size, size)
+        assert _open(data).format == 'JPEG'
+
+
+def test_gif_is_stored_as_png():
+    img_type, original, thumbnails = process_profile_image(
+        _image('GIF', (64, 64), mode='P'))
+
+    assert img_type == 'image/png'
+    assert _open(original).format == 'PNG'
+    assert all(_open(data).format == 'PNG' for data in thumbnails.values())
+
+
+def test_exif_orientation_is_applied():
+    exif = Image.Exif()
+    exif[0x0112] = 6    # rotated 90 degrees
+    data = _image('JPEG', (200, 100), exif=exif.tobytes())
+
+    _, original, _ = process_profile_image(data)
+
+    assert _open(original).size == (100, 200)
+
+
+def test_unsupported_format_is_rejected():
+    with pytest.raises(UnvalidInputException):
+        process_profile_image(_image('BMP', (10, 10)))
+
+
+def test_data_that_is_not_image_is_rejected():
+    with pytest.raises(UnvalidInputException):
+        process_profile_image(b'not an image')
+
+
+def test_truncated_image_is_rejected():
+    buffer = BytesIO()
+    Image.effect_noise((100, 100), 50).save(buffer, 'PNG')
+
+    with pytest.raises(UnvalidInputException):
+        process_profile_image(buffer.getvalue()[:len(buffer.getvalue()) // 2])
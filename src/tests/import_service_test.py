@@ -0,0 +1,259 @@
+from datetime import datetime
+from io import StringIO
+
+import pytest
+from sqlalchemy import text
+
+from services.import_service import ImportService
+from utils.exceptions import UnvalidInputException
+import utils.config as configs
+
+_TASKS_HEADER = ('project,feature,name,description,assignee,status,type,'
+                 'priority,flags,created\n')
+_COMMENTS_HEADER = 'project,feature,task,assignee,time_spent,comment\n'
+
+
+class _Lookup:
+    '''Status or type repository with fixed rows
+    '''
+
+    def __init__(self, rows: list):
+        self.rows = rows
+
+    def get_all(self) -> list:
+        return self.rows
+
+
+class _ImportRepository:
+    '''Import repository resolving names from dictionaries and
+       recording copied rows instead of writing them
+    '''
+
+    def __init__(self):
+        self.features = {('Project', 'Feature'): ['f1']}
+        self.tasks = {('Project', 'Feature', 'Task'): ['t1']}
+        self.users = {'worker': ['u1'], 'twin': ['u2', 'u3']}
+        self.copies = []
+        self.committed = False
+        self.rolled_back = False
+
+    def get_feature_ids(self, names: list) -> dict:
+        return {name: self.features[name] for name in names
+                if name in self.features}
+
+    def get_task_ids(self, names: list) -> dict:
+        return {name: self.tasks[name] for name in names if name in self.tasks}
+
+    def get_user_ids(self, usernames: set) -> dict:
+        return {name: self.users[name] for name in usernames
+                if name in self.users}
+
+    def copy(self, table: str, columns: tuple, rows: list):
+        if rows:
+            self.copies.append((table, columns, rows))
+
+    def commit(self):
+        self.committed = True
+
+    def rollback(self):
+        self.rolled_back = True
+
+
+@pytest.fixture
+def repository():
+    return _ImportRepository()
+
+
+@pytest.fixture
+def service(repository):    # pylint: disable=redefined-outer-name
+    return ImportService(repository, _Lookup([('s1', 'Not started')]),
+                         _Lookup([('y1', 'Bugfixes')]))
+
+
+def test_tasks_are_copied_with_resolved_ids(repository, service):
+    # pylint: disable=redefined-outer-name
+    result = service.import_tasks(
+        StringIO(_TASKS_HEADER +
+                 'Project,Feature,First,Text,worker,not started,BUGFIXES,1,'
+                 'a;b;,\n'
+                 'Project,Feature,Second,Text,worker,Not started,bugfixes,3,'
+                 ',2021-05-01 12:00\n'))
+
+    assert result.succeeded
+    assert result.imported == 2
+    assert repository.committed
+    columns = ('feature_id', 'assignee', 'name', 'description', 'flags',
+               'status', 'type', 'priority')
+    assert repository.copies == [
+        ('Tasks', columns,
+         [('f1', 'u1', 'First', 'Text', 'a;b;', 's1', 'y1', 1)]),
+        ('Tasks', columns + ('created', 'updated_on'),
+         [('f1', 'u1', 'Second', 'Text', '', 's1', 'y1', 3,
+           datetime(2021, 5, 1, 12), datetime(2021, 5, 1, 12))]),
+    ]
+
+
+def test_missing_columns_of_header_raise(repository, service):
+    # pylint: disable=redefined-outer-name
+    with pytest.raises(UnvalidInputException) as error:
+        service.import_tasks(StringIO('project,feature,name\n'))
+
+    assert 'missing description, assignee' in str(error.value)
+    assert repository.rolled_back
+    assert not repository.copies
+
+
+def test_unvalid_rows_are_reported_by_line_and_nothing_is_imported(
+        repository, service):
+    # pylint: disable=redefined-outer-name
+    result = service.import_tasks(
+        StringIO(_TASKS_HEADER +
+                 'Project,Feature,Ok,Text,worker,not started,bugfixes,1,,\n'
+                 'Project,Feature, ,Text,worker,not started,bugfixes,1,,\n'
+                 'Project,Feature,A,Text,worker,done,bugfixes,1,,\n'
+                 'Project,Feature,A,Text,worker,not started,bugfixes,x,,\n'
+                 'Project,Feature,A,Text,worker,not started,bugfixes,4,,\n'
+                 'Project,Feature,A,Text,worker,not started,bugfixes,1,a,\n'
+                 'Project,Feature,A,Text,worker,not started,bugfixes,1,,'
+                 'yesterday\n'
+                 'Project,Nope,A,Text,worker,not started,bugfixes,1,,\n'
+                 'Project,Feature,A,Text,twin,not started,bugfixes,1,,\n'
+                 'Project,Feature,A,Text,worker,not started,bugfixes,1,,,x\n'))
+
+    assert not result.succeeded
+    assert result.imported == 0
+    assert result.errors == [
+        (3, 'name is empty'),
+        (4, 'status "done" not found'),
+        (5, 'priority is not an integer'),
+        (6, 'priority is not in scale 1-3'),
+        (7, 'flags is not in "one;two;flags;" format'),
+        (8, 'created is not in YYYY-MM-DD[ HH:MM[:SS]] format'),
+        (9, 'feature "Project / Nope" not found'),
+        (10, 'assignee "twin" is ambiguous'),
+        (11, 'too many values'),
+    ]
+    assert repository.rolled_back
+    assert not repository.committed
+    assert not repository.copies
+
+
+def test_error_in_later_batch_discards_copied_batches(repository, service,
+                                                      monkeypatch):
+    # pylint: disable=redefined-outer-name
+    monkeypatch.setattr(configs, 'import_batch_size', 2)
+
+    result = service.import_tasks(
+        StringIO(_TASKS_HEADER +
+                 'Project,Feature,A,Text,worker,not started,bugfixes,1,,\n'
+                 'Project,Feature,B,Text,worker,not started,bugfixes,1,,\n'
+                 'Project,Feature,C,Text,worker,not started,bugfixes,0,,\n'))
+
+    assert result.errors == [(4, 'priority is not in scale 1-3')]
+    assert result.imported == 0
+    assert len(repository.copies) == 1
+    assert repository.rolled_back
+    assert not repository.committed
+
+
+def test_comments_are_related_to_task_or_feature(repository, service):
+    # pylint: disable=redefined-outer-name
+    result = service.import_comments(
+        StringIO(_COMMENTS_HEADER + 'Project,Feature,Task,worker,1.5,Done\n'
+                 'Project,Feature,,worker,2,<b>Planned</b>\n'))
+
+    assert result.imported == 2
+    assert repository.copies == [
+        ('Comments',
+         ('feature_id', 'task_id', 'assignee', 'comment', 'time_spent'), [
+             (None, 't1', 'u1', 'Done', 1.5),
+             ('f1', None, 'u1', '&lt;b&gt;Planned&lt;/b&gt;', 2.0),
+         ])
+    ]
+
+
+def test_unvalid_comments_are_reported(repository, service):
+    # pylint: disable=redefined-outer-name
+    result = service.import_comments(
+        StringIO(_COMMENTS_HEADER + 'Project,Feature,Task,worker,lots,Done\n'
+                 'Project,Feature,Nope,worker,1,Done\n'
+                 'Project,Feature,,worker,1,\n'))
+
+    assert result.errors == [
+        (2, 'time_spent is not a number'),
+        (3, 'task "Project / Feature / Nope" not found'),
+        (4, 'comment is empty'),
+    ]
+    assert not repository.copies
+
+
+@pytest.mark.parametrize('time_spent', ['nan', 'NaN', 'inf', '-inf',
+                                        'Infinity', '-0.5'])
+def test_time_spent_has_to_be_finite_and_not_negative(repository, service,
+                                                      time_spent):
+    # pylint: disable=redefined-outer-name
+    result = service.import_comments(
+        StringIO(_COMMENTS_HEADER +
+                 f'Project,Feature,Task,worker,{time_spent},Done\n'))
+
+    assert result.errors == [
+        (2, 'time_spent is not a finite number of at least 0'),
+    ]
+    assert not repository.copies
+
+
+def test_zero_time_spent_is_imported(repository, service):
+    # pylint: disable=redefined-outer-name
+    result = service.import_comments(
+        StringIO(_COMMENTS_HEADER + 'Project,Feature,Task,worker,0,Done\n'))
+
+    assert result.imported == 1
+    assert repository.copies[0][2] == [(None, 't1', 'u1', 'Done', 0.0)]
+
+
+def test_nulls_and_empty_values_are_kept_apart(database):
+    # pylint: disable=redefined-outer-name
+    user = database.execute(
+        text('''INSERT INTO Users (username, user_role, password_hash,
+                    firstname, lastname)
+                VALUES ('importer', 1, 'hash', 'Im', 'Porter')
+                RETURNING id''')).scalar()
+    project = database.execute(
+        text('''INSERT INTO Projects (project_owner, name)
+                VALUES (:user, 'Import project') RETURNING id'''), {
+            'user': user
+        }).scalar()
+    feature = database.execute(
+        text('''INSERT INTO Features (project_id, feature_owner, name)
+                VALUES (:project, :user, 'Import feature') RETURNING id'''), {
+            'project': project,
+            'user': user
+        }).scalar()
+    database.execute(
+        text('''INSERT INTO Tasks (feature_id, assignee, name)
+                VALUES (:feature, :user, 'Import task')'''), {
+            'feature': feature,
+            'user': user
+        })
+
+    service = ImportService()    # pylint: disable=redefined-outer-name
+    tasks = service.import_tasks(
+        StringIO(_TASKS_HEADER +
+                 'Import project,Import feature,Empty flags,\\N,importer,'
+                 'not started,bugfixes,2,,\n'))
+    comments = service.import_comments(
+        StringIO(_COMMENTS_HEADER +
+                 'Import project,Import feature,Import task,importer,1,'
+                 'On task\n'
+                 'Import project,Import feature,,importer,2,\\N\n'))
+
+    assert tasks.succeeded and comments.succeeded
+    assert database.execute(
+        text('''SELECT description, flags FROM Tasks
+                WHERE name = 'Empty flags' ''')).fetchone() == ('\\N', '')
+    assert database.execute(
+        text('''SELECT feature_id IS NULL, task_id IS NULL, comment
+                FROM Comments WHERE assignee = :user
+                ORDER BY time_spent'''), {
+            'user': user
+        }).fetchall() == [(True, False, 'On task'), (False, True, '\\N')]
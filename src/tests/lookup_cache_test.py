@@ -0,0 +1,102 @@
+from sqlalchemy import text
+
+from utils.lookup_cache import LookupCache
+
+
+class _Table:
+    '''Lookup table whose version is bumped on every write,
+       like triggers do for LookupVersions
+    '''
+
+    def __init__(self, rows: list):
+        self.rows = rows
+        self.version = 1
+        self.loads = 0
+
+    def load(self) -> list:
+        self.loads += 1
+        return list(self.rows)
+
+    def write(self, rows: list):
+        self.rows = rows
+        self.version += 1
+
+
+class _Cache(LookupCache):
+
+    def __init__(self, table: _Table, check_interval: float):
+        super().__init__('statuses', table.load, check_interval)
+        self.table = table
+        self.version_checks = 0
+
+    def _get_version(self) -> int:
+        self.version_checks += 1
+        return self.table.version
+
+
+def test_table_is_loaded_once_while_version_is_unchanged():
+    table = _Table([('a', 'not started'), ('b', 'done')])
+    cache = _Cache(table, check_interval=0)
+
+    assert cache.get_all() == table.rows
+    assert cache.get('b') == ('b', 'done')
+    assert cache.get_all() == table.rows
+
+    assert table.loads == 1
+    assert cache.version_checks == 3
+
+
+def test_table_is_loaded_again_when_version_changes():
+    table = _Table([('a', 'not started')])
+    cache = _Cache(table, check_interval=0)
+    cache.get_all()
+
+    table.write([('a', 'started')])
+
+    assert cache.get('a') == ('a', 'started')
+    assert table.loads == 2
+
+
+def test_version_is_not_checked_again_within_interval():
+    table = _Table([('a', 'not started')])
+    cache = _Cache(table, check_interval=3600)
+    cache.get_all()
+
+    table.write([('a', 'started')])
+
+    assert cache.get('a') == ('a', 'not started')
+    assert cache.version_checks == 1
+
+
+def test_invalidate_loads_table_on_next_use():
+    table = _Table([('a', 'not started')])
+    cache = _Cache(table, check_interval=3600)
+    cache.get_all()
+
+    table.write([('a', 'started')])
+    cache.invalidate()
+
+    assert cache.get('a') == ('a', 'started')
+    assert table.loads == 2
+
+
+def test_ids_are_matched_as_strings_ignoring_case():
+    table = _Table([('ABC-1', 'uuid'), (2, 'serial')])
+    cache = _Cache(table, check_interval=0)
+
+    assert cache.get('abc-1') == ('ABC-1', 'uuid')
+    assert cache.get('2') == (2, 'serial')
+    assert cache.get(2) == (2, 'serial')
+    assert cache.get('missing') is None
+
+
+def test_writes_to_table_change_its_version(database):
+    rows = []
+    cache = LookupCache('statuses', lambda: list(rows), check_interval=0)
+    cache.get_all()
+
+    # written by another process, which does not invalidate this cache
+    rows.append(('new', 'reviewed'))
+    database.execute(text("INSERT INTO Statuses (name) VALUES ('reviewed')"))
+
+    assert cache.get('new') == ('new', 'reviewed')
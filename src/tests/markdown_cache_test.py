@@ -0,0 +1,73 @@
+import pytest
+from markdown2 import markdown
+
+import utils.markdown_cache
+from utils.markdown_cache import MarkdownCache
+import utils.config as configs
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    '''rendered gives list of texts rendered by markdown2
+    '''
+    texts = []
+
+    def counting_markdown(text: str) -> str:
+        texts.append(text)
+        return markdown(text)
+
+    monkeypatch.setattr(utils.markdown_cache, 'markdown', counting_markdown)
+    return texts
+
+
+def test_html_is_rendered_from_markdown():
+    cache = MarkdownCache(size=10)
+
+    assert cache.render('**bold**') == markdown('**bold**')
+
+
+def test_same_text_is_rendered_once(rendered):
+    # pylint: disable=redefined-outer-name
+    cache = MarkdownCache(size=10)
+
+    first = cache.render('*text*')
+    second = cache.render('*text*')
+
+    assert first == second
+    assert rendered == ['*text*']
+
+
+def test_least_recently_used_text_is_dropped_when_full(rendered):
+    # pylint: disable=redefined-outer-name
+    cache = MarkdownCache(size=2)
+    cache.render('a')
+    cache.render('b')
+    cache.render('a')
+
+    cache.render('c')
+    cache.render('a')
+    cache.render('b')
+
+    assert rendered == ['a', 'b', 'c', 'b']
+
+
+def test_nothing_is_cached_with_size_zero(rendered):
+    # pylint: disable=redefined-outer-name
+    cache = MarkdownCache(size=0)
+
+    cache.render('text')
+    cache.render('text')
+
+    assert rendered == ['text', 'text']
+
+
+def test_size_defaults_to_config(monkeypatch, rendered):
+    # pylint: disable=redefined-outer-name
+    monkeypatch.setattr(configs, 'markdown_cache_size', 1)
+    cache = MarkdownCache()
+
+    cache.render('a')
+    cache.render('b')
+    cache.render('a')
+
+    assert rendered == ['a', 'b', 'a']
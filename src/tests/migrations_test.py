@@ -0,0 +1,145 @@
+import os
+import shutil
+
+import pytest
+from sqlalchemy import text
+
+from utils.exceptions import DatabaseException
+from utils.migrations import MIGRATIONS_DIRECTORY, Migration, load, migrate
+
+
+def test_statements_are_split_at_semicolons_ending_a_line():
+    migration = Migration(
+        '0001', 'indexes', '''-- migrate:no-transaction
+-- comment lines are left out
+CREATE INDEX CONCURRENTLY a_idx ON A (a);
+CREATE INDEX CONCURRENTLY b_idx
+  ON B (b);  
+CREATE INDEX CONCURRENTLY c_idx ON C (c)''')
+
+    assert migration.statements() == [
+        'CREATE INDEX CONCURRENTLY a_idx ON A (a)',
+        'CREATE INDEX CONCURRENTLY b_idx\n  ON B (b)',
+        'CREATE INDEX CONCURRENTLY c_idx ON C (c)',
+    ]
+
+
+def test_semicolons_inside_a_line_do_not_split():
+    migration = Migration(
+        '0001', 'flags',
+        "UPDATE A SET flags = 'a;b;' WHERE flags LIKE '%;%';\n")
+
+    assert migration.statements() == [
+        "UPDATE A SET flags = 'a;b;' WHERE flags LIKE '%;%'"
+    ]
+
+
+def test_migration_without_statements_has_none():
+    assert not Migration('0001', 'empty', '-- nothing yet\n\n').statements()
+
+
+@pytest.mark.parametrize('sql, transactional', [
+    ('-- migrate:no-transaction\nCREATE INDEX CONCURRENTLY a ON A (a);',
+     False),
+    ('\n  -- migrate:no-transaction\nCREATE INDEX CONCURRENTLY a ON A (a);',
+     False),
+    ('CREATE INDEX a ON A (a);', True),
+    ('-- adds index\n-- migrate:no-transaction\nCREATE INDEX a ON A (a);',
+     True),
+])
+def test_no_transaction_is_detected_from_first_line(sql, transactional):
+    assert Migration('0001', 'index', sql).transactional == transactional
+
+
+def test_migrations_are_loaded_in_order_of_version(tmp_path):
+    for filename in ('0002_second.sql', '0001_first.sql', 'README.md',
+                     '0003_third.sql.orig'):
+        (tmp_path / filename).write_text('SELECT 1;', encoding='utf-8')
+
+    migrations = load(str(tmp_path))
+
+    assert [(m.version, m.name) for m in migrations] == [('0001', 'first'),
+                                                         ('0002', 'second')]
+
+
+def test_repository_migrations_have_unique_versions():
+    versions = [migration.version for migration in load()]
+
+    assert versions
+    assert len(versions) == len(set(versions))
+
+
+@pytest.fixture
+def clean_migrations(engine):    # pylint: disable=redefined-outer-name
+    '''clean_migrations removes versions recorded by the test and
+       tables created by it
+    '''
+    versions = []
+    yield versions
+    with engine.begin() as connection:
+        connection.execute(text('DROP TABLE IF EXISTS migration_test'))
+        connection.execute(
+            text('DELETE FROM schema_migrations '
+                 'WHERE version = ANY(:versions)'), {'versions': versions})
+
+
+def test_migrations_with_percent_signs_are_applied(tmp_path, engine,
+                                                   clean_migrations):
+    # pylint: disable=redefined-outer-name
+    (tmp_path / '90001_percent_table.sql').write_text(
+        '''-- names matching '%word%' or 100% of them
+CREATE TABLE migration_test (name TEXT DEFAULT '100%');
+''', encoding='utf-8')
+    (tmp_path / '90002_percent_index.sql').write_text(
+        '''-- migrate:no-transaction
+-- '%word%'
+CREATE INDEX CONCURRENTLY IF NOT EXISTS migration_test_idx
+  ON migration_test (name) WHERE name LIKE '%!%';
+''', encoding='utf-8')
+    clean_migrations.extend(['90001', '90002'])
+
+    applied = migrate(str(tmp_path))
+
+    assert [migration.version for migration in applied] == ['90001', '90002']
+    assert not migrate(str(tmp_path))
+    with engine.connect() as connection:
+        connection.execute(text('INSERT INTO migration_test DEFAULT VALUES'))
+        assert connection.execute(
+            text('SELECT name FROM migration_test')).scalar() == '100%'
+
+
+def test_failed_migration_is_rolled_back_and_not_recorded(tmp_path, engine,
+                                                          clean_migrations):
+    # pylint: disable=redefined-outer-name
+    (tmp_path / '90001_broken.sql').write_text(
+        '''CREATE TABLE migration_test (name TEXT);
+SELECT * FROM not_existing_table;
+''', encoding='utf-8')
+    clean_migrations.append('90001')
+
+    with pytest.raises(DatabaseException):
+        migrate(str(tmp_path))
+
+    with engine.connect() as connection:
+        assert connection.execute(
+            text("SELECT to_regclass('migration_test')")).scalar() is None
+        assert connection.execute(
+            text('SELECT COUNT(*) FROM schema_migrations '
+                 "WHERE version = '90001'")).scalar() == 0
+
+
+def test_repository_migrations_apply_on_database_from_structure(
+        tmp_path, clean_migrations):
+    # pylint: disable=redefined-outer-name
+    '''database_structure.sql does not record migrations, so every
+       migration is run on new databases and has to succeed there
+    '''
+    for filename in os.listdir(MIGRATIONS_DIRECTORY):
+        shutil.copy(os.path.join(MIGRATIONS_DIRECTORY, filename),
+                    tmp_path / f'9{filename}')
+    versions = [migration.version for migration in load(str(tmp_path))]
+    clean_migrations.extend(versions)
+
+    applied = migrate(str(tmp_path))
+
+    assert [migration.version for migration in applied] == versions
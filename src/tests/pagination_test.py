@@ -0,0 +1,126 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from datetime import datetime
+from uuid import UUID
+
+import pytest
+
+from utils.exceptions import UnvalidInputException
+from utils.pagination import Keyset, Page
+
+_KEYSET = Keyset(('T.created', 'timestamp'), ('T.id', 'uuid'))
+_ID = UUID('6f1c2a34-5b6d-4e7f-8a9b-0c1d2e3f4a5b')
+_CREATED = datetime(2022, 3, 4, 5, 6, 7, 890000)
+
+
+def _cursor(values: list) -> str:
+    return urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def _rows(count: int) -> list:
+    return [(datetime(2022, 1, 1, 0, 0, number), f'id {number}')
+            for number in range(count)]
+
+
+def _key(row: tuple) -> tuple:
+    return row
+
+
+def test_first_page_has_no_condition():
+    condition, order, values = _KEYSET.clause()
+
+    assert condition == 'TRUE'
+    assert order == 'T.created DESC, T.id DESC'
+    assert values == {}
+
+
+def test_cursor_decodes_into_key_values():
+    page = _KEYSET.page([(_CREATED, _ID), (_CREATED, _ID)], 1, _key)
+
+    condition, order, values = _KEYSET.clause(after=page.next_cursor)
+
+    assert condition == ('(T.created, T.id) < (CAST(:cursor_0 AS timestamp), '
+                         'CAST(:cursor_1 AS uuid))')
+    assert order == 'T.created DESC, T.id DESC'
+    assert values == {'cursor_0': str(_CREATED), 'cursor_1': str(_ID)}
+
+
+def test_before_reverses_order_and_comparison():
+    condition, order, _ = _KEYSET.clause(
+        before=_cursor([_CREATED.isoformat(), str(_ID)]))
+
+    assert condition.startswith('(T.created, T.id) > ')
+    assert order == 'T.created ASC, T.id ASC'
+
+
+def test_ascending_keyset_compares_upwards():
+    keyset = Keyset(('U.username', 'text'), descending=False)
+
+    condition, order, _ = keyset.clause(after=_cursor(['name']))
+
+    assert condition == '(U.username) > (CAST(:cursor_0 AS text))'
+    assert order == 'U.username ASC'
+
+
+def test_page_with_extra_row_has_next_cursor():
+    page = _KEYSET.page(_rows(3), 2, _key)
+
+    assert page.items == _rows(2)
+    assert page.prev_cursor is None
+    assert json.loads(urlsafe_b64decode(page.next_cursor)) == [
+        _rows(2)[1][0].isoformat(), 'id 1'
+    ]
+
+
+def test_last_page_has_no_next_cursor():
+    page = _KEYSET.page(_rows(2), 2, _key, after=_cursor(['x', 'y']))
+
+    assert page.next_cursor is None
+    assert page.prev_cursor is not None
+
+
+def test_page_fetched_backwards_is_returned_in_listing_order():
+    rows = list(reversed(_rows(3)))
+
+    page = _KEYSET.page(rows, 2, _key, before=_cursor(['x', 'y']))
+
+    assert page.items == _rows(3)[1:]
+    assert page.next_cursor is not None
+    assert page.prev_cursor is not None
+
+
+def test_empty_page_has_no_cursors():
+    page = _KEYSET.page([], 2, _key, after=_cursor(['x', 'y']))
+
+    assert page.items == []
+    assert page.next_cursor is None
+    assert page.prev_cursor is None
+
+
+def test_map_keeps_cursors():
+    page = Page([1, 2], 'next', 'prev').map(str)
+
+    assert page.items == ['1', '2']
+    assert (page.next_cursor, page.prev_cursor) == ('next', 'prev')
+
+
+@pytest.mark.parametrize('cursor', [
+    'not base64!',
+    urlsafe_b64encode(b'not json').decode(),
+    _cursor({'created': 'x'}),
+    _cursor([_CREATED.isoformat()]),
+    _cursor([_CREATED.isoformat(), str(_ID), 'extra']),
+    _cursor(['yesterday', str(_ID)]),
+    _cursor([_CREATED.isoformat(), "x' OR '1'='1"]),
+    _cursor([_CREATED.isoformat(), None]),
+])
+def test_tampered_cursor_is_rejected(cursor):
+    with pytest.raises(UnvalidInputException):
+        _KEYSET.clause(after=cursor)
+
+
+def test_after_and_before_together_are_rejected():
+    cursor = _cursor([_CREATED.isoformat(), str(_ID)])
+
+    with pytest.raises(UnvalidInputException):
+        _KEYSET.clause(after=cursor, before=cursor)
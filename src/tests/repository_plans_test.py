@@ -0,0 +1,318 @@
+import importlib
+import pkgutil
+import re
+
+import pytest
+from sqlalchemy import event, text
+from sqlalchemy.sql.elements import TextClause
+
+import repositories
+from repositories.api_repository import FIELDS, FILTERS, api_repository
+from repositories.comment_repository import comment_repository
+from repositories.export_repository import export_repository
+from repositories.feature_repository import feature_repository
+from repositories.project_repository import project_repository
+from repositories.search_repository import search_repository
+from repositories.task_repository import task_repository
+from repositories.user_repository import user_repository
+from utils.database import db
+
+# lookup tables and their versions are small and cached by LookupCache,
+# scanning them is fine
+_LOOKUP_TABLES = {'roles', 'statuses', 'types', 'lookupversions'}
+
+# statements reading whole tables by design
+_WHOLE_TABLE_STATEMENTS = {
+    'feature_repository._GET_FEATURES',
+    'project_repository._GET_PROJECTS',
+}
+
+# statements whose index use depends on the searched pattern, which is
+# not known when the generic plan is made
+_PATTERN_STATEMENTS = {
+    'user_repository._GET_USERS_BY_NAME',
+}
+
+# users, teams and projects are seeded in proportion to each other, and
+# flags on few rows, so that planner chooses indexes for the filters
+# where they are useful
+_SEED = (
+    '''INSERT INTO Users (username, user_role, password_hash, firstname,
+           lastname, email)
+       SELECT 'plan_user_' || number, 1 + number % 3, 'hash', 'First',
+           'Last ' || number, 'user' || number || '@test.fi'
+       FROM generate_series(1, 2000) number''',
+    '''CREATE TEMPORARY TABLE seeded_users ON COMMIT DROP AS
+       SELECT id, row_number() OVER (ORDER BY id) AS number FROM Users
+       WHERE username LIKE 'plan_user_%' ''',
+    '''INSERT INTO ProfileImages (user_id, image_type, image_data,
+           image_version)
+       SELECT id, 'image/png', 'image', md5('image') FROM seeded_users
+       WHERE number % 2 = 0''',
+    '''INSERT INTO ProfileImageVariants (user_id, size, image_type,
+           image_data)
+       SELECT user_id, 48, image_type, image_data FROM ProfileImages''',
+    '''INSERT INTO Teams (name, team_leader)
+       SELECT 'Team ' || number, id FROM seeded_users
+       WHERE number % 20 = 0''',
+    '''INSERT INTO Teamsusers (user_id, team_id)
+       SELECT U.id, T.id
+       FROM seeded_users U
+       JOIN (SELECT id, row_number() OVER (ORDER BY id) - 1 AS slot
+             FROM Teams
+             WHERE team_leader IN (SELECT id FROM seeded_users)) T
+       ON T.slot = U.number % 100''',
+    '''INSERT INTO Projects (project_owner, name, description, flags)
+       SELECT id, 'Project ' || number, 'description',
+           CASE WHEN number % 200 = 0 THEN 'a;b;' END
+       FROM seeded_users WHERE number % 10 = 0''',
+    '''INSERT INTO Features (project_id, feature_owner, name, status, type,
+           priority, flags)
+       SELECT P.id, U.id, 'Feature ' || feature,
+           (SELECT id FROM Statuses LIMIT 1), (SELECT id FROM Types LIMIT 1),
+           1, CASE WHEN feature = 1 AND P.project % 10 = 0 THEN 'x;' END
+       FROM (SELECT id, row_number() OVER (ORDER BY id) AS project
+             FROM Projects
+             WHERE project_owner IN (SELECT id FROM seeded_users)) P
+       CROSS JOIN generate_series(1, 10) feature
+       JOIN seeded_users U ON U.number = 1 + (P.project * 10 + feature) % 2000
+    ''',
+    '''INSERT INTO Tasks (feature_id, assignee, name, status, type, priority,
+           flags)
+       SELECT F.id, U.id, 'Task ' || task, F.status, F.type, 1,
+           CASE WHEN task = 1 AND F.feature % 100 = 0 THEN 'y;' END
+       FROM (SELECT *, row_number() OVER (ORDER BY id) AS feature
+             FROM Features
+             WHERE feature_owner IN (SELECT id FROM seeded_users)) F
+       CROSS JOIN generate_series(1, 5) task
+       JOIN seeded_users U ON U.number = 1 + (F.feature * 5 + task) % 2000
+    ''',
+    '''INSERT INTO Comments (task_id, comment, time_spent, assignee)
+       SELECT id, 'comment', 1, assignee FROM Tasks''',
+    '''INSERT INTO Comments (feature_id, comment, time_spent, assignee)
+       SELECT id, 'comment', 1, feature_owner FROM Features''',
+    'ANALYZE',
+)
+
+# flags seeded for projects, features and tasks
+_FLAGS = {'projects': 'a', 'features': 'x', 'tasks': 'y'}
+
+# listings of statements built when called are read in small pages, so
+# that every listing has pages after and before
+_PAGE_SIZE = 5
+
+_PARAMETER = re.compile(r'%\((\w+)\)s')
+
+
+def _statements() -> list:
+    '''_statements is used to find statements built by repositories
+       at module level
+    '''
+    found = []
+    for module_info in pkgutil.iter_modules(repositories.__path__):
+        module = importlib.import_module(
+            f'{repositories.__name__}.{module_info.name}')
+        for name, value in vars(module).items():
+            if isinstance(value, TextClause):
+                found.append((f'{module_info.name}.{name}', value))
+    return found
+
+
+def _seeded_ids(database) -> dict:
+    '''_seeded_ids is used to get ids of seeded rows, by names of the
+       filters of the API taking them
+    '''
+    # pylint: disable=redefined-outer-name
+    task = database.execute(
+        text('''SELECT T.id, T.feature_id, F.project_id, T.assignee
+                FROM Tasks T JOIN Features F ON F.id = T.feature_id
+                WHERE T.assignee IN (SELECT id FROM seeded_users)
+                LIMIT 1''')).fetchone()
+    team = database.execute(
+        text('''SELECT team_id, user_id FROM Teamsusers
+                WHERE user_id IN (SELECT id FROM seeded_users)
+                LIMIT 1''')).fetchone()
+    leader = database.execute(
+        text('SELECT team_leader FROM Teams WHERE id = :team'), {
+            'team': team[0]
+        }).scalar()
+    return {
+        'task': str(task[0]),
+        'feature': str(task[1]),
+        'project': str(task[2]),
+        'assignee': str(task[3]),
+        'owner': str(task[3]),
+        'team': str(team[0]),
+        'user': str(team[1]),
+        'leader': str(leader),
+    }
+
+
+def _pages(method, *args, **kwargs):
+    '''_pages is used to read the first page of a listing, the page
+       after it and the page before that one
+    '''
+    page = method(*args, **kwargs, limit=_PAGE_SIZE)
+    assert page.next_cursor, f'{method.__qualname__} has only one page'
+    page = method(*args, **kwargs, after=page.next_cursor, limit=_PAGE_SIZE)
+    method(*args, **kwargs, before=page.prev_cursor, limit=_PAGE_SIZE)
+
+
+def _api_calls(ids: dict) -> list:
+    '''_api_calls is used to get calls reading every resource of the API
+       with all fields, unfiltered, with each filter and by id
+    '''
+    calls = []
+    for name, fields in FIELDS.items():
+        ids_of_resource = {
+            **ids, 'flag': _FLAGS.get(name)
+        }
+        calls.append((f'api_repository.get_page {name}',
+                      lambda name=name, fields=fields: _pages(
+                          api_repository.get_page, name, fields)))
+        for filter_name in FILTERS[name]:
+            filters = {filter_name: ids_of_resource[filter_name]}
+            calls.append(
+                (f'api_repository.get_page {name} {filter_name}',
+                 lambda name=name, fields=fields, filters=filters:
+                 api_repository.get_page(name, fields, filters)))
+        calls.append((f'api_repository.get_by_id {name}',
+                      lambda name=name, fields=fields: api_repository.
+                      get_by_id(name, ids['user'], fields)))
+    return calls
+
+
+def _repository_calls(ids: dict) -> list:
+    '''_repository_calls is used to get calls of repository methods
+       building their statements when called, by names of the methods
+    '''
+    calls = [
+        ('project_repository.get_all_summaries',
+         lambda: _pages(project_repository.get_all_summaries)),
+        ('project_repository.get_all_summaries flag',
+         lambda: _pages(project_repository.get_all_summaries, flag='a')),
+        ('feature_repository.get_all_summaries',
+         lambda: _pages(feature_repository.get_all_summaries)),
+        ('feature_repository.get_all_summaries flag',
+         lambda: _pages(feature_repository.get_all_summaries, flag='x')),
+        ('task_repository.get_all_summaries',
+         lambda: _pages(task_repository.get_all_summaries)),
+        ('task_repository.get_all_summaries flag',
+         lambda: _pages(task_repository.get_all_summaries, flag='y')),
+        ('user_repository.get_all', lambda: _pages(user_repository.get_all)),
+        ('comment_repository.get_all_by_assignee',
+         lambda: comment_repository.get_all_by_assignee(ids['assignee'])),
+        ('search_repository.search',
+         lambda: _pages(search_repository.search, 'comment')),
+    ]
+    for target in ('tasks', 'features', 'comments'):
+        stream = getattr(export_repository, f'stream_{target}')
+        calls.append((f'export_repository.stream_{target} project',
+                      lambda stream=stream: list(stream(pid=ids['project']))))
+        calls.append(
+            (f'export_repository.stream_{target} assignee',
+             lambda stream=stream: list(stream(aid=ids['assignee']))))
+    return calls + _api_calls(ids)
+
+
+def _executed(call) -> list:
+    '''_executed is used to get statements and parameters sent to the
+       database by the call
+    '''
+    executed = []
+
+    def _record(*args):
+        # arguments are connection, cursor, statement and its parameters
+        executed.append((args[2], args[3]))
+
+    event.listen(db.engine, 'before_cursor_execute', _record)
+    try:
+        call()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', _record)
+    return executed
+
+
+def _generic_sql(clause: TextClause, dialect) -> str:
+    '''_generic_sql is used to compile statement with numbered
+       parameters, which EXPLAIN (GENERIC_PLAN) accepts without values
+    '''
+    names = []
+
+    def _number(match) -> str:
+        if match.group(1) not in names:
+            names.append(match.group(1))
+        return f'${names.index(match.group(1)) + 1}'
+
+    sql = str(clause.compile(dialect=dialect))
+    return _PARAMETER.sub(_number, sql).replace('%%', '%')
+
+
+def _full_scans(plan: dict) -> list:
+    '''_full_scans is used to find tables read whole in the plan, with
+       sequential scan or with index scan filtering rows without using
+       the index for the condition
+    '''
+    scans = []
+    if plan['Node Type'] == 'Seq Scan' or (
+            plan['Node Type'] in ('Index Scan', 'Index Only Scan')
+            and 'Filter' in plan and 'Index Cond' not in plan):
+        scans.append(plan['Relation Name'])
+    for child in plan.get('Plans', []):
+        scans.extend(_full_scans(child))
+    return scans
+
+
+def _seed(database):
+    '''_seed is used to add rows for planning and disable sequential
+       scans, so that sequential scan is planned only if no index can
+       be used for the statement
+    '''
+    # pylint: disable=redefined-outer-name
+    for sql in _SEED:
+        database.execute(text(sql))
+    database.execute(text('SET LOCAL enable_seqscan = off'))
+
+
+def test_repository_statements_use_indexes(database):
+    # pylint: disable=redefined-outer-name
+    version = database.execute(text('SHOW server_version_num')).scalar()
+    if int(version) < 160000:
+        pytest.skip('EXPLAIN (GENERIC_PLAN) requires PostgreSQL 16')
+
+    _seed(database)
+    connection = database.connection()
+    explain = connection.execution_options(no_parameters=True)
+
+    scanning = {}
+    for name, clause in _statements():
+        sql = _generic_sql(clause, connection.dialect)
+        plan = explain.exec_driver_sql(
+            f'EXPLAIN (GENERIC_PLAN, FORMAT JSON) {sql}').scalar()
+        scans = set(_full_scans(plan[0]['Plan'])) - _LOOKUP_TABLES
+        allowed = _WHOLE_TABLE_STATEMENTS | _PATTERN_STATEMENTS
+        if scans and name not in allowed:
+            scanning[name] = sorted(scans)
+
+    assert not scanning, '\n'.join(f'{k}: {v}' for k, v in scanning.items())
+
+
+def test_statements_built_by_repository_methods_use_indexes(database):
+    '''Statements built when repository methods are called are
+       explained with the values they were run with
+    '''
+    # pylint: disable=redefined-outer-name
+    _seed(database)
+    cursor = database.connection().connection.cursor()
+
+    scanning = {}
+    for name, call in _repository_calls(_seeded_ids(database)):
+        scans = set()
+        for sql, parameters in _executed(call):
+            cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', parameters)
+            scans.update(_full_scans(cursor.fetchone()[0][0]['Plan']))
+        scans -= _LOOKUP_TABLES
+        if scans:
+            scanning[name] = sorted(scans)
+
+    assert not scanning, '\n'.join(f'{k}: {v}' for k, v in scanning.items())
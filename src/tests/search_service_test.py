@@ -0,0 +1,123 @@
+import pytest
+from sqlalchemy import text
+
+from repositories.search_repository import search_repository, HIGHLIGHT_START, HIGHLIGHT_STOP
+from services.search_service import SearchService
+from utils.exceptions import EmptyValueException, UnvalidInputException
+from utils.pagination import Page
+
+_ID = '2b4c6d8e-0f1a-4b3c-8d5e-7f9a1b3c5d71'
+_TARGET = '8f7e6d5c-4b3a-4291-8f0e-1d2c3b4a5f62'
+
+
+def _marked(word: str) -> str:
+    return f'{HIGHLIGHT_START}{word}{HIGHLIGHT_STOP}'
+
+
+class _SearchRepository:
+    '''Search repository returning given rows, recording the queries
+    '''
+
+    def __init__(self, rows: list):
+        self.rows = rows
+        self.queries = []
+
+    def search(self, query, after=None, before=None):
+        self.queries.append((query, after, before))
+        return Page(self.rows)
+
+
+def _search(kind: str, name: str, snippet: str):
+    service = SearchService(default_search_repository=_SearchRepository(
+        [(kind, _ID, name, snippet, 'features', _TARGET, 0.5)]))
+    return service.search('word').items[0]
+
+
+def test_highlight_marks_become_mark_elements():
+    result = _search('tasks', f'Fix {_marked("login")}',
+                     f'{_marked("login")} fails')
+
+    assert result.name == 'Fix <mark>login</mark>'
+    assert result.snippet == '<mark>login</mark> fails'
+    assert result.url == f'/features/{_TARGET}'
+
+
+def test_text_around_marks_is_escaped():
+    result = _search('tasks', f'<mark>{_marked("x")}</mark>',
+                     f'<script>{_marked("x")} & y')
+
+    assert result.name == '&lt;mark&gt;<mark>x</mark>&lt;/mark&gt;'
+    assert result.snippet == '&lt;script&gt;<mark>x</mark> &amp; y'
+
+
+def test_stored_escapes_of_comments_are_not_escaped_twice():
+    snippet = f'&lt;b&gt; {_marked("login")} &amp; stuff'
+
+    comment = _search('comments', 'Feature', snippet)
+    task = _search('tasks', 'Task', snippet)
+
+    assert comment.snippet == '&lt;b&gt; <mark>login</mark> &amp; stuff'
+    assert task.snippet == ('&amp;lt;b&amp;gt; <mark>login</mark> '
+                            '&amp;amp; stuff')
+
+
+def test_query_is_stripped_before_searching():
+    repository = _SearchRepository([])
+    service = SearchService(default_search_repository=repository)
+
+    service.search('  login  ', after='cursor')
+
+    assert repository.queries == [('login', 'cursor', None)]
+
+
+@pytest.mark.parametrize('query', [None, '', '   '])
+def test_empty_query_is_rejected(query):
+    service = SearchService(default_search_repository=_SearchRepository([]))
+
+    with pytest.raises(EmptyValueException):
+        service.search(query)
+
+
+def test_too_long_query_is_rejected():
+    service = SearchService(default_search_repository=_SearchRepository([]))
+
+    with pytest.raises(UnvalidInputException):
+        service.search('a' * 201)
+
+
+def test_pages_follow_rank_across_cursors(database):
+    '''Ranks are real numbers, results with equal ranks are ordered by
+       kind and id, all descending
+    '''
+    owner = database.execute(
+        text('''INSERT INTO Users (username, user_role, password_hash,
+                    firstname, lastname)
+                VALUES ('search_owner', 1, 'hash', 'First', 'Last')
+                RETURNING id''')).scalar()
+    for number, words in enumerate((1, 2, 2, 3, 5, 5, 8), 1):
+        database.execute(
+            text('''INSERT INTO Projects (project_owner, name, description)
+                    VALUES (:owner, :name, :description)'''), {
+                'owner': owner,
+                'name': f'Project {number}',
+                'description': ' '.join(['zebrapaging'] * words +
+                                        ['filler'] * (9 - words))
+            })
+
+    results = []
+    page = search_repository.search('zebrapaging', limit=3)
+    results.extend(page.items)
+    while page.next_cursor:
+        page = search_repository.search('zebrapaging',
+                                        after=page.next_cursor,
+                                        limit=3)
+        results.extend(page.items)
+    keys = [(result[6], result[0], result[1]) for result in results]
+
+    assert len(results) == 7
+    assert keys == sorted(keys, reverse=True)
+
+    back = search_repository.search('zebrapaging',
+                                    before=page.prev_cursor,
+                                    limit=3)
+    assert back.items == results[3:6]
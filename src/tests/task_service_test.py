@@ -0,0 +1,101 @@
+import pytest
+from sqlalchemy import text
+
+from repositories.team_repository import team_repository
+from services.task_service import TaskService
+from utils.exceptions import UnvalidInputException
+
+_EDITOR = '3d3a2c55-1f6b-4b0e-9d55-6f1c0a3c7a11'
+_TEAMMATE = '7b0f4c8e-5a43-4f7b-8c11-2e9f2d1b6c22'
+_STRANGER = 'c1d2e3f4-a5b6-4c7d-8e9f-0a1b2c3d4e33'
+_TASK = '9e8d7c6b-5a49-4382-9716-a5b4c3d2e144'
+
+
+class _TaskRepository:
+
+    def __init__(self):
+        self.updates = []
+
+    def bulk_update(self, tids, status, aid, priority):
+        self.updates.append((tids, status, aid, priority))
+        return []
+
+
+class _TeamRepository:
+
+    @staticmethod
+    def shares_team(uid: str, member: str) -> bool:
+        return uid == _EDITOR and member in (_EDITOR, _TEAMMATE)
+
+
+@pytest.fixture
+def task_repository():
+    return _TaskRepository()
+
+
+@pytest.fixture
+def service(task_repository):    # pylint: disable=redefined-outer-name
+    return TaskService(default_task_repository=task_repository,
+                       default_team_repository=_TeamRepository())
+
+
+def test_tasks_can_be_assigned_to_teammates(task_repository, service):
+    # pylint: disable=redefined-outer-name
+    service.bulk_update([_TASK], _EDITOR, False, aid=_TEAMMATE)
+
+    assert task_repository.updates == [({_TASK}, None, _TEAMMATE, None)]
+
+
+def test_tasks_can_not_be_assigned_outside_teams(task_repository, service):
+    # pylint: disable=redefined-outer-name
+    with pytest.raises(UnvalidInputException):
+        service.bulk_update([_TASK], _EDITOR, False, aid=_STRANGER)
+
+    assert not task_repository.updates
+
+
+def test_privileged_users_assign_tasks_to_anyone(task_repository, service):
+    # pylint: disable=redefined-outer-name
+    service.bulk_update([_TASK], _EDITOR, True, aid=_STRANGER)
+
+    assert task_repository.updates == [({_TASK}, None, _STRANGER, None)]
+
+
+def test_teams_are_not_checked_if_assignee_is_kept(task_repository, service):
+    # pylint: disable=redefined-outer-name
+    service.bulk_update([_TASK], _STRANGER, False, priority='3')
+
+    assert task_repository.updates == [({_TASK}, None, None, 3)]
+
+
+def test_shares_team_finds_members_and_leaders_of_teams(database):
+    users = {}
+    for username in ('leader', 'member', 'mate', 'stranger'):
+        users[username] = str(
+            database.execute(
+                text('''INSERT INTO Users (username, user_role,
+                            password_hash, firstname, lastname)
+                        VALUES (:username, 2, 'hash', 'First', 'Last')
+                        RETURNING id'''), {
+                    'username': f'shares_{username}'
+                }).scalar())
+    team = database.execute(
+        text('''INSERT INTO Teams (name, team_leader)
+                VALUES ('Shared team', :leader) RETURNING id'''), {
+            'leader': users['leader']
+        }).scalar()
+    for username in ('member', 'mate'):
+        database.execute(
+            text('''INSERT INTO Teamsusers (user_id, team_id)
+                    VALUES (:user, :team)'''), {
+                'user': users[username],
+                'team': team
+            })
+
+    assert team_repository.shares_team(users['leader'], users['member'])
+    assert team_repository.shares_team(users['member'], users['mate'])
+    assert team_repository.shares_team(users['member'], users['leader'])
+    assert not team_repository.shares_team(users['leader'],
+                                           users['stranger'])
+    assert not team_repository.shares_team(users['stranger'],
+                                           users['member'])
@@ -0,0 +1,183 @@
+import pytest
+from sqlalchemy import text
+
+# time spent of comments summed again from the tables, in the same
+# shape as TimeSpentRollups
+_AGGREGATE = '''
+    SELECT scope, id, COUNT(*), SUM(time_spent)
+    FROM (
+        SELECT 'user' AS scope, assignee AS id, time_spent FROM Comments
+        UNION ALL
+        SELECT 'feature', feature_id, time_spent FROM Comments
+        UNION ALL
+        SELECT 'task', task_id, time_spent FROM Comments
+        UNION ALL
+        SELECT 'project', F.project_id, C.time_spent
+        FROM Comments C JOIN Features F ON F.id = C.feature_id
+        UNION ALL
+        SELECT 'project', F.project_id, C.time_spent
+        FROM Comments C
+        JOIN Tasks T ON T.id = C.task_id
+        JOIN Features F ON F.id = T.feature_id
+    ) AS comment_scopes
+    WHERE id = ANY(CAST(:ids AS uuid[]))
+    GROUP BY scope, id
+'''
+
+_ROLLUPS = '''
+    SELECT scope, id, comments, time_spent FROM TimeSpentRollups
+    WHERE id = ANY(CAST(:ids AS uuid[]))
+        AND (comments <> 0 OR time_spent <> 0)
+'''
+
+
+class _Rows:
+    '''Users, projects, features and tasks of a test, whose ids are
+       given to statements as parameters named after them
+    '''
+
+    def __init__(self, database):
+        self.database = database
+        self.ids = {}
+
+    def add(self, name: str, sql: str, values: dict = None):
+        self.ids[name] = str(
+            self.database.execute(text(sql), {
+                **self.ids,
+                **(values or {})
+            }).scalar())
+
+    def run(self, sql: str, values: dict = None):
+        self.database.execute(text(sql), {**self.ids, **(values or {})})
+
+    def assert_rollups_match_comments(self):
+        ids = list(self.ids.values())
+        rollups = self.database.execute(text(_ROLLUPS), {
+            'ids': ids
+        }).fetchall()
+        aggregate = self.database.execute(text(_AGGREGATE), {
+            'ids': ids
+        }).fetchall()
+
+        assert sorted(map(tuple, rollups)) == sorted(map(tuple, aggregate))
+
+
+@pytest.fixture
+def rows(database):
+    '''rows gives two users, two projects with a feature each, and a
+       task under each feature
+    '''
+    added = _Rows(database)
+    for user in ('ann', 'bob'):
+        added.add(
+            user, '''INSERT INTO Users (username, user_role, password_hash,
+                         firstname, lastname)
+                     VALUES (:username, 1, 'hash', 'First', 'Last')
+                     RETURNING id''', {'username': f'rollup_{user}'})
+    for number in ('1', '2'):
+        added.add(
+            f'project{number}', '''INSERT INTO Projects (project_owner, name)
+                                   VALUES (:ann, 'Project') RETURNING id''')
+        added.add(
+            f'feature{number}',
+            f'''INSERT INTO Features (project_id, feature_owner, name)
+                VALUES (:project{number}, :ann, 'Feature') RETURNING id''')
+        added.add(
+            f'task{number}',
+            f'''INSERT INTO Tasks (feature_id, assignee, name)
+                VALUES (:feature{number}, :ann, 'Task') RETURNING id''')
+    return added
+
+
+def _add_comments(rows):    # pylint: disable=redefined-outer-name
+    '''_add_comments is used to add comments to both tasks and features
+       with one statement
+    '''
+    rows.run(
+        '''INSERT INTO Comments (feature_id, task_id, assignee, comment,
+               time_spent)
+           VALUES (:feature1, NULL, :ann, 'a', 1.5),
+               (NULL, :task1, :ann, 'b', 2),
+               (NULL, :task1, :bob, 'c', 0.25),
+               (:feature2, NULL, :bob, 'd', 4),
+               (NULL, :task2, :bob, 'e', 8)''')
+
+
+def test_inserted_comments_are_rolled_up(rows):
+    # pylint: disable=redefined-outer-name
+    _add_comments(rows)
+
+    rows.assert_rollups_match_comments()
+
+
+def test_comments_added_one_at_a_time_are_rolled_up(rows):
+    # pylint: disable=redefined-outer-name
+    for time_spent in (1, 2, 3):
+        rows.run(
+            '''INSERT INTO Comments (task_id, assignee, comment, time_spent)
+               VALUES (:task1, :ann, 'comment', :time_spent)''',
+            {'time_spent': time_spent})
+
+    rows.assert_rollups_match_comments()
+
+
+def test_updated_time_spent_and_assignee_are_rolled_up(rows):
+    # pylint: disable=redefined-outer-name
+    _add_comments(rows)
+
+    rows.run('UPDATE Comments SET time_spent = time_spent * 3 '
+             'WHERE assignee = :ann')
+    rows.run('UPDATE Comments SET assignee = :bob WHERE time_spent < 1')
+
+    rows.assert_rollups_match_comments()
+
+
+def test_comments_moved_between_task_and_feature_are_rolled_up(rows):
+    # pylint: disable=redefined-outer-name
+    _add_comments(rows)
+
+    rows.run(
+        '''UPDATE Comments SET feature_id = :feature2, task_id = NULL
+           WHERE task_id = :task1''')
+    rows.run(
+        '''UPDATE Comments SET feature_id = NULL, task_id = :task1
+           WHERE feature_id = :feature1''')
+
+    rows.assert_rollups_match_comments()
+
+
+def test_deleted_comments_are_removed_from_rollups(rows):
+    # pylint: disable=redefined-outer-name
+    _add_comments(rows)
+
+    rows.run('DELETE FROM Comments WHERE assignee = :bob')
+
+    rows.assert_rollups_match_comments()
+
+
+def test_task_moved_to_feature_of_other_project_is_rolled_up(rows):
+    # pylint: disable=redefined-outer-name
+    _add_comments(rows)
+
+    rows.run('UPDATE Tasks SET feature_id = :feature2 WHERE id = :task1')
+
+    rows.assert_rollups_match_comments()
+
+
+def test_feature_moved_to_other_project_is_rolled_up(rows):
+    # pylint: disable=redefined-outer-name
+    _add_comments(rows)
+
+    rows.run('UPDATE Features SET project_id = :project2 WHERE id = :feature1')
+
+    rows.assert_rollups_match_comments()
+
+
+def test_deleted_tasks_and_features_are_removed_from_rollups(rows):
+    # pylint: disable=redefined-outer-name
+    _add_comments(rows)
+
+    rows.run('DELETE FROM Tasks WHERE id = :task1')
+    rows.run('DELETE FROM Features WHERE id = :feature2')
+
+    rows.assert_rollups_match_comments()
@@ -0,0 +1,82 @@
+import uuid
+
+import pytest
+from sqlalchemy import text
+
+from app import app
+
+_BASE_URL = 'https://localhost'
+_TEAM = 'Unit of work team'
+
+
+@pytest.fixture
+def users(engine):
+    '''users gives ids of a team leader and a member, committed for the
+       requests of the test, and removes them and their team afterwards
+    '''
+    ids = {}
+    with engine.begin() as connection:
+        for username in ('uow_leader', 'uow_member'):
+            ids[username] = str(
+                connection.execute(
+                    text('''INSERT INTO Users (username, user_role,
+                                password_hash, firstname, lastname)
+                            VALUES (:username, 2, 'hash', 'First', 'Last')
+                            RETURNING id'''), {
+                        'username': username
+                    }).scalar())
+    try:
+        yield ids
+    finally:
+        with engine.begin() as connection:
+            connection.execute(text('DELETE FROM Teams WHERE name = :name'),
+                               {'name': _TEAM})
+            connection.execute(
+                text("DELETE FROM Users WHERE username LIKE 'uow\\_%'"))
+
+
+def _create_team(users_ids: dict, members: list):
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['user'] = users_ids['uow_leader']
+        session['user_role'] = 3
+        session['token'] = 'token'
+    return client.post('/teams/add',
+                       data={
+                           'token': 'token',
+                           'name': _TEAM,
+                           'description': 'Team of the unit of work test',
+                           'team_leader': users_ids['uow_leader'],
+                           'members': members
+                       },
+                       base_url=_BASE_URL)
+
+
+def _team_members(engine) -> list:
+    with engine.connect() as connection:
+        return connection.execute(
+            text('''SELECT U.username FROM Teams T
+                    LEFT JOIN Teamsusers TU ON TU.team_id = T.id
+                    LEFT JOIN Users U ON U.id = TU.user_id
+                    WHERE T.name = :name
+                    ORDER BY U.username'''), {
+                'name': _TEAM
+            }).scalars().all()
+
+
+def test_request_commits_team_and_members(engine, users):
+    # pylint: disable=redefined-outer-name
+    response = _create_team(users, [users['uow_member']])
+
+    assert response.status_code == 302
+    assert _team_members(engine) == ['uow_leader', 'uow_member']
+
+
+def test_failed_request_redirecting_leaves_nothing_written(engine, users):
+    # pylint: disable=redefined-outer-name
+    response = _create_team(users,
+                            [users['uow_member'],
+                             str(uuid.uuid4())])
+
+    assert response.status_code == 302
+    assert not _team_members(engine)
@@ -3,6 +3,24 @@ from os import getenv
 secret = getenv('SECRET')
 database_url = getenv('DATABASE_URL')
 mode = getenv('mode')
+avatar_max_age = int(getenv('AVATAR_MAX_AGE', '300'))
+avatar_versioned_max_age = int(
+    getenv('AVATAR_VERSIONED_MAX_AGE', str(365 * 24 * 60 * 60)))
+lookup_cache_check_interval = float(
+    getenv('LOOKUP_CACHE_CHECK_INTERVAL', '30'))
+page_size = int(getenv('PAGE_SIZE', '50'))
+export_batch_size = int(getenv('EXPORT_BATCH_SIZE', '1000'))
+import_batch_size = int(getenv('IMPORT_BATCH_SIZE', '1000'))
+bulk_edit_max_tasks = int(getenv('BULK_EDIT_MAX_TASKS', '1000'))
+markdown_cache_size = int(getenv('MARKDOWN_CACHE_SIZE', '2000'))
+search_max_matches = int(getenv('SEARCH_MAX_MATCHES', '5000'))
+autocomplete_limit = int(getenv('AUTOCOMPLETE_LIMIT', '20'))
+db_pool_size = int(getenv('DB_POOL_SIZE', '5'))
+db_max_overflow = int(getenv('DB_MAX_OVERFLOW', '10'))
+db_pool_timeout = float(getenv('DB_POOL_TIMEOUT', '30'))
+db_pool_recycle = int(getenv('DB_POOL_RECYCLE', '1800'))
+db_pool_pre_ping = getenv('DB_POOL_PRE_PING', 'true').lower() == 'true'
+db_statement_cache_size = int(getenv('DB_STATEMENT_CACHE_SIZE', '500'))
 
 csp = {
     'default-src': [
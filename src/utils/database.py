@@ -1,5 +1,10 @@
+from functools import lru_cache
 from app import app
 from flask_sqlalchemy import SQLAlchemy
+from psycopg2.errorcodes import FOREIGN_KEY_VIOLATION
+from sqlalchemy import bindparam, text
+from sqlalchemy.sql.elements import TextClause
+from utils.exceptions import NotExistingException
 import utils.config as configs
 
 db_uri = configs.database_url
@@ -10,5 +15,95 @@ if db_uri.startswith('postgres://'):
 app.config['SQLALCHEMY_DATABASE_URI'] = db_uri
 # let's get rid of annoying warning in the logs.
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+app.config['SQLALCHEMY_ENGINE_OPTIONS'] = {
+    'pool_size': configs.db_pool_size,
+    'max_overflow': configs.db_max_overflow,
+    'pool_timeout': configs.db_pool_timeout,
+    'pool_recycle': configs.db_pool_recycle,
+    'pool_pre_ping': configs.db_pool_pre_ping,
+    # compiled forms of statements, shared by all connections
+    'query_cache_size': configs.db_statement_cache_size,
+}
 
 db = SQLAlchemy(app)
+
+
+@lru_cache(maxsize=configs.db_statement_cache_size)
+def statement(sql: str, **types) -> TextClause:
+    '''statement is used to build SQL statement only once, so that
+       it is not parsed again on every execution
+
+    Repositories build their statements at module level. Statements
+    built at runtime, for example pages with cursor conditions,
+    are cached by their SQL.
+
+    Args:
+        sql (str): SQL of the statement with :named parameters
+        types: SQLAlchemy types of the parameters, which need
+            conversion, for example limit=Integer
+
+    Returns:
+        TextClause: statement to be given to db.session.execute
+    '''
+    clause = text(sql)
+    if types:
+        clause = clause.bindparams(
+            *[bindparam(name, type_=type_) for name, type_ in types.items()])
+    return clause
+
+
+def raise_for_foreign_key(error: Exception, references: dict):
+    '''raise_for_foreign_key is used to turn foreign key violation of
+       failed statement into NotExistingException
+
+    Session is rolled back, so that it can be used after the error.
+    Within a request this discards also earlier writes of the request.
+
+    Args:
+        error (Exception): error raised while executing the statement
+        references (dict): names of referenced objects keyed by
+            names of foreign key constraints
+
+    Raises:
+        NotExistingException: raised if error is violation of one
+            of the given foreign key constraints
+    '''
+    db.session.rollback()
+
+    # errors of raw psycopg2 cursors are not wrapped by SQLAlchemy
+    orig = getattr(error, 'orig', error)
+    if getattr(orig, 'pgcode', None) != FOREIGN_KEY_VIOLATION:
+        return
+
+    constraint = orig.diag.constraint_name
+    if constraint in references:
+        raise NotExistingException(references[constraint]) from error
+
+
+def flag_condition(alias: str) -> str:
+    '''flag_condition is used to build condition for rows having
+       the flag given as parameter :flag, which uses index of flag_list
+
+    Args:
+        alias (str): alias of the table in the statement
+
+    Returns:
+        str: SQL condition to be added to WHERE clause
+    '''
+    return f'{alias}.flag_list @> ARRAY[CAST(:flag AS TEXT)]'
+
+
+def like_patterns(term: str) -> dict:
+    '''like_patterns is used to build ILIKE patterns for finding
+       names containing given term, with wildcards of the term escaped
+
+    Args:
+        term (str): text typed by the user
+
+    Returns:
+        dict: parameters 'contains' matching names with the term
+            anywhere and 'prefix' matching names starting with it
+    '''
+    escaped = (term.replace('\\', '\\\\').replace('%', '\\%').replace(
+        '_', '\\_'))
+    return {'contains': f'%{escaped}%', 'prefix': f'{escaped}%'}
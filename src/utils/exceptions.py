@@ -1,4 +1,21 @@
-class EmptyValueException(Exception):
+from flask import g, has_request_context
+
+
+class ApplicationException(Exception):
+    '''Base class for exceptions of the application
+
+    Creating one during a request marks the unit of work of the request
+    failed, so that its writes are rolled back also when a route
+    catches the exception and answers with a redirect.
+    '''
+
+    def __new__(cls, *args, **kwargs):
+        if has_request_context():
+            g.unit_of_work_failed = True
+        return super().__new__(cls, *args, **kwargs)
+
+
+class EmptyValueException(ApplicationException):
     '''Class for exception raised if given value is empty.
     '''
 
@@ -24,7 +41,7 @@ class EmptyValueException(Exception):
         return f'Error: {self.message} in {self.source}'
 
 
-class ValueShorterThanException(Exception):
+class ValueShorterThanException(ApplicationException):
     '''Class for exception raised if given value is shorter than asked
     '''
 
@@ -54,7 +71,7 @@ class ValueShorterThanException(Exception):
         return f'Error: {self.message} {self.length} in {self.source}'
 
 
-class DatabaseException(Exception):
+class DatabaseException(ApplicationException):
     '''Class for exception raised if error given while operating with database
     '''
 
@@ -82,7 +99,7 @@ class DatabaseException(Exception):
         return f'{self.message} {self.source}'
 
 
-class NotExistingException(Exception):
+class NotExistingException(ApplicationException):
     '''Class for exception raised if given object is not found
     '''
 
@@ -111,7 +128,7 @@ class NotExistingException(Exception):
         return f'Error: {self.object} {self.message}'
 
 
-class LoginException(Exception):
+class LoginException(ApplicationException):
     '''Class for exception raised if username or password is not correct
     '''
 
@@ -133,7 +150,7 @@ class LoginException(Exception):
         return self.message
 
 
-class UsernameDuplicateException(Exception):
+class UsernameDuplicateException(ApplicationException):
     '''Class for exception raised if username is already in use.
     '''
 
@@ -155,7 +172,7 @@ class UsernameDuplicateException(Exception):
         return self.message
 
 
-class UnvalidInputException(Exception):
+class UnvalidInputException(ApplicationException):
     '''Class for execption raised if unvalid input given
     '''
 
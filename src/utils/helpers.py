@@ -21,7 +21,7 @@ def fullname(firstname: str, lastname: str) -> str:
     return f'{firstname} {lastname}'
 
 
-def image_string(img_type: str, img_data: str):
-    if not img_type:
+def avatar_url(uid: str, img_version: str, size: int = 48):
+    if not img_version:
         return None
-    return f'data:{img_type};base64,{img_data}'
+    return f'/users/{uid}/avatar?size={size}&v={img_version}'
@@ -0,0 +1,98 @@
+from functools import wraps
+from flask import g, has_app_context, current_app
+
+
+def identity_mapped(method):
+    '''identity_mapped is used to decorate repository methods which find
+       single row by id, so that same row is loaded only once per request
+
+    Results are stored in flask.g and are dropped after the request.
+    Exceptions, like NotExistingException, are not stored. Outside of
+    application context the method is called as is.
+
+    Args:
+        method (function): repository method taking id as first argument
+
+    Returns:
+        function: decorated method
+    '''
+
+    @wraps(method)
+    def wrapper(self, key, *args, **kwargs):
+        if not has_app_context():
+            return method(self, key, *args, **kwargs)
+
+        identity_map = g.setdefault('identity_map', {})
+        stats = g.setdefault('identity_map_stats', {'hits': 0, 'misses': 0})
+        identity = (method.__qualname__, str(key), args,
+                    tuple(sorted(kwargs.items())))
+
+        if identity in identity_map:
+            stats['hits'] += 1
+            return identity_map[identity]
+
+        stats['misses'] += 1
+        result = method(self, key, *args, **kwargs)
+        identity_map[identity] = result
+        return result
+
+    return wrapper
+
+
+def invalidates_identity_map(method):
+    '''invalidates_identity_map is used to decorate repository methods
+       which write into the database, clearing request´s identity map
+
+    Whole map is cleared, because stored rows contain names of
+    related rows, for example feature´s rows contain project´s name.
+
+    Args:
+        method (function): repository method writing into the database
+
+    Returns:
+        function: decorated method
+    '''
+
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        try:
+            return method(*args, **kwargs)
+        finally:
+            clear()
+
+    return wrapper
+
+
+def clear():
+    '''clear is used to empty identity map of current request
+    '''
+    if has_app_context():
+        g.pop('identity_map', None)
+
+
+def get_stats() -> dict:
+    '''get_stats is used to get hit and miss counts of current request
+
+    Returns:
+        dict: amounts of hits and misses
+    '''
+    if not has_app_context():
+        return {'hits': 0, 'misses': 0}
+    return g.get('identity_map_stats', {'hits': 0, 'misses': 0})
+
+
+def add_stats_header(response):
+    '''add_stats_header is used as after_request handler to
+       expose identity map statistics of request in debug mode
+
+    Args:
+        response (Response): response of the request
+
+    Returns:
+        Response: response with X-Identity-Map header in debug mode
+    '''
+    if current_app.debug:
+        stats = get_stats()
+        response.headers['X-Identity-Map'] = (f'hits={stats["hits"]}; '
+                                              f'misses={stats["misses"]}')
+    return response
@@ -0,0 +1,81 @@
+from io import BytesIO
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+from utils.exceptions import UnvalidInputException
+
+ORIGINAL_MAX_SIZE = 1024
+THUMBNAIL_SIZES = (48, 128)
+
+_FORMATS = {
+    'JPEG': 'image/jpeg',
+    'PNG': 'image/png',
+    'GIF': 'image/gif',
+}
+
+
+def _encode(image: Image.Image, img_format: str) -> bytes:
+    '''_encode is used to save image into bytes in given format
+
+    Args:
+        image (Image.Image): image to be saved
+        img_format (str): Pillow´s name of the format
+
+    Returns:
+        bytes: encoded image
+    '''
+    buffer = BytesIO()
+    if img_format == 'JPEG':
+        image.convert('RGB').save(buffer, 'JPEG', quality=85, optimize=True)
+    else:
+        image.save(buffer, 'PNG', optimize=True)
+    return buffer.getvalue()
+
+
+def process_profile_image(img_data: bytes) -> tuple:
+    '''process_profile_image is used to validate uploaded profile image,
+       downscale it and to create square thumbnails of it
+
+    JPEG images are stored as JPEG, others as PNG. Orientation
+    from EXIF data is applied before resizing.
+
+    Args:
+        img_data (bytes): uploaded image
+
+    Raises:
+        UnvalidInputException: raised if image can not be decoded
+            or is not in supported format
+
+    Returns:
+        tuple: type and bytes of downscaled image, and dict
+            of thumbnails´ bytes keyed by their size
+    '''
+    try:
+        image = Image.open(BytesIO(img_data))
+        img_format = image.format
+        image.load()
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError,
+            SyntaxError) as error:
+        raise UnvalidInputException(
+            'Profile image could not be read') from error
+
+    if img_format not in _FORMATS:
+        raise UnvalidInputException('''Profile image type not supported,
+            supported types are "image/jpeg", "image/png", "image/gif"''')
+
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'RGBA', 'L', 'LA'):
+        image = image.convert('RGBA')
+
+    img_format = 'JPEG' if img_format == 'JPEG' else 'PNG'
+
+    original = image.copy()
+    original.thumbnail((ORIGINAL_MAX_SIZE, ORIGINAL_MAX_SIZE),
+                       Image.Resampling.LANCZOS)
+
+    thumbnails = {
+        size: _encode(
+            ImageOps.fit(image, (size, size), Image.Resampling.LANCZOS),
+            img_format) for size in THUMBNAIL_SIZES
+    }
+
+    return (_FORMATS[img_format], _encode(original, img_format), thumbnails)
@@ -0,0 +1,119 @@
+from threading import Lock
+from time import monotonic
+
+from utils.database import db, statement
+from utils.exceptions import DatabaseException
+import utils.config as configs
+
+
+_GET_VERSION = statement('''
+    SELECT version
+    FROM LookupVersions
+    WHERE table_name=:table
+''')
+
+
+class LookupCache:
+    '''Class for caching small lookup table, like Statuses, in memory
+       of the worker process
+
+    Whole table is loaded on first use. Afterwards version of the
+    table is read from LookupVersions at most once in check interval,
+    and table is loaded again only if the version has changed.
+    Versions are bumped by triggers whenever the table is written,
+    so writes done by other processes are noticed too.
+    '''
+
+    def __init__(self, table: str, loader, check_interval: float = None):
+        '''Initializes LookupCache
+
+        Args:
+            table (str): name of the cached table in lowercase,
+                as stored in LookupVersions
+            loader (function): function returning all rows of the table,
+                id of the row being first value of each row
+            check_interval (float, optional): seconds between version
+                checks. Defaults to lookup_cache_check_interval of config.
+        '''
+
+        self._table = table
+        self._loader = loader
+        self._check_interval = (configs.lookup_cache_check_interval
+                                if check_interval is None else check_interval)
+        self._lock = Lock()
+        self._rows = None
+        self._by_id = {}
+        self._version = None
+        self._checked_at = 0.0
+
+    def get_all(self) -> [tuple]:
+        '''get_all is used to get all rows of the table
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            [tuple]: all rows of the table
+        '''
+        self._refresh()
+        return list(self._rows)
+
+    def get(self, key) -> tuple:
+        '''get is used to get row of the table with given id
+
+        Args:
+            key (str | int): id of the row
+
+        Raises:
+            DatabaseException: raised if problems occur
+                while interacting with the database
+
+        Returns:
+            tuple: found row or None if not found
+        '''
+        self._refresh()
+        return self._by_id.get(self._key(key))
+
+    def invalidate(self):
+        '''invalidate is used to drop cached rows, so that
+           the table is loaded again on next use
+        '''
+        with self._lock:
+            self._rows = None
+            self._by_id = {}
+            self._version = None
+            self._checked_at = 0.0
+
+    @staticmethod
+    def _key(key) -> str:
+        return str(key).lower()
+
+    def _get_version(self) -> int:
+        try:
+            version = db.session.execute(_GET_VERSION, {
+                'table': self._table
+            }).fetchone()
+        except Exception as error:
+            raise DatabaseException(
+                f'While getting version of {self._table}') from error
+
+        return version[0] if version else 0
+
+    def _refresh(self):
+        if (self._rows is not None
+                and monotonic() - self._checked_at < self._check_interval):
+            return
+
+        with self._lock:
+            if (self._rows is not None and
+                    monotonic() - self._checked_at < self._check_interval):
+                return
+
+            version = self._get_version()
+            if self._rows is None or version != self._version:
+                rows = self._loader()
+                self._by_id = {self._key(row[0]): row for row in rows}
+                self._rows = rows
+                self._version = version
+            self._checked_at = monotonic()
@@ -0,0 +1,60 @@
+from collections import OrderedDict
+from hashlib import sha256
+from threading import Lock
+
+from markdown2 import markdown
+
+import utils.config as configs
+
+
+class MarkdownCache:
+    '''Class for caching HTML rendered from markdown in memory
+       of the worker process
+
+    Rendered HTML is kept by hash of the markdown, so that the same
+    text, for example comment shown on several pages, is rendered
+    only once. Least recently used entries are dropped when the cache
+    is full.
+    '''
+
+    def __init__(self, size: int = None):
+        '''Initializes MarkdownCache
+
+        Args:
+            size (int, optional): maximum amount of cached texts.
+                Defaults to markdown_cache_size of config.
+        '''
+
+        self._size = configs.markdown_cache_size if size is None else size
+        self._lock = Lock()
+        self._html = OrderedDict()
+
+    def render(self, text: str) -> str:
+        '''render is used to get HTML of markdown text, rendering it
+           only if it is not found from the cache
+
+        Args:
+            text (str): markdown to be rendered
+
+        Returns:
+            str: rendered HTML
+        '''
+        key = sha256(text.encode()).digest()
+
+        with self._lock:
+            html = self._html.get(key)
+            if html is not None:
+                self._html.move_to_end(key)
+                return html
+
+        html = markdown(text)
+
+        with self._lock:
+            self._html[key] = html
+            if len(self._html) > self._size:
+                self._html.popitem(last=False)
+
+        return html
+
+
+markdown_cache = MarkdownCache()
@@ -0,0 +1,157 @@
+import os
+import re
+
+from utils.database import db
+from utils.exceptions import DatabaseException
+
+MIGRATIONS_DIRECTORY = os.path.join(os.path.dirname(__file__), '..', '..',
+                                    'migrations')
+NO_TRANSACTION = '-- migrate:no-transaction'
+
+# arbitrary key, held while migrating so that only one process migrates
+_LOCK_KEY = 4708219
+
+_FILENAME = re.compile(r'^(\d+)_(\w+)\.sql$')
+_STATEMENT_END = re.compile(r';\s*$', re.MULTILINE)
+
+
+class Migration:
+    '''Class for one versioned migration file
+
+    Attributes:
+        version (str): version of the migration, numeric prefix of filename
+        name (str): name of the migration
+        sql (str): contents of the migration file
+        transactional (bool): False if migration has to be run
+            outside of transaction, for example CREATE INDEX CONCURRENTLY
+    '''
+
+    def __init__(self, version: str, name: str, sql: str):
+        '''Initializes Migration
+
+        Args:
+            version (str): version of the migration
+            name (str): name of the migration
+            sql (str): contents of the migration file
+        '''
+        self.version = version
+        self.name = name
+        self.sql = sql
+        self.transactional = not sql.lstrip().startswith(NO_TRANSACTION)
+
+    def statements(self) -> [str]:
+        '''statements is used to split migration into single statements,
+           at semicolons ending a line
+
+        Returns:
+            [str]: statements of the migration
+        '''
+        statements = []
+        for statement in _STATEMENT_END.split(self.sql):
+            lines = [
+                line for line in statement.splitlines()
+                if line.strip() and not line.strip().startswith('--')
+            ]
+            if lines:
+                statements.append('\n'.join(lines))
+        return statements
+
+
+def load(directory: str = MIGRATIONS_DIRECTORY) -> [Migration]:
+    '''load is used to read migrations from given directory,
+       ordered by version
+
+    Args:
+        directory (str, optional): directory of migration files.
+            Defaults to migrations directory of the repository.
+
+    Returns:
+        [Migration]: found migrations
+    '''
+    migrations = []
+    for filename in sorted(os.listdir(directory)):
+        match = _FILENAME.match(filename)
+        if not match:
+            continue
+        with open(os.path.join(directory, filename), encoding='utf-8') as file:
+            migrations.append(
+                Migration(match.group(1), match.group(2), file.read()))
+    return migrations
+
+
+def migrate(directory: str = MIGRATIONS_DIRECTORY) -> [Migration]:
+    '''migrate is used to apply migrations not yet recorded
+       in schema_migrations table
+
+    Transactional migrations are applied and recorded in one
+    transaction. Others are run statement by statement in autocommit
+    mode and recorded after all statements have succeeded, so they
+    have to be safe to run again, for example with IF NOT EXISTS.
+
+    Args:
+        directory (str, optional): directory of migration files.
+            Defaults to migrations directory of the repository.
+
+    Raises:
+        DatabaseException: raised if applying a migration fails
+
+    Returns:
+        [Migration]: applied migrations
+    '''
+    applied = []
+
+    with db.engine.connect() as connection:
+        connection = connection.execution_options(isolation_level='AUTOCOMMIT')
+        connection.exec_driver_sql('''
+            CREATE TABLE IF NOT EXISTS schema_migrations(
+              version TEXT PRIMARY KEY NOT NULL,
+              name TEXT NOT NULL,
+              applied_on TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        ''')
+        connection.exec_driver_sql(f'SELECT pg_advisory_lock({_LOCK_KEY})')
+
+        try:
+            done = {
+                row[0] for row in connection.exec_driver_sql(
+                    'SELECT version FROM schema_migrations')
+            }
+
+            for migration in load(directory):
+                if migration.version in done:
+                    continue
+                _apply(connection, migration)
+                applied.append(migration)
+        finally:
+            connection.exec_driver_sql(
+                f'SELECT pg_advisory_unlock({_LOCK_KEY})')
+
+    return applied
+
+
+def _apply(connection, migration: Migration):
+    record = ('INSERT INTO schema_migrations (version, name) '
+              'VALUES (%(version)s, %(name)s)')
+    values = {'version': migration.version, 'name': migration.name}
+    # migrations are sent as written, without parameters, so that
+    # the driver does not take % in them for parameter formatting
+    script = connection.execution_options(no_parameters=True)
+
+    try:
+        if migration.transactional:
+            connection.exec_driver_sql('BEGIN')
+            try:
+                script.exec_driver_sql(migration.sql)
+                connection.exec_driver_sql(record, values)
+            except Exception:
+                connection.exec_driver_sql('ROLLBACK')
+                raise
+            connection.exec_driver_sql('COMMIT')
+        else:
+            for statement in migration.statements():
+                script.exec_driver_sql(statement)
+            connection.exec_driver_sql(record, values)
+    except Exception as error:
+        raise DatabaseException(
+            f'While applying migration {migration.version}_{migration.name}'
+        ) from error
@@ -0,0 +1,191 @@
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from binascii import Error as Base64Error
+from datetime import datetime
+from uuid import UUID
+
+from utils.exceptions import UnvalidInputException
+
+_PARSERS = {
+    'timestamp': datetime.fromisoformat,
+    'uuid': UUID,
+    'integer': int,
+    'real': float,
+    'text': str,
+}
+
+
+class Page:
+    '''Class for one page of listing paginated with keyset
+
+    Attributes:
+        items (list): items of the page
+        next_cursor (str): cursor for the page after this one,
+            None if this is the last page
+        prev_cursor (str): cursor for the page before this one,
+            None if this is the first page
+    '''
+
+    def __init__(self,
+                 items: list,
+                 next_cursor: str = None,
+                 prev_cursor: str = None):
+        '''Initializes Page
+
+        Args:
+            items (list): items of the page
+            next_cursor (str, optional): cursor for the next page.
+                Defaults to None.
+            prev_cursor (str, optional): cursor for the previous page.
+                Defaults to None.
+        '''
+        self.items = items
+        self.next_cursor = next_cursor
+        self.prev_cursor = prev_cursor
+
+    def map(self, function) -> 'Page':
+        '''map is used to convert items of the page, for example
+           repository rows into entities
+
+        Args:
+            function (function): function applied to every item
+
+        Returns:
+            Page: page with converted items and same cursors
+        '''
+        return Page([function(item) for item in self.items], self.next_cursor,
+                    self.prev_cursor)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __len__(self):
+        return len(self.items)
+
+
+class Keyset:
+    '''Class describing unique ordering of a listing, used to paginate
+       it with cursors instead of offsets
+
+    Cursor holds key values of the last or first row of a page, so
+    next page is found from index without scanning skipped rows.
+    '''
+
+    def __init__(self, *columns: tuple, descending: bool = True):
+        '''Initializes Keyset
+
+        Args:
+            columns (tuple): expression and SQL type of each key column,
+                for example ('T.created', 'timestamp'), ('T.id', 'uuid').
+                Key columns together have to be unique.
+            descending (bool, optional): order of the listing.
+                Defaults to True.
+        '''
+        self._columns = columns
+        self._descending = descending
+
+    @property
+    def columns(self) -> tuple:
+        '''columns is used to get expression and SQL type
+           of each key column
+        '''
+        return self._columns
+
+    def clause(self, after: str = None, before: str = None) -> tuple:
+        '''clause is used to get condition and ordering of a page
+
+        Args:
+            after (str, optional): cursor of the row after which
+                page starts. Defaults to None.
+            before (str, optional): cursor of the row before which
+                page ends. Defaults to None.
+
+        Raises:
+            UnvalidInputException: raised if cursor is unvalid
+
+        Returns:
+            tuple: SQL condition, SQL ordering and values for the condition
+        '''
+        if after and before:
+            raise UnvalidInputException(
+                reason='only one of after and before can be given',
+                source='cursor')
+
+        cursor = after or before
+        backwards = bool(before)
+        descending = self._descending != backwards
+
+        direction = 'DESC' if descending else 'ASC'
+        order = ', '.join(f'{column} {direction}'
+                          for column, _ in self._columns)
+
+        if not cursor:
+            return ('TRUE', order, {})
+
+        values = self._decode(cursor)
+        keys = ', '.join(column for column, _ in self._columns)
+        params = ', '.join(f'CAST(:cursor_{index} AS {sql_type})'
+                           for index, (_, sql_type) in enumerate(self._columns))
+        operator = '<' if descending else '>'
+
+        return (f'({keys}) {operator} ({params})', order, {
+            f'cursor_{index}': value for index, value in enumerate(values)
+        })
+
+    def page(self,
+             rows: list,
+             limit: int,
+             key,
+             after: str = None,
+             before: str = None) -> Page:
+        '''page is used to build Page from rows fetched with clause
+
+        Rows are expected to be fetched with one extra row over
+        the limit, so that existence of further page is known.
+
+        Args:
+            rows (list): fetched rows, at most limit + 1
+            limit (int): size of the page
+            key (function): function returning key values of a row
+            after (str, optional): cursor used in fetching. Defaults to None.
+            before (str, optional): cursor used in fetching. Defaults to None.
+
+        Returns:
+            Page: rows of the page in listing´s order with cursors
+        '''
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        if before:
+            rows.reverse()
+            has_next, has_prev = True, has_more
+        else:
+            has_next, has_prev = has_more, bool(after)
+
+        if not rows:
+            return Page(rows)
+
+        return Page(rows,
+                    self._encode(key(rows[-1])) if has_next else None,
+                    self._encode(key(rows[0])) if has_prev else None)
+
+    @staticmethod
+    def _encode(values: tuple) -> str:
+        values = [
+            value.isoformat() if isinstance(value, datetime) else str(value)
+            for value in values
+        ]
+        return urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def _decode(self, cursor: str) -> list:
+        try:
+            values = json.loads(urlsafe_b64decode(cursor.encode()))
+            if len(values) != len(self._columns):
+                raise ValueError('wrong amount of key values')
+            return [
+                str(_PARSERS[sql_type](value))
+                for value, (_, sql_type) in zip(values, self._columns)
+            ]
+        except (Base64Error, TypeError, ValueError) as error:
+            raise UnvalidInputException(reason='unvalid formatting',
+                                        source='cursor') from error
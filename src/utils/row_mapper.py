@@ -0,0 +1,152 @@
+from entities.comment import Comment
+from entities.feature import Feature, FeatureSummary
+from entities.project import Project, ProjectSummary
+from entities.task import Task, TaskSummary
+from entities.team import Team
+from entities.user import User
+from utils.helpers import avatar_url, fullname
+
+# Functions building entities straight from rows returned by repositories,
+# so that services do not need to know the order of the columns.
+
+
+def to_comment(row) -> Comment:
+    '''to_comment is used to build Comment from comment row, starting
+       with mode, either 'features' or 'tasks'
+
+    Args:
+        row: comment as returned by CommentRepository
+
+    Returns:
+        Comment: comment related to feature or task
+    '''
+    if row[0] == 'features':
+        return Comment(row[1], row[2], fullname(row[3], row[4]), row[5],
+                       row[6], row[7], row[8], fid=row[9], fname=row[10],
+                       mode=row[0], html=row[11])
+    return Comment(row[1], row[2], fullname(row[3], row[4]), row[5], row[6],
+                   row[7], row[8], tid=row[9], tname=row[10], mode=row[0],
+                   html=row[11])
+
+
+def to_task(row, comments: [Comment] = None) -> Task:
+    '''to_task is used to build Task from task row
+
+    Args:
+        row: task as returned by TaskRepository
+        comments ([Comment], optional): comments of the task.
+            Defaults to None.
+
+    Returns:
+        Task: task with given comments
+    '''
+    return Task(row[0], row[1], row[2], row[3], fullname(row[4], row[5]),
+                row[6], row[7], row[8], row[9], row[10], row[11], row[12],
+                row[13], row[14], row[15], comments)
+
+
+def to_task_summary(row) -> TaskSummary:
+    '''to_task_summary is used to build TaskSummary from summary row
+
+    Args:
+        row: task summary as returned by TaskRepository
+
+    Returns:
+        TaskSummary: task with amount of comments and time spent
+    '''
+    return TaskSummary(row[0], row[1], row[2], row[3],
+                       fullname(row[4], row[5]), row[6], row[7], row[8],
+                       row[9], row[10], row[11], row[12], row[13], row[14],
+                       row[15], row[16], float(row[17]))
+
+
+def to_feature(row,
+               tasks: [Task] = None,
+               comments: [Comment] = None) -> Feature:
+    '''to_feature is used to build Feature from feature row
+
+    Args:
+        row: feature as returned by FeatureRepository
+        tasks ([Task], optional): tasks of the feature. Defaults to None.
+        comments ([Comment], optional): comments of the feature.
+            Defaults to None.
+
+    Returns:
+        Feature: feature with given tasks and comments
+    '''
+    return Feature(row[0], row[1], row[2], row[3], fullname(row[4], row[5]),
+                   row[6], row[7], row[8], row[9], row[10], row[11], row[12],
+                   row[13], row[14], row[15], tasks, comments)
+
+
+def to_feature_summary(row) -> FeatureSummary:
+    '''to_feature_summary is used to build FeatureSummary from summary row
+
+    Args:
+        row: feature summary as returned by FeatureRepository
+
+    Returns:
+        FeatureSummary: feature with amounts of tasks and comments
+            and time spent
+    '''
+    return FeatureSummary(row[0], row[1], row[2], row[3],
+                          fullname(row[4], row[5]), row[6], row[7], row[8],
+                          row[9], row[10], row[11], row[12], row[13],
+                          row[14], row[15], row[16], row[17], float(row[18]))
+
+
+def to_project(row, features: [Feature] = None) -> Project:
+    '''to_project is used to build Project from project row
+
+    Args:
+        row: project as returned by ProjectRepository
+        features ([Feature], optional): features of the project.
+            Defaults to None.
+
+    Returns:
+        Project: project with given features
+    '''
+    return Project(row[0], row[1], fullname(row[2], row[3]), row[4], row[5],
+                   row[6], row[7], row[8], features)
+
+
+def to_project_summary(row) -> ProjectSummary:
+    '''to_project_summary is used to build ProjectSummary from summary row
+
+    Args:
+        row: project summary as returned by ProjectRepository
+
+    Returns:
+        ProjectSummary: project with amounts of features and tasks
+            and time spent
+    '''
+    return ProjectSummary(row[0], row[1], fullname(row[2], row[3]), row[4],
+                          row[5], row[6], row[7], row[8], row[9], row[10],
+                          float(row[11]))
+
+
+def to_user(row) -> User:
+    '''to_user is used to build User from user row
+
+    Args:
+        row: user as returned by UserRepository
+
+    Returns:
+        User: user with url of the profile image
+    '''
+    return User(row[0], row[1], row[2], row[3], row[4], row[5], row[6],
+                row[7], avatar_url(row[0], row[8]), row[9], row[10])
+
+
+def to_team(row, members: [User] = None) -> Team:
+    '''to_team is used to build Team from team row
+
+    Args:
+        row: team as returned by TeamRepository
+        members ([User], optional): members of the team. Defaults to None.
+
+    Returns:
+        Team: team with given members
+    '''
+    return Team(row[0], row[1], row[2], row[3], fullname(row[4], row[5]),
+                members)
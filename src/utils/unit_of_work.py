@@ -0,0 +1,89 @@
+from contextlib import contextmanager
+from flask import g, has_request_context
+from app import app
+from utils.database import db
+from utils.exceptions import DatabaseException
+
+
+def commit():
+    '''commit is used by repositories after writing into the database
+
+    During a request the commit is deferred to the end of the request,
+    so that all writes of the request are saved in one transaction.
+    Outside of requests, for example in scripts, and inside
+    immediate blocks the transaction is committed right away.
+
+    Raises:
+        DatabaseException: raised if committing right away fails
+    '''
+    if has_request_context() and not g.get('unit_of_work_immediate'):
+        g.unit_of_work_pending = True
+        return
+
+    try:
+        db.session.commit()
+    except Exception as error:
+        db.session.rollback()
+        raise DatabaseException('While committing transaction') from error
+
+
+def rollback():
+    '''rollback is used to discard writes not yet committed,
+       also writes of the request made before the failed one
+    '''
+    db.session.rollback()
+    if has_request_context():
+        g.pop('unit_of_work_pending', None)
+
+
+@contextmanager
+def immediate():
+    '''immediate is used to opt out of the unit of work for long jobs,
+       for example imports, which commit their own transactions
+
+    Writes made by the request before the block are committed when
+    the block starts, unless the request has failed, and writes inside
+    the block are committed whenever repositories commit.
+    '''
+    previous = g.get('unit_of_work_immediate', False)
+    g.unit_of_work_immediate = True
+    try:
+        if g.pop('unit_of_work_pending', None):
+            if g.get('unit_of_work_failed'):
+                db.session.rollback()
+            else:
+                commit()
+        yield
+    finally:
+        g.unit_of_work_immediate = previous
+
+
+@app.after_request
+def _commit_request(response):
+    '''Commits writes of the request if the request succeeded,
+       rolls them back if response is an error or an exception of the
+       application was raised during the request
+    '''
+    failed = g.pop('unit_of_work_failed', False)
+    if not g.pop('unit_of_work_pending', None):
+        return response
+
+    if failed or response.status_code >= 400:
+        db.session.rollback()
+        return response
+
+    try:
+        db.session.commit()
+    except Exception as error:
+        db.session.rollback()
+        raise DatabaseException('While committing request') from error
+
+    return response
+
+
+@app.teardown_request
+def _rollback_request(error):
+    '''Rolls back writes of the request if it raised an exception
+    '''
+    if error is not None and g.pop('unit_of_work_pending', None):
+        db.session.rollback()
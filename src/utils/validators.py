@@ -35,3 +35,19 @@ def validate_flags(flags: str) -> bool:
     if check:
         return check.end(0) == len(flags)
     return False
+
+
+def validate_flag(flag: str) -> bool:
+    '''validate_flag is used to check if given string
+    is single flag, which can be searched from flags.
+
+    Args:
+        flag (str): flag to check
+
+    Returns:
+        bool: True if flag is valid
+    '''
+    if not isinstance(flag, str):
+        return False
+
+    return bool(flag.strip()) and ';' not in flag and len(flag) <= 100
@@ -1,4 +1,3 @@
-from os import getenv
 from invoke import task
 
 
@@ -9,8 +8,23 @@ def start(ctx):
 
 
 @task
+def migrate(ctx):
+    ctx.run('python3 src/migrate.py')
+
+
+@task
+def rebuild_rollups(ctx):
+    ctx.run('python3 src/rebuild_rollups.py')
+
+
+@task
+def import_csv(ctx, target, file):
+    ctx.run(f'python3 src/import_csv.py {target} {file}')
+
+
+@task(migrate)
 def start_production(ctx):
-    ctx.run(f'cd src && gunicorn app:app --bind 0.0.0.0:{getenv("PORT")}')
+    ctx.run('cd src && gunicorn -c gunicorn_config.py app:app')
 
 
 @task
@@ -28,6 +42,11 @@ def coverage_report(ctx):
     ctx.run('coverage xml')
 
 
+@task
+def benchmark(ctx, name, args=''):
+    ctx.run(f'cd src && python3 -m benchmarks.{name} {args}')
+
+
 @task
 def lint(ctx):
     ctx.run('pylint src')